@@ -0,0 +1,187 @@
+"""Synthetic CLAUDE.md and README corpus seeded from the scenarios collection."""
+
+import random
+import re
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from ..markdown_document import CodeBlock, parse_markdown
+
+SCENARIOS_DIR = Path(__file__).resolve().parents[2] / "scenarios"
+
+SIZE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([kmg]?)b?", re.IGNORECASE)
+SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+# Section titles typical of CLAUDE.md files, mixed with those of the seed
+CLAUDE_SECTIONS = [
+    "Architecture Overview",
+    "Development Commands",
+    "Testing",
+    "Deployment",
+    "Troubleshooting",
+    "Project Structure",
+    "Code Style",
+    "Constraints",
+    "Workflow",
+]
+README_SECTIONS = [
+    "Installation",
+    "Usage",
+    "Features",
+    "Configuration",
+    "Examples",
+    "Contributing",
+    "License",
+    "Changelog",
+]
+INSTALL_LINES = [
+    "npm install -g {name}",
+    "pip install {name}",
+    "cargo install {name}",
+    "brew install {name}",
+    "go install github.com/{owner}/{name}@latest",
+]
+TOPICS = ["cli", "claude", "ai", "developer-tools", "automation", "sdk", "plugin"]
+LICENSES = ["MIT", "Apache-2.0", "BSD-3-Clause", "GPL-3.0", None]
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as ``512``, ``4KB`` or ``1.5MB`` into bytes."""
+    match = SIZE_PATTERN.fullmatch(text.strip())
+    if match is None:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).lower()])
+
+
+def format_size(size: int) -> str:
+    """Format a byte count with the largest unit that divides it evenly."""
+    for unit in ("G", "M", "K"):
+        scale = SIZE_UNITS[unit.lower()]
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}B"
+    return f"{size}B"
+
+
+@dataclass
+class SeedMaterial:
+    """Building blocks harvested from real markdown documents."""
+
+    headings: list[str] = field(default_factory=list)
+    paragraphs: list[str] = field(default_factory=list)
+    bullets: list[str] = field(default_factory=list)
+    code_blocks: list[CodeBlock] = field(default_factory=list)
+
+    def add_document(self, content: str) -> None:
+        """Harvest the headings, paragraphs, bullets and code of a document."""
+        document = parse_markdown(content)
+        self.headings.extend(h.title for h in document.headings if h.level >= 2)
+        self.bullets.extend(bullet.text for bullet in document.bullets)
+        self.code_blocks.extend(block for block in document.code_blocks if block.text)
+        for block in content.split("\n\n"):
+            block = block.strip()
+            is_prose = not block.startswith(("#", "-", "*", "|", "`", ">", "<"))
+            if len(block) > 40 and is_prose and "```" not in block:
+                self.paragraphs.append(block)
+
+
+def load_seed(scenarios_dir: str | Path = SCENARIOS_DIR) -> SeedMaterial:
+    """Harvest seed material from every markdown file of the scenarios collection."""
+    seed = SeedMaterial()
+    for path in sorted(Path(scenarios_dir).rglob("*.md")):
+        seed.add_document(path.read_text(encoding="utf-8", errors="replace"))
+    if not (seed.headings and seed.paragraphs and seed.bullets and seed.code_blocks):
+        raise ValueError(f"Not enough markdown in {scenarios_dir} to seed a corpus")
+    return seed
+
+
+class CorpusGenerator:
+    """Generates reproducible CLAUDE.md files, READMEs and candidate metadata.
+
+    Documents are assembled from seed paragraphs, bullets and code blocks
+    under typical section headings until they reach the requested size.
+    The same seed, kind, size and index always produce the same document.
+    """
+
+    def __init__(self, seed_material: SeedMaterial | None = None, seed: int = 0):
+        self.material = seed_material or load_seed()
+        self.seed = seed
+
+    def _random(self, *key) -> random.Random:
+        return random.Random(":".join(str(part) for part in (self.seed, *key)))
+
+    def claude_md(self, size: int, index: int = 0) -> str:
+        """Return a CLAUDE.md of roughly ``size`` bytes."""
+        rng = self._random("claude", size, index)
+        parts = [f"# {rng.choice(self.material.headings)}\n"]
+        self._fill(parts, size, rng, CLAUDE_SECTIONS)
+        return "".join(parts)
+
+    def readme(self, size: int, index: int = 0) -> str:
+        """Return a tool README of roughly ``size`` bytes."""
+        rng = self._random("readme", size, index)
+        name = f"tool-{index}"
+        install = rng.choice(INSTALL_LINES).format(name=name, owner="owner")
+        parts = [
+            f"# {name}\n",
+            f"{rng.choice(self.material.paragraphs)}\n",
+            f"## Installation\n\n```bash\n{install}\n```\n",
+            f"## Usage\n\n```bash\n{name} --help\n```\n",
+        ]
+        self._fill(parts, size, rng, README_SECTIONS)
+        return "".join(parts)
+
+    def _fill(
+        self, parts: list[str], size: int, rng: random.Random, sections: list[str]
+    ) -> None:
+        """Append sections to ``parts`` until their total length reaches ``size``."""
+        material = self.material
+        length = sum(len(part) for part in parts)
+        while length < size:
+            title = rng.choice(sections + material.headings)
+            section = [f"\n## {title}\n\n{rng.choice(material.paragraphs)}\n\n"]
+            section.extend(
+                f"- {rng.choice(material.bullets)}\n" for _ in range(rng.randint(2, 6))
+            )
+            if rng.random() < 0.6:
+                block = rng.choice(material.code_blocks)
+                section.append(f"\n```{block.language}\n{block.text}\n```\n")
+            if rng.random() < 0.3:
+                section.append(
+                    f"\n### {rng.choice(material.headings)}\n\n"
+                    f"{rng.choice(material.paragraphs)}\n"
+                )
+            text = "".join(section)
+            parts.append(text)
+            length += len(text)
+
+    def _metadata(self, kind: str, index: int) -> dict:
+        rng = self._random(kind, "metadata", index)
+        owner = f"owner{index % 97}"
+        name = f"{kind}-{index}"
+        updated = datetime(2025, 1, 1, tzinfo=UTC) - timedelta(days=rng.randint(0, 720))
+        return {
+            "full_name": f"{owner}/{name}",
+            "name": name,
+            "owner": owner,
+            "stars": int(rng.paretovariate(1.2)) * 5,
+            "forks": rng.randint(0, 50),
+            "description": rng.choice(self.material.paragraphs)[:160],
+            "topics": rng.sample(TOPICS, rng.randint(0, 3)),
+            "language": rng.choice(["Python", "TypeScript", "Go", "Rust"]),
+            "html_url": f"https://github.com/{owner}/{name}",
+            "created_at": (updated - timedelta(days=365)).isoformat(),
+            "updated_at": updated.isoformat(),
+            "organization": None,
+        }
+
+    def repository_candidate(self, index: int = 0) -> dict:
+        """Return CLAUDE.md candidate metadata as the repository searcher builds it."""
+        return {**self._metadata("repo", index), "claude_file_path": "CLAUDE.md"}
+
+    def tool_candidate(self, readme: str, index: int = 0) -> dict:
+        """Return tool candidate metadata with its README content."""
+        candidate = self._metadata("tool", index)
+        candidate["license"] = self._random("license", index).choice(LICENSES)
+        candidate["readme_content"] = readme
+        return candidate
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Load test the discovery pipelines against a fake GitHub API.
+
+For every requested size, a synthetic data set with that many candidate
+repositories is served by ``FakeGitHubServer`` and the unmodified
+``ClaudeFileDiscovery`` or ``ClaudeToolDiscovery`` pipeline is run
+against it through ``GITHUB_API_URL``. The report gives candidates per
+second and the API calls per candidate, in total and per endpoint, so
+changes to searching, enrichment or evaluation can be judged at 10k-100k
+candidates without touching GitHub.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from scripts.benchmarks.fake_github import (
+    FakeGitHubData,
+    FakeGitHubServer,
+    add_server_arguments,
+    populate,
+    server_options,
+)
+from scripts.discovery.blob_store import BlobStore
+from scripts.discovery.orchestrator import ClaudeFileDiscovery
+from scripts.tool_discovery.orchestrator import ClaudeToolDiscovery
+
+logger = logging.getLogger(__name__)
+
+PIPELINES = ("files", "tools")
+LOAD_TOKEN = "load-test"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(
+        description="Load test a discovery pipeline against a fake GitHub API."
+    )
+    parser.add_argument(
+        "--pipeline",
+        choices=PIPELINES,
+        default="files",
+        help="files runs CLAUDE.md discovery, tools runs tool discovery",
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        nargs="+",
+        default=[10_000],
+        help="Candidate repositories in the data set, one run each (default: 10000)",
+    )
+    parser.add_argument(
+        "--sharding",
+        default="size,pushed",
+        help='Shard dimensions of CLAUDE.md discovery, "" to disable '
+        "(default: size,pushed)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of candidates evaluated concurrently (default: 4)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=0,
+        help="Score candidates in this many worker processes (default: 0)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Data set seed")
+    add_server_arguments(parser)
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    return parser.parse_args(argv)
+
+
+@contextlib.contextmanager
+def api_url(url: str) -> Iterator[None]:
+    """Point GITHUB_API_URL at a server for the duration of the block."""
+    previous = os.environ.get("GITHUB_API_URL")
+    os.environ["GITHUB_API_URL"] = url
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ["GITHUB_API_URL"]
+        else:
+            os.environ["GITHUB_API_URL"] = previous
+
+
+def run_load(
+    data: FakeGitHubData,
+    pipeline: str = "files",
+    shard_dimensions: list[str] | None = None,
+    workers: int = 4,
+    processes: int = 0,
+    **options,
+) -> dict:
+    """Run a discovery pipeline against a fake server holding ``data``.
+
+    ``options`` configure the FakeGitHubServer. The pipeline runs in a
+    temporary directory, so it sees no existing collection and its report
+    file is discarded; nothing is cached between runs.
+    """
+    with (
+        FakeGitHubServer(data, **options) as server,
+        api_url(server.base_url),
+        tempfile.TemporaryDirectory() as workdir,
+        contextlib.chdir(workdir),
+    ):
+        started = time.perf_counter()
+        if pipeline == "files":
+            discovery = ClaudeFileDiscovery(
+                LOAD_TOKEN,
+                shard_dimensions=shard_dimensions,
+                blob_store=BlobStore(),
+                workers=workers,
+                processes=processes,
+            )
+            evaluated = len(discovery.discover_new_repositories())
+        else:
+            discovery = ClaudeToolDiscovery(
+                LOAD_TOKEN, workers=workers, processes=processes
+            )
+            discovery.discover_new_tools()
+            evaluated = discovery.evaluated
+        elapsed = time.perf_counter() - started
+        stats = server.stats()
+
+    per_candidate = max(evaluated, 1)
+    return {
+        "pipeline": pipeline,
+        "repositories": len(data.repositories),
+        "candidates": evaluated,
+        "evaluated": evaluated,
+        "seconds": round(elapsed, 3),
+        "candidates_per_sec": round(evaluated / elapsed, 2) if elapsed > 0 else 0.0,
+        "api_calls": stats["calls"],
+        "api_calls_per_candidate": round(stats["calls"] / per_candidate, 3),
+        "endpoint_calls_per_candidate": {
+            endpoint: round(calls / per_candidate, 3)
+            for endpoint, calls in stats["endpoints"].items()
+        },
+        "errors": stats["errors"],
+        "rate_limited": stats["rate_limited"],
+        "bytes": stats["bytes"],
+    }
+
+
+def format_result(result: dict) -> str:
+    """Render one run as a plain-text report line plus its per-endpoint calls."""
+    endpoints = ", ".join(
+        f"{endpoint} {calls:.2f}"
+        for endpoint, calls in result["endpoint_calls_per_candidate"].items()
+    )
+    return (
+        f"{result['pipeline']:<5} {result['repositories']:>7} repos  "
+        f"{result['candidates']:>7} candidates  {result['seconds']:>8.1f}s  "
+        f"{result['candidates_per_sec']:>8.1f} candidates/sec  "
+        f"{result['api_calls']:>7} API calls  "
+        f"{result['api_calls_per_candidate']:.2f} calls/candidate\n"
+        f"      per candidate: {endpoints}"
+    )
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # The pipelines log every candidate; keep the report readable
+    logging.getLogger("scripts.discovery").setLevel(logging.WARNING)
+    logging.getLogger("scripts.tool_discovery").setLevel(logging.WARNING)
+
+    shard_dimensions = args.sharding.replace(",", " ").split() or None
+    results = []
+    for size in args.candidates:
+        if args.pipeline == "files":
+            data = populate(size, seed=args.seed)
+        else:
+            data = populate(0, tools=size, seed=args.seed)
+        result = run_load(
+            data,
+            args.pipeline,
+            shard_dimensions,
+            args.workers,
+            args.processes,
+            **server_options(args),
+        )
+        results.append(result)
+        print(format_result(result))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1163 @@
+#!/usr/bin/env python3
+"""
+A local stand-in for the parts of the GitHub API the discovery pipeline uses.
+
+``FakeGitHubServer`` answers code and repository search (with pagination
+and the 1,000-result cap), repositories, topics, contents, READMEs, git
+trees and blobs, issue creation, rate limit status and the GraphQL
+``nodes(ids:)`` repository query, all from an in-memory
+``FakeGitHubData`` set. Responses carry ``X-RateLimit-*`` headers from
+per-token quotas, and the server can add latency and inject errors.
+
+``populate`` fills a data set from the synthetic benchmark corpus, so the
+pipeline can be run against tens of thousands of repositories by pointing
+``GITHUB_API_URL`` at the server.
+"""
+
+import argparse
+import base64
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+
+from scripts.benchmarks.corpus import CorpusGenerator
+from scripts.discovery.blob_store import git_blob_sha
+from scripts.discovery.rate_limiter import BUCKET_LIMITS, bucket_for_url
+from scripts.discovery.sharding import (
+    MAX_INDEXED_FILE_SIZE,
+    SEARCH_RESULT_CAP,
+    parse_range,
+)
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_REPOSITORY = ("josix", "awesome-claude-md")
+
+# Quota of every bucket unless GitHub's documented limits are requested
+UNLIMITED_RATE_LIMITS = dict.fromkeys(BUCKET_LIMITS, (10_000_000, 3600))
+
+# Where the instruction file of a generated repository lives, with its share
+INSTRUCTION_PATHS = [
+    ("CLAUDE.md", 0.80),
+    (".claude/CLAUDE.md", 0.08),
+    ("docs/CLAUDE.md", 0.07),
+    ("AGENTS.md", 0.05),
+]
+TOOL_PHRASES = [
+    "CLAUDE.md generator",
+    "CLAUDE.md sync tool",
+    "CLAUDE.md linter",
+    "CLAUDE.md analyzer",
+    "AGENTS.md and CLAUDE.md scaffold generator",
+    "CLAUDE.md CLI",
+    "GitHub action for CLAUDE.md",
+]
+
+QUERY_TOKEN = re.compile(r'(-?)(\w+):("[^"]*"|\S+)|"([^"]*)"|(\S+)')
+CACHED_QUERIES = 4096
+
+
+@dataclass(frozen=True)
+class FakeFile:
+    """A file of a fake repository; its text is ``prefix`` plus a pooled document."""
+
+    path: str
+    prefix: str
+    document: int | None
+    size: int
+    sha: str
+
+
+@dataclass
+class FakeRepository:
+    """A fake repository with the metadata the pipeline reads."""
+
+    id: int
+    owner: str
+    name: str
+    description: str = ""
+    stars: int = 0
+    forks: int = 0
+    language: str | None = None
+    topics: list[str] = field(default_factory=list)
+    created_at: datetime = datetime(2024, 1, 1, tzinfo=UTC)
+    updated_at: datetime = datetime(2024, 1, 1, tzinfo=UTC)
+    archived: bool = False
+    fork: bool = False
+    license: str | None = None
+    organization: bool = False
+    files: dict[str, FakeFile] = field(default_factory=dict)
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.name}"
+
+    @property
+    def node_id(self) -> str:
+        return base64.b64encode(f"010:Repository{self.id}".encode()).decode()
+
+
+def parse_query(query: str) -> tuple[list[list[str]], list[tuple[bool, str, str]]]:
+    """Split a search query into term groups and ``(negated, name, value)`` qualifiers.
+
+    Terms joined by ``OR`` form one group, and a match needs one term of
+    every group. Quoted phrases are single terms.
+    """
+    groups: list[list[str]] = []
+    qualifiers = []
+    joined = False
+    for match in QUERY_TOKEN.finditer(query):
+        negated, name, value, phrase, word = match.groups()
+        if name is not None:
+            qualifiers.append((negated == "-", name.lower(), value.strip('"')))
+            continue
+        term = phrase if phrase is not None else word
+        if term == "OR":
+            joined = bool(groups)
+        elif term != "AND":
+            if joined:
+                groups[-1].append(term.lower())
+            else:
+                groups.append([term.lower()])
+            joined = False
+    return groups, qualifiers
+
+
+def _in_range(value, spec: str, parse, lowest, highest, step) -> bool:
+    low, high = parse_range(spec, parse, lowest, highest, step)
+    return low <= value <= high
+
+
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value[:10])
+
+
+def _date_range(value: date, spec: str) -> bool:
+    return _in_range(value, spec, _parse_date, date.min, date.max, timedelta(days=1))
+
+
+def _int_range(value: int, spec: str) -> bool:
+    return _in_range(value, spec, int, -math.inf, math.inf, 1)
+
+
+class FakeGitHubData:
+    """The repositories, files and search indexes a fake GitHub API serves.
+
+    File texts are not stored: each is a short per-file prefix followed by
+    a document from a shared pool, so a large data set stays small in
+    memory while every file still has its own git blob SHA.
+    """
+
+    def __init__(self):
+        self.repositories: dict[str, FakeRepository] = {}
+        self.nodes: dict[str, FakeRepository] = {}
+        self.documents: list[str] = []
+        self._files: list[tuple[FakeRepository, FakeFile]] = []
+        self._files_by_name: dict[str, list[tuple[FakeRepository, FakeFile]]] = {}
+        self._size_indexes: dict[str | None, tuple[list[int], list]] = {}
+        self._query_cache: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def add_document(self, text: str) -> int:
+        """Add a document to the pool and return its index."""
+        self.documents.append(text)
+        return len(self.documents) - 1
+
+    def add_repository(self, owner: str, name: str, **fields) -> FakeRepository:
+        """Add a repository; ``fields`` set its FakeRepository attributes."""
+        repo = FakeRepository(len(self.repositories) + 1, owner, name, **fields)
+        self.repositories[repo.full_name.lower()] = repo
+        self.nodes[repo.node_id] = repo
+        return repo
+
+    def add_file(
+        self,
+        repo: FakeRepository,
+        path: str,
+        prefix: str = "",
+        document: int | None = None,
+    ) -> FakeFile:
+        """Add a file whose text is ``prefix`` followed by a pooled document."""
+        data = self._join(prefix, document).encode("utf-8")
+        file = FakeFile(path, prefix, document, len(data), git_blob_sha(data))
+        repo.files[path] = file
+        self._files.append((repo, file))
+        name = path.rsplit("/", 1)[-1].lower()
+        self._files_by_name.setdefault(name, []).append((repo, file))
+        self._size_indexes.clear()
+        self._query_cache.clear()
+        return file
+
+    def _join(self, prefix: str, document: int | None) -> str:
+        return prefix + (self.documents[document] if document is not None else "")
+
+    def text(self, file: FakeFile) -> str:
+        """Return the text of a file."""
+        return self._join(file.prefix, file.document)
+
+    def repository(self, owner: str, name: str) -> FakeRepository | None:
+        """Return a repository by owner and name, ignoring case like GitHub."""
+        return self.repositories.get(f"{owner}/{name}".lower())
+
+    def _size_index(self, filename: str | None) -> tuple[list[int], list]:
+        """Return the files with a name (or all files), sorted by size."""
+        with self._lock:
+            index = self._size_indexes.get(filename)
+            if index is None:
+                files = (
+                    self._files_by_name.get(filename, []) if filename else self._files
+                )
+                entries = sorted(files, key=lambda entry: entry[1].size)
+                index = ([file.size for _, file in entries], entries)
+                self._size_indexes[filename] = index
+            return index
+
+    def _cached(self, key: tuple, search) -> list:
+        with self._lock:
+            results = self._query_cache.get(key)
+        if results is None:
+            results = search()
+            with self._lock:
+                if len(self._query_cache) >= CACHED_QUERIES:
+                    self._query_cache.pop(next(iter(self._query_cache)))
+                self._query_cache[key] = results
+        return results
+
+    def search_code(
+        self, query: str, sort: str | None = None, order: str = "desc"
+    ) -> list[tuple[FakeRepository, FakeFile]]:
+        """Return the (repository, file) pairs matching a code search query.
+
+        Supports the ``filename``, ``extension``, ``path``, ``size``,
+        ``stars``, ``pushed``, ``language``, ``repo``, ``user`` and ``org``
+        qualifiers, each optionally negated; other qualifiers are ignored.
+        Terms are matched against file paths and texts.
+        """
+        return self._cached(
+            ("code", query, sort, order),
+            lambda: self._search_code(query, sort, order),
+        )
+
+    def _search_code(self, query: str, sort: str | None, order: str) -> list:
+        groups, qualifiers = parse_query(query)
+        filename = size = None
+        predicates = []
+        for negated, name, value in qualifiers:
+            if name == "filename" and not negated and filename is None:
+                filename = value.lower()
+            elif name == "size" and not negated and size is None:
+                size = value
+            else:
+                predicate = _code_predicate(name, value)
+                if predicate is not None:
+                    predicates.append((predicate, negated))
+
+        sizes, entries = self._size_index(filename)
+        if size is not None:
+            low, high = parse_range(size, int, 0, MAX_INDEXED_FILE_SIZE, 1)
+            entries = entries[bisect_left(sizes, low) : bisect_right(sizes, high)]
+
+        results = [
+            (repo, file)
+            for repo, file in entries
+            if all(
+                predicate(repo, file) != negated for predicate, negated in predicates
+            )
+            and (not groups or self._matches_terms(groups, file.path, file))
+        ]
+        if sort == "indexed":
+            results.sort(key=lambda entry: (entry[0].updated_at, entry[1].path))
+        else:
+            results.sort(key=lambda entry: (entry[0].stars, entry[0].full_name))
+        if order != "asc":
+            results.reverse()
+        return results
+
+    def _matches_terms(self, groups: list[list[str]], *texts) -> bool:
+        lowered = " ".join(
+            self.text(text) if isinstance(text, FakeFile) else text for text in texts
+        ).lower()
+        return all(any(term in lowered for term in group) for group in groups)
+
+    def search_repositories(
+        self, query: str, sort: str | None = None, order: str = "desc"
+    ) -> list[FakeRepository]:
+        """Return the repositories matching a repository search query.
+
+        Terms are matched in the name, description and topics, or the
+        fields listed by ``in:`` (``readme`` included). Supports the
+        ``stars``, ``forks``, ``language``, ``topic``, ``pushed``,
+        ``created``, ``user``, ``org``, ``archived`` and ``fork``
+        qualifiers; forks are left out unless ``fork:true`` or ``fork:only``.
+        """
+        return self._cached(
+            ("repositories", query, sort, order),
+            lambda: self._search_repositories(query, sort, order),
+        )
+
+    def _search_repositories(self, query: str, sort: str | None, order: str) -> list:
+        groups, qualifiers = parse_query(query)
+        fields = ["name", "description", "topics"]
+        forks = "false"
+        predicates = []
+        for negated, name, value in qualifiers:
+            if name == "in":
+                fields = value.lower().split(",")
+            elif name == "fork":
+                forks = value.lower()
+            else:
+                predicate = _repository_predicate(name, value)
+                if predicate is not None:
+                    predicates.append((predicate, negated))
+
+        results = []
+        for repo in self.repositories.values():
+            if (forks == "false" and repo.fork) or (forks == "only" and not repo.fork):
+                continue
+            if not all(predicate(repo) != negated for predicate, negated in predicates):
+                continue
+            if groups and not self._matches_terms(
+                groups, *self._repository_texts(repo, fields)
+            ):
+                continue
+            results.append(repo)
+
+        if sort == "updated":
+            results.sort(key=lambda repo: (repo.updated_at, repo.full_name))
+        elif sort == "forks":
+            results.sort(key=lambda repo: (repo.forks, repo.full_name))
+        else:
+            results.sort(key=lambda repo: (repo.stars, repo.full_name))
+        if order != "asc":
+            results.reverse()
+        return results
+
+    def _repository_texts(self, repo: FakeRepository, fields: list[str]) -> list:
+        texts: list = []
+        if "name" in fields:
+            texts.append(repo.name)
+        if "description" in fields:
+            texts.append(repo.description)
+        if "topics" in fields:
+            texts.append(" ".join(repo.topics))
+        if "readme" in fields and "README.md" in repo.files:
+            texts.append(repo.files["README.md"])
+        return texts
+
+
+def _code_predicate(name: str, value: str):
+    """Return a (repository, file) predicate for a code search qualifier."""
+    lowered = value.lower()
+    predicates = {
+        "filename": lambda repo, file: file.path.rsplit("/", 1)[-1].lower() == lowered,
+        "extension": lambda repo, file: file.path.lower().endswith(f".{lowered}"),
+        "path": lambda repo, file: file.path.lower().startswith(lowered.strip("/")),
+        "size": lambda repo, file: _int_range(file.size, value),
+        "stars": lambda repo, file: _int_range(repo.stars, value),
+        "pushed": lambda repo, file: _date_range(repo.updated_at.date(), value),
+        "language": lambda repo, file: (repo.language or "").lower() == lowered,
+        "repo": lambda repo, file: repo.full_name.lower() == lowered,
+        "user": lambda repo, file: repo.owner.lower() == lowered,
+        "org": lambda repo, file: repo.owner.lower() == lowered,
+    }
+    return predicates.get(name)
+
+
+def _repository_predicate(name: str, value: str):
+    """Return a repository predicate for a repository search qualifier."""
+    lowered = value.lower()
+    predicates = {
+        "stars": lambda repo: _int_range(repo.stars, value),
+        "forks": lambda repo: _int_range(repo.forks, value),
+        "language": lambda repo: (repo.language or "").lower() == lowered,
+        "topic": lambda repo: lowered in repo.topics,
+        "pushed": lambda repo: _date_range(repo.updated_at.date(), value),
+        "created": lambda repo: _date_range(repo.created_at.date(), value),
+        "user": lambda repo: repo.owner.lower() == lowered,
+        "org": lambda repo: repo.owner.lower() == lowered,
+        "archived": lambda repo: repo.archived == (lowered == "true"),
+    }
+    return predicates.get(name)
+
+
+def populate(
+    repositories: int,
+    tools: int = 0,
+    seed: int = 0,
+    documents: int = 256,
+    generator: CorpusGenerator | None = None,
+) -> FakeGitHubData:
+    """Build a data set of CLAUDE.md repositories and CLAUDE.md tools.
+
+    Repository metadata and documents come from the benchmark corpus.
+    Most repositories keep a CLAUDE.md at their root; the rest keep it
+    under ``.claude/`` or ``docs/``, or only have an AGENTS.md, and a few
+    are archived or forks. Tool repositories describe themselves with
+    the phrases the tool searcher looks for. The collection repository
+    that discovery issues are filed in is always present.
+    """
+    generator = generator or CorpusGenerator(seed=seed)
+    data = FakeGitHubData()
+    rng = random.Random(seed)
+
+    sizes = [
+        int(math.exp(rng.uniform(math.log(300), math.log(32 * 1024))))
+        for _ in range(documents)
+    ]
+    claude_documents = [
+        data.add_document(generator.claude_md(size, index))
+        for index, size in enumerate(sizes)
+    ]
+    readme_documents = [
+        data.add_document(generator.readme(size // 2, index))
+        for index, size in enumerate(sizes)
+    ]
+
+    data.add_repository(*COLLECTION_REPOSITORY, description="Curated CLAUDE.md files")
+
+    paths, weights = zip(*INSTRUCTION_PATHS, strict=True)
+    for index in range(repositories):
+        metadata = generator.repository_candidate(index)
+        layout = random.Random(f"{seed}:layout:{index}")
+        repo = _add_candidate_repository(data, metadata, layout)
+        path = layout.choices(paths, weights)[0]
+        data.add_file(
+            repo,
+            path,
+            f"# {repo.name}\n\n",
+            claude_documents[index % len(claude_documents)],
+        )
+        data.add_file(repo, "README.md", f"# {repo.name}\n\n{repo.description}\n")
+        data.add_file(repo, "src/main.py", f"print({repo.name!r})\n")
+
+    for index in range(tools):
+        metadata = generator.tool_candidate("", index)
+        layout = random.Random(f"{seed}:tool:{index}")
+        if layout.random() < 0.3:
+            metadata["name"] = f"claude-md-{metadata['name']}"
+        metadata["description"] = (
+            f"{layout.choice(TOOL_PHRASES)}: {metadata['description']}"
+        )
+        repo = _add_candidate_repository(data, metadata, layout)
+        data.add_file(
+            repo,
+            "README.md",
+            f"# {repo.name}\n\n",
+            readme_documents[index % len(readme_documents)],
+        )
+
+    return data
+
+
+def _add_candidate_repository(
+    data: FakeGitHubData, metadata: dict, layout: random.Random
+) -> FakeRepository:
+    """Add a repository from corpus candidate metadata."""
+    roll = layout.random()
+    return data.add_repository(
+        metadata["owner"],
+        metadata["name"],
+        description=metadata["description"],
+        stars=metadata["stars"],
+        forks=metadata["forks"],
+        language=metadata["language"],
+        topics=metadata["topics"],
+        created_at=datetime.fromisoformat(metadata["created_at"]),
+        updated_at=datetime.fromisoformat(metadata["updated_at"]),
+        archived=roll < 0.03,
+        fork=0.03 <= roll < 0.06,
+        license=metadata.get("license"),
+        organization=layout.random() < 0.2,
+    )
+
+
+class RateLimits:
+    """Per-token request quotas of every bucket, in fixed windows like GitHub's."""
+
+    def __init__(self, limits: dict[str, tuple[int, int]]):
+        self.limits = dict(limits)
+        # (token, bucket) -> [reset epoch, requests used]
+        self._windows: dict[tuple[str, str], list[int]] = {}
+        self._lock = threading.Lock()
+
+    def _window(self, token: str, bucket: str, now: float) -> list[int]:
+        window = self._windows.get((token, bucket))
+        if window is None or now >= window[0]:
+            window = [math.ceil(now + self.limits[bucket][1]), 0]
+            self._windows[(token, bucket)] = window
+        return window
+
+    def take(self, token: str, bucket: str) -> tuple[bool, dict[str, str]]:
+        """Count a request against a bucket; return whether it is allowed and its headers."""
+        limit = self.limits[bucket][0]
+        with self._lock:
+            window = self._window(token, bucket, time.time())
+            allowed = window[1] < limit
+            if allowed:
+                window[1] += 1
+            reset, used = window
+        return allowed, {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(limit - used),
+            "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Used": str(used),
+            "X-RateLimit-Resource": bucket,
+        }
+
+    def status(self, token: str) -> dict[str, dict[str, int]]:
+        """Return the quota of every bucket for a token without using any."""
+        with self._lock:
+            now = time.time()
+            resources = {}
+            for bucket, (limit, _) in self.limits.items():
+                reset, used = self._window(token, bucket, now)
+                resources[bucket] = {
+                    "limit": limit,
+                    "used": used,
+                    "remaining": limit - used,
+                    "reset": reset,
+                }
+            return resources
+
+
+@dataclass
+class _Request:
+    method: str
+    path: str
+    query: dict[str, str]
+    body: bytes
+    headers: dict[str, str]
+    params: dict[str, str]
+
+
+_REPO = r"/repos/(?P<owner>[^/]+)/(?P<name>[^/]+)"
+ROUTES = [
+    ("GET", r"/search/code", "search_code"),
+    ("GET", r"/search/repositories", "search_repositories"),
+    ("GET", r"/rate_limit", "rate_limit"),
+    ("POST", r"/graphql", "graphql"),
+    ("GET", _REPO, "repository"),
+    ("GET", _REPO + r"/topics", "topics"),
+    ("GET", _REPO + r"/readme", "readme"),
+    ("GET", _REPO + r"/contents/(?P<path>.*)", "contents"),
+    ("GET", _REPO + r"/git/trees/(?P<ref>.+)", "tree"),
+    ("GET", _REPO + r"/git/blobs/(?P<sha>[0-9a-f]+)", "blob"),
+    ("POST", _REPO + r"/issues", "create_issue"),
+]
+_ROUTES = [
+    (method, re.compile(pattern + "/?"), endpoint)
+    for method, pattern, endpoint in ROUTES
+]
+
+NOT_FOUND = {
+    "message": "Not Found",
+    "documentation_url": "https://docs.github.com/rest",
+}
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 256
+    fake: "FakeGitHubServer"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't let Nagle hold the body
+    disable_nagle_algorithm = True
+    server: _HTTPServer
+
+    def do_GET(self):
+        self.server.fake.handle(self)
+
+    do_POST = do_GET
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class FakeGitHubServer:
+    """A threaded HTTP server answering GitHub API requests from a FakeGitHubData.
+
+    Every request waits ``latency`` plus up to ``jitter`` seconds. A share
+    ``error_rate`` of requests then fails with ``error_status``; the rest
+    draw from the per-token quotas of ``rate_limits`` (bucket to
+    ``(limit, window seconds)``, unlimited by default) and are answered
+    with ``X-RateLimit-*`` headers, or rejected with a 403 once a quota is
+    used up. ``stats()`` counts the requests of every endpoint.
+    """
+
+    def __init__(
+        self,
+        data: FakeGitHubData,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 502,
+        rate_limits: dict[str, tuple[int, int]] | None = None,
+        seed: int = 0,
+    ):
+        self.data = data
+        self.address = (host, port)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limits = RateLimits(rate_limits or UNLIMITED_RATE_LIMITS)
+        self.issues: list[dict] = []
+        self.calls: dict[str, int] = {}
+        self.errors = 0
+        self.rate_limited = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd: _HTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL to set GITHUB_API_URL to."""
+        if self._httpd is None:
+            raise RuntimeError("Fake GitHub server is not running")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHubServer":
+        """Start serving in a background thread."""
+        self._httpd = _HTTPServer(self.address, _Handler)
+        self._httpd.fake = self
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-github", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Fake GitHub API listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def __enter__(self) -> "FakeGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        """Return request counters: calls in total and per endpoint, errors and bytes."""
+        with self._lock:
+            return {
+                "calls": sum(self.calls.values()),
+                "endpoints": dict(sorted(self.calls.items())),
+                "errors": self.errors,
+                "rate_limited": self.rate_limited,
+                "bytes": self.bytes_sent,
+                "issues": len(self.issues),
+            }
+
+    def handle(self, handler: BaseHTTPRequestHandler) -> None:
+        """Answer one request of the HTTP handler."""
+        url = urlsplit(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        endpoint, params = self._route(handler.command, url.path)
+        request = _Request(
+            handler.command,
+            url.path,
+            {name: values[0] for name, values in parse_qs(url.query).items()},
+            body,
+            dict(handler.headers.items()),
+            params,
+        )
+
+        with self._lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+
+        headers: dict[str, str] = {}
+        if failed:
+            with self._lock:
+                self.errors += 1
+            status, payload = self.error_status, {"message": "Server Error"}
+        elif endpoint == "unknown":
+            status, payload = 404, NOT_FOUND
+        else:
+            status, payload, headers = self._answer(endpoint, request)
+        self._send(handler, status, payload, headers)
+
+    def _route(self, method: str, path: str) -> tuple[str, dict[str, str]]:
+        for route_method, pattern, endpoint in _ROUTES:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                return endpoint, match.groupdict()
+        return "unknown", {}
+
+    def _answer(self, endpoint: str, request: _Request):
+        """Apply the rate limit, then run the endpoint."""
+        headers: dict[str, str] = {}
+        if endpoint != "rate_limit":
+            token = request.headers.get("Authorization", "anonymous")
+            allowed, headers = self.rate_limits.take(
+                token, bucket_for_url(request.path)
+            )
+            if not allowed:
+                with self._lock:
+                    self.rate_limited += 1
+                message = {
+                    "message": "API rate limit exceeded",
+                    "documentation_url": "https://docs.github.com/rest/rate-limit",
+                }
+                return 403, message, headers
+        try:
+            status, payload, extra = getattr(self, f"_{endpoint}")(request)
+        except Exception as e:
+            logger.exception(f"Fake GitHub API failed on {request.path}: {e}")
+            return 500, {"message": str(e)}, headers
+        return status, payload, {**headers, **extra}
+
+    def _send(self, handler, status: int, payload, headers: dict[str, str]) -> None:
+        if isinstance(payload, bytes):
+            body = payload
+            content_type = "application/vnd.github.raw"
+        else:
+            body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+        with self._lock:
+            self.bytes_sent += len(body)
+
+    # JSON representations
+
+    def _repository_url(self, repo: FakeRepository) -> str:
+        return f"{self.base_url}/repos/{repo.full_name}"
+
+    def _owner_json(self, repo: FakeRepository) -> dict:
+        return {
+            "login": repo.owner,
+            "id": sum(repo.owner.encode()),
+            "type": "Organization" if repo.organization else "User",
+            "url": f"{self.base_url}/users/{repo.owner}",
+            "html_url": f"https://github.com/{repo.owner}",
+        }
+
+    def _repository_json(self, repo: FakeRepository, full: bool = True) -> dict:
+        record = {
+            "id": repo.id,
+            "node_id": repo.node_id,
+            "name": repo.name,
+            "full_name": repo.full_name,
+            "owner": self._owner_json(repo),
+            "private": False,
+            "html_url": f"https://github.com/{repo.full_name}",
+            "description": repo.description or None,
+            "fork": repo.fork,
+            "url": self._repository_url(repo),
+        }
+        if not full:
+            return record
+        record.update(
+            {
+                "created_at": _timestamp(repo.created_at),
+                "updated_at": _timestamp(repo.updated_at),
+                "pushed_at": _timestamp(repo.updated_at),
+                "size": sum(file.size for file in repo.files.values()) // 1024,
+                "stargazers_count": repo.stars,
+                "watchers_count": repo.stars,
+                "forks_count": repo.forks,
+                "open_issues_count": 0,
+                "language": repo.language,
+                "archived": repo.archived,
+                "disabled": False,
+                "visibility": "public",
+                "default_branch": "main",
+                "topics": repo.topics,
+                "license": (
+                    {"key": repo.license.lower(), "spdx_id": repo.license}
+                    if repo.license
+                    else None
+                ),
+            }
+        )
+        if repo.organization:
+            record["organization"] = self._owner_json(repo)
+        return record
+
+    def _file_json(self, repo: FakeRepository, file: FakeFile) -> dict:
+        url = f"{self._repository_url(repo)}/contents/{file.path}"
+        return {
+            "type": "file",
+            "encoding": "base64",
+            "name": file.path.rsplit("/", 1)[-1],
+            "path": file.path,
+            "size": file.size,
+            "sha": file.sha,
+            "content": base64.encodebytes(self.data.text(file).encode()).decode(),
+            "url": url,
+            "git_url": f"{self._repository_url(repo)}/git/blobs/{file.sha}",
+            "html_url": f"https://github.com/{repo.full_name}/blob/main/{file.path}",
+            "download_url": None,
+        }
+
+    def _code_result_json(self, entry: tuple[FakeRepository, FakeFile]) -> dict:
+        repo, file = entry
+        return {
+            "name": file.path.rsplit("/", 1)[-1],
+            "path": file.path,
+            "sha": file.sha,
+            "url": f"{self._repository_url(repo)}/contents/{file.path}?ref=main",
+            "git_url": f"{self._repository_url(repo)}/git/blobs/{file.sha}",
+            "html_url": f"https://github.com/{repo.full_name}/blob/main/{file.path}",
+            "repository": self._repository_json(repo, full=False),
+            "score": 1.0,
+        }
+
+    def _graphql_repository(self, repo: FakeRepository, objects) -> dict:
+        record = {
+            "id": repo.node_id,
+            "nameWithOwner": repo.full_name,
+            "name": repo.name,
+            "owner": {
+                "__typename": "Organization" if repo.organization else "User",
+                "login": repo.owner,
+            },
+            "description": repo.description or None,
+            "stargazerCount": repo.stars,
+            "forkCount": repo.forks,
+            "primaryLanguage": {"name": repo.language} if repo.language else None,
+            "repositoryTopics": {
+                "nodes": [{"topic": {"name": topic}} for topic in repo.topics]
+            },
+            "url": f"https://github.com/{repo.full_name}",
+            "createdAt": _timestamp(repo.created_at),
+            "updatedAt": _timestamp(repo.updated_at),
+            "isArchived": repo.archived,
+            "isFork": repo.fork,
+            "licenseInfo": {"spdxId": repo.license} if repo.license else None,
+        }
+        for alias, path in objects:
+            file = repo.files.get(path)
+            record[alias] = file and {
+                "oid": file.sha,
+                "byteSize": file.size,
+                "text": self.data.text(file),
+                "isBinary": False,
+                "isTruncated": False,
+            }
+        return record
+
+    # Endpoints: each returns (status, payload, headers)
+
+    def _search_page(self, request: _Request, results: list, serialize):
+        """Return one page of search results, honouring the 1,000-result cap."""
+        per_page = min(int(request.query.get("per_page", 30)), 100)
+        page = max(int(request.query.get("page", 1)), 1)
+        start = (page - 1) * per_page
+        if start >= SEARCH_RESULT_CAP:
+            message = {
+                "message": "Only the first 1000 search results are available",
+                "documentation_url": "https://docs.github.com/rest/search",
+            }
+            return 422, message, {}
+        items = results[start : min(start + per_page, SEARCH_RESULT_CAP)]
+
+        last = max(math.ceil(min(len(results), SEARCH_RESULT_CAP) / per_page), 1)
+        links = []
+        for relation, number in (("next", page + 1), ("last", last)):
+            if number <= last and (relation == "last" or page < last):
+                query = urlencode({**request.query, "page": number})
+                links.append(
+                    f'<{self.base_url}{request.path}?{query}>; rel="{relation}"'
+                )
+        payload = {
+            "total_count": len(results),
+            "incomplete_results": False,
+            "items": [serialize(item) for item in items],
+        }
+        return 200, payload, {"Link": ", ".join(links)} if links else {}
+
+    def _search_code(self, request: _Request):
+        if not request.query.get("q"):
+            return 422, {"message": "Validation Failed"}, {}
+        results = self.data.search_code(
+            request.query["q"],
+            request.query.get("sort"),
+            request.query.get("order", "desc"),
+        )
+        return self._search_page(request, results, self._code_result_json)
+
+    def _search_repositories(self, request: _Request):
+        if not request.query.get("q"):
+            return 422, {"message": "Validation Failed"}, {}
+        results = self.data.search_repositories(
+            request.query["q"],
+            request.query.get("sort"),
+            request.query.get("order", "desc"),
+        )
+        return self._search_page(request, results, self._repository_json)
+
+    def _rate_limit(self, request: _Request):
+        token = request.headers.get("Authorization", "anonymous")
+        resources = self.rate_limits.status(token)
+        return 200, {"resources": resources, "rate": resources["core"]}, {}
+
+    def _find_repository(self, request: _Request) -> FakeRepository | None:
+        return self.data.repository(request.params["owner"], request.params["name"])
+
+    def _repository(self, request: _Request):
+        repo = self._find_repository(request)
+        if repo is None:
+            return 404, NOT_FOUND, {}
+        return 200, self._repository_json(repo), {}
+
+    def _topics(self, request: _Request):
+        repo = self._find_repository(request)
+        if repo is None:
+            return 404, NOT_FOUND, {}
+        return 200, {"names": repo.topics}, {}
+
+    def _readme(self, request: _Request):
+        repo = self._find_repository(request)
+        file = repo and repo.files.get("README.md")
+        if file is None:
+            return 404, NOT_FOUND, {}
+        return 200, self._file_json(repo, file), {}
+
+    def _contents(self, request: _Request):
+        repo = self._find_repository(request)
+        file = repo and repo.files.get(unquote(request.params["path"]).strip("/"))
+        if file is None:
+            return 404, NOT_FOUND, {}
+        return 200, self._file_json(repo, file), {}
+
+    def _tree(self, request: _Request):
+        repo = self._find_repository(request)
+        if repo is None or not repo.files:
+            return 404, NOT_FOUND, {}
+        recursive = request.query.get("recursive", "") not in ("", "0", "false")
+        url = self._repository_url(repo)
+
+        directories = {
+            "/".join(parts[:depth])
+            for parts in (path.split("/") for path in repo.files)
+            for depth in range(1, len(parts))
+        }
+        elements = [
+            {
+                "path": directory,
+                "mode": "040000",
+                "type": "tree",
+                "sha": git_blob_sha(directory.encode()),
+                "url": f"{url}/git/trees/{git_blob_sha(directory.encode())}",
+            }
+            for directory in directories
+        ]
+        elements.extend(
+            {
+                "path": file.path,
+                "mode": "100644",
+                "type": "blob",
+                "sha": file.sha,
+                "size": file.size,
+                "url": f"{url}/git/blobs/{file.sha}",
+            }
+            for file in repo.files.values()
+        )
+        if not recursive:
+            elements = [element for element in elements if "/" not in element["path"]]
+        elements.sort(key=lambda element: element["path"])
+        sha = git_blob_sha(repo.full_name.encode())
+        payload = {
+            "sha": sha,
+            "url": f"{url}/git/trees/{sha}",
+            "tree": elements,
+            "truncated": False,
+        }
+        return 200, payload, {}
+
+    def _blob(self, request: _Request):
+        repo = self._find_repository(request)
+        file = repo and next(
+            (f for f in repo.files.values() if f.sha == request.params["sha"]), None
+        )
+        if file is None:
+            return 404, NOT_FOUND, {}
+        content = self.data.text(file).encode("utf-8")
+        if "raw" in request.headers.get("Accept", ""):
+            return 200, content, {}
+        payload = {
+            "sha": file.sha,
+            "size": file.size,
+            "url": f"{self._repository_url(repo)}/git/blobs/{file.sha}",
+            "content": base64.encodebytes(content).decode(),
+            "encoding": "base64",
+        }
+        return 200, payload, {}
+
+    def _create_issue(self, request: _Request):
+        repo = self._find_repository(request)
+        if repo is None:
+            return 404, NOT_FOUND, {}
+        fields = json.loads(request.body or b"{}")
+        with self._lock:
+            number = len(self.issues) + 1
+            self.issues.append(
+                {"repository": repo.full_name, "number": number, **fields}
+            )
+        payload = {
+            "id": number,
+            "number": number,
+            "title": fields.get("title", ""),
+            "body": fields.get("body", ""),
+            "state": "open",
+            "labels": [{"name": label} for label in fields.get("labels", [])],
+            "url": f"{self._repository_url(repo)}/issues/{number}",
+            "html_url": f"https://github.com/{repo.full_name}/issues/{number}",
+            "created_at": _timestamp(datetime.now(UTC)),
+        }
+        return 201, payload, {}
+
+    def _graphql(self, request: _Request):
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return 400, {"message": "Problems parsing JSON"}, {}
+        query = payload.get("query") or ""
+        node_ids = (payload.get("variables") or {}).get("ids")
+        if not re.search(r"nodes\s*\(\s*ids\s*:", query) or not isinstance(
+            node_ids, list
+        ):
+            message = "The fake GitHub API only answers repository nodes(ids:) queries"
+            return 200, {"errors": [{"message": message}]}, {}
+
+        objects = re.findall(
+            r'(\w+)\s*:\s*object\s*\(\s*expression\s*:\s*"HEAD:([^"]+)"\s*\)', query
+        )
+        nodes = []
+        errors = []
+        for position, node_id in enumerate(node_ids):
+            repo = self.data.nodes.get(node_id)
+            if repo is None:
+                nodes.append(None)
+                errors.append(
+                    {
+                        "type": "NOT_FOUND",
+                        "path": ["nodes", position],
+                        "message": f"Could not resolve to a node with the global id of '{node_id}'",
+                    }
+                )
+            else:
+                nodes.append(self._graphql_repository(repo, objects))
+        result = {"data": {"nodes": nodes}}
+        if errors:
+            result["errors"] = errors
+        return 200, result, {}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(
+        description="Serve a fake GitHub API filled with synthetic repositories."
+    )
+    parser.add_argument(
+        "--repositories",
+        type=int,
+        default=1000,
+        help="Number of CLAUDE.md repositories (default: 1000)",
+    )
+    parser.add_argument(
+        "--tools",
+        type=int,
+        default=100,
+        help="Number of tool repositories (default: 100)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Data set seed")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port (default: 8000)")
+    add_server_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the latency, error and rate limit options of the fake server."""
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Added latency per request"
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="Random extra latency per request"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests failing with a 502 (default: 0)",
+    )
+    parser.add_argument(
+        "--github-limits",
+        action="store_true",
+        help="Enforce GitHub's documented rate limits instead of none",
+    )
+
+
+def server_options(args: argparse.Namespace) -> dict:
+    """Return FakeGitHubServer keyword arguments from parsed server options."""
+    return {
+        "latency": args.latency_ms / 1000,
+        "jitter": args.jitter_ms / 1000,
+        "error_rate": args.error_rate,
+        "rate_limits": BUCKET_LIMITS if args.github_limits else None,
+        "seed": args.seed,
+    }
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    data = populate(args.repositories, args.tools, args.seed)
+    server = FakeGitHubServer(
+        data, args.host, args.port, **server_options(args)
+    ).start()
+    print(f"export GITHUB_API_URL={server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        logger.info(f"Served {server.stats()['calls']} requests")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
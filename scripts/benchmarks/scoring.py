@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Benchmark evaluator scoring throughput on a synthetic corpus.
+
+``RepositoryEvaluator`` and ``ToolEvaluator`` score generated CLAUDE.md
+files and READMEs in size tiers from 1 KB to 5 MB. For every tier the
+benchmark reports the time each scoring component takes per document,
+end-to-end documents per second and the peak memory allocated while
+scoring one document. Results are compared with a baseline file, and the
+run fails if throughput or memory regressed beyond a tolerance. Nothing
+touches the network.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from scripts.benchmarks.corpus import CorpusGenerator, format_size, parse_size
+from scripts.discovery.evaluator import RepositoryEvaluator
+from scripts.discovery.features import extract_content_features
+from scripts.markdown_document import clear_document_cache
+from scripts.tool_discovery.evaluator import ToolEvaluator
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+BASELINE_VERSION = 1
+DEFAULT_SIZES = ["1KB", "16KB", "256KB", "1MB", "5MB"]
+# Each tier scores at most this much text, so large tiers hold fewer documents
+TIER_BYTES = 2 * 1024 * 1024
+# Measurements stop repeating once they have taken this many seconds
+REPEAT_SECONDS = 0.5
+
+REPOSITORY_COMPONENTS: dict[str, Callable] = {
+    "content_depth": lambda ev, c, text: ev._calculate_content_depth_score(
+        extract_content_features(text)
+    ),
+    "educational_value": lambda ev, c, text: ev._calculate_educational_value_score(
+        extract_content_features(text), c
+    ),
+    "ai_effectiveness": lambda ev, c, text: ev._calculate_ai_effectiveness_score(
+        extract_content_features(text)
+    ),
+    "project_maturity": lambda ev, c, text: ev._calculate_project_maturity_score(c),
+    "community_recognition": lambda ev, c, text: (
+        ev._calculate_community_recognition_score(c)
+    ),
+    "suggest_category": lambda ev, c, text: ev._suggest_category(c, text),
+}
+TOOL_COMPONENTS: dict[str, Callable] = {
+    "tool_functionality": lambda ev, c, text: ev._calculate_tool_functionality_score(
+        c, text
+    ),
+    "readme_quality": lambda ev, c, text: ev._score_readme_quality(text),
+    "license_quality": lambda ev, c, text: ev._calculate_license_quality_score(c, text),
+    "project_maturity": lambda ev, c, text: ev._calculate_project_maturity_score(
+        c, text
+    ),
+    "community": lambda ev, c, text: ev._calculate_community_score(c),
+    "detect_tool_type": lambda ev, c, text: ev._detect_tool_type(c, text),
+}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark evaluator scoring on a synthetic corpus."
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help=f"Document size tiers (default: {' '.join(DEFAULT_SIZES)})",
+    )
+    parser.add_argument(
+        "--docs",
+        type=int,
+        default=20,
+        help="Documents per size tier, fewer for large tiers (default: 20)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timing repetitions; the fastest is kept (default: 3)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="Baseline results to compare against (default: the bundled baseline)",
+    )
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help="Write the results to the baseline file instead of comparing",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown or memory growth (default: 0.25)",
+    )
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    return parser.parse_args(argv)
+
+
+def tier_documents(
+    generator: CorpusGenerator, kind: str, size: int, docs: int
+) -> list[tuple[dict, str]]:
+    """Generate the (candidate, text) pairs of one size tier."""
+    count = max(1, min(docs, TIER_BYTES // size))
+    pairs = []
+    for index in range(count):
+        if kind == "repository":
+            pairs.append(
+                (
+                    generator.repository_candidate(index),
+                    generator.claude_md(size, index),
+                )
+            )
+        else:
+            readme = generator.readme(size, index)
+            pairs.append((generator.tool_candidate(readme, index), readme))
+    return pairs
+
+
+def _best_time(repeat: int, function: Callable, *args) -> float:
+    """Return the fastest of up to ``repeat`` cold runs of a function.
+
+    Slow functions are run fewer times, as soon as their runs add up to
+    ``REPEAT_SECONDS``, so large documents are usually timed once.
+    """
+    best = float("inf")
+    spent = 0.0
+    for _ in range(max(1, repeat)):
+        clear_document_cache()
+        started = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - started
+        best = min(best, elapsed)
+        spent += elapsed
+        if spent >= REPEAT_SECONDS:
+            break
+    return best
+
+
+def benchmark_tier(kind: str, pairs: list[tuple[dict, str]], repeat: int) -> dict:
+    """Time every component and the full evaluation over one tier's documents."""
+    if kind == "repository":
+        evaluator = RepositoryEvaluator(None)
+        components = REPOSITORY_COMPONENTS
+
+        def evaluate(candidate, text):
+            return evaluator.score_candidate(candidate, text)
+
+    else:
+        evaluator = ToolEvaluator()
+        components = TOOL_COMPONENTS
+
+        def evaluate(candidate, text):
+            return evaluator.evaluate_candidate(candidate)
+
+    component_ms = {}
+    for name, component in components.items():
+        total = sum(
+            _best_time(repeat, component, evaluator, candidate, text)
+            for candidate, text in pairs
+        )
+        component_ms[name] = round(total / len(pairs) * 1000, 3)
+
+    elapsed = sum(
+        _best_time(repeat, evaluate, candidate, text) for candidate, text in pairs
+    )
+
+    # Allocation tracing slows everything down, so memory gets its own pass
+    peak = 0
+    tracemalloc.start()
+    try:
+        for candidate, text in pairs:
+            clear_document_cache()
+            tracemalloc.reset_peak()
+            evaluate(candidate, text)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "docs": len(pairs),
+        "bytes_per_doc": sum(len(text) for _, text in pairs) // len(pairs),
+        "docs_per_sec": round(len(pairs) / elapsed, 2),
+        "peak_bytes": peak,
+        "components_ms": component_ms,
+    }
+
+
+def run_benchmarks(
+    sizes: list[int], docs: int = 20, repeat: int = 3, seed: int = 0
+) -> dict:
+    """Benchmark both evaluators over every size tier."""
+    generator = CorpusGenerator(seed=seed)
+    results: dict = {}
+    for kind in ("repository", "tool"):
+        results[kind] = {}
+        for size in sizes:
+            pairs = tier_documents(generator, kind, size, docs)
+            results[kind][format_size(size)] = benchmark_tier(kind, pairs, repeat)
+    return {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a message for every tier that regressed against the baseline.
+
+    A tier regresses when its documents per second fall, or its peak
+    memory grows, by more than ``tolerance`` relative to the baseline.
+    Tiers missing from either side are not compared.
+    """
+    regressions = []
+    for kind, tiers in results["results"].items():
+        for tier, current in tiers.items():
+            previous = baseline.get("results", {}).get(kind, {}).get(tier)
+            if previous is None:
+                continue
+            if current["docs_per_sec"] < previous["docs_per_sec"] * (1 - tolerance):
+                regressions.append(
+                    f"{kind} {tier}: {current['docs_per_sec']} docs/sec, "
+                    f"baseline {previous['docs_per_sec']}"
+                )
+            if current["peak_bytes"] > previous["peak_bytes"] * (1 + tolerance):
+                regressions.append(
+                    f"{kind} {tier}: peak {current['peak_bytes']:,} bytes, "
+                    f"baseline {previous['peak_bytes']:,}"
+                )
+    return regressions
+
+
+def format_results(results: dict) -> str:
+    """Render results as a plain-text table, one row per evaluator and tier."""
+    lines = []
+    for kind, tiers in results["results"].items():
+        for tier, result in tiers.items():
+            components = ", ".join(
+                f"{name} {ms:.2f}" for name, ms in result["components_ms"].items()
+            )
+            lines.append(
+                f"{kind:<10} {tier:>6}  {result['docs']:>3} docs  "
+                f"{result['docs_per_sec']:>10.2f} docs/sec  "
+                f"peak {result['peak_bytes'] / 1024**2:>8.2f} MB  "
+                f"ms/doc: {components}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Evaluators log one line per document; keep the report readable
+    logging.getLogger("scripts.discovery.evaluator").setLevel(logging.WARNING)
+    logging.getLogger("scripts.tool_discovery.evaluator").setLevel(logging.WARNING)
+
+    sizes = [parse_size(size) for size in args.sizes]
+    results = run_benchmarks(sizes, args.docs, args.repeat, args.seed)
+    print(format_results(results))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.write_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        logger.info(f"Wrote baseline {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        logger.info(f"No baseline at {args.baseline}, nothing to compare")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        logger.error(f"Regression: {regression}")
+    if regressions:
+        return 1
+    logger.info(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Compare the run manifests of two discovery runs and flag regressions.
+
+Manifests are written by ``discover-claude-files`` and
+``discover-claude-tools``. Every numeric metric of the two runs is listed
+with its relative change; metrics that got worse by more than their
+tolerance are marked and make the command exit with status 1, so a
+scoring or search change that made the weekly job slower or more
+expensive fails the comparison.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from scripts.discovery.run_manifest import (
+    DEFAULT_MIN_SECONDS,
+    DEFAULT_TOLERANCES,
+    MetricChange,
+    compare_manifests,
+)
+
+
+def parse_tolerance(value: str) -> tuple[str, float]:
+    """Parse a ``PATTERN=FRACTION`` tolerance option."""
+    pattern, separator, fraction = value.rpartition("=")
+    try:
+        if not separator or not pattern:
+            raise ValueError
+        return pattern, float(fraction)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected PATTERN=FRACTION, e.g. 'stage_seconds.*=0.5', got {value!r}"
+        ) from None
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(
+        description="Diff two discovery run manifests and flag regressions."
+    )
+    parser.add_argument("baseline", type=Path, help="Manifest of the reference run")
+    parser.add_argument("current", type=Path, help="Manifest of the run to check")
+    parser.add_argument(
+        "--tolerance",
+        type=parse_tolerance,
+        action="append",
+        default=[],
+        metavar="PATTERN=FRACTION",
+        help="Relative tolerance of the metrics matching a glob pattern, "
+        "e.g. 'wall_seconds=0.3'; may be repeated "
+        f"(defaults: {', '.join(f'{p}={t}' for p, t in DEFAULT_TOLERANCES.items())})",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=DEFAULT_MIN_SECONDS,
+        help="Ignore time changes smaller than this many seconds "
+        f"(default: {DEFAULT_MIN_SECONDS})",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="List unchanged metrics too",
+    )
+    return parser.parse_args(argv)
+
+
+def _format_value(value: float | None) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:,.3f}"
+    return f"{value:,}"
+
+
+def format_changes(changes: list[MetricChange], show_all: bool = False) -> str:
+    """Render metric changes as a plain-text table, regressions marked with '!'."""
+    lines = [f"  {'metric':<40} {'baseline':>16} {'current':>16} {'change':>9}"]
+    for change in changes:
+        if not show_all and change.baseline == change.current:
+            continue
+        relative = "-" if change.change is None else f"{change.change:+.1%}"
+        marker = "!" if change.regression else " "
+        lines.append(
+            f"{marker} {change.metric:<40} {_format_value(change.baseline):>16} "
+            f"{_format_value(change.current):>16} {relative:>9}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+
+    if baseline.get("pipeline") != current.get("pipeline"):
+        print(
+            f"Warning: comparing a {baseline.get('pipeline')} run "
+            f"with a {current.get('pipeline')} run",
+            file=sys.stderr,
+        )
+
+    changes = compare_manifests(
+        baseline, current, dict(args.tolerance), min_seconds=args.min_seconds
+    )
+    print(format_changes(changes, args.all))
+
+    regressions = [change for change in changes if change.regression]
+    if regressions:
+        print(
+            f"\n{len(regressions)} regression(s) beyond tolerance: "
+            + ", ".join(change.metric for change in regressions)
+        )
+        return 1
+    print("\nNo regressions beyond tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
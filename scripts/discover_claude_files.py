@@ -9,33 +9,182 @@ review of promising candidates.
 Refactored into modular components following single responsibility principle.
 """
 
+import argparse
+import contextlib
 import os
+from datetime import datetime
 
+from scripts.discovery.blob_store import DEFAULT_BLOB_STORE_PATH, BlobStore
+from scripts.discovery.cassette import cassette_from_env
+from scripts.discovery.feature_cache import DEFAULT_FEATURE_CACHE_PATH, FeatureCache
+from scripts.discovery.http_cache import DEFAULT_CACHE_PATH, HTTPCache
 from scripts.discovery.orchestrator import ClaudeFileDiscovery
+from scripts.discovery.run_state import DEFAULT_STATE_PATH, RunStateStore
+from scripts.discovery.token_pool import tokens_from_env
+from scripts.discovery.tracing import Tracer
 from scripts.discovery.utils import setup_logging
+from scripts.profiling import Profiler, add_profile_arguments
 
 logger = setup_logging()
 
 
-def main():
-    """Main execution function."""
-    github_token = os.environ.get("GITHUB_TOKEN")
-    if not github_token:
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    # The report, manifest and API usage files of one run share a timestamp
+    timestamp = f"{datetime.now():%Y%m%d_%H%M%S}"
+    parser = argparse.ArgumentParser(
+        description="Discover and evaluate new CLAUDE.md files on GitHub."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of candidates evaluated concurrently (default: 4)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=0,
+        help="Score candidates in this many worker processes (default: 0, in threads)",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=f"discovery_manifest_{timestamp}.json",
+        help='Write the run manifest to this file, "" to skip it '
+        "(default: discovery_manifest_<timestamp>.json)",
+    )
+    parser.add_argument(
+        "--api-usage",
+        default=f"discovery_api_usage_{timestamp}.json",
+        help='Write the API usage summary to this file, "" to skip it '
+        "(default: discovery_api_usage_<timestamp>.json)",
+    )
+    parser.add_argument(
+        "--trace",
+        default=os.environ.get("DISCOVERY_TRACE", ""),
+        help="Write a Chrome trace-event JSON file of the run's spans "
+        "(default: $DISCOVERY_TRACE, off when empty)",
+    )
+    add_profile_arguments(parser)
+    parser.set_defaults(timestamp=timestamp)
+    return parser.parse_args(argv)
+
+
+def discover(args: argparse.Namespace) -> int:
+    """Run CLAUDE.md discovery with parsed command line options."""
+    # GITHUB_TOKENS may list extra tokens to spread the API quota across
+    github_tokens = tokens_from_env()
+    # GITHUB_CASSETTE records the run's API traffic or replays it offline
+    cassette = cassette_from_env()
+    if not github_tokens and cassette is not None and cassette.mode == "replay":
+        github_tokens = ["replay"]
+    if not github_tokens:
         logger.error("Error: GITHUB_TOKEN environment variable is required")
         return 1
 
     logger.info("🔍 Starting automated CLAUDE.md discovery...")
 
-    discovery = ClaudeFileDiscovery(github_token)
+    # Persistent ETag cache; set GITHUB_HTTP_CACHE="" to disable it
+    cache_path = os.environ.get("GITHUB_HTTP_CACHE", str(DEFAULT_CACHE_PATH))
+    http_cache = HTTPCache(cache_path) if cache_path else None
+
+    if len(github_tokens) > 1:
+        logger.info(f"Using a pool of {len(github_tokens)} GitHub tokens")
+
+    # Incremental run state; set DISCOVERY_STATE="" to force a full scan
+    state_path = os.environ.get("DISCOVERY_STATE", str(DEFAULT_STATE_PATH))
+    run_state = RunStateStore(state_path) if state_path else None
+
+    # Query sharding, e.g. DISCOVERY_SHARDING="size,pushed" to enumerate all results
+    shard_dimensions = (
+        os.environ.get("DISCOVERY_SHARDING", "").replace(",", " ").split()
+    )
+
+    # CLAUDE.md blobs by SHA; set DISCOVERY_BLOB_STORE="" to keep them in memory
+    blob_path = os.environ.get("DISCOVERY_BLOB_STORE", str(DEFAULT_BLOB_STORE_PATH))
+    blob_store = BlobStore(
+        blob_path or None,
+        compression=os.environ.get("DISCOVERY_BLOB_COMPRESSION", "auto"),
+    )
+
+    # Content profiles by blob SHA; set DISCOVERY_FEATURE_CACHE="" to disable it
+    feature_path = os.environ.get(
+        "DISCOVERY_FEATURE_CACHE", str(DEFAULT_FEATURE_CACHE_PATH)
+    )
+    feature_cache = FeatureCache(feature_path) if feature_path else None
+
+    discovery = ClaudeFileDiscovery(
+        github_tokens,
+        http_cache=http_cache,
+        run_state=run_state,
+        shard_dimensions=shard_dimensions or None,
+        blob_store=blob_store,
+        workers=args.workers,
+        processes=args.processes,
+        cassette=cassette,
+        report_timestamp=args.timestamp,
+        feature_cache=feature_cache,
+    )
 
     # Run the discovery workflow
-    evaluations = discovery.discover_new_repositories()
+    tracer = Tracer() if args.trace else None
+    with tracer or contextlib.nullcontext():
+        evaluations = discovery.discover_new_repositories()
+    if tracer is not None:
+        tracer.save(args.trace)
+    discovery.api_usage.log_summary()
+    if args.api_usage:
+        try:
+            discovery.api_usage.save(args.api_usage)
+            logger.info(f"API usage summary saved to {args.api_usage}")
+        except OSError as e:
+            logger.error(f"Error saving API usage summary to file: {e}")
+
+    if http_cache is not None:
+        stats = http_cache.stats()
+        logger.info(
+            f"HTTP cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['bytes_saved']:,} bytes saved"
+        )
+        discovery.manifest.record_cache("http_cache", stats)
+        http_cache.close()
+
+    if cassette is not None:
+        stats = cassette.stats()
+        logger.info(
+            f"Cassette {cassette.path}: {stats['recorded']} recorded, "
+            f"{stats['replayed']} replayed, {stats['misses']} missing"
+        )
+        cassette.close()
+
+    # Keep the persisted store within its size budget for the next run
+    blob_store.prune()
+    stats = blob_store.stats()
+    logger.info(
+        f"Blob store: {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['writes']} blobs written, {stats['evictions']} evicted"
+    )
+    discovery.manifest.record_cache("blob_store", stats)
+
+    if feature_cache is not None:
+        stats = feature_cache.stats()
+        logger.info(
+            f"Feature cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['writes']} profiles written"
+        )
+        discovery.manifest.record_cache("feature_cache", stats)
+        feature_cache.close()
+
+    if args.manifest:
+        discovery.manifest.save(args.manifest, discovery.api_usage)
+        logger.info(f"Run manifest saved to {args.manifest}")
 
     # Filter for quality threshold (60+ points on 100-point scale)
-    quality_evaluations = [e for e in evaluations if e["score"] >= 60]
+    threshold = discovery.QUALITY_THRESHOLD
+    quality_evaluations = [e for e in evaluations if e["score"] >= threshold]
 
     logger.info(
-        f"Found {len(quality_evaluations)} candidates that meet quality thresholds (60+ points)"
+        f"Found {len(quality_evaluations)} candidates that meet quality thresholds ({threshold}+ points)"
     )
 
     if not quality_evaluations:
@@ -44,5 +193,12 @@ def main():
     return 0
 
 
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    with Profiler("discover_claude_files", args.profile, args.profile_dir):
+        return discover(args)
+
+
 if __name__ == "__main__":
     exit(main())
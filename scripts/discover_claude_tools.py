@@ -7,27 +7,128 @@ sync, lint, or otherwise manage CLAUDE.md files, evaluates them against quality
 standards, and creates issues for community review of promising candidates.
 """
 
+import argparse
+import contextlib
 import os
+from datetime import datetime
 
+from scripts.discovery.cassette import cassette_from_env
+from scripts.discovery.http_cache import DEFAULT_CACHE_PATH, HTTPCache
+from scripts.discovery.token_pool import tokens_from_env
+from scripts.discovery.tracing import Tracer
 from scripts.discovery.utils import setup_logging
+from scripts.profiling import Profiler, add_profile_arguments
 from scripts.tool_discovery.orchestrator import ClaudeToolDiscovery
 
 logger = setup_logging()
 
 
-def main():
-    """Main execution function."""
-    github_token = os.environ.get("GITHUB_TOKEN")
-    if not github_token:
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    # The report, manifest and API usage files of one run share a timestamp
+    timestamp = f"{datetime.now():%Y%m%d_%H%M%S}"
+    parser = argparse.ArgumentParser(
+        description="Discover and evaluate CLAUDE.md-related tools on GitHub."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of candidates evaluated concurrently (default: 4)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=0,
+        help="Score candidates in this many worker processes (default: 0, in threads)",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=f"tool_discovery_manifest_{timestamp}.json",
+        help='Write the run manifest to this file, "" to skip it '
+        "(default: tool_discovery_manifest_<timestamp>.json)",
+    )
+    parser.add_argument(
+        "--api-usage",
+        default=f"tool_discovery_api_usage_{timestamp}.json",
+        help='Write the API usage summary to this file, "" to skip it '
+        "(default: tool_discovery_api_usage_<timestamp>.json)",
+    )
+    parser.add_argument(
+        "--trace",
+        default=os.environ.get("DISCOVERY_TRACE", ""),
+        help="Write a Chrome trace-event JSON file of the run's spans "
+        "(default: $DISCOVERY_TRACE, off when empty)",
+    )
+    add_profile_arguments(parser)
+    parser.set_defaults(timestamp=timestamp)
+    return parser.parse_args(argv)
+
+
+def discover(args: argparse.Namespace) -> int:
+    """Run tool discovery with parsed command line options."""
+    # GITHUB_TOKENS may list extra tokens to spread the API quota across
+    github_tokens = tokens_from_env()
+    # GITHUB_CASSETTE records the run's API traffic or replays it offline
+    cassette = cassette_from_env()
+    if not github_tokens and cassette is not None and cassette.mode == "replay":
+        github_tokens = ["replay"]
+    if not github_tokens:
         logger.error("Error: GITHUB_TOKEN environment variable is required")
         return 1
 
     logger.info("🔍 Starting automated CLAUDE.md tool discovery...")
 
-    discovery = ClaudeToolDiscovery(github_token)
+    # Persistent ETag cache; set GITHUB_HTTP_CACHE="" to disable it
+    cache_path = os.environ.get("GITHUB_HTTP_CACHE", str(DEFAULT_CACHE_PATH))
+    http_cache = HTTPCache(cache_path) if cache_path else None
+
+    if len(github_tokens) > 1:
+        logger.info(f"Using a pool of {len(github_tokens)} GitHub tokens")
+
+    discovery = ClaudeToolDiscovery(
+        github_tokens,
+        http_cache=http_cache,
+        workers=args.workers,
+        processes=args.processes,
+        cassette=cassette,
+        report_timestamp=args.timestamp,
+    )
 
     # Run the tool discovery workflow
-    evaluations = discovery.discover_new_tools()
+    tracer = Tracer() if args.trace else None
+    with tracer or contextlib.nullcontext():
+        evaluations = discovery.discover_new_tools()
+    if tracer is not None:
+        tracer.save(args.trace)
+    discovery.api_usage.log_summary()
+    if args.api_usage:
+        try:
+            discovery.api_usage.save(args.api_usage)
+            logger.info(f"API usage summary saved to {args.api_usage}")
+        except OSError as e:
+            logger.error(f"Error saving API usage summary to file: {e}")
+
+    if http_cache is not None:
+        stats = http_cache.stats()
+        logger.info(
+            f"HTTP cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['bytes_saved']:,} bytes saved"
+        )
+        discovery.manifest.record_cache("http_cache", stats)
+        http_cache.close()
+
+    if cassette is not None:
+        stats = cassette.stats()
+        logger.info(
+            f"Cassette {cassette.path}: {stats['recorded']} recorded, "
+            f"{stats['replayed']} replayed, {stats['misses']} missing"
+        )
+        cassette.close()
+
+    if args.manifest:
+        discovery.manifest.save(args.manifest, discovery.api_usage)
+        logger.info(f"Run manifest saved to {args.manifest}")
 
     logger.info(
         f"Found {len(evaluations)} tool candidates that meet quality thresholds"
@@ -39,5 +140,12 @@ def main():
     return 0
 
 
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    with Profiler("discover_claude_tools", args.profile, args.profile_dir):
+        return discover(args)
+
+
 if __name__ == "__main__":
     exit(main())
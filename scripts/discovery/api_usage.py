@@ -0,0 +1,195 @@
+"""Per-stage accounting of the GitHub API requests of a discovery run."""
+
+import contextlib
+import contextvars
+import json
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import requests.exceptions
+
+logger = logging.getLogger(__name__)
+
+UNATTRIBUTED = "unattributed"
+
+# (stage, candidate) that requests made in the current context are charged to
+_current_stage: contextvars.ContextVar[tuple[str, str | None]] = contextvars.ContextVar(
+    "api_stage", default=(UNATTRIBUTED, None)
+)
+
+
+@contextlib.contextmanager
+def api_stage(stage: str, candidate: str | None = None) -> Iterator[None]:
+    """Charge the GitHub requests made inside the block to a stage and candidate.
+
+    Without a candidate, the one of an enclosing block is kept. The stage
+    is a context variable: work submitted to a ContextThreadPoolExecutor
+    inherits it, other threads do not.
+    """
+    if candidate is None:
+        candidate = _current_stage.get()[1]
+    token = _current_stage.set((stage, candidate))
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+def current_stage() -> tuple[str, str | None]:
+    """Return the (stage, candidate) requests are currently charged to."""
+    return _current_stage.get()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of some values, or 0.0 for none."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+@dataclass
+class StageUsage:
+    """Requests, bytes, latencies and waits charged to one stage."""
+
+    calls: int = 0
+    bytes: int = 0
+    errors: int = 0
+    retries: int = 0
+    rate_limit_wait: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    candidates: Counter = field(default_factory=Counter)
+
+    def add(self, other: "StageUsage") -> None:
+        """Add another stage's usage to this one."""
+        self.calls += other.calls
+        self.bytes += other.bytes
+        self.errors += other.errors
+        self.retries += other.retries
+        self.rate_limit_wait += other.rate_limit_wait
+        self.latencies.extend(other.latencies)
+        self.candidates.update(other.candidates)
+
+    def summary(self) -> dict:
+        """Return the usage as plain numbers, latencies in milliseconds."""
+        return {
+            "calls": self.calls,
+            "bytes": self.bytes,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rate_limit_wait_seconds": round(self.rate_limit_wait, 3),
+            "latency_p50_ms": round(percentile(self.latencies, 0.50) * 1000, 1),
+            "latency_p95_ms": round(percentile(self.latencies, 0.95) * 1000, 1),
+            "candidates": len(self.candidates),
+            "calls_per_candidate": (
+                round(sum(self.candidates.values()) / len(self.candidates), 2)
+                if self.candidates
+                else None
+            ),
+        }
+
+
+class ApiUsage:
+    """Collects every GitHub request of a run by stage and candidate.
+
+    A call is one request as the application made it: its latency
+    excludes rate limiter waits, and resends of a rate-limited request
+    count as retries of the same call.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, StageUsage] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        stage: str,
+        candidate: str | None,
+        seconds: float,
+        size: int,
+        status: int | None,
+        retries: int = 0,
+        wait: float = 0.0,
+    ) -> None:
+        """Record one call; a status of None means the request failed to complete."""
+        with self._lock:
+            usage = self.stages.setdefault(stage, StageUsage())
+            usage.calls += 1
+            usage.bytes += size
+            usage.errors += status is None or status >= 400
+            usage.retries += retries
+            usage.rate_limit_wait += wait
+            usage.latencies.append(seconds)
+            if candidate is not None:
+                usage.candidates[candidate] += 1
+
+    def summary(self, top: int = 10) -> dict:
+        """Return per-stage and total usage plus the costliest candidates."""
+        with self._lock:
+            total = StageUsage()
+            for usage in self.stages.values():
+                total.add(usage)
+            return {
+                "stages": {
+                    stage: usage.summary()
+                    for stage, usage in sorted(self.stages.items())
+                },
+                "total": total.summary(),
+                "costliest_candidates": [
+                    {"candidate": candidate, "calls": calls}
+                    for candidate, calls in total.candidates.most_common(top)
+                ],
+            }
+
+    def save(self, path: str | Path) -> None:
+        """Write the summary to a JSON file."""
+        Path(path).write_text(json.dumps(self.summary(), indent=2) + "\n")
+
+    def log_summary(self) -> None:
+        """Log one line per stage."""
+        for stage, usage in self.summary()["stages"].items():
+            logger.info(
+                f"API usage [{stage}]: {usage['calls']} calls, {usage['bytes']:,} bytes, "
+                f"p50 {usage['latency_p50_ms']} ms, p95 {usage['latency_p95_ms']} ms, "
+                f"{usage['retries']} retries, "
+                f"{usage['rate_limit_wait_seconds']}s rate limit wait"
+            )
+
+
+class ApiUsageMiddleware:
+    """Transport middleware that records every request into an ApiUsage.
+
+    It belongs after the HTTP cache, so only requests that reach GitHub
+    are counted, and before the rate limiter, whose retries and waits it
+    reads from the response.
+    """
+
+    def __init__(self, usage: ApiUsage):
+        self.usage = usage
+
+    def handle(self, request, send, **kwargs):
+        """Send a request and record it under the current stage."""
+        stage, candidate = current_stage()
+        started = time.perf_counter()
+        try:
+            response = send(request, **kwargs)
+        except requests.exceptions.RequestException:
+            self.usage.record(stage, candidate, time.perf_counter() - started, 0, None)
+            raise
+        wait = getattr(response, "rate_limit_wait", 0.0)
+        self.usage.record(
+            stage,
+            candidate,
+            max(time.perf_counter() - started - wait, 0.0),
+            len(response.content or b""),
+            response.status_code,
+            getattr(response, "retries", 0),
+            wait,
+        )
+        return response
@@ -0,0 +1,93 @@
+"""Vectorized scoring of many candidates from a feature matrix."""
+
+from collections.abc import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+from .features import (
+    COMPONENTS,
+    FEATURE_NAMES,
+    GROUP_CAPS,
+    SCORING_RULES,
+    component_weights,
+    extract_features,
+)
+
+FEATURE_INDEX = {name: index for index, name in enumerate(FEATURE_NAMES)}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "Batch scoring requires the 'numpy' package (install the 'perf' extra)"
+        )
+
+
+def feature_matrix(rows: Iterable[dict]):
+    """Stack feature dicts into an integer matrix with one row per candidate.
+
+    Columns follow ``FEATURE_NAMES``.
+    """
+    _require_numpy()
+    matrix = np.array(
+        [[row[name] for name in FEATURE_NAMES] for row in rows], dtype=np.int64
+    )
+    return matrix.reshape(-1, len(FEATURE_NAMES))
+
+
+class BatchScorer:
+    """Scores a feature matrix with the evaluator's rules and weights.
+
+    Every rule becomes a threshold comparison over one column, so a whole
+    batch is scored with a handful of array operations. The results equal
+    ``RepositoryEvaluator.score_candidate`` for the same features; pass an
+    evaluator to score with its (possibly changed) component weights.
+    """
+
+    def __init__(self, evaluator=None):
+        _require_numpy()
+        if evaluator is None:
+            from .evaluator import RepositoryEvaluator
+
+            evaluator = RepositoryEvaluator(None)
+        self.weights = component_weights(evaluator)
+
+    def component_scores(self, matrix) -> dict:
+        """Return each component's capped points as a column per candidate."""
+        matrix = np.asarray(matrix, dtype=np.int64)
+        scores = {}
+        for component in COMPONENTS:
+            total = np.zeros(len(matrix), dtype=np.int64)
+            groups: dict = {}
+            for rule in SCORING_RULES[component]:
+                column = matrix[:, FEATURE_INDEX[rule.feature]]
+                # Tiers run from the highest minimum down; the first reached wins
+                points = np.select(
+                    [column >= tier.minimum for tier in rule.tiers],
+                    [tier.points for tier in rule.tiers],
+                    default=0,
+                )
+                if rule.group is None:
+                    total += points
+                else:
+                    groups[rule.group] = groups.get(rule.group, 0) + points
+            for group, points in groups.items():
+                total += np.minimum(points, GROUP_CAPS[group])
+            scores[component] = np.minimum(total, self.weights[component])
+        return scores
+
+    def score(self, matrix):
+        """Return the total score of every row."""
+        return sum(self.component_scores(matrix).values())
+
+    def score_candidates(self, candidates: Iterable[tuple[dict, str]]):
+        """Extract features for (candidate, content) pairs and score them."""
+        return self.score(
+            feature_matrix(
+                extract_features(candidate, content)
+                for candidate, content in candidates
+            )
+        )
@@ -0,0 +1,226 @@
+"""Content-addressed store for git blobs fetched during discovery."""
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOB_STORE_PATH = Path(".cache") / "blobs"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+COMPRESSION_SUFFIXES = {"zstd": ".zst", "gzip": ".gz", "none": ""}
+
+
+def git_blob_sha(data: bytes) -> str:
+    """Return the git blob SHA-1 of some content."""
+    header = f"blob {len(data)}\0".encode()
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def resolve_compression(compression: str | None) -> str:
+    """Return the effective compression, picking zstd for "auto" when installed."""
+    compression = (compression or "none").lower()
+    if compression == "auto":
+        return "zstd" if zstandard is not None else "gzip"
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown blob compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError(
+            "zstd compression requires the 'zstandard' package "
+            "(install the 'perf' extra)"
+        )
+    return compression
+
+
+class BlobStore:
+    """Blob contents keyed by git blob SHA, on disk or in memory.
+
+    Blobs are immutable, so an entry never needs revalidation: a SHA found in
+    the store is served without any API call, across runs when the store is
+    on disk. Files are laid out as ``<root>/<sha[:2]>/<sha[2:]>`` plus a
+    suffix for the compression they were written with; any existing
+    compression is readable regardless of the current setting. With no
+    ``root`` the store only lives for the current process.
+
+    A read refreshes the file's modification time, and ``prune`` deletes the
+    least recently used files until the store fits ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        compression: str = "auto",
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.root = Path(root) if root is not None else None
+        self.compression = resolve_compression(compression)
+        self.max_bytes = max_bytes
+        self._memory: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _path(self, sha: str, compression: str) -> Path:
+        return self.root / sha[:2] / (sha[2:] + COMPRESSION_SUFFIXES[compression])
+
+    def __contains__(self, sha: str) -> bool:
+        if self.root is None:
+            return sha in self._memory
+        return any(self._path(sha, c).exists() for c in COMPRESSION_SUFFIXES)
+
+    def get(self, sha: str) -> bytes | None:
+        """Return the content of a blob, or None if it is not stored."""
+        data = self._read(sha) if sha else None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def get_text(self, sha: str) -> str | None:
+        """Return a blob decoded as UTF-8, or None if missing or not text."""
+        data = self.get(sha)
+        if data is None:
+            return None
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError:
+            logger.debug(f"Blob {sha} is not valid UTF-8")
+            return None
+
+    def _read(self, sha: str) -> bytes | None:
+        if self.root is None:
+            with self._lock:
+                return self._memory.get(sha)
+        for compression in COMPRESSION_SUFFIXES:
+            path = self._path(sha, compression)
+            try:
+                raw = path.read_bytes()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Could not read blob {sha}: {e}")
+                return None
+            try:
+                data = _decompress(raw, compression)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Discarding unreadable blob {path}: {e}")
+                path.unlink(missing_ok=True)
+                return None
+            # Mark the blob as recently used for prune
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return data
+        return None
+
+    def put(self, sha: str, data: bytes) -> None:
+        """Store the content of a blob under its git SHA."""
+        if not sha:
+            return
+        if self.root is None:
+            with self._lock:
+                self._memory[sha] = data
+                self.writes += 1
+            return
+        # Racing writers of one SHA store identical content, and each renames
+        # its own temporary file into place, so the last rename simply wins
+        if sha in self:
+            return
+
+        path = self._path(sha, self.compression)
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+            ) as tmp_file:
+                tmp_path = Path(tmp_file.name)
+                tmp_file.write(_compress(data, self.compression))
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not store blob {sha}: {e}")
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+            return
+        with self._lock:
+            self.writes += 1
+
+    def put_text(self, sha: str, text: str) -> None:
+        """Store text content of a blob under its git SHA."""
+        self.put(sha, text.encode("utf-8"))
+
+    def prune(self) -> int:
+        """Delete least recently used blobs until the store fits ``max_bytes``.
+
+        Temporary files left behind by interrupted writes are deleted too,
+        so call it while no other process writes to the store. Returns the
+        number of blobs evicted.
+        """
+        if self.root is None or not self.root.is_dir():
+            return 0
+        entries = []
+        size = 0
+        for path in self.root.glob("*/*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.suffix == ".tmp":
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            size += stat.st_size
+
+        evicted = 0
+        for _, entry_size, path in sorted(entries, key=lambda entry: entry[0]):
+            if size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+            evicted += 1
+        with self._lock:
+            self.evictions += evicted
+        return evicted
+
+    def stats(self) -> dict:
+        """Return hit, miss, write and eviction counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    if compression == "gzip":
+        return gzip.compress(data, mtime=0)
+    return data
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd blob found but 'zstandard' is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compression == "gzip":
+        return gzip.decompress(data)
+    return data
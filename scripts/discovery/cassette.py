@@ -0,0 +1,178 @@
+"""Record and replay GitHub API traffic for deterministic offline runs."""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from .transport import build_response
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("record", "replay")
+
+# Headers describing the wire encoding; recorded bodies are stored decoded
+_WIRE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """Raised in replay mode for a request the cassette holds no response for."""
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """Return the key a request is recorded and replayed under.
+
+    It combines the method, the URL without a default port and with its
+    query parameters sorted, and a hash of the body, so GraphQL queries with different variables are
+    told apart. Headers, and with them tokens, are not part of the key.
+    """
+    scheme, netloc, path, query, _ = urlsplit(request.url or "")
+    # PyGithub spells out the default port, requests does not
+    netloc = netloc.removesuffix({"https": ":443", "http": ":80"}.get(scheme, ""))
+    query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    url = urlunsplit((scheme, netloc, path, query, ""))
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:16] if body else "-"
+    return f"{request.method} {url} {digest}"
+
+
+class Cassette:
+    """A gzip-compressed JSON lines file of recorded GitHub API responses.
+
+    In ``record`` mode every response is appended to the file as it
+    arrives, without request headers, so tokens never reach the cassette.
+    In ``replay`` mode responses are served by request key, in the order
+    they were recorded; once a key's recordings are used up its last
+    response is repeated, so retries and polling still get an answer.
+    """
+
+    def __init__(self, path: str | Path, mode: str = "replay"):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._interactions: dict[str, deque] = defaultdict(deque)
+        self._last: dict[str, dict] = {}
+        self._file = None
+
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        else:
+            self._load()
+
+    def _load(self) -> None:
+        """Read every interaction of the cassette, tolerating a truncated tail."""
+        count = 0
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    interaction = json.loads(line)
+                    self._interactions[interaction["key"]].append(interaction)
+                    count += 1
+        except (EOFError, json.JSONDecodeError) as e:
+            logger.warning(f"Cassette {self.path} is truncated after {count}: {e}")
+        logger.info(f"Loaded {count} recorded responses from {self.path}")
+
+    def record(self, key: str, response: requests.Response) -> None:
+        """Append a response to the cassette."""
+        body = response.content or b""
+        try:
+            encoded = {"text": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            encoded = {"base64": base64.b64encode(body).decode("ascii")}
+        interaction = {
+            "key": key,
+            "status": response.status_code,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in _WIRE_HEADERS
+            },
+            **encoded,
+        }
+        line = json.dumps(interaction, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                raise ValueError("Cassette is closed")
+            self._file.write(line)
+            self.recorded += 1
+
+    def replay(self, key: str, request: requests.PreparedRequest) -> requests.Response:
+        """Return the next recorded response for a request."""
+        with self._lock:
+            queue = self._interactions.get(key)
+            if queue:
+                interaction = queue.popleft()
+                self._last[key] = interaction
+            else:
+                interaction = self._last.get(key)
+            if interaction is None:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded response for {key}")
+            self.replayed += 1
+        if "base64" in interaction:
+            body = base64.b64decode(interaction["base64"])
+        else:
+            body = interaction["text"].encode("utf-8")
+        return build_response(
+            request, interaction["status"], interaction["headers"], body
+        )
+
+    def stats(self) -> dict[str, int]:
+        """Return record/replay counters for the current process."""
+        return {
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        """Finish writing a recorded cassette."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class CassetteMiddleware:
+    """Transport middleware that records responses to, or replays them from, a cassette.
+
+    It belongs first in the chain: recordings then hold the responses the
+    application saw, after caching and token selection, and replays skip
+    the cache, the token pool and its rate limiters entirely.
+    """
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def handle(self, request, send, **kwargs):
+        """Answer a request from the cassette, or send it and record the response."""
+        key = request_key(request)
+        if self.cassette.mode == "replay":
+            return self.cassette.replay(key, request)
+        response = send(request, **kwargs)
+        self.cassette.record(key, response)
+        return response
+
+
+def cassette_from_env() -> Cassette | None:
+    """Open the cassette named by GITHUB_CASSETTE in GITHUB_CASSETTE_MODE, if set."""
+    path = os.environ.get("GITHUB_CASSETTE", "")
+    if not path:
+        return None
+    return Cassette(path, os.environ.get("GITHUB_CASSETTE_MODE", "replay"))
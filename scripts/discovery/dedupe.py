@@ -0,0 +1,61 @@
+"""Collapsing search hits to one per repository before any per-repository work."""
+
+import logging
+import threading
+from collections import Counter
+
+from .transport import raw_field
+
+logger = logging.getLogger(__name__)
+
+
+class RepositoryDeduplicator:
+    """Admits each repository once across all queries and pages of a search run.
+
+    Hits are dropped when their repository is already in the collection, is
+    a fork or mirror of another repository, or was already admitted (names
+    compared case-insensitively). Fork and mirror flags are read from the
+    search payload itself, so the check never costs an API call. Only
+    repositories that would have been enriched count as duplicates.
+    """
+
+    def __init__(self, exclude: set[str] | None = None):
+        self.exclude = {name.lower() for name in exclude or ()}
+        self.counts: Counter[str] = Counter()
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+
+    def admit(self, repo) -> bool:
+        """Return True if the repository should be enriched, recording why not."""
+        key = repo.full_name.lower()
+        with self._lock:
+            if key in self.exclude:
+                reason = "existing"
+            elif raw_field(repo, "fork", complete=False):
+                reason = "fork"
+            elif raw_field(repo, "mirror_url", complete=False):
+                reason = "mirror"
+            elif key in self._seen:
+                reason = "duplicate"
+            else:
+                reason = "admitted"
+                self._seen.add(key)
+            self.counts[reason] += 1
+        return reason == "admitted"
+
+    def filter(self, items, repo_of=lambda item: item) -> list:
+        """Return the items whose repository is admitted, in their original order."""
+        return [item for item in items if self.admit(repo_of(item))]
+
+    def saved_calls(self, calls_per_repo: int) -> int:
+        """Estimate the enrichment requests avoided by dropping duplicates."""
+        return self.counts["duplicate"] * calls_per_repo
+
+    def log_summary(self, calls_per_repo: int) -> None:
+        """Log how many hits were dropped and the enrichment calls saved."""
+        logger.info(
+            f"Dedupe: {self.counts['admitted']} repositories admitted, dropped "
+            f"{self.counts['duplicate']} duplicates, {self.counts['existing']} existing, "
+            f"{self.counts['fork']} forks and {self.counts['mirror']} mirrors "
+            f"(~{self.saved_calls(calls_per_repo)} enrichment calls saved)"
+        )
@@ -0,0 +1,141 @@
+"""Batched GraphQL enrichment of repositories found by code search."""
+
+import logging
+
+import requests
+
+from .transport import github_api_url
+
+logger = logging.getLogger(__name__)
+
+REPOSITORY_QUERY = """
+query($ids: [ID!]!) {
+  nodes(ids: $ids) {
+    ... on Repository {
+      id
+      nameWithOwner
+      name
+      owner { __typename login }
+      description
+      stargazerCount
+      forkCount
+      primaryLanguage { name }
+      repositoryTopics(first: 20) { nodes { topic { name } } }
+      url
+      createdAt
+      updatedAt
+      isArchived
+      isFork
+      licenseInfo { spdxId }
+      claudeFile: object(expression: "HEAD:CLAUDE.md") {
+        ... on Blob { oid byteSize text isBinary isTruncated }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLError(Exception):
+    """Raised when a GraphQL response carries no usable data."""
+
+
+class RepositoryEnricher:
+    """Resolves repository metadata and CLAUDE.md blobs in batched GraphQL queries.
+
+    A single query replaces the lazy PyGithub requests (repository completion,
+    topics, owner, organization and the CLAUDE.md contents) that would
+    otherwise be made for every repository in a search page.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        graphql_url: str | None = None,
+        batch_size: int = 50,
+    ):
+        self.session = session
+        self.graphql_url = graphql_url or f"{github_api_url()}/graphql"
+        self.batch_size = batch_size
+        self.queries_sent = 0
+
+    def fetch_repositories(self, node_ids: list[str]) -> dict[str, dict]:
+        """Return GraphQL repository records keyed by node ID."""
+        records: dict[str, dict] = {}
+        unique_ids = list(dict.fromkeys(node_ids))
+
+        for start in range(0, len(unique_ids), self.batch_size):
+            batch = unique_ids[start : start + self.batch_size]
+            for node in self._query_nodes(batch):
+                if node and node.get("id"):
+                    records[node["id"]] = node
+
+        return records
+
+    def _query_nodes(self, node_ids: list[str]) -> list[dict | None]:
+        """Run the repository query for one batch of node IDs."""
+        response = self.session.post(
+            self.graphql_url,
+            json={"query": REPOSITORY_QUERY, "variables": {"ids": node_ids}},
+            timeout=30,
+        )
+        self.queries_sent += 1
+        response.raise_for_status()
+        payload = response.json()
+
+        data = payload.get("data")
+        if not data or data.get("nodes") is None:
+            raise GraphQLError(f"GraphQL query failed: {payload.get('errors')}")
+        if payload.get("errors"):
+            # Partial results: unresolvable nodes come back as null
+            logger.debug(f"GraphQL query returned errors: {payload['errors']}")
+
+        return data["nodes"]
+
+
+def claude_blob(record: dict) -> dict | None:
+    """Return the root CLAUDE.md blob of a GraphQL repository record, if any."""
+    blob = record.get("claudeFile")
+    if not blob or blob.get("isBinary"):
+        return None
+    return blob
+
+
+def candidate_from_record(record: dict, claude_file_path: str) -> dict:
+    """Create a candidate dictionary from a GraphQL repository record."""
+    owner = record["owner"]
+    topics = [
+        node["topic"]["name"]
+        for node in (record.get("repositoryTopics") or {}).get("nodes", [])
+    ]
+    candidate = {
+        "full_name": record["nameWithOwner"],
+        "name": record["name"],
+        "owner": owner["login"],
+        "description": record.get("description") or "",
+        "stars": record["stargazerCount"],
+        "forks": record["forkCount"],
+        "language": (record.get("primaryLanguage") or {}).get("name"),
+        "topics": topics,
+        "html_url": record["url"],
+        "created_at": record["createdAt"],
+        "updated_at": record["updatedAt"],
+        "claude_file_path": claude_file_path,
+        "organization": (
+            owner["login"] if owner.get("__typename") == "Organization" else None
+        ),
+    }
+
+    blob = claude_blob(record)
+    if blob:
+        candidate["claude_file_sha"] = blob["oid"]
+
+    return candidate
+
+
+def claude_blob_text(record: dict) -> str | None:
+    """Return the full text of the root CLAUDE.md blob, if GraphQL returned it."""
+    blob = claude_blob(record)
+    if not blob or blob.get("text") is None or blob.get("isTruncated"):
+        return None
+    return blob["text"]
@@ -0,0 +1,88 @@
+"""Concurrent candidate evaluation with per-candidate error isolation."""
+
+import logging
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import nullcontext
+
+from .tracing import ContextThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def _candidate_name(candidate) -> str:
+    if isinstance(candidate, dict):
+        return candidate.get("full_name", "unknown")
+    return "unknown"
+
+
+class EvaluationPool:
+    """Evaluates candidates concurrently and yields results in input order.
+
+    ``prepare`` runs on a pool of ``workers`` threads and does the network
+    bound part of an evaluation; it returns the arguments for ``score``, or
+    None to reject the candidate. With ``processes`` > 0, ``score`` runs in a
+    process pool and must be a picklable module-level function; otherwise it
+    runs in the preparing thread. An exception while evaluating one
+    candidate is logged and yields None for that candidate only.
+    """
+
+    def __init__(self, workers: int = 4, processes: int = 0):
+        self.workers = max(1, workers)
+        self.processes = max(0, processes)
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def map(
+        self,
+        items: Iterable,
+        score: Callable,
+        prepare: Callable | None = None,
+    ) -> Iterator:
+        """Yield the evaluation of every item (None where it failed), in order.
+
+        At most twice as many items as there are workers are in flight, so
+        a lazy ``items`` iterable is consumed no faster than results are.
+        """
+        process_pool = (
+            ProcessPoolExecutor(max_workers=self.processes)
+            if self.processes
+            else nullcontext()
+        )
+        with (
+            ContextThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="evaluate"
+            ) as threads,
+            process_pool as processes,
+        ):
+            pending: deque[Future] = deque()
+            for item in items:
+                pending.append(
+                    threads.submit(self._evaluate, item, score, prepare, processes)
+                )
+                while len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _evaluate(
+        self,
+        item,
+        score: Callable,
+        prepare: Callable | None,
+        processes: Executor | None,
+    ):
+        try:
+            args = prepare(item) if prepare is not None else (item,)
+            if args is None:
+                return None
+            if processes is not None:
+                return processes.submit(score, *args).result()
+            return score(*args)
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+            logger.error(f"Evaluation of {_candidate_name(item)} failed: {e}")
+            return None
@@ -1,12 +1,27 @@
 """Repository evaluator for scoring and assessing repository candidates."""
 
 import logging
-import re
-from datetime import datetime
 
 import requests.exceptions
 from github.GithubException import GithubException, UnknownObjectException
 
+from .api_usage import api_stage
+from .feature_cache import FeatureCache
+from .features import (
+    ALL_CATEGORY_KEYWORDS,
+    CATEGORY_KEYWORDS,
+    KEYWORD_MATCHER,
+    ContentProfile,
+    component_weights,
+    days_since_update,
+    extract_content_profile,
+    extract_maturity_features,
+    extract_metadata_features,
+    extract_recognition_features,
+    score_component,
+)
+from .keyword_matcher import KeywordHits
+from .tracing import span
 from .utils import retry_with_backoff
 
 logger = logging.getLogger(__name__)
@@ -15,8 +30,16 @@ logger = logging.getLogger(__name__)
 class RepositoryEvaluator:
     """Handles evaluation and scoring of repository candidates using content-first approach."""
 
-    def __init__(self, github_searcher):
+    def __init__(
+        self,
+        github_searcher,
+        feature_cache: FeatureCache | None = None,
+    ):
         self.github_searcher = github_searcher
+        # Content profiles by blob SHA; a hit skips fetching and scanning
+        self.feature_cache = feature_cache
+        # Candidates whose CLAUDE.md was read because no cached profile had it
+        self.fetched = 0
         # Content-first scoring weights
         self.content_depth_weight = 30
         self.educational_value_weight = 25
@@ -78,65 +101,16 @@ class RepositoryEvaluator:
             return None
 
         try:
-            # Get repository object and fetch CLAUDE.md content
-            repo = self.github_searcher.github.get_repo(candidate["full_name"])
-            claude_content = self._fetch_claude_content(repo, candidate)
-
-            # Calculate scores
-            score = 0
-            reasons = []
-
-            # Calculate content-first scoring components (0-100 scale)
-            (
-                content_depth_score,
-                content_depth_reasons,
-            ) = self._calculate_content_depth_score(claude_content)
-            (
-                educational_score,
-                educational_reasons,
-            ) = self._calculate_educational_value_score(claude_content, candidate)
-            (
-                ai_effectiveness_score,
-                ai_effectiveness_reasons,
-            ) = self._calculate_ai_effectiveness_score(claude_content)
-            maturity_score, maturity_reasons = self._calculate_project_maturity_score(
-                candidate
-            )
-            (
-                recognition_score,
-                recognition_reasons,
-            ) = self._calculate_community_recognition_score(candidate)
-
-            # Combine scores with weights
-            score = (
-                content_depth_score
-                + educational_score
-                + ai_effectiveness_score
-                + maturity_score
-                + recognition_score
-            )
-            reasons.extend(
-                content_depth_reasons
-                + educational_reasons
-                + ai_effectiveness_reasons
-                + maturity_reasons
-                + recognition_reasons
-            )
-
-            # Suggest appropriate category
-            suggested_category = self._suggest_category(candidate, claude_content)
-
-            evaluation = {
-                "candidate": candidate,
-                "score": score,
-                "reasons": reasons,
-                "suggested_category": suggested_category,
-                "claude_content_length": len(claude_content) if claude_content else 0,
-                "last_updated_days": self._calculate_days_since_update(candidate),
-            }
-
-            logger.info(f"Evaluated {candidate['full_name']}: score {score}/100")
-            return evaluation
+            with span("evaluate", repository=candidate["full_name"]) as current:
+                profile = self._cached_profile(candidate)
+                current.set_attribute("cached", profile is not None)
+                if profile is None:
+                    claude_content = self._resolve_claude_content(candidate)
+                    with span("evaluate.extract", length=len(claude_content)):
+                        profile = extract_content_profile(claude_content)
+                    self.cache_profile(profile)
+                with span("evaluate.score"):
+                    return self.score_profile(candidate, profile)
 
         except (UnknownObjectException, GithubException) as e:
             logger.warning(f"Could not evaluate {candidate['full_name']}: {e}")
@@ -145,6 +119,112 @@ class RepositoryEvaluator:
             logger.error(f"Unexpected error evaluating {candidate['full_name']}: {e}")
             return None
 
+    def prepare_candidate(
+        self, candidate: dict
+    ) -> tuple[dict, str | ContentProfile] | None:
+        """Validate a candidate and fetch its CLAUDE.md content for scoring.
+
+        A content profile found in the feature cache is returned in place
+        of the content.
+        """
+        if not self._validate_candidate(candidate):
+            return None
+        try:
+            with span("evaluate.prepare", repository=candidate["full_name"]):
+                profile = self._cached_profile(candidate)
+                if profile is not None:
+                    return candidate, profile
+                return candidate, self._resolve_claude_content(candidate)
+        except (UnknownObjectException, GithubException) as e:
+            logger.warning(f"Could not evaluate {candidate['full_name']}: {e}")
+            return None
+
+    def score_candidate(self, candidate: dict, claude_content: str) -> dict:
+        """Score a candidate whose CLAUDE.md content is already known.
+
+        This step makes no API calls, so it can run in a worker process.
+        """
+        return self.score_profile(candidate, extract_content_profile(claude_content))
+
+    def score_profile(self, candidate: dict, profile: ContentProfile) -> dict:
+        """Score a candidate from the profile of its CLAUDE.md content.
+
+        Only the description and topics are scanned for keywords; the
+        content's contribution comes entirely from the profile, so this
+        gives the same result as scoring the content itself.
+        """
+        features = {**profile.features, **extract_metadata_features(candidate)}
+        score, reasons = self.score_features(candidate, features)
+
+        # Suggest appropriate category
+        metadata_hits = KEYWORD_MATCHER.scan(self._metadata_text(candidate))
+        suggested_category = self._category_from_keywords(
+            candidate,
+            profile.category_keywords
+            | {
+                keyword for keyword in ALL_CATEGORY_KEYWORDS if keyword in metadata_hits
+            },
+        )
+
+        evaluation = {
+            "candidate": candidate,
+            "score": score,
+            "reasons": reasons,
+            "suggested_category": suggested_category,
+            "claude_content_length": profile.features["content_length"],
+            "last_updated_days": self._calculate_days_since_update(candidate),
+        }
+
+        logger.info(f"Evaluated {candidate['full_name']}: score {score}/100")
+        return evaluation
+
+    def score_features(self, candidate: dict, features: dict) -> tuple[int, list[str]]:
+        """Combine the content-first scoring components (0-100 scale)."""
+        score = 0
+        reasons = []
+        for component, weight in component_weights(self).items():
+            component_score, component_reasons = score_component(
+                component, features, weight, candidate
+            )
+            score += component_score
+            reasons.extend(component_reasons)
+        return score, reasons
+
+    def _cached_profile(self, candidate: dict) -> ContentProfile | None:
+        """Return the cached profile of the candidate's CLAUDE.md blob, if any."""
+        if self.feature_cache is None or candidate.get("claude_content") is not None:
+            return None
+        return self.feature_cache.get(candidate.get("claude_file_sha"))
+
+    def cache_profile(self, profile: ContentProfile) -> None:
+        """Store an extracted profile in the feature cache, if there is one."""
+        if self.feature_cache is not None:
+            self.feature_cache.put(profile)
+
+    def _resolve_claude_content(self, candidate: dict) -> str:
+        """Return CLAUDE.md content, preferring what discovery already fetched.
+
+        Content is taken from the candidate, then from the blob store by the
+        blob SHA found during search; only candidates without a SHA fall back
+        to fetching the repository and its file contents.
+        """
+        claude_content = candidate.get("claude_content")
+        if claude_content is not None:
+            return claude_content
+
+        self.fetched += 1
+        with api_stage("evaluate", candidate["full_name"]), span("evaluate.fetch"):
+            sha = candidate.get("claude_file_sha")
+            if sha:
+                claude_content = self.github_searcher.read_blob(
+                    candidate["full_name"], sha
+                )
+                if claude_content is not None:
+                    return claude_content
+
+            repo = self.github_searcher.github.get_repo(candidate["full_name"])
+            return self._fetch_claude_content(repo, candidate)
+
     def _fetch_claude_content(self, repo, candidate: dict) -> str:
         """Fetch CLAUDE.md content from repository."""
         try:
@@ -156,440 +236,101 @@ class RepositoryEvaluator:
             )
             return ""
 
+    def scan_keywords(
+        self, candidate: dict, claude_content: str
+    ) -> tuple[KeywordHits, KeywordHits]:
+        """Find every keyword in the candidate's text in a single pass.
+
+        Description, topics and CLAUDE.md content are lowercased and scanned
+        together once. Returns the hits for the whole text, which drive the
+        category suggestion, and a view of the hits inside the content alone,
+        which drive the content scores.
+        """
+        prefix = self._metadata_text(candidate)
+        hits = KEYWORD_MATCHER.scan(prefix + claude_content.lower())
+        return hits, hits.within(len(prefix), len(hits.text))
+
+    def _metadata_text(self, candidate: dict) -> str:
+        """Return the lowercased description and topics, each followed by a space.
+
+        No category keyword contains a space, so none can span the end of
+        this text: scanning it apart from the content finds the same
+        category keywords as scanning both together.
+        """
+        return (
+            candidate.get("description", "")
+            + " "
+            + " ".join(candidate.get("topics", []))
+            + " "
+        ).lower()
+
     def _calculate_content_depth_score(
-        self, claude_content: str
+        self, features: dict[str, int]
     ) -> tuple[int, list[str]]:
-        """Calculate score based on content depth and structure (0-30 points)."""
-        if not claude_content:
-            return 0, []
+        """Calculate score based on content depth and structure (0-30 points).
 
-        content_lower = claude_content.lower()
-        score = 0
-        reasons = []
-
-        # Architecture documentation (0-8 points)
-        architecture_keywords = [
-            "## architecture",
-            "## overview",
-            "## design",
-            "## system",
-            "## structure",
-        ]
-        if any(keyword in content_lower for keyword in architecture_keywords):
-            score += 8
-            reasons.append("Contains comprehensive architecture documentation")
-
-        # Development workflows (0-8 points)
-        dev_keywords = [
-            "## development",
-            "## building",
-            "## commands",
-            "## setup",
-            "## workflow",
-        ]
-        if any(keyword in content_lower for keyword in dev_keywords):
-            score += 8
-            reasons.append("Contains clear development workflows")
-
-        # Testing and deployment (0-6 points)
-        test_deploy_keywords = [
-            "## testing",
-            "## tests",
-            "## deployment",
-            "## production",
-        ]
-        if any(keyword in content_lower for keyword in test_deploy_keywords):
-            score += 6
-            reasons.append("Contains testing and deployment guidance")
-
-        # File organization and context (0-2 points)
-        if len(claude_content) > 3000:
-            score += 2
-            reasons.append("Comprehensive and detailed documentation")
-        elif len(claude_content) > 1500:
-            score += 1
-            reasons.append("Substantial documentation")
-
-        # Troubleshooting information (0-2 points)
-        troubleshoot_keywords = [
-            "## troubleshooting",
-            "## debugging",
-            "## known issues",
-            "## faq",
-        ]
-        if any(keyword in content_lower for keyword in troubleshoot_keywords):
-            score += 2
-            reasons.append("Contains troubleshooting information")
-
-        # Function-level code navigation (0-4 points)
-        file_path_pattern = (
-            r"[`/][a-zA-Z0-9_./]+\.(py|ts|js|rs|go|java|tsx|jsx|rb|cpp|swift|kt)"
-        )
-        func_ref_pattern = r"[a-zA-Z_]\w*(?:::\w+)?\(\)"
-        file_refs = len(re.findall(file_path_pattern, claude_content))
-        func_refs = len(re.findall(func_ref_pattern, claude_content))
-        nav_refs = file_refs + func_refs
-        if nav_refs >= 5:
-            score += 4
-            reasons.append("Provides function-level code navigation")
-        elif nav_refs >= 2:
-            score += 2
-            reasons.append("Contains specific file/function references")
-
-        return min(score, self.content_depth_weight), reasons
+        ``features`` are the content features, as extracted once per
+        evaluation by ``extract_content_features``.
+        """
+        return score_component("content_depth", features, self.content_depth_weight)
 
     def _calculate_educational_value_score(
-        self, claude_content: str, candidate: dict
+        self, features: dict[str, int], candidate: dict
     ) -> tuple[int, list[str]]:
         """Calculate score based on educational value (0-25 points)."""
-        if not claude_content:
-            return 0, []
-
-        content_lower = claude_content.lower()
-        score = 0
-        reasons = []
-
-        # Advanced patterns and techniques (0-10 points)
-        advanced_keywords = [
-            "pattern",
-            "best practice",
-            "architecture",
-            "design principle",
-            "methodology",
-        ]
-        advanced_count = sum(
-            1 for keyword in advanced_keywords if keyword in content_lower
-        )
-        if advanced_count >= 3:
-            score += 10
-            reasons.append("Demonstrates advanced patterns and techniques")
-        elif advanced_count >= 1:
-            score += 5
-            reasons.append("Shows some advanced patterns")
-
-        # Concrete code snippets (0-5 points)
-        code_example_score = 0
-        if "```" in claude_content:
-            code_example_score += 5
-            reasons.append("Includes concrete code snippets")
-
-        # Example documentation (0-3 points, additive with code snippets but capped)
-        if "example" in content_lower:
-            code_example_score += 3
-            reasons.append("References examples or usage patterns")
-
-        score += min(code_example_score, 8)
-
-        # Actionable guidance (0-5 points)
-        actionable_keywords = ["step", "how to", "guide", "tutorial", "instruction"]
-        if any(keyword in content_lower for keyword in actionable_keywords):
-            score += 5
-            reasons.append("Provides actionable, specific guidance")
-
-        # Rejected approaches and deliberate decisions (0-3 points)
-        rejection_patterns = [
-            "rejected",
-            "decided against",
-            "instead of",
-            "why not",
-            "deliberately",
-            "intentionally",
-            "chose not to",
-            "we don't",
-        ]
-        if any(p in content_lower for p in rejection_patterns):
-            score += 3
-            reasons.append(
-                "Documents rejected approaches or deliberate design decisions"
-            )
-
-        # Tool preferences with reasoning (0-2 points)
-        tool_pref_pattern = (
-            r"(use|prefer|choose)\s+\w+\s+(instead of|over|rather than|not)\s+\w+"
+        return score_component(
+            "educational_value", features, self.educational_value_weight, candidate
         )
-        if re.search(tool_pref_pattern, content_lower):
-            score += 2
-            reasons.append("Provides tool preferences with reasoning")
-
-        return min(score, self.educational_value_weight), reasons
 
     def _calculate_ai_effectiveness_score(
-        self, claude_content: str
+        self, features: dict[str, int]
     ) -> tuple[int, list[str]]:
         """Calculate score based on AI assistant effectiveness (0-15 points)."""
-        if not claude_content:
-            return 0, []
-
-        content_lower = claude_content.lower()
-        score = 0
-        reasons = []
-
-        # Well-structured sections (0-6 points)
-        section_count = claude_content.count("##")
-        if section_count >= 8:
-            score += 6
-            reasons.append("Well-organized with clear section headers")
-        elif section_count >= 4:
-            score += 3
-            reasons.append("Good section organization")
-
-        # Specific commands and workflows (0-3 points)
-        if (
-            "npm" in claude_content
-            or "yarn" in claude_content
-            or "pip" in claude_content
-            or "cargo" in claude_content
-        ):
-            score += 3
-            reasons.append("Contains specific commands and workflows")
-
-        # Context about goals and constraints (0-2 points)
-        context_keywords = [
-            "goal",
-            "purpose",
-            "constraint",
-            "requirement",
-            "limitation",
-        ]
-        if any(keyword in content_lower for keyword in context_keywords):
-            score += 2
-            reasons.append("Provides project context and constraints")
-
-        # Explicit constraints and directives (0-4 points)
-        constraint_patterns = [
-            "never ",
-            "must not",
-            "do not ",
-            "don't ",
-            "always ",
-            "important:",
-            "## constraints",
-            "## rules",
-            "## guidelines",
-            "required:",
-        ]
-        constraint_count = sum(1 for p in constraint_patterns if p in content_lower)
-        if constraint_count >= 3:
-            score += 4
-            reasons.append("Contains explicit constraints and behavioral directives")
-        elif constraint_count >= 1:
-            score += 2
-            reasons.append("Contains some constraints or directives")
-
-        # Role assignment and methodology (0-2 points)
-        role_patterns = ["you are", "act as", "your role", "## role"]
-        methodology_patterns = [
-            "tdd",
-            "test-driven",
-            "## methodology",
-            "## protocol",
-            "## workflow",
-            "phase",
-        ]
-        if any(p in content_lower for p in role_patterns + methodology_patterns):
-            score += 2
-            reasons.append("Assigns AI role or enforces development methodology")
-
-        return min(score, self.ai_effectiveness_weight), reasons
+        return score_component(
+            "ai_effectiveness", features, self.ai_effectiveness_weight
+        )
 
     def _calculate_project_maturity_score(
         self, candidate: dict
     ) -> tuple[int, list[str]]:
         """Calculate score based on project maturity (0-20 points)."""
-        score = 0
-        reasons = []
-
-        # Recent activity (0-8 points)
-        days_since_update = self._calculate_days_since_update(candidate)
-        if days_since_update <= 30:
-            score += 8
-            reasons.append("Recently updated (last 30 days)")
-        elif days_since_update <= 90:
-            score += 4
-            reasons.append("Recently updated (last 90 days)")
-
-        # CI/CD indicators (0-3 points)
-        desc = candidate.get("description", "").lower()
-        topics_str = " ".join(t.lower() for t in candidate.get("topics", []))
-        ci_keywords = [
-            "ci/cd",
-            "pipeline",
-            "actions",
-            "continuous integration",
-            "continuous delivery",
-            "automation",
-            "github actions",
-        ]
-        if any(kw in desc or kw in topics_str for kw in ci_keywords):
-            score += 3
-            reasons.append("Has CI/CD or automation indicators")
-
-        # Maintenance signals (0-3 points)
-        maintenance_keywords = ["maintained", "production", "active", "stable"]
-        if any(kw in desc for kw in maintenance_keywords):
-            score += 3
-            reasons.append("Shows active maintenance signals")
-
-        # Production indicators (0-6 points)
-        if candidate.get("description"):
-            desc_lower = candidate["description"].lower()
-            prod_keywords = ["production", "enterprise", "scale", "deployed", "used by"]
-            if any(keyword in desc_lower for keyword in prod_keywords):
-                score += 6
-                reasons.append("Evidence of production usage")
-
-        return min(score, self.project_maturity_weight), reasons
+        features = extract_maturity_features(candidate)
+        return score_component(
+            "project_maturity", features, self.project_maturity_weight, candidate
+        )
 
     def _calculate_community_recognition_score(
         self, candidate: dict
     ) -> tuple[int, list[str]]:
         """Calculate score based on community recognition (0-10 points)."""
-        score = 0
-        reasons = []
-
-        # Notable organizations (0-5 points) - reduced impact
-        recognized_orgs = {
-            "anthropic",
-            "openai",
-            "microsoft",
-            "google",
-            "meta",
-            "facebook",
-            "apple",
-            "amazon",
-            "netflix",
-            "uber",
-            "airbnb",
-            "spotify",
-            "github",
-            "gitlab",
-            "atlassian",
-            "docker",
-            "kubernetes",
-            "pytorch",
-            "tensorflow",
-            "huggingface",
-            "langchain",
-            "cloudflare",
-            "vercel",
-            "netlify",
-            "elastic",
-            "mongodb",
-            "redis",
-            "postgresql",
-            "mysql",
-            "sentry",
-            "datadog",
-            "stripe",
-            "twilio",
-            "shopify",
-            "square",
-            "paypal",
-            "ethereum",
-            "bitcoin",
-            "polygon",
-            "chainlink",
-        }
-
-        owner_lower = candidate["owner"].lower()
-        if owner_lower in recognized_orgs:
-            score += 5
-            reasons.append(f"From recognized organization ({candidate['owner']})")
-        elif (
-            candidate.get("organization")
-            and candidate["organization"].lower() in recognized_orgs
-        ):
-            score += 5
-            reasons.append(
-                f"From recognized organization ({candidate['organization']})"
-            )
-
-        # High star count as validation (0-5 points) - reduced from primary factor
-        stars = candidate["stars"]
-        if stars >= 1000:
-            score += 5
-            reasons.append(f"High community validation ({stars} stars)")
-        elif stars >= 500:
-            score += 3
-            reasons.append(f"Good community validation ({stars} stars)")
-
-        return min(score, self.community_recognition_weight), reasons
+        features = extract_recognition_features(candidate)
+        return score_component(
+            "community_recognition",
+            features,
+            self.community_recognition_weight,
+            candidate,
+        )
 
     def _calculate_days_since_update(self, candidate: dict) -> int:
         """Calculate days since last repository update."""
-        updated_date = datetime.fromisoformat(
-            candidate["updated_at"].replace("Z", "+00:00")
-        )
-        return (datetime.now().replace(tzinfo=updated_date.tzinfo) - updated_date).days
+        return days_since_update(candidate)
 
-    def _suggest_category(self, candidate: dict, claude_content: str) -> str:
+    def _suggest_category(
+        self, candidate: dict, claude_content: str, hits: KeywordHits | None = None
+    ) -> str:
         """Suggest appropriate category based on repository characteristics."""
+        if hits is None:
+            hits, _ = self.scan_keywords(candidate, claude_content)
+        return self._category_from_keywords(
+            candidate, {keyword for keyword in ALL_CATEGORY_KEYWORDS if keyword in hits}
+        )
 
-        # Keywords that suggest different categories
-        categories = {
-            "complex-projects": [
-                "microservices",
-                "architecture",
-                "distributed",
-                "enterprise",
-                "platform",
-                "system",
-                "infrastructure",
-                "scalable",
-                "multi-service",
-            ],
-            "libraries-frameworks": [
-                "library",
-                "framework",
-                "sdk",
-                "api",
-                "npm",
-                "pypi",
-                "package",
-                "component",
-                "widget",
-                "utility",
-                "helper",
-            ],
-            "developer-tooling": [
-                "cli",
-                "tool",
-                "build",
-                "deploy",
-                "automation",
-                "workflow",
-                "pipeline",
-                "ci/cd",
-                "development",
-                "debugging",
-            ],
-            "getting-started": [
-                "tutorial",
-                "example",
-                "demo",
-                "sample",
-                "template",
-                "boilerplate",
-                "starter",
-                "quickstart",
-                "beginner",
-                "learning",
-            ],
-        }
-
-        # Analyze description and topics
-        text_to_analyze = (
-            candidate.get("description", "")
-            + " "
-            + " ".join(candidate.get("topics", []))
-            + " "
-            + claude_content
-        ).lower()
-
+    def _category_from_keywords(self, candidate: dict, present) -> str:
+        """Pick the category whose keywords occur most often among ``present``."""
         category_scores = {}
 
-        for category, keywords in categories.items():
-            score = sum(1 for keyword in keywords if keyword in text_to_analyze)
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            score = sum(1 for keyword in keywords if keyword in present)
             if score > 0:
                 category_scores[category] = score
 
@@ -611,3 +352,24 @@ class RepositoryEvaluator:
             return "libraries-frameworks"
 
         return "complex-projects"  # Default category
+
+
+def evaluate_repository(
+    candidate: dict,
+    content: str | ContentProfile,
+    weights: dict[str, int] | None = None,
+) -> tuple[dict, ContentProfile | None]:
+    """Score a candidate prepared with its content or its cached profile.
+
+    A picklable entry point for worker processes that also returns the
+    newly extracted profile, so the caller can cache it; it is None when
+    the candidate arrived with a profile already. ``weights`` are the
+    calling evaluator's ``component_weights``; the defaults apply without.
+    """
+    evaluator = RepositoryEvaluator(None)
+    for component, weight in (weights or {}).items():
+        setattr(evaluator, f"{component}_weight", weight)
+    if isinstance(content, ContentProfile):
+        return evaluator.score_profile(candidate, content), None
+    profile = extract_content_profile(content)
+    return evaluator.score_profile(candidate, profile), profile
@@ -0,0 +1,119 @@
+"""Persistent cache of CLAUDE.md content profiles keyed by blob SHA."""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+from .features import ContentProfile, content_extractor_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEATURE_CACHE_PATH = Path(".cache") / "discovery" / "features.sqlite3"
+
+
+class FeatureCache:
+    """SQLite store of extracted content profiles.
+
+    Entries are keyed by git blob SHA and feature extractor version. A blob
+    never changes, so an entry stays valid until the extraction itself
+    changes; entries written by any other version are deleted when the
+    cache is opened. Scoring a cached profile needs neither the content
+    nor a keyword scan, so changed weights or rules can be applied to
+    every known CLAUDE.md offline.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_FEATURE_CACHE_PATH,
+        version: str | None = None,
+    ):
+        self.path = Path(path)
+        self.version = version or content_extractor_version()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                blob_sha TEXT NOT NULL,
+                version TEXT NOT NULL,
+                features TEXT NOT NULL,
+                category_keywords TEXT NOT NULL,
+                PRIMARY KEY (blob_sha, version)
+            )
+            """
+        )
+        self.invalidated = self._conn.execute(
+            "DELETE FROM profiles WHERE version != ?", (self.version,)
+        ).rowcount
+        self._conn.commit()
+        if self.invalidated:
+            logger.info(
+                f"Feature extractor changed, dropped {self.invalidated} cached profiles"
+            )
+
+    def get(self, blob_sha: str | None) -> ContentProfile | None:
+        """Return the cached profile of a blob, or None if it is not cached."""
+        with self._lock:
+            row = (
+                self._conn.execute(
+                    "SELECT features, category_keywords FROM profiles "
+                    "WHERE blob_sha = ? AND version = ?",
+                    (blob_sha, self.version),
+                ).fetchone()
+                if blob_sha
+                else None
+            )
+            if row is None or not blob_sha:
+                self.misses += 1
+                return None
+            self.hits += 1
+        features, category_keywords = row
+        return ContentProfile(
+            blob_sha=blob_sha,
+            features=json.loads(features),
+            category_keywords=frozenset(json.loads(category_keywords)),
+        )
+
+    def put(self, profile: ContentProfile) -> None:
+        """Store a profile under its blob SHA and the current version."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles "
+                "(blob_sha, version, features, category_keywords) VALUES (?, ?, ?, ?)",
+                (
+                    profile.blob_sha,
+                    self.version,
+                    json.dumps(profile.features),
+                    json.dumps(sorted(profile.category_keywords)),
+                ),
+            )
+            self._conn.commit()
+            self.writes += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()
+        return count
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters for the current process."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "invalidated": self.invalidated,
+            "entries": len(self),
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
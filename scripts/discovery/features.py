@@ -0,0 +1,600 @@
+"""Feature extraction and the scoring rules table for repository evaluation.
+
+Scoring a candidate is split in two: extracting a fixed set of integer
+features from its metadata and CLAUDE.md content, and turning features
+into points with ``SCORING_RULES``. The same table drives the evaluator's
+per-candidate scoring and the vectorized batch scorer, so both produce
+identical scores.
+"""
+
+import hashlib
+import inspect
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cache
+
+from .. import markdown_document
+from ..markdown_document import parse_document
+from . import keyword_matcher
+from .blob_store import git_blob_sha
+from .keyword_matcher import KeywordHits, KeywordMatcher
+
+# Section titles that earn content points, matched against heading prefixes
+ARCHITECTURE_HEADINGS = [
+    "architecture",
+    "overview",
+    "design",
+    "system",
+    "structure",
+]
+DEVELOPMENT_HEADINGS = [
+    "development",
+    "building",
+    "commands",
+    "setup",
+    "workflow",
+]
+TEST_DEPLOY_HEADINGS = [
+    "testing",
+    "tests",
+    "deployment",
+    "production",
+]
+TROUBLESHOOTING_HEADINGS = [
+    "troubleshooting",
+    "debugging",
+    "known issues",
+    "faq",
+]
+CONSTRAINT_HEADINGS = ["constraints", "rules", "guidelines"]
+ROLE_HEADINGS = ["role"]
+METHODOLOGY_HEADINGS = ["methodology", "protocol", "workflow"]
+
+# Keywords that earn content points, grouped by the check that uses them
+ADVANCED_KEYWORDS = [
+    "pattern",
+    "best practice",
+    "architecture",
+    "design principle",
+    "methodology",
+]
+ACTIONABLE_KEYWORDS = ["step", "how to", "guide", "tutorial", "instruction"]
+REJECTION_PATTERNS = [
+    "rejected",
+    "decided against",
+    "instead of",
+    "why not",
+    "deliberately",
+    "intentionally",
+    "chose not to",
+    "we don't",
+]
+CONTEXT_KEYWORDS = [
+    "goal",
+    "purpose",
+    "constraint",
+    "requirement",
+    "limitation",
+]
+CONSTRAINT_PATTERNS = [
+    "never ",
+    "must not",
+    "do not ",
+    "don't ",
+    "always ",
+    "important:",
+    "required:",
+]
+ROLE_PATTERNS = ["you are", "act as", "your role"]
+METHODOLOGY_PATTERNS = [
+    "tdd",
+    "test-driven",
+    "phase",
+]
+
+# Package managers named in commands, matched case-sensitively
+PACKAGE_MANAGERS = ["npm", "yarn", "pip", "cargo"]
+
+# Keywords that suggest different categories
+CATEGORY_KEYWORDS = {
+    "complex-projects": [
+        "microservices",
+        "architecture",
+        "distributed",
+        "enterprise",
+        "platform",
+        "system",
+        "infrastructure",
+        "scalable",
+        "multi-service",
+    ],
+    "libraries-frameworks": [
+        "library",
+        "framework",
+        "sdk",
+        "api",
+        "npm",
+        "pypi",
+        "package",
+        "component",
+        "widget",
+        "utility",
+        "helper",
+    ],
+    "developer-tooling": [
+        "cli",
+        "tool",
+        "build",
+        "deploy",
+        "automation",
+        "workflow",
+        "pipeline",
+        "ci/cd",
+        "development",
+        "debugging",
+    ],
+    "getting-started": [
+        "tutorial",
+        "example",
+        "demo",
+        "sample",
+        "template",
+        "boilerplate",
+        "starter",
+        "quickstart",
+        "beginner",
+        "learning",
+    ],
+}
+
+# Every category keyword, in the order the categories list them
+ALL_CATEGORY_KEYWORDS = tuple(
+    dict.fromkeys(
+        keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords
+    )
+)
+
+# One matcher for every case-insensitive keyword above, built once at import
+KEYWORD_MATCHER = KeywordMatcher(
+    ADVANCED_KEYWORDS
+    + ["example"]
+    + ACTIONABLE_KEYWORDS
+    + REJECTION_PATTERNS
+    + CONTEXT_KEYWORDS
+    + CONSTRAINT_PATTERNS
+    + ROLE_PATTERNS
+    + METHODOLOGY_PATTERNS
+    + list(ALL_CATEGORY_KEYWORDS)
+)
+
+FILE_PATH_PATTERN = re.compile(
+    r"[`/][a-zA-Z0-9_./]+\.(py|ts|js|rs|go|java|tsx|jsx|rb|cpp|swift|kt)"
+)
+FUNC_REF_PATTERN = re.compile(r"[a-zA-Z_]\w*(?:::\w+)?\(\)")
+TOOL_PREFERENCE_PATTERN = re.compile(
+    r"(use|prefer|choose)\s+\w+\s+(instead of|over|rather than|not)\s+\w+"
+)
+
+
+# Metadata keywords, matched against the lowercased description and topics
+CI_KEYWORDS = [
+    "ci/cd",
+    "pipeline",
+    "actions",
+    "continuous integration",
+    "continuous delivery",
+    "automation",
+    "github actions",
+]
+MAINTENANCE_KEYWORDS = ["maintained", "production", "active", "stable"]
+PRODUCTION_KEYWORDS = ["production", "enterprise", "scale", "deployed", "used by"]
+
+RECOGNIZED_ORGS = {
+    "anthropic",
+    "openai",
+    "microsoft",
+    "google",
+    "meta",
+    "facebook",
+    "apple",
+    "amazon",
+    "netflix",
+    "uber",
+    "airbnb",
+    "spotify",
+    "github",
+    "gitlab",
+    "atlassian",
+    "docker",
+    "kubernetes",
+    "pytorch",
+    "tensorflow",
+    "huggingface",
+    "langchain",
+    "cloudflare",
+    "vercel",
+    "netlify",
+    "elastic",
+    "mongodb",
+    "redis",
+    "postgresql",
+    "mysql",
+    "sentry",
+    "datadog",
+    "stripe",
+    "twilio",
+    "shopify",
+    "square",
+    "paypal",
+    "ethereum",
+    "bitcoin",
+    "polygon",
+    "chainlink",
+}
+
+CONTENT_FEATURES = (
+    "architecture_section",
+    "development_section",
+    "test_deploy_section",
+    "troubleshooting_section",
+    "content_length",
+    "nav_refs",
+    "advanced_keywords",
+    "code_blocks",
+    "example_mention",
+    "actionable_guidance",
+    "rejected_approaches",
+    "tool_preferences",
+    "section_count",
+    "package_manager_commands",
+    "context_keywords",
+    "constraint_count",
+    "role_or_methodology",
+)
+METADATA_FEATURES = (
+    "recent_activity",
+    "ci_indicators",
+    "maintenance_signals",
+    "production_usage",
+    "recognized_org",
+    "stars",
+)
+FEATURE_NAMES = CONTENT_FEATURES + METADATA_FEATURES
+
+
+@dataclass(frozen=True)
+class Tier:
+    """Points awarded once a feature reaches ``minimum``.
+
+    ``reason`` is formatted with the candidate's fields.
+    """
+
+    minimum: int
+    points: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Scores one feature by the first of its tiers it reaches.
+
+    Tiers are listed from the highest minimum down. Rules sharing a
+    ``group`` have their combined points capped by ``GROUP_CAPS``.
+    """
+
+    feature: str
+    tiers: tuple[Tier, ...]
+    group: str | None = None
+
+
+def _flag(feature: str, points: int, reason: str, group: str | None = None) -> Rule:
+    """Return a rule awarding points when a feature is present."""
+    return Rule(feature, (Tier(1, points, reason),), group)
+
+
+# Rules per component, in the order their reasons are reported
+SCORING_RULES: dict[str, tuple[Rule, ...]] = {
+    "content_depth": (
+        _flag(
+            "architecture_section",
+            8,
+            "Contains comprehensive architecture documentation",
+        ),
+        _flag("development_section", 8, "Contains clear development workflows"),
+        _flag("test_deploy_section", 6, "Contains testing and deployment guidance"),
+        Rule(
+            "content_length",
+            (
+                Tier(3001, 2, "Comprehensive and detailed documentation"),
+                Tier(1501, 1, "Substantial documentation"),
+            ),
+        ),
+        _flag("troubleshooting_section", 2, "Contains troubleshooting information"),
+        Rule(
+            "nav_refs",
+            (
+                Tier(5, 4, "Provides function-level code navigation"),
+                Tier(2, 2, "Contains specific file/function references"),
+            ),
+        ),
+    ),
+    "educational_value": (
+        Rule(
+            "advanced_keywords",
+            (
+                Tier(3, 10, "Demonstrates advanced patterns and techniques"),
+                Tier(1, 5, "Shows some advanced patterns"),
+            ),
+        ),
+        _flag("code_blocks", 5, "Includes concrete code snippets", "code_examples"),
+        _flag(
+            "example_mention",
+            3,
+            "References examples or usage patterns",
+            "code_examples",
+        ),
+        _flag("actionable_guidance", 5, "Provides actionable, specific guidance"),
+        _flag(
+            "rejected_approaches",
+            3,
+            "Documents rejected approaches or deliberate design decisions",
+        ),
+        _flag("tool_preferences", 2, "Provides tool preferences with reasoning"),
+    ),
+    "ai_effectiveness": (
+        Rule(
+            "section_count",
+            (
+                Tier(8, 6, "Well-organized with clear section headers"),
+                Tier(4, 3, "Good section organization"),
+            ),
+        ),
+        _flag(
+            "package_manager_commands", 3, "Contains specific commands and workflows"
+        ),
+        _flag("context_keywords", 2, "Provides project context and constraints"),
+        Rule(
+            "constraint_count",
+            (
+                Tier(3, 4, "Contains explicit constraints and behavioral directives"),
+                Tier(1, 2, "Contains some constraints or directives"),
+            ),
+        ),
+        _flag(
+            "role_or_methodology",
+            2,
+            "Assigns AI role or enforces development methodology",
+        ),
+    ),
+    "project_maturity": (
+        Rule(
+            "recent_activity",
+            (
+                Tier(2, 8, "Recently updated (last 30 days)"),
+                Tier(1, 4, "Recently updated (last 90 days)"),
+            ),
+        ),
+        _flag("ci_indicators", 3, "Has CI/CD or automation indicators"),
+        _flag("maintenance_signals", 3, "Shows active maintenance signals"),
+        _flag("production_usage", 6, "Evidence of production usage"),
+    ),
+    "community_recognition": (
+        Rule(
+            "recognized_org",
+            (
+                Tier(2, 5, "From recognized organization ({owner})"),
+                Tier(1, 5, "From recognized organization ({organization})"),
+            ),
+        ),
+        Rule(
+            "stars",
+            (
+                Tier(1000, 5, "High community validation ({stars} stars)"),
+                Tier(500, 3, "Good community validation ({stars} stars)"),
+            ),
+        ),
+    ),
+}
+
+# Combined cap for rules sharing a group, applied before the component cap
+GROUP_CAPS = {"code_examples": 8}
+
+COMPONENTS = tuple(SCORING_RULES)
+
+
+def component_weights(evaluator) -> dict[str, int]:
+    """Return each component's cap from an evaluator's ``*_weight`` attributes."""
+    return {
+        component: getattr(evaluator, f"{component}_weight") for component in COMPONENTS
+    }
+
+
+def score_component(
+    component: str, features: dict, weight: int, candidate: dict | None = None
+) -> tuple[int, list[str]]:
+    """Score one component from features, returning its points and reasons."""
+    score = 0
+    reasons = []
+    group_points: dict[str, int] = {}
+    for rule in SCORING_RULES[component]:
+        value = features[rule.feature]
+        tier = next((t for t in rule.tiers if value >= t.minimum), None)
+        if tier is None:
+            continue
+        reasons.append(tier.reason.format_map(candidate or {}))
+        if rule.group is None:
+            score += tier.points
+        else:
+            group_points[rule.group] = group_points.get(rule.group, 0) + tier.points
+    for group, points in group_points.items():
+        score += min(points, GROUP_CAPS[group])
+    return min(score, weight), reasons
+
+
+def days_since_update(candidate: dict) -> int:
+    """Calculate days since last repository update."""
+    updated_date = datetime.fromisoformat(
+        candidate["updated_at"].replace("Z", "+00:00")
+    )
+    return (datetime.now().replace(tzinfo=updated_date.tzinfo) - updated_date).days
+
+
+def extract_content_features(
+    claude_content: str, hits: KeywordHits | None = None
+) -> dict[str, int]:
+    """Extract the CLAUDE.md features; they depend on the content alone.
+
+    ``hits`` are the keyword hits of the lowercased content, as returned by
+    the evaluator's single keyword scan; the content is scanned if omitted.
+    """
+    if hits is None:
+        hits = KEYWORD_MATCHER.scan(claude_content.lower())
+    document = parse_document(claude_content)
+    return {
+        "architecture_section": int(document.has_heading(ARCHITECTURE_HEADINGS)),
+        "development_section": int(document.has_heading(DEVELOPMENT_HEADINGS)),
+        "test_deploy_section": int(document.has_heading(TEST_DEPLOY_HEADINGS)),
+        "troubleshooting_section": int(document.has_heading(TROUBLESHOOTING_HEADINGS)),
+        "content_length": len(claude_content),
+        "nav_refs": len(FILE_PATH_PATTERN.findall(claude_content))
+        + len(FUNC_REF_PATTERN.findall(claude_content)),
+        "advanced_keywords": hits.count_present(ADVANCED_KEYWORDS),
+        "code_blocks": len(document.code_blocks),
+        "example_mention": int("example" in hits),
+        "actionable_guidance": int(hits.any(ACTIONABLE_KEYWORDS)),
+        "rejected_approaches": int(hits.any(REJECTION_PATTERNS)),
+        "tool_preferences": int(
+            TOOL_PREFERENCE_PATTERN.search(hits.text, hits.start, hits.end) is not None
+        ),
+        "section_count": document.section_count(),
+        "package_manager_commands": int(
+            any(manager in claude_content for manager in PACKAGE_MANAGERS)
+        ),
+        "context_keywords": int(hits.any(CONTEXT_KEYWORDS)),
+        "constraint_count": hits.count_present(CONSTRAINT_PATTERNS)
+        + sum(1 for title in CONSTRAINT_HEADINGS if document.has_heading([title])),
+        "role_or_methodology": int(
+            hits.any(ROLE_PATTERNS + METHODOLOGY_PATTERNS)
+            or document.has_heading(ROLE_HEADINGS + METHODOLOGY_HEADINGS)
+        ),
+    }
+
+
+def extract_maturity_features(candidate: dict) -> dict[str, int]:
+    """Extract the project maturity features from repository metadata."""
+    days = days_since_update(candidate)
+    desc = candidate.get("description", "").lower()
+    topics_str = " ".join(t.lower() for t in candidate.get("topics", []))
+    return {
+        "recent_activity": 2 if days <= 30 else 1 if days <= 90 else 0,
+        "ci_indicators": int(any(kw in desc or kw in topics_str for kw in CI_KEYWORDS)),
+        "maintenance_signals": int(any(kw in desc for kw in MAINTENANCE_KEYWORDS)),
+        "production_usage": int(any(kw in desc for kw in PRODUCTION_KEYWORDS)),
+    }
+
+
+def extract_recognition_features(candidate: dict) -> dict[str, int]:
+    """Extract the community recognition features from repository metadata."""
+    if candidate["owner"].lower() in RECOGNIZED_ORGS:
+        recognized_org = 2
+    elif (
+        candidate.get("organization")
+        and candidate["organization"].lower() in RECOGNIZED_ORGS
+    ):
+        recognized_org = 1
+    else:
+        recognized_org = 0
+    return {"recognized_org": recognized_org, "stars": candidate["stars"]}
+
+
+def extract_metadata_features(candidate: dict) -> dict[str, int]:
+    """Extract the features that depend on repository metadata alone."""
+    return {
+        **extract_maturity_features(candidate),
+        **extract_recognition_features(candidate),
+    }
+
+
+def extract_features(candidate: dict, claude_content: str, hits=None) -> dict[str, int]:
+    """Extract every feature of a candidate and its CLAUDE.md content."""
+    return {
+        **extract_content_features(claude_content, hits),
+        **extract_metadata_features(candidate),
+    }
+
+
+@dataclass(frozen=True)
+class ContentProfile:
+    """What scoring needs from a CLAUDE.md file, without the file itself.
+
+    Holds the content features and the category keywords the content
+    mentions; with the candidate's metadata they reproduce the full
+    evaluation. ``blob_sha`` is the git blob SHA of the content.
+    """
+
+    blob_sha: str
+    features: dict[str, int]
+    category_keywords: frozenset[str]
+
+
+def extract_content_profile(
+    claude_content: str, hits: KeywordHits | None = None
+) -> ContentProfile:
+    """Extract the content profile of some CLAUDE.md content.
+
+    ``hits`` are the keyword hits of the lowercased content, as for
+    ``extract_content_features``.
+    """
+    if hits is None:
+        hits = KEYWORD_MATCHER.scan(claude_content.lower())
+    return ContentProfile(
+        blob_sha=git_blob_sha(claude_content.encode("utf-8", "surrogatepass")),
+        features=extract_content_features(claude_content, hits),
+        category_keywords=frozenset(
+            keyword for keyword in ALL_CATEGORY_KEYWORDS if keyword in hits
+        ),
+    )
+
+
+@cache
+def content_extractor_version() -> str:
+    """Return a hash identifying how content profiles are extracted.
+
+    It covers the keyword lists, heading prefixes and patterns, the
+    extraction functions and the keyword matcher and markdown modules they
+    rely on, so editing any of them changes the version. Scoring rules and
+    weights are not included: they apply to profiles after extraction.
+    """
+    digest = hashlib.sha256()
+    inputs = (
+        CONTENT_FEATURES,
+        ARCHITECTURE_HEADINGS,
+        DEVELOPMENT_HEADINGS,
+        TEST_DEPLOY_HEADINGS,
+        TROUBLESHOOTING_HEADINGS,
+        CONSTRAINT_HEADINGS,
+        ROLE_HEADINGS,
+        METHODOLOGY_HEADINGS,
+        ADVANCED_KEYWORDS,
+        ACTIONABLE_KEYWORDS,
+        REJECTION_PATTERNS,
+        CONTEXT_KEYWORDS,
+        CONSTRAINT_PATTERNS,
+        ROLE_PATTERNS,
+        METHODOLOGY_PATTERNS,
+        PACKAGE_MANAGERS,
+        ALL_CATEGORY_KEYWORDS,
+        FILE_PATH_PATTERN.pattern,
+        FUNC_REF_PATTERN.pattern,
+        TOOL_PREFERENCE_PATTERN.pattern,
+    )
+    digest.update(repr(inputs).encode())
+    for source in (
+        extract_content_features,
+        extract_content_profile,
+        keyword_matcher,
+        markdown_document,
+    ):
+        digest.update(inspect.getsource(source).encode())
+    return digest.hexdigest()[:16]
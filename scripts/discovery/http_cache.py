@@ -0,0 +1,244 @@
+"""Persistent conditional-request cache for GitHub API responses."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .transport import build_response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(".cache") / "github" / "http_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Headers that describe the new response rather than the cached representation
+_REFRESHED_HEADERS = (
+    "date",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+    "x-ratelimit-reset",
+    "x-ratelimit-used",
+    "x-ratelimit-resource",
+)
+
+# Headers describing the wire encoding; cached bodies are stored decoded
+_WIRE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+@dataclass
+class CachedResponse:
+    """A stored response and the validators used to revalidate it."""
+
+    status_code: int
+    headers: dict[str, str]
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+
+
+class HTTPCache:
+    """SQLite-backed response cache with ETag revalidation and LRU eviction."""
+
+    def __init__(
+        self, path: str | Path = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Return the cached response for a key, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, headers, body, etag, last_modified "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        status_code, headers, body, etag, last_modified = row
+        return CachedResponse(
+            status_code, json.loads(headers), bytes(body), etag, last_modified
+        )
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        """Store a response and evict least recently used entries if needed."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, status_code, headers, body, etag, last_modified, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    entry.body,
+                    entry.etag,
+                    entry.last_modified,
+                    len(entry.body),
+                    time.time(),
+                ),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        """Mark a cached entry as recently used."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+
+    def total_size(self) -> int:
+        """Return the total size of cached response bodies in bytes."""
+        with self._lock:
+            (size,) = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return size
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits its budget."""
+        (size,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if size <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        for key, entry_size in rows:
+            if size <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            size -= entry_size
+            self.evictions += 1
+
+    def record_hit(self, bytes_saved: int) -> None:
+        """Count a revalidated response served from the cache."""
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += bytes_saved
+
+    def record_miss(self) -> None:
+        """Count a response that had to be downloaded."""
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters for the current process."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions,
+            "size_bytes": self.total_size(),
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachingMiddleware:
+    """Transport middleware that revalidates cached GET responses.
+
+    Cached entries are sent back with ``If-None-Match``/``If-Modified-Since``;
+    a ``304 Not Modified`` reply is answered from the cache and does not count
+    against the primary rate limit.
+    """
+
+    def __init__(self, cache: HTTPCache):
+        self.cache = cache
+
+    def _cache_key(self, request) -> str:
+        """Build the cache key for a request.
+
+        Responses vary by Accept and by credential, since what a token may
+        see differs; the key holds a short hash of the Authorization header,
+        never the token itself.
+        """
+        accept = request.headers.get("Accept", "")
+        authorization = request.headers.get("Authorization", "")
+        credential = hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:12]
+        return f"{request.method} {request.url} {accept} {credential}"
+
+    def handle(self, request, send, **kwargs):
+        """Send a request, revalidating and refreshing the cache around it."""
+        if request.method != "GET":
+            return send(request, **kwargs)
+
+        key = self._cache_key(request)
+        cached = self.cache.get(key)
+        if cached is not None:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = send(request, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.record_hit(len(cached.body))
+            self.cache.touch(key)
+            headers = dict(cached.headers)
+            for name in _REFRESHED_HEADERS:
+                if name in response.headers:
+                    headers[name] = response.headers[name]
+            return build_response(request, cached.status_code, headers, cached.body)
+
+        self.cache.record_miss()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            # Keyed by the token that fetched it, in case a retry switched tokens
+            self.cache.put(
+                self._cache_key(request),
+                CachedResponse(
+                    status_code=response.status_code,
+                    headers={
+                        k.lower(): v
+                        for k, v in response.headers.items()
+                        if k.lower() not in _WIRE_HEADERS
+                    },
+                    body=response.content,
+                    etag=etag,
+                    last_modified=last_modified,
+                ),
+            )
+        return response
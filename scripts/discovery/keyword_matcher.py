@@ -0,0 +1,121 @@
+"""Single-pass multi-keyword matching for the evaluators."""
+
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+
+
+class KeywordHits:
+    """Positions of every keyword occurrence found in one scan of a text.
+
+    A hit counts only if the whole keyword lies inside the view's
+    ``text[start:end]`` window, so views over parts of a concatenated text
+    behave exactly like scans of the parts on their own.
+    """
+
+    def __init__(
+        self,
+        positions: dict[str, list[int]],
+        text: str,
+        start: int = 0,
+        end: int | None = None,
+    ):
+        self._positions = positions
+        self.text = text
+        self.start = start
+        self.end = len(text) if end is None else end
+
+    def positions(self, keyword: str) -> list[int]:
+        """Return the start offsets of a keyword, in ascending order."""
+        found = self._positions.get(keyword, [])
+        if self.start == 0 and self.end == len(self.text):
+            return found
+        first = bisect_left(found, self.start)
+        return found[first : bisect_right(found, self.end - len(keyword), first)]
+
+    def __contains__(self, keyword: str) -> bool:
+        found = self._positions.get(keyword)
+        if not found:
+            return False
+        first = bisect_left(found, self.start)
+        return first < len(found) and found[first] <= self.end - len(keyword)
+
+    def any(self, keywords: Iterable[str]) -> bool:
+        """Return True if any of the keywords occurs."""
+        return any(keyword in self for keyword in keywords)
+
+    def count_present(self, keywords: Iterable[str]) -> int:
+        """Return how many of the keywords occur at least once."""
+        return sum(1 for keyword in keywords if keyword in self)
+
+    def count(self, keyword: str) -> int:
+        """Count non-overlapping occurrences, as ``str.count`` would."""
+        total = 0
+        next_free = -1
+        for position in self.positions(keyword):
+            if position >= next_free:
+                total += 1
+                next_free = position + len(keyword)
+        return total
+
+    def within(self, start: int, end: int) -> "KeywordHits":
+        """Return a view restricted to hits fully inside ``[start, end)``."""
+        return KeywordHits(self._positions, self.text, start, end)
+
+
+class KeywordMatcher:
+    """Finds every occurrence of a fixed keyword set in one pass over a text.
+
+    The keywords are compiled into a trie-shaped regular expression, so the
+    regex engine skips ahead to characters that can start a keyword and then
+    branches on characters instead of trying each keyword in turn. Each
+    search resumes one character after the previous match, so overlapping
+    keywords are all found. At each position the longest keyword is
+    matched; every shorter keyword that is a prefix of it matches there
+    too. Matching is case-sensitive: scan lowercased text for
+    case-insensitive keywords.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keywords))
+        if not self.keywords or not all(self.keywords):
+            raise ValueError("Keywords must be non-empty strings")
+
+        trie: dict = {}
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = True
+        self._pattern = re.compile(_trie_pattern(trie), re.DOTALL)
+        self._prefixes = {
+            keyword: [k for k in self.keywords if keyword.startswith(k)]
+            for keyword in self.keywords
+        }
+
+    def scan(self, text: str) -> KeywordHits:
+        """Return the positions of every keyword occurrence in the text."""
+        positions: dict[str, list[int]] = {}
+        prefixes = self._prefixes
+        search = self._pattern.search
+        match = search(text)
+        while match is not None:
+            position = match.start()
+            for keyword in prefixes[match.group()]:
+                positions.setdefault(keyword, []).append(position)
+            match = search(text, position + 1)
+        return KeywordHits(positions, text)
+
+
+def _trie_pattern(node: dict) -> str:
+    """Build a regex matching the longest keyword in a trie at a position."""
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    # Greedy optional group: prefer a longer keyword, fall back to this one
+    return f"(?:{body})?" if "" in node else body
@@ -1,48 +1,175 @@
 """Main orchestrator for the discovery workflow."""
 
 import logging
+from collections.abc import Iterator
+from functools import partial
 from typing import Any
 
-from .evaluator import RepositoryEvaluator
+from .api_usage import ApiUsage, ApiUsageMiddleware
+from .blob_store import BlobStore
+from .cassette import Cassette, CassetteMiddleware
+from .evaluation_pool import EvaluationPool
+from .evaluator import RepositoryEvaluator, evaluate_repository
+from .feature_cache import FeatureCache
+from .features import component_weights
+from .http_cache import CachingMiddleware, HTTPCache
 from .loader import RepositoryLoader
+from .pipeline import stream
 from .reporter import IssueGenerator
+from .run_manifest import RunManifest
+from .run_state import RunStateStore
 from .searcher import GitHubSearcher
+from .token_pool import TokenAssignmentMiddleware, TokenPool, TokenPoolMiddleware
+from .tracing import traced
+from .transport import GitHubTransport
 
 logger = logging.getLogger(__name__)
 
 
+def build_transport(
+    github_token: str | list[str],
+    http_cache: HTTPCache | None = None,
+    cassette: Cassette | None = None,
+    api_usage: ApiUsage | None = None,
+) -> GitHubTransport:
+    """Build the shared GitHub transport for the configured middleware."""
+    middleware = []
+    if cassette is not None:
+        middleware.append(CassetteMiddleware(cassette))
+    pool = TokenPool(github_token)
+    if http_cache is not None:
+        # The cache keys responses by token, so pick it before the lookup
+        middleware.append(TokenAssignmentMiddleware(pool))
+        middleware.append(CachingMiddleware(http_cache))
+    if api_usage is not None:
+        middleware.append(ApiUsageMiddleware(api_usage))
+    middleware.append(TokenPoolMiddleware(pool))
+    return GitHubTransport(middleware)
+
+
 class ClaudeFileDiscovery:
     """Orchestrates the discovery and evaluation of new CLAUDE.md files on GitHub."""
 
-    def __init__(self, github_token: str):
+    # Quality threshold for CLAUDE.md candidates (100-point scale)
+    QUALITY_THRESHOLD = 60
+
+    def __init__(
+        self,
+        github_token: str | list[str],
+        http_cache: HTTPCache | None = None,
+        run_state: RunStateStore | None = None,
+        shard_dimensions: list[str] | None = None,
+        blob_store: BlobStore | None = None,
+        workers: int = 4,
+        processes: int = 0,
+        feature_cache: FeatureCache | None = None,
+        cassette: Cassette | None = None,
+        report_timestamp: str | None = None,
+    ):
         self.repo_loader = RepositoryLoader()
-        self.github_searcher = GitHubSearcher(github_token)
-        self.evaluator = RepositoryEvaluator(self.github_searcher)
-        self.issue_generator = IssueGenerator(self.github_searcher)
+        self.http_cache = http_cache
+        self.run_state = run_state
+        # Every GitHub request of the run, by pipeline stage and candidate
+        self.api_usage = ApiUsage()
+        # Stage timings and candidate counters for the run manifest
+        self.manifest = RunManifest("files")
+        self.transport = build_transport(
+            github_token, http_cache, cassette, self.api_usage
+        )
+        self.github_searcher = GitHubSearcher(
+            github_token,
+            transport=self.transport,
+            run_state=run_state,
+            shard_dimensions=shard_dimensions,
+            blob_store=blob_store,
+        )
+        self.evaluator = RepositoryEvaluator(
+            self.github_searcher, feature_cache=feature_cache
+        )
+        self.evaluation_pool = EvaluationPool(workers, processes)
+        self.issue_generator = IssueGenerator(
+            self.github_searcher, timestamp=report_timestamp
+        )
+        # Items a pipeline stage may run ahead of the stage consuming it
+        self.queue_size = 32
 
         # Load existing repositories to avoid duplicates
         self.existing_repos = self.repo_loader.load_existing_repos()
 
+    @traced("discovery")
     def discover_new_repositories(self) -> list[dict[str, Any]]:
-        """Main discovery workflow: search, evaluate, and report on new repositories."""
+        """Main discovery workflow: search, evaluate, and report on new repositories.
+
+        The stages run concurrently and hand work over bounded queues, so
+        evaluation starts with the first enriched candidate and no stage
+        gets more than ``queue_size`` items ahead of the next.
+        """
         logger.info("Starting automated discovery of new CLAUDE.md repositories")
 
         # Search for candidate repositories
-        candidates = self.github_searcher.search_github_repos(self.existing_repos)
+        candidates = stream(
+            self.manifest.timed(
+                self.github_searcher.iter_candidates(self.existing_repos),
+                "search",
+                counter="seen",
+            ),
+            maxsize=self.queue_size,
+            name="search",
+        )
 
-        if not candidates:
-            logger.info("No new candidates found")
-            return []
+        # Evaluate each candidate as it arrives
+        evaluated = stream(
+            self.manifest.timed(
+                self._evaluate_candidates(candidates), "evaluate", counter="scored"
+            ),
+            maxsize=self.queue_size,
+            name="evaluate",
+        )
 
-        # Evaluate each candidate
+        # Remember evaluated blobs so unchanged files are skipped next run
         evaluations = []
-        for candidate in candidates:
-            evaluation = self.evaluator.evaluate_candidate(candidate)
-            if evaluation:
-                evaluations.append(evaluation)
+        for evaluation in evaluated:
+            evaluations.append(evaluation)
+            if self.run_state is not None:
+                self.run_state.record_evaluation(
+                    evaluation["candidate"], evaluation["score"]
+                )
+        if self.run_state is not None:
+            self.run_state.save()
+        self.manifest.count("fetched", self.evaluator.fetched)
+
+        if not evaluations:
+            logger.info("No new candidates found")
+            return []
 
         # Create discovery issue/report
-        if evaluations:
+        with self.manifest.stage("report"):
             self.issue_generator.create_discovery_issue(evaluations)
 
         return evaluations
+
+    def _evaluate_candidates(self, candidates) -> Iterator[dict[str, Any]]:
+        """Yield the evaluation of every candidate that could be evaluated."""
+        if self.evaluation_pool.processes:
+            # Fetch content in threads, score in worker processes with the
+            # evaluator's weights
+            score = partial(
+                evaluate_repository, weights=component_weights(self.evaluator)
+            )
+            for result in self.evaluation_pool.map(
+                candidates,
+                score,
+                prepare=self.evaluator.prepare_candidate,
+            ):
+                if result:
+                    evaluation, profile = result
+                    if profile is not None:
+                        self.evaluator.cache_profile(profile)
+                    yield evaluation
+            return
+        results = self.evaluation_pool.map(
+            candidates, self.evaluator.evaluate_candidate
+        )
+        for evaluation in results:
+            if evaluation:
+                yield evaluation
@@ -0,0 +1,80 @@
+"""Bounded-queue stages for streaming discovery work between threads."""
+
+import contextvars
+import logging
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_END = object()
+
+
+class _Failure:
+    """Carries an exception raised by a stage's source to its consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def stream(source: Iterable[T], maxsize: int = 32, name: str = "stage") -> Iterator[T]:
+    """Run an iterable in a background thread, handing items over a bounded queue.
+
+    The producer blocks once ``maxsize`` items are waiting, so a slow
+    consumer applies backpressure instead of letting items pile up in
+    memory. Exceptions raised by the source are re-raised in the consumer,
+    and closing the returned iterator early stops the producer.
+    """
+    items: queue.Queue = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(source)
+        try:
+            with span(f"pipeline.{name}"):
+                for item in iterator:
+                    if not put(item):
+                        return
+        except BaseException as e:
+            put(_Failure(e))
+            return
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        put(_END)
+
+    # The producer inherits the caller's context, and with it the current span
+    thread = threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(produce,),
+        name=f"discovery-{name}",
+        daemon=True,
+    )
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
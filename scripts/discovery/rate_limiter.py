@@ -0,0 +1,217 @@
+"""Process-wide adaptive rate limiter for GitHub API requests."""
+
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Documented GitHub limits for an authenticated token: (requests, window seconds)
+BUCKET_LIMITS = {
+    "core": (5000, 3600),
+    "search": (30, 60),
+    "code_search": (10, 60),
+    "graphql": (5000, 3600),
+}
+
+
+def bucket_for_url(url: str) -> str:
+    """Return the rate limit bucket a request URL draws from."""
+    path = urlparse(url).path
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/code" in path:
+        return "code_search"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+class TokenBucket:
+    """Token bucket for one GitHub rate limit resource.
+
+    Tokens refill continuously at ``limit / window``. Observed
+    ``X-RateLimit-*`` headers clamp the bucket to what the server reports,
+    and an exhausted quota or ``Retry-After`` blocks the bucket until the
+    server-side reset. Reservations may drive the bucket negative: each caller
+    is told exactly how long to wait for its own slot.
+    """
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.tokens = float(limit)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.reset_epoch = 0.0
+
+    @property
+    def refill_rate(self) -> float:
+        return self.limit / self.window
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.limit, self.tokens + elapsed * self.refill_rate)
+            self.updated_at = now
+
+    def headroom(self, now: float) -> tuple[float, float]:
+        """Return (seconds until a token is usable, tokens available) without taking one."""
+        self._refill(now)
+        delay = max(0.0, (1 - self.tokens) / self.refill_rate)
+        return max(delay, self.blocked_until - now, 0.0), self.tokens
+
+    def reserve(self, now: float) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        self._refill(now)
+        self.tokens -= 1
+        delay = max(0.0, -self.tokens / self.refill_rate)
+        return max(delay, self.blocked_until - now)
+
+    def observe(
+        self,
+        now: float,
+        limit: int | None,
+        remaining: int | None,
+        reset_epoch: float | None,
+        retry_after: float | None = None,
+    ) -> None:
+        """Adapt the bucket to rate limit headers from a response."""
+        self._refill(now)
+        if limit:
+            self.limit = limit
+        if remaining is not None:
+            if reset_epoch and reset_epoch > self.reset_epoch:
+                # A new server-side window started: trust its count
+                self.tokens = float(remaining)
+            else:
+                self.tokens = min(self.tokens, float(remaining))
+            if remaining == 0 and reset_epoch:
+                self.blocked_until = max(
+                    self.blocked_until, now + reset_epoch - time.time() + 1
+                )
+        if reset_epoch:
+            self.reset_epoch = max(self.reset_epoch, reset_epoch)
+        if retry_after is not None:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+
+def _parse_number(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Schedules GitHub requests just-in-time across the separate rate buckets."""
+
+    def __init__(self, max_wait: float = 60.0):
+        # Cap any single wait to avoid workflow timeout
+        self.max_wait = max_wait
+        self.buckets = {
+            name: TokenBucket(limit, window)
+            for name, (limit, window) in BUCKET_LIMITS.items()
+        }
+        self.total_wait = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, bucket: str) -> float:
+        """Reserve a request slot and return the delay before it may be sent."""
+        with self._lock:
+            return self.buckets[bucket].reserve(time.monotonic())
+
+    def headroom(self, bucket: str) -> tuple[float, float]:
+        """Return (seconds until the bucket can serve a request, tokens available)."""
+        with self._lock:
+            return self.buckets[bucket].headroom(time.monotonic())
+
+    def acquire(self, bucket: str) -> float:
+        """Block until a request from the bucket may be sent; return the wait."""
+        delay = min(self.reserve(bucket), self.max_wait)
+        if delay > 0:
+            logger.info(f"Rate limiter: waiting {delay:.1f}s for '{bucket}' quota")
+            time.sleep(delay)
+            with self._lock:
+                self.total_wait += delay
+        return delay
+
+    def observe(self, bucket: str, headers, status_code: int = 200) -> None:
+        """Learn the bucket state from a response's rate limit headers."""
+        resource = headers.get("X-RateLimit-Resource")
+        if resource in self.buckets:
+            bucket = resource
+
+        retry_after = _parse_number(headers.get("Retry-After"))
+        if retry_after is None and status_code in (403, 429):
+            if headers.get("X-RateLimit-Remaining") != "0":
+                # Secondary rate limit without Retry-After: back off a minute
+                retry_after = 60.0
+
+        remaining = _parse_number(headers.get("X-RateLimit-Remaining"))
+        limit = _parse_number(headers.get("X-RateLimit-Limit"))
+        with self._lock:
+            self.buckets[bucket].observe(
+                time.monotonic(),
+                int(limit) if limit else None,
+                int(remaining) if remaining is not None else None,
+                _parse_number(headers.get("X-RateLimit-Reset")),
+                retry_after,
+            )
+
+
+def is_rate_limited(response) -> bool:
+    """Return True if a response was rejected by a primary or secondary limit."""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    return (
+        response.headers.get("X-RateLimit-Remaining") == "0"
+        or "Retry-After" in response.headers
+    )
+
+
+class RateLimitMiddleware:
+    """Transport middleware that draws every request from a RateLimiter."""
+
+    def __init__(self, limiter: RateLimiter, max_retries: int = 2):
+        self.limiter = limiter
+        self.max_retries = max_retries
+
+    def _checkout(self, request, bucket: str) -> RateLimiter:
+        """Return the limiter the request is scheduled against."""
+        return self.limiter
+
+    def handle(self, request, send, **kwargs):
+        """Send a request once its bucket allows it, retrying if rate limited."""
+        bucket = bucket_for_url(request.url or "")
+        waited = 0.0
+        for attempt in range(self.max_retries + 1):
+            limiter = self._checkout(request, bucket)
+            waited += limiter.acquire(bucket)
+            response = send(request, **kwargs)
+            limiter.observe(bucket, response.headers, response.status_code)
+            if not is_rate_limited(response) or attempt == self.max_retries:
+                break
+            logger.warning(
+                f"Rate limited on {request.method} {request.url} "
+                f"(attempt {attempt + 1}), rescheduling"
+            )
+        # Outer middleware can tell waiting and resending apart from latency
+        response.rate_limit_wait = waited
+        response.retries = attempt
+        return response
+
+
+_shared_limiters: dict[str, RateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str = "default") -> RateLimiter:
+    """Return the process-wide limiter for a quota owner (one per token)."""
+    with _shared_limiters_lock:
+        if key not in _shared_limiters:
+            _shared_limiters[key] = RateLimiter()
+        return _shared_limiters[key]
@@ -4,7 +4,9 @@ import logging
 from datetime import datetime
 from typing import Any
 
+from .api_usage import api_stage
 from .reporters.issue_formatter import IssueFormatter
+from .tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +14,13 @@ logger = logging.getLogger(__name__)
 class IssueGenerator:
     """Handles GitHub issue creation and report generation."""
 
-    def __init__(self, github_searcher):
+    def __init__(self, github_searcher, timestamp: str | None = None):
         self.github_searcher = github_searcher
+        # Names the report file; the run's other output files share it
+        self.timestamp = timestamp
         self.issue_formatter = IssueFormatter()
 
+    @traced("report")
     def create_discovery_issue(self, evaluations: list[dict[str, Any]]) -> None:
         """Create a GitHub issue with the discovery results."""
         if not evaluations:
@@ -23,8 +28,9 @@ class IssueGenerator:
             return
 
         # Create issue title and body
-        title = self.issue_formatter.create_issue_title(evaluations)
-        body = self.issue_formatter.create_issue_body(evaluations)
+        with span("report.format", evaluations=len(evaluations)):
+            title = self.issue_formatter.create_issue_title(evaluations)
+            body = self.issue_formatter.create_issue_body(evaluations)
 
         # Validate and truncate body if needed (GitHub limit is 65536 characters)
         body = self._validate_and_truncate_body(body, evaluations)
@@ -34,12 +40,13 @@ class IssueGenerator:
 
         # Create the GitHub issue
         try:
-            repo = self.github_searcher.github.get_repo("josix/awesome-claude-md")
-            issue = repo.create_issue(
-                title=title,
-                body=body,
-                labels=["automation", "discovery", "review-needed"],
-            )
+            with api_stage("report"), span("report.create_issue"):
+                repo = self.github_searcher.github.get_repo("josix/awesome-claude-md")
+                issue = repo.create_issue(
+                    title=title,
+                    body=body,
+                    labels=["automation", "discovery", "review-needed"],
+                )
             logger.info(f"Created GitHub issue #{issue.number}: {title}")
             logger.info(f"Issue URL: {issue.html_url}")
         except Exception as e:
@@ -81,7 +88,7 @@ class IssueGenerator:
 
     def _save_discovery_report(self, title: str, body: str) -> None:
         """Save discovery report to file for review."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self.timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"discovery_report_{timestamp}.md"
 
         try:
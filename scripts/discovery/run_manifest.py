@@ -0,0 +1,246 @@
+"""Machine-readable manifest of a discovery run, and comparison of two runs."""
+
+import contextlib
+import fnmatch
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TypeVar
+
+from scripts.profiling import profile_stage
+
+from .api_usage import ApiUsage
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+T = TypeVar("T")
+
+MANIFEST_VERSION = 1
+
+# Candidate counters every manifest reports, in pipeline order
+CANDIDATE_COUNTERS = ("seen", "fetched", "scored")
+
+# Relative tolerance of a metric; the first matching pattern wins
+DEFAULT_TOLERANCES = {
+    "caches.*.hit_rate": 0.05,
+    "api.*": 0.10,
+    "per_candidate.*": 0.10,
+    "peak_rss_bytes": 0.25,
+    "*": 0.20,
+}
+
+# Changes in seconds smaller than this are timing noise, not regressions
+DEFAULT_MIN_SECONDS = 1.0
+
+
+def peak_rss_bytes() -> int | None:
+    """Return the peak resident set size of this process, if the OS reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def hit_rate(hits: int, misses: int) -> float | None:
+    """Return the fraction of lookups that hit, or None without lookups."""
+    lookups = hits + misses
+    return round(hits / lookups, 4) if lookups else None
+
+
+class RunManifest:
+    """Collects stage timings and counters of one discovery run.
+
+    Stages may run concurrently in different threads; the time of each is
+    its own wall time from first to last item, so the stages of a
+    streaming pipeline add up to more than the run.
+    """
+
+    def __init__(self, pipeline: str):
+        self.pipeline = pipeline
+        self.started_at = datetime.now(UTC)
+        self._started = time.perf_counter()
+        self.stage_seconds: dict[str, float] = {}
+        self.counts: Counter = Counter(dict.fromkeys(CANDIDATE_COUNTERS, 0))
+        self.caches: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add to a candidate counter."""
+        with self._lock:
+            self.counts[name] += n
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to a stage."""
+        started = time.perf_counter()
+        try:
+            with profile_stage(name):
+                yield
+        finally:
+            self._add_seconds(name, time.perf_counter() - started)
+
+    def timed(
+        self, items: Iterable[T], name: str, counter: str | None = None
+    ) -> Iterator[T]:
+        """Yield from an iterable, timing it as a stage and counting its items."""
+        started = time.perf_counter()
+        try:
+            with profile_stage(name):
+                for item in items:
+                    if counter is not None:
+                        self.count(counter)
+                    yield item
+        finally:
+            self._add_seconds(name, time.perf_counter() - started)
+
+    def _add_seconds(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + seconds
+
+    def record_cache(self, name: str, stats: dict) -> None:
+        """Record the hit and miss counters of a cache or store."""
+        with self._lock:
+            self.caches[name] = {
+                "hits": stats["hits"],
+                "misses": stats["misses"],
+                "hit_rate": hit_rate(stats["hits"], stats["misses"]),
+            }
+
+    def to_dict(self, api_usage: ApiUsage | None = None) -> dict:
+        """Return the manifest as plain data."""
+        wall_seconds = time.perf_counter() - self._started
+        with self._lock:
+            seen = self.counts["seen"]
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "pipeline": self.pipeline,
+                "started_at": self.started_at.isoformat(),
+                "wall_seconds": round(wall_seconds, 3),
+                "stage_seconds": {
+                    name: round(seconds, 3)
+                    for name, seconds in sorted(self.stage_seconds.items())
+                },
+                "candidates": dict(self.counts),
+                "caches": dict(self.caches),
+                "api": None,
+                "per_candidate": {
+                    "wall_ms": round(wall_seconds * 1000 / seen, 3) if seen else None,
+                    "api_calls": None,
+                },
+                "peak_rss_bytes": peak_rss_bytes(),
+            }
+        if api_usage is not None:
+            summary = api_usage.summary()
+            manifest["api"] = {
+                **{
+                    key: value
+                    for key, value in summary["total"].items()
+                    if key not in ("candidates", "calls_per_candidate")
+                },
+                "stages": {
+                    stage: usage["calls"] for stage, usage in summary["stages"].items()
+                },
+            }
+            if seen:
+                manifest["per_candidate"]["api_calls"] = round(
+                    summary["total"]["calls"] / seen, 3
+                )
+        return manifest
+
+    def save(self, path: str | Path, api_usage: ApiUsage | None = None) -> None:
+        """Write the manifest to a JSON file."""
+        Path(path).write_text(json.dumps(self.to_dict(api_usage), indent=2) + "\n")
+
+
+@dataclass
+class MetricChange:
+    """The value of one manifest metric in two runs."""
+
+    metric: str
+    baseline: float | None
+    current: float | None
+    tolerance: float
+    regression: bool
+
+    @property
+    def change(self) -> float | None:
+        """Return the relative change from the baseline, or None if undefined."""
+        if self.baseline is None or self.current is None or self.baseline == 0:
+            return None
+        return (self.current - self.baseline) / self.baseline
+
+
+def flatten(manifest: dict, prefix: str = "") -> dict[str, float]:
+    """Return the numeric leaves of a manifest by dotted path."""
+    metrics = {}
+    for key, value in manifest.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, f"{name}."))
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            metrics[name] = value
+    return metrics
+
+
+def tolerance_for(metric: str, tolerances: dict[str, float]) -> float:
+    """Return the tolerance of the first pattern matching a metric."""
+    for pattern, tolerance in tolerances.items():
+        if fnmatch.fnmatchcase(metric, pattern):
+            return tolerance
+    return DEFAULT_TOLERANCES["*"]
+
+
+def _higher_is_better(metric: str) -> bool:
+    return metric.endswith("hit_rate")
+
+
+def _is_informational(metric: str) -> bool:
+    # Counts describe how much a run did, not how well it did it
+    return (
+        metric == "version"
+        or metric.startswith("candidates.")
+        or (metric.startswith("caches.") and not metric.endswith("hit_rate"))
+    )
+
+
+def compare_manifests(
+    baseline: dict,
+    current: dict,
+    tolerances: dict[str, float] | None = None,
+    min_seconds: float = DEFAULT_MIN_SECONDS,
+) -> list[MetricChange]:
+    """Compare every metric of two manifests and flag regressions.
+
+    A metric regresses when it gets worse by more than its relative
+    tolerance: hit rates by falling, everything else by rising. Candidate
+    and cache lookup counts are reported but never flagged, and time
+    metrics must also change by at least ``min_seconds``. ``tolerances`` maps glob patterns
+    over dotted metric names to relative tolerances and takes precedence
+    over the defaults.
+    """
+    tolerances = dict(tolerances or {})
+    for pattern, tolerance in DEFAULT_TOLERANCES.items():
+        tolerances.setdefault(pattern, tolerance)
+    old, new = flatten(baseline), flatten(current)
+    changes = []
+    for metric in sorted(old.keys() | new.keys()):
+        before, after = old.get(metric), new.get(metric)
+        tolerance = tolerance_for(metric, tolerances)
+        regression = False
+        if before is not None and after is not None and not _is_informational(metric):
+            delta = before - after if _higher_is_better(metric) else after - before
+            regression = delta > abs(before) * tolerance
+            if "seconds" in metric and delta < min_seconds:
+                regression = False
+        changes.append(MetricChange(metric, before, after, tolerance, regression))
+    return changes
@@ -0,0 +1,122 @@
+"""Persistent state shared between incremental discovery runs."""
+
+import json
+import logging
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path(".cache") / "discovery" / "run_state.json"
+STATE_VERSION = 2
+
+
+class RunStateStore:
+    """JSON-backed record of what previous discovery runs already processed.
+
+    Two kinds of state are kept:
+
+    - per search query, a cursor holding the newest results seen last time,
+      so later runs stop paging once they reach known territory;
+    - per repository, the search hit (path and blob SHA) it was last found
+      by, so unchanged hits are not enriched and evaluated again, and the
+      blob SHA, score and metadata of the evaluated file, so it can be
+      re-scored offline. The two differ when the search hit was not the
+      file that got evaluated, e.g. when the tree probe picked a nested one.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_STATE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.queries: dict[str, dict] = {}
+        self.repositories: dict[str, dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        """Load state from disk, starting fresh if it is missing or unreadable."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read run state {self.path}: {e}")
+            return
+        if data.get("version") != STATE_VERSION:
+            logger.info("Run state version changed, starting a full scan")
+            return
+        self.queries = data.get("queries", {})
+        self.repositories = data.get("repositories", {})
+        logger.info(
+            f"Loaded run state: {len(self.queries)} query cursors, "
+            f"{len(self.repositories)} evaluated repositories"
+        )
+
+    def save(self) -> None:
+        """Write the state to disk."""
+        with self._lock:
+            data = {
+                "version": STATE_VERSION,
+                "queries": self.queries,
+                "repositories": self.repositories,
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.error(f"Error saving run state to {self.path}: {e}")
+
+    def query_cursor(self, query: str) -> set[str]:
+        """Return the result keys seen at the head of a query on the last run."""
+        with self._lock:
+            return set(self.queries.get(query, {}).get("seen", []))
+
+    def set_query_cursor(self, query: str, keys: list[str]) -> None:
+        """Remember the newest result keys of a query for the next run."""
+        if not keys:
+            return
+        with self._lock:
+            self.queries[query] = {"seen": keys, "updated_at": _now()}
+
+    def is_unchanged(self, full_name: str, path: str, blob_sha: str | None) -> bool:
+        """Return True if this exact search hit was already evaluated."""
+        if not blob_sha:
+            return False
+        with self._lock:
+            entry = self.repositories.get(full_name)
+        return (
+            entry is not None
+            and entry.get("search_path") == path
+            and entry.get("search_sha") == blob_sha
+        )
+
+    def record_evaluation(self, candidate: dict, score: int) -> None:
+        """Record the search hit, blob SHA, score and metadata of a candidate.
+
+        Candidates that did not come from a search hit are keyed by their
+        evaluated file.
+        """
+        path = candidate.get("claude_file_path")
+        blob_sha = candidate.get("claude_file_sha")
+        with self._lock:
+            self.repositories[candidate["full_name"]] = {
+                "search_path": candidate.get("search_path", path),
+                "search_sha": candidate.get("search_sha", blob_sha),
+                "path": path,
+                "blob_sha": blob_sha,
+                "score": score,
+                "evaluated_at": _now(),
+                "candidate": {
+                    key: value
+                    for key, value in candidate.items()
+                    if key != "claude_content"
+                },
+            }
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
@@ -1,58 +1,115 @@
 """GitHub repository searcher for finding CLAUDE.md files."""
 
 import logging
-import time
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
 import requests
 import requests.exceptions
 from github import Github
+from github.Consts import DEFAULT_PER_PAGE
 from github.GithubException import (
     GithubException,
     RateLimitExceededException,
     UnknownObjectException,
 )
 
+from .api_usage import api_stage
+from .blob_store import BlobStore
+from .dedupe import RepositoryDeduplicator
+from .enricher import (
+    GraphQLError,
+    RepositoryEnricher,
+    candidate_from_record,
+    claude_blob,
+    claude_blob_text,
+)
+from .run_state import RunStateStore
+from .sharding import QuerySharder
+from .token_pool import TokenPool, TokenPoolMiddleware, normalize_tokens
+from .tracing import ContextThreadPoolExecutor, span
+from .transport import (
+    GitHubTransport,
+    create_github_client,
+    github_api_url,
+    mount_transport,
+    raw_field,
+)
+from .tree_probe import InstructionFile, find_instruction_files
 from .utils import retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+# Requests a repository costs before evaluation (tree probe or GraphQL slot,
+# topics or blob fetch), used to report what deduplication saved
+ENRICHMENT_CALLS_PER_REPO = 2
+
+
+def search_hit_key(hit) -> str:
+    """Return an identifier for a code search hit that changes with its content."""
+    return f"{hit.repository.full_name}:{hit.path}:{hit.sha}"
+
 
 class GitHubSearcher:
     """Handles GitHub API interactions and repository searching."""
 
-    def __init__(self, github_token: str):
-        self.github = Github(github_token)
+    def __init__(
+        self,
+        github_token: str | list[str],
+        max_workers: int = 4,
+        transport: GitHubTransport | None = None,
+        run_state: RunStateStore | None = None,
+        shard_dimensions: list[str] | None = None,
+        blob_store: BlobStore | None = None,
+    ):
+        # Requests are routed across the token pool and its rate limiters
+        self.tokens = normalize_tokens(github_token)
+        self.transport = transport or GitHubTransport(
+            [TokenPoolMiddleware(TokenPool(self.tokens))]
+        )
+        # Sharded searches enumerate every result page, so use the largest pages
+        self.sharder = QuerySharder(shard_dimensions) if shard_dimensions else None
+        self.per_page = 100 if self.sharder else DEFAULT_PER_PAGE
+        self.api_url = github_api_url()
+        self.github = create_github_client(
+            self.tokens[0], self.transport, self.per_page, self.api_url
+        )
         self.session = requests.Session()
         self.session.headers.update(
             {
-                "Authorization": f"token {github_token}",
+                "Authorization": f"token {self.tokens[0]}",
                 "Accept": "application/vnd.github.v3+json",
             }
         )
+        mount_transport(self.session, self.transport)
+        self.enricher = RepositoryEnricher(self.session, f"{self.api_url}/graphql")
+        # CLAUDE.md contents seen during search, keyed by blob SHA
+        self.blob_store = blob_store if blob_store is not None else BlobStore()
         # Content-first approach - no star minimums
         self.min_file_size = 1000  # Increased for more substantial content
-
-    def _handle_rate_limiting(self, response: requests.Response) -> None:
-        """Handle GitHub API rate limiting adaptively."""
-        # Check rate limit headers
-        remaining = response.headers.get("X-RateLimit-Remaining")
-        reset_time = response.headers.get("X-RateLimit-Reset")
-
-        if remaining and int(remaining) < 10:
-            if reset_time:
-                try:
-                    reset_timestamp = int(reset_time)
-                    current_time = time.time()
-                    # Cap sleep time at 60 seconds to avoid workflow timeout
-                    sleep_time = min(reset_timestamp - current_time + 1, 60)
-                    if sleep_time > 0:
-                        logger.warning(
-                            f"Rate limit low, sleeping for {sleep_time} seconds"
-                        )
-                        time.sleep(sleep_time)
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Could not parse rate limit headers: {e}")
-                    time.sleep(1)  # Default 1 second delay
+        # Search fan-out: every (query, page) pair is fetched by a worker pool
+        self.max_workers = max_workers
+        self.max_pages = 3
+        self._local = threading.local()
+        # Incremental runs: per-query cursors and the evaluated-blob ledger
+        self.run_state = run_state
+        self.cursor_size = 10
+
+    def _thread_client(self) -> Github:
+        """Return the Github client owned by the calling worker thread.
+
+        PyGithub keeps a single connection object per client and stores the
+        pending request on it, so a client must never be shared across threads.
+        """
+        client = getattr(self._local, "github", None)
+        if client is None:
+            client = create_github_client(
+                self.tokens[0], self.transport, self.per_page, self.api_url
+            )
+            self._local.github = client
+        return client
 
     @retry_with_backoff(
         max_retries=3,
@@ -60,72 +117,335 @@ class GitHubSearcher:
     )
     def search_github_repos(self, existing_repos: set[str]) -> list[dict]:
         """Search GitHub for repositories with CLAUDE.md files."""
+        return list(self.iter_candidates(existing_repos))
+
+    def iter_candidates(self, existing_repos: set[str]) -> Iterator[dict]:
+        """Yield candidate repositories as soon as their enrichment batch completes.
+
+        Result pages are handed to deduplication and enrichment as they
+        arrive, in page order within each query, so the first candidates do
+        not wait for the whole search. At most ``max_workers`` batches are
+        enriched ahead of the consumer, so a slow consumer throttles
+        enrichment instead of buffering candidates.
+        """
         logger.info("Starting GitHub repository search...")
 
         search_queries = [
             "filename:CLAUDE.md stars:>100",
             "filename:CLAUDE.md size:>1000",
         ]
+        found = 0
+        # Collapse hits to one per repository across all queries; a page is
+        # only released after the earlier pages of its query, so the first
+        # occurrence wins as if the pages had been read in order
+        deduplicator = RepositoryDeduplicator(existing_repos)
+        heads: dict[str, list] = {}
+        enriching: set[Future] = set()
+
+        with ContextThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            if self.sharder is not None:
+                pages = self._submit_sharded_pages(executor, search_queries)
+            else:
+                pages = {
+                    query: deque([executor.submit(self._fetch_page, query, 0)])
+                    for query in search_queries
+                }
+
+            while enriching or any(pages.values()):
+                for query, pending in pages.items():
+                    while (
+                        pending
+                        and pending[0].done()
+                        and len(enriching) < self.max_workers
+                    ):
+                        page_results = pending.popleft().result()
+                        self._schedule_pages(
+                            executor, query, page_results, pending, query in heads
+                        )
+                        heads.setdefault(query, page_results)
+                        hits = self._select_new_hits(query, [page_results])
+                        hits = deduplicator.filter(hits, lambda hit: hit.repository)
+                        enriching.update(
+                            self._submit_enrichment(executor, hits, existing_repos)
+                        )
 
-        all_candidates = []
+                # Wake up for the next finished batch, or for the next page
+                # while there is room to enrich it
+                waiting = set(enriching)
+                if len(enriching) < self.max_workers:
+                    waiting.update(queued[0] for queued in pages.values() if queued)
+                done, _ = wait(waiting, return_when=FIRST_COMPLETED)
+                for future in done & enriching:
+                    enriching.discard(future)
+                    for candidate in future.result():
+                        found += 1
+                        yield candidate
 
         for query in search_queries:
-            logger.info(f"Searching with query: {query}")
-            candidates = self._search_with_query(query, existing_repos)
-            all_candidates.extend(candidates)
-
-        logger.info(f"Found {len(all_candidates)} candidate repositories")
-        return all_candidates
+            if query in heads:
+                self._advance_cursor(query, [heads[query]])
+        deduplicator.log_summary(ENRICHMENT_CALLS_PER_REPO)
+        logger.info(f"Found {found} candidate repositories")
+
+    def _schedule_pages(
+        self,
+        executor: ThreadPoolExecutor,
+        query: str,
+        page_results: list,
+        pending: deque[Future],
+        seen_first_page: bool,
+    ) -> None:
+        """Queue or drop the remaining pages of a query after one of its pages.
+
+        Results are sorted newest-indexed first, so once a page reaches the
+        previous run's cursor the later pages hold nothing new. Otherwise the
+        first page fans out the remaining pages. Sharded queries have all of
+        their pages queued up front and carry no cursor.
+        """
+        if self.sharder is not None:
+            return
+        if self._reaches_known_results(query, page_results):
+            for future in pending:
+                future.cancel()
+            pending.clear()
+        elif not seen_first_page:
+            pending.extend(
+                executor.submit(self._fetch_page, query, page)
+                for page in range(1, self.max_pages)
+            )
+
+    def _submit_sharded_pages(
+        self, executor: ThreadPoolExecutor, search_queries: list[str]
+    ) -> dict[str, deque[Future]]:
+        """Split every query into shards and queue the fetch of all their pages.
+
+        Each query is split until all of its shards report at most 1,000
+        results, then the remaining pages of all shards are fanned out
+        together. Pages are queued shard by shard in page order.
+        """
+        leaves = self.sharder.expand(executor, self._probe_query, search_queries)
+
+        pages: dict[str, deque[Future]] = {}
+        for query in search_queries:
+            pages[query] = deque()
+            for result in leaves[query]:
+                first_page: Future = Future()
+                first_page.set_result(result.first_page)
+                pages[query].append(first_page)
+                pages[query].extend(
+                    executor.submit(self._fetch_page, result.shard.query, page)
+                    for page in range(1, result.page_count(self.per_page))
+                )
+        return pages
+
+    def _submit_enrichment(
+        self, executor: ThreadPoolExecutor, hits: list, existing_repos: set[str]
+    ) -> list[Future]:
+        """Queue the enrichment of search hits in batches."""
+        batch_size = self.enricher.batch_size
+        return [
+            executor.submit(
+                self._process_search_results,
+                hits[start : start + batch_size],
+                existing_repos,
+            )
+            for start in range(0, len(hits), batch_size)
+        ]
 
-    def _search_with_query(self, query: str, existing_repos: set[str]) -> list[dict]:
-        """Search GitHub with a specific query and return candidates."""
-        candidates = []
+    def _probe_query(self, query: str) -> tuple[int, list]:
+        """Fetch the first page of a query and return (total results, page)."""
+        client = self._thread_client()
 
         try:
-            # Search for repositories using the GitHub API
-            for page in range(1, 4):  # Limit to 3 pages to avoid timeout
-                search_results = self.github.search_code(
+            with api_stage("search"), span("search.page", query=query, page=1):
+                search_results = client.search_code(
                     query=query, sort="indexed", order="desc"
                 )
+                first_page = list(search_results.get_page(0))
+            # get_page records total_count, so this does not send another request
+            return (search_results.totalCount if first_page else 0), first_page
 
-                # Get specific page results
-                page_results = search_results.get_page(
-                    page - 1
-                )  # get_page is 0-indexed
-                page_candidates = self._process_search_results(
-                    page_results, existing_repos
-                )
-                candidates.extend(page_candidates)
+        except RateLimitExceededException:
+            logger.warning(f"Rate limit exceeded while sharding query: {query}")
+        except Exception as e:
+            logger.error(f"Error probing query '{query}': {e}")
 
-                # Add a smaller delay between page requests for faster execution
-                time.sleep(5)
+        return 0, []
+
+    def _fetch_page(self, query: str, page: int) -> list:
+        """Fetch one page of code search results for a query."""
+        client = self._thread_client()
+
+        try:
+            with api_stage("search"), span("search.page", query=query, page=page + 1):
+                search_results = client.search_code(
+                    query=query, sort="indexed", order="desc"
+                )
+                return list(search_results.get_page(page))  # get_page is 0-indexed
 
         except RateLimitExceededException:
-            logger.warning(f"Rate limit exceeded for query: {query}")
-            time.sleep(60)  # Wait a minute before continuing
+            # The shared rate limiter already waited and retried this request
+            logger.warning(f"Rate limit exceeded for query: {query} (page {page + 1})")
         except Exception as e:
-            logger.error(f"Error searching with query '{query}': {e}")
-
-        return candidates
+            logger.error(f"Error searching with query '{query}' (page {page + 1}): {e}")
+
+        return []
+
+    def _reaches_known_results(self, query: str, page_results: list) -> bool:
+        """Return True if a page contains a result from the query's last cursor."""
+        if self.run_state is None:
+            return False
+        cursor = self.run_state.query_cursor(query)
+        return any(search_hit_key(hit) in cursor for hit in page_results)
+
+    def _advance_cursor(self, query: str, pages: list[list]) -> None:
+        """Move a query's cursor to the head of this run's results."""
+        # Sharded results are not ordered by recency, so they carry no cursor
+        if self.run_state is not None and self.sharder is None and pages:
+            self.run_state.set_query_cursor(
+                query, [search_hit_key(hit) for hit in pages[0][: self.cursor_size]]
+            )
+
+    def _select_new_hits(self, query: str, pages: list[list]) -> list:
+        """Return the hits of a query that were not processed on a previous run.
+
+        Results are sorted newest-indexed first, so everything from the first
+        hit of the previous cursor onwards has been seen before. Hits whose
+        CLAUDE.md blob is unchanged since it was last evaluated are dropped.
+        """
+        hits = [hit for page in pages for hit in page]
+        if self.run_state is None:
+            return hits
+
+        cursor = set() if self.sharder else self.run_state.query_cursor(query)
+        new_hits = []
+        for hit in hits:
+            if search_hit_key(hit) in cursor:
+                logger.info(f"Reached results seen on the last run for: {query}")
+                break
+            if self.run_state.is_unchanged(hit.repository.full_name, hit.path, hit.sha):
+                logger.debug(
+                    f"Skipping unchanged CLAUDE.md in {hit.repository.full_name}"
+                )
+                continue
+            new_hits.append(hit)
+        return new_hits
 
     def _process_search_results(
         self, page_results, existing_repos: set[str]
     ) -> list[dict]:
         """Process search results and return valid candidates."""
-        candidates = []
+        # Code search results have a .repository property
+        repos = [code_result.repository for code_result in page_results]
+        records = self._enrich_repositories(
+            [repo for repo in repos if repo.full_name not in existing_repos]
+        )
 
-        for code_result in page_results:
-            # Code search results have a .repository property
-            repo = code_result.repository
-            candidate = self._process_single_repository(repo, existing_repos)
+        candidates = []
+        for hit, repo in zip(page_results, repos, strict=True):
+            record = records.get(raw_field(repo, "node_id"))
+            with (
+                api_stage("repository", repo.full_name),
+                span("search.repository", repository=repo.full_name),
+            ):
+                if record is not None:
+                    candidate = self._process_graphql_record(record, repo)
+                else:
+                    candidate = self._process_single_repository(repo, existing_repos)
             if candidate:
+                # The run state recognises the repository by the hit it came
+                # from, even when the evaluated file is another one
+                candidate["search_path"] = hit.path
+                candidate["search_sha"] = hit.sha
                 candidates.append(candidate)
                 logger.info(
-                    f"Found candidate: {repo.full_name} ({repo.stargazers_count} stars)"
+                    f"Found candidate: {candidate['full_name']} ({candidate['stars']} stars)"
                 )
 
         return candidates
 
+    def _enrich_repositories(self, repos: list) -> dict[str, dict]:
+        """Resolve repository metadata for a search page in batched GraphQL queries.
+
+        Returns an empty mapping on failure so callers fall back to the
+        per-repository REST path.
+        """
+        if not repos:
+            return {}
+        try:
+            with api_stage("enrich"), span("search.enrich", repositories=len(repos)):
+                return self.enricher.fetch_repositories(
+                    [raw_field(repo, "node_id") for repo in repos]
+                )
+        except (
+            GraphQLError,
+            requests.exceptions.RequestException,
+            ValueError,
+            TypeError,
+        ) as e:
+            logger.warning(f"GraphQL enrichment failed, falling back to REST: {e}")
+            return {}
+
+    def _process_graphql_record(self, record: dict, repo=None) -> dict | None:
+        """Validate a GraphQL repository record and return a candidate dict.
+
+        Repositories without a root CLAUDE.md of at least ``min_file_size``
+        bytes are probed for nested CLAUDE.md/AGENTS.md files through their
+        git tree when ``repo`` is given.
+        """
+        full_name = record["nameWithOwner"]
+
+        # Skip archived or forked repositories
+        if record["isArchived"] or record["isFork"]:
+            logger.debug(f"Skipping archived/forked repository: {full_name}")
+            return None
+
+        blob = claude_blob(record)
+        if blob is not None and blob["byteSize"] < self.min_file_size:
+            logger.debug(
+                f"CLAUDE.md file too small in {full_name}: {blob['byteSize']} bytes"
+            )
+            blob = None
+        if blob is None:
+            instruction_file = self._find_claude_file(repo) if repo else None
+            if instruction_file is None:
+                logger.debug(f"No CLAUDE.md file found in {full_name}")
+                return None
+            candidate = candidate_from_record(record, instruction_file.path)
+            candidate["claude_file_sha"] = instruction_file.sha
+            return candidate
+
+        # Keep the content GraphQL already returned for the evaluator
+        text = claude_blob_text(record)
+        if text is not None:
+            self.blob_store.put_text(blob["oid"], text)
+
+        return candidate_from_record(record, "CLAUDE.md")
+
+    def read_blob(self, full_name: str, sha: str) -> str | None:
+        """Return the text of a git blob from the blob store, fetching it if needed.
+
+        A blob missing from the store costs a single raw git blob request.
+        """
+        content = self.blob_store.get_text(sha)
+        if content is not None:
+            return content
+
+        try:
+            with span("search.read_blob", repository=full_name, sha=sha):
+                response = self.session.get(
+                    f"{self.api_url}/repos/{full_name}/git/blobs/{sha}",
+                    headers={"Accept": "application/vnd.github.raw"},
+                    timeout=30,
+                )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not fetch blob {sha} from {full_name}: {e}")
+            return None
+
+        self.blob_store.put(sha, response.content)
+        return self.blob_store.get_text(sha)
+
     def _process_single_repository(self, repo, existing_repos: set[str]) -> dict | None:
         """Process a single repository and return candidate dict if valid."""
         # Skip repos we already have
@@ -140,13 +460,15 @@ class GitHubSearcher:
 
         # No star-based filtering - content quality is evaluated in the evaluator
 
-        # Try to fetch the CLAUDE.md file
-        claude_file_path = self._find_claude_file(repo)
-        if not claude_file_path:
+        # Locate CLAUDE.md (or AGENTS.md) anywhere in the repository
+        instruction_file = self._find_claude_file(repo)
+        if not instruction_file:
             logger.debug(f"No CLAUDE.md file found in {repo.full_name}")
             return None
 
-        return self._create_candidate_dict(repo, claude_file_path)
+        candidate = self._create_candidate_dict(repo, instruction_file.path)
+        candidate["claude_file_sha"] = instruction_file.sha
+        return candidate
 
     def _create_candidate_dict(self, repo, claude_file_path: str) -> dict:
         """Create a candidate dictionary from repository information."""
@@ -158,7 +480,7 @@ class GitHubSearcher:
             "stars": repo.stargazers_count,
             "forks": repo.forks_count,
             "language": repo.language,
-            "topics": repo.get_topics(),
+            "topics": self._fetch_topics(repo),
             "html_url": repo.html_url,
             "created_at": repo.created_at.isoformat(),
             "updated_at": repo.updated_at.isoformat(),
@@ -166,40 +488,36 @@ class GitHubSearcher:
             "organization": repo.organization.login if repo.organization else None,
         }
 
-    @retry_with_backoff(
-        max_retries=3,
-        exceptions=(
-            UnknownObjectException,
-            GithubException,
-            requests.exceptions.HTTPError,
-        ),
-    )
-    def _find_claude_file(self, repo) -> str | None:
-        """Find CLAUDE.md file in repository and validate its size."""
-        possible_paths = ["CLAUDE.md"]
+    def _fetch_topics(self, repo) -> list[str]:
+        """Fetch the topics of a repository."""
+        with api_stage("topics"), span("search.topics"):
+            return repo.get_topics()
 
-        for path in possible_paths:
-            try:
-                file_contents = repo.get_contents(path)
+    def _find_claude_file(self, repo) -> InstructionFile | None:
+        """Find the preferred CLAUDE.md/AGENTS.md in a repository with one tree request.
 
-                # Check file size
-                if file_contents.size < self.min_file_size:
-                    logger.debug(
-                        f"CLAUDE.md file too small in {repo.full_name}: {file_contents.size} bytes"
-                    )
-                    continue
+        The default branch's recursive tree lists every blob with its size
+        and SHA, so all paths are checked and size-validated in memory.
+        """
+        try:
+            with api_stage("tree_probe"), span("search.tree_probe"):
+                tree = repo.get_git_tree("HEAD", recursive=True)
+        except UnknownObjectException:
+            # Empty repository or no default branch
+            return None
+        except (GithubException, requests.exceptions.RequestException) as e:
+            logger.warning(f"Could not fetch git tree of {repo.full_name}: {e}")
+            return None
 
-                return path
+        if tree.raw_data.get("truncated"):
+            logger.debug(f"Git tree of {repo.full_name} is truncated")
 
-            except UnknownObjectException:
-                # File doesn't exist at this path
-                continue
-            except (
-                GithubException,
-                requests.exceptions.HTTPError,
-                requests.exceptions.RequestException,
-            ) as e:
-                logger.warning(f"Could not fetch CLAUDE.md from {repo.full_name}: {e}")
-                continue
+        for instruction_file in find_instruction_files(tree.tree):
+            if instruction_file.size >= self.min_file_size:
+                return instruction_file
+            logger.debug(
+                f"{instruction_file.path} too small in {repo.full_name}: "
+                f"{instruction_file.size} bytes"
+            )
 
         return None
@@ -0,0 +1,229 @@
+"""Query sharding to enumerate search results beyond GitHub's 1,000-result cap."""
+
+import logging
+import math
+import re
+from concurrent.futures import Executor
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+
+logger = logging.getLogger(__name__)
+
+# GitHub returns at most this many results for any single search query
+SEARCH_RESULT_CAP = 1000
+
+# Code search only indexes files smaller than 384 KB
+MAX_INDEXED_FILE_SIZE = 384 * 1024
+
+PUSHED_EPOCH = date(2008, 1, 1)
+
+DEFAULT_LANGUAGES = (
+    "Markdown",
+    "Python",
+    "TypeScript",
+    "JavaScript",
+    "Go",
+    "Rust",
+    "Java",
+    "C#",
+    "C++",
+    "Ruby",
+    "PHP",
+    "Swift",
+    "Kotlin",
+    "Shell",
+)
+
+SHARD_DIMENSIONS = ("size", "pushed", "language")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """A search query narrowed by size, pushed-date and language qualifiers."""
+
+    base: str
+    size: tuple[int, int] | None = None
+    pushed: tuple[date, date] | None = None
+    language: str | None = None
+    excluded_languages: tuple[str, ...] = ()
+
+    @property
+    def query(self) -> str:
+        """Return the search query string for this shard."""
+        parts = [self.base]
+        if self.size is not None:
+            parts.append(f"size:{self.size[0]}..{self.size[1]}")
+        if self.pushed is not None:
+            parts.append(
+                f"pushed:{self.pushed[0].isoformat()}..{self.pushed[1].isoformat()}"
+            )
+        if self.language is not None:
+            parts.append(f"language:{_quote(self.language)}")
+        parts.extend(f"-language:{_quote(lang)}" for lang in self.excluded_languages)
+        return " ".join(parts)
+
+
+@dataclass
+class ShardResult:
+    """A leaf shard with its total result count and already-fetched first page."""
+
+    shard: Shard
+    total_count: int
+    first_page: list
+
+    def page_count(self, per_page: int) -> int:
+        """Return how many result pages the shard spans."""
+        return math.ceil(min(self.total_count, SEARCH_RESULT_CAP) / per_page)
+
+
+def _quote(value: str) -> str:
+    return f'"{value}"' if " " in value else value
+
+
+def parse_range(value: str, parse, lowest, highest, step):
+    """Parse a GitHub range qualifier value (``>N``, ``<=N``, ``N..M``, ``N``)."""
+    if ".." in value:
+        low, high = value.split("..", 1)
+        return (
+            lowest if low == "*" else parse(low),
+            highest if high == "*" else parse(high),
+        )
+    for prefix, bounds in (
+        (">=", lambda v: (v, highest)),
+        ("<=", lambda v: (lowest, v)),
+        (">", lambda v: (v + step, highest)),
+        ("<", lambda v: (lowest, v - step)),
+    ):
+        if value.startswith(prefix):
+            return bounds(parse(value[len(prefix) :]))
+    return parse(value), parse(value)
+
+
+def _take_qualifier(query: str, name: str) -> tuple[str, str | None]:
+    """Remove a ``name:value`` qualifier from a query, returning both parts."""
+    match = re.search(rf"(?:^|\s){name}:(\S+)", query)
+    if not match:
+        return query, None
+    stripped = (query[: match.start()] + query[match.end() :]).strip()
+    return " ".join(stripped.split()), match.group(1)
+
+
+class QuerySharder:
+    """Recursively splits search queries until every shard fits under the cap.
+
+    Shards are split along the configured dimensions in order: ``size``
+    ranges are bisected, ``pushed`` date windows are bisected, and
+    ``language`` partitions a shard into one shard per language plus a
+    remainder that excludes them all. A dimension is only used once the
+    previous ones can no longer be split.
+    """
+
+    def __init__(
+        self,
+        dimensions: tuple[str, ...] | list[str] = ("size",),
+        max_results: int = SEARCH_RESULT_CAP,
+        languages: tuple[str, ...] = DEFAULT_LANGUAGES,
+    ):
+        unknown = set(dimensions) - set(SHARD_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown shard dimensions: {', '.join(sorted(unknown))}")
+        self.dimensions = tuple(dimensions)
+        self.max_results = max_results
+        self.languages = languages
+        self.probes_sent = 0
+
+    def root(self, query: str) -> Shard:
+        """Return the unsplit shard for a query, absorbing its range qualifiers."""
+        base = query
+        size = pushed = None
+        if "size" in self.dimensions:
+            base, value = _take_qualifier(base, "size")
+            size = (0, MAX_INDEXED_FILE_SIZE)
+            if value:
+                size = parse_range(value, int, 0, MAX_INDEXED_FILE_SIZE, 1)
+        if "pushed" in self.dimensions:
+            base, value = _take_qualifier(base, "pushed")
+            pushed = (PUSHED_EPOCH, date.today())
+            if value:
+                pushed = parse_range(
+                    value,
+                    date.fromisoformat,
+                    PUSHED_EPOCH,
+                    date.today(),
+                    timedelta(days=1),
+                )
+        return Shard(base=base, size=size, pushed=pushed)
+
+    def split(self, shard: Shard) -> list[Shard]:
+        """Split a shard along the first dimension that can still be divided."""
+        for dimension in self.dimensions:
+            children = getattr(self, f"_split_{dimension}")(shard)
+            if children:
+                return children
+        return []
+
+    def _split_size(self, shard: Shard) -> list[Shard]:
+        low, high = shard.size
+        if low >= high:
+            return []
+        middle = (low + high) // 2
+        return [
+            replace(shard, size=(low, middle)),
+            replace(shard, size=(middle + 1, high)),
+        ]
+
+    def _split_pushed(self, shard: Shard) -> list[Shard]:
+        start, end = shard.pushed
+        if start >= end:
+            return []
+        middle = start + (end - start) // 2
+        return [
+            replace(shard, pushed=(start, middle)),
+            replace(shard, pushed=(middle + timedelta(days=1), end)),
+        ]
+
+    def _split_language(self, shard: Shard) -> list[Shard]:
+        if shard.language is not None or shard.excluded_languages:
+            return []
+        return [replace(shard, language=lang) for lang in self.languages] + [
+            replace(shard, excluded_languages=tuple(self.languages))
+        ]
+
+    def expand(
+        self, executor: Executor, probe, queries: list[str]
+    ) -> dict[str, list[ShardResult]]:
+        """Split every query into leaf shards that each fit under the cap.
+
+        ``probe(query)`` must return ``(total_count, first_page)``. Each level
+        of the split tree is probed in parallel across all queries, and the
+        first page of every leaf is kept so it does not need fetching again.
+        """
+        leaves: dict[str, list[ShardResult]] = {query: [] for query in queries}
+        frontier = [(query, self.root(query)) for query in queries]
+
+        while frontier:
+            probes = executor.map(lambda item: probe(item[1].query), frontier)
+            next_frontier = []
+            for (query, shard), (total, first_page) in zip(
+                frontier, probes, strict=True
+            ):
+                self.probes_sent += 1
+                if total > self.max_results:
+                    children = self.split(shard)
+                    if children:
+                        next_frontier.extend((query, child) for child in children)
+                        continue
+                    logger.warning(
+                        f"Shard has {total} results but cannot be split further: "
+                        f"{shard.query}"
+                    )
+                if total:
+                    leaves[query].append(ShardResult(shard, total, first_page))
+            frontier = next_frontier
+
+        for query, results in leaves.items():
+            logger.info(
+                f"Sharded '{query}' into {len(results)} shards covering "
+                f"{sum(r.total_count for r in results)} results"
+            )
+        return leaves
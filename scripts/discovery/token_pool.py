@@ -0,0 +1,123 @@
+"""Pool of GitHub tokens with quota-aware request routing."""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections.abc import Iterable
+
+from .rate_limiter import (
+    RateLimiter,
+    RateLimitMiddleware,
+    bucket_for_url,
+    get_rate_limiter,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_tokens(github_token: str | Iterable[str]) -> list[str]:
+    """Return a deduplicated list of tokens from a token or collection of tokens."""
+    tokens = [github_token] if isinstance(github_token, str) else list(github_token)
+    return list(dict.fromkeys(token for token in tokens if token))
+
+
+def tokens_from_env() -> list[str]:
+    """Read GITHUB_TOKEN plus any extra tokens listed in GITHUB_TOKENS."""
+    extra = re.split(r"[\s,]+", os.environ.get("GITHUB_TOKENS", ""))
+    return normalize_tokens([os.environ.get("GITHUB_TOKEN", ""), *extra])
+
+
+def token_fingerprint(token: str) -> str:
+    """Return a stable identifier for a token that is safe to log."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:12]
+
+
+class TokenPool:
+    """Routes each request to the token with the most quota in its bucket.
+
+    Every token draws from its own process-wide RateLimiter. Tokens whose
+    bucket is exhausted stay parked until their reset time, and a request only
+    waits when every token in the pool is parked.
+    """
+
+    def __init__(self, tokens: str | Iterable[str]):
+        self.tokens = normalize_tokens(tokens)
+        if not self.tokens:
+            raise ValueError("TokenPool requires at least one token")
+        self.limiters = {
+            token: get_rate_limiter(token_fingerprint(token)) for token in self.tokens
+        }
+        self.requests_per_token = dict.fromkeys(self.tokens, 0)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def limiter_for(self, token: str) -> RateLimiter:
+        """Return the limiter tracking a token's quota."""
+        return self.limiters[token]
+
+    def select(self, bucket: str) -> str:
+        """Pick the token that can serve a request from the bucket soonest."""
+        with self._lock:
+            best = min(
+                self.tokens,
+                key=lambda token: self._priority(token, bucket),
+            )
+            self.requests_per_token[best] += 1
+        return best
+
+    def _priority(self, token: str, bucket: str) -> tuple[float, float]:
+        """Sort key: shortest wait first, then the most remaining quota."""
+        wait, available = self.limiters[token].headroom(bucket)
+        return wait, -available
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of requests routed to each token (by fingerprint)."""
+        with self._lock:
+            return {
+                token_fingerprint(token): count
+                for token, count in self.requests_per_token.items()
+            }
+
+
+class TokenPoolMiddleware(RateLimitMiddleware):
+    """Rate limit middleware that authenticates each request from a TokenPool."""
+
+    def __init__(self, pool: TokenPool, max_retries: int = 2):
+        super().__init__(pool.limiter_for(pool.tokens[0]), max_retries)
+        self.pool = pool
+
+    def _checkout(self, request, bucket: str) -> RateLimiter:
+        """Assign the best token to the request and return its limiter.
+
+        A token assigned by an outer TokenAssignmentMiddleware is kept for
+        the first attempt; a rate limited request is rerouted on retry.
+        """
+        token = getattr(request, "pool_token", None)
+        if token is None:
+            token = self.pool.select(bucket)
+        else:
+            request.pool_token = None
+        request.headers["Authorization"] = f"token {token}"
+        return self.pool.limiter_for(token)
+
+
+class TokenAssignmentMiddleware:
+    """Chooses a request's token before outer layers, such as the cache, see it.
+
+    The HTTP cache keys responses by the credential they were fetched with,
+    so the token must be on the request before the cache lookup.
+    """
+
+    def __init__(self, pool: TokenPool):
+        self.pool = pool
+
+    def handle(self, request, send, **kwargs):
+        """Assign a token from the pool, then pass the request on."""
+        token = self.pool.select(bucket_for_url(request.url or ""))
+        request.pool_token = token
+        request.headers["Authorization"] = f"token {token}"
+        return send(request, **kwargs)
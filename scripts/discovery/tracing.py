@@ -0,0 +1,216 @@
+"""In-process tracing spans exported in the Chrome trace-event format.
+
+Spans nest through a context variable, so a span opened while another is
+current becomes its child. Work handed to a ``ContextThreadPoolExecutor``
+runs in a copy of the submitting context, so spans opened by pool threads
+are children of the span that submitted them. Without an active
+``Tracer``, ``span`` does nothing beyond yielding a placeholder.
+
+The exported JSON loads in chrome://tracing, Perfetto or speedscope.
+"""
+
+import contextlib
+import contextvars
+import functools
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Finished spans kept per trace; later ones are counted as dropped
+MAX_SPANS = 1_000_000
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "current_span", default=None
+)
+_active: "Tracer | None" = None
+_span_ids = itertools.count(1)
+
+
+@dataclass
+class Span:
+    """A named, timed operation with attributes.
+
+    Timestamps are ``time.monotonic_ns()`` values; ``end`` is None while
+    the span is open.
+    """
+
+    name: str
+    span_id: int
+    parent_id: int | None
+    start: int
+    thread_id: int
+    thread_name: str
+    attributes: dict[str, Any] = field(default_factory=dict)
+    end: int | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> int | None:
+        """Return the span's duration in nanoseconds, or None while open."""
+        return None if self.end is None else self.end - self.start
+
+
+class _NoopSpan:
+    """Stands in for a span when no tracer is active."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes) -> Iterator[Span | _NoopSpan]:
+    """Trace the block as a span, a child of the current span if there is one.
+
+    The span must be closed in the context that opened it, so it should
+    not be held open across a generator's ``yield``.
+    """
+    tracer = _active
+    if tracer is None:
+        yield _NOOP_SPAN
+        return
+    parent = _current_span.get()
+    thread = threading.current_thread()
+    current = Span(
+        name=name,
+        span_id=next(_span_ids),
+        parent_id=parent.span_id if parent is not None else None,
+        start=time.monotonic_ns(),
+        thread_id=thread.ident or 0,
+        thread_name=thread.name,
+        attributes=attributes,
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.set_attribute("error", type(e).__name__)
+        raise
+    finally:
+        current.end = time.monotonic_ns()
+        _current_span.reset(token)
+        tracer.record(current)
+
+
+def traced(name: str) -> Callable:
+    """Decorate a function so every call is traced as a span."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_span() -> Span | None:
+    """Return the innermost open span of the current context."""
+    return _current_span.get()
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """A thread pool that runs every task in a copy of the submitter's context.
+
+    Open spans and other context variables, such as the API usage stage,
+    carry over from the submitting thread into the task.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class Tracer:
+    """Collects the spans of a run while active and saves them as a trace."""
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self.max_spans = max_spans
+        self.spans: list[Span] = []
+        self.dropped = 0
+        self.origin = time.monotonic_ns()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Tracer":
+        global _active
+        if _active is not None:
+            raise RuntimeError("A tracer is already active")
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _active
+        _active = None
+
+    def record(self, finished: Span) -> None:
+        """Keep a finished span."""
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(finished)
+            else:
+                self.dropped += 1
+
+    def trace_events(self) -> list[dict]:
+        """Return the spans as Chrome trace events, with thread name metadata."""
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        events = []
+        threads = {}
+        for finished in spans:
+            threads.setdefault(finished.thread_id, finished.thread_name)
+            events.append(
+                {
+                    "name": finished.name,
+                    "cat": finished.name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": (finished.start - self.origin) / 1000,
+                    "dur": finished.duration / 1000,
+                    "pid": pid,
+                    "tid": finished.thread_id,
+                    "args": {
+                        **finished.attributes,
+                        "span_id": finished.span_id,
+                        "parent_id": finished.parent_id,
+                    },
+                }
+            )
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread_id,
+                "args": {"name": name},
+            }
+            for thread_id, name in threads.items()
+        ]
+        return metadata + events
+
+    def save(self, path: str | Path) -> None:
+        """Write the trace as a Chrome trace-event JSON file."""
+        trace = {
+            "traceEvents": self.trace_events(),
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_spans": self.dropped},
+        }
+        Path(path).write_text(json.dumps(trace, default=str) + "\n")
+        logger.info(f"Trace of {len(self.spans)} spans saved to {path}")
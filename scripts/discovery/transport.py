@@ -0,0 +1,120 @@
+"""Shared HTTP transport for all GitHub API traffic in the discovery system."""
+
+import functools
+import logging
+import os
+
+import requests
+from github import Github
+from github.Consts import DEFAULT_PER_PAGE
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GITHUB_API_URL = "https://api.github.com"
+
+
+def github_api_url() -> str:
+    """Return the base URL of the GitHub API, overridable with GITHUB_API_URL.
+
+    Pointing it at another server, such as the fake GitHub API used for
+    load benchmarks, sends a run's REST and GraphQL traffic there.
+    """
+    return os.environ.get("GITHUB_API_URL", "").rstrip("/") or DEFAULT_GITHUB_API_URL
+
+
+class GitHubTransport(HTTPAdapter):
+    """requests adapter that passes every request through a middleware chain.
+
+    Each middleware exposes ``handle(request, send, **kwargs)`` and must either
+    return a response itself or delegate to ``send``. The first middleware in
+    the list sees the request first; the last one sits next to the network.
+    """
+
+    def __init__(self, middleware=None, **kwargs):
+        super().__init__(**kwargs)
+        self.middleware = list(middleware or [])
+
+    def send(self, request, **kwargs):
+        """Send a prepared request through the middleware chain."""
+        send = super().send
+        for layer in reversed(self.middleware):
+            send = functools.partial(layer.handle, send=send)
+        return send(request, **kwargs)
+
+
+def attach_transport(github: Github, transport: GitHubTransport) -> Github:
+    """Route all requests made by a PyGithub client through the transport.
+
+    PyGithub creates its own ``requests.Session`` per connection, so the
+    transport is mounted on every connection the client's requester creates.
+    """
+    requester = github._Github__requester  # type: ignore[attr-defined]
+    connection_class = requester._Requester__connectionClass
+
+    def connection_factory(*args, **kwargs):
+        connection = connection_class(*args, **kwargs)
+        connection.session.mount(f"{connection.protocol}://", transport)
+        return connection
+
+    requester._Requester__connectionClass = connection_factory
+    return github
+
+
+def mount_transport(session: requests.Session, transport: GitHubTransport) -> None:
+    """Route all requests of a session through the transport.
+
+    Plain HTTP is included for stand-in API servers running locally.
+    """
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, transport)
+
+
+def create_github_client(
+    github_token: str,
+    transport: GitHubTransport | None = None,
+    per_page: int = DEFAULT_PER_PAGE,
+    base_url: str | None = None,
+) -> Github:
+    """Create a PyGithub client, optionally routed through a shared transport."""
+    github = Github(
+        github_token, base_url=base_url or github_api_url(), per_page=per_page
+    )
+    if transport is not None:
+        attach_transport(github, transport)
+    return github
+
+
+def raw_field(github_object, name: str, complete: bool = True):
+    """Return a field of a PyGithub object as the API sent it.
+
+    PyGithub 1.59 models no attribute for some fields, such as the
+    ``node_id`` and ``license`` of repositories, and reading ``raw_data``
+    would first complete the object with another request. The JSON the
+    object was built from is read instead. A field missing from it is read
+    from the attribute, unless ``complete`` is False, since that may
+    complete the object with a request too; None is returned then.
+    """
+    raw = getattr(github_object, "_rawData", None)
+    if isinstance(raw, dict) and name in raw:
+        return raw[name]
+    return getattr(github_object, name, None) if complete else None
+
+
+def build_response(
+    request: requests.PreparedRequest,
+    status_code: int,
+    headers: dict[str, str],
+    body: bytes,
+) -> requests.Response:
+    """Build a ``requests.Response`` for a request answered without the network."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url or ""
+    response.request = request
+    return response
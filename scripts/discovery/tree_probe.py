@@ -0,0 +1,51 @@
+"""Locating agent instruction files in a repository's git tree."""
+
+import posixpath
+from dataclasses import dataclass
+
+# Instruction file names, in order of preference
+INSTRUCTION_FILENAMES = ("CLAUDE.md", "AGENTS.md")
+
+# Directories where an instruction file applies to the whole repository
+ROOT_DIRECTORIES = ("", ".claude")
+
+
+@dataclass(frozen=True)
+class InstructionFile:
+    """A CLAUDE.md or AGENTS.md blob found in a repository tree."""
+
+    path: str
+    size: int
+    sha: str
+
+
+def instruction_file_rank(instruction_file: InstructionFile) -> tuple:
+    """Sort key preferring CLAUDE.md over AGENTS.md and shallow over nested paths."""
+    directory, name = posixpath.split(instruction_file.path)
+    filenames = [filename.lower() for filename in INSTRUCTION_FILENAMES]
+    if directory in ROOT_DIRECTORIES:
+        location = ROOT_DIRECTORIES.index(directory)
+    else:
+        location = len(ROOT_DIRECTORIES)
+    return (
+        filenames.index(name.lower()),
+        location,
+        instruction_file.path.count("/"),
+        instruction_file.path,
+    )
+
+
+def find_instruction_files(tree_elements) -> list[InstructionFile]:
+    """Pick every CLAUDE.md/AGENTS.md blob out of a recursive git tree listing.
+
+    Names are matched case-insensitively at any depth. The result is sorted
+    by ``instruction_file_rank``, so the most representative file comes first.
+    """
+    filenames = {filename.lower() for filename in INSTRUCTION_FILENAMES}
+    files = [
+        InstructionFile(element.path, element.size or 0, element.sha)
+        for element in tree_elements
+        if element.type == "blob"
+        and posixpath.basename(element.path).lower() in filenames
+    ]
+    return sorted(files, key=instruction_file_rank)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Score a local corpus of CLAUDE.md files without the GitHub API.
+
+The corpus is a directory tree or a tarball. Each CLAUDE.md may have a
+sidecar ``CLAUDE.md.json`` next to it holding the repository metadata the
+evaluator uses (``full_name``, ``stars``, ``description``, ``topics``,
+``updated_at``, ...); missing fields are derived from the file's path and
+modification time. Files are scored in a process pool and results are
+written as JSON lines in corpus order while scoring continues.
+"""
+
+import argparse
+import fnmatch
+import json
+import logging
+import os
+import sys
+import tarfile
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path, PurePosixPath
+
+from scripts.discovery.evaluation_pool import EvaluationPool
+from scripts.discovery.evaluator import evaluate_repository
+from scripts.discovery.utils import setup_logging
+
+logger = setup_logging()
+
+SIDECAR_SUFFIX = ".json"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(
+        description="Score a directory or tarball of CLAUDE.md files offline."
+    )
+    parser.add_argument("corpus", help="Directory or tarball containing the files")
+    parser.add_argument(
+        "--pattern",
+        default="CLAUDE.md",
+        help="File name pattern of the documents to score (default: CLAUDE.md)",
+    )
+    parser.add_argument(
+        "--output",
+        help="Write JSON lines to this file instead of standard output",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of scoring processes (default: CPU count, 0 scores in threads)",
+    )
+    return parser.parse_args(argv)
+
+
+def default_candidate(path: PurePosixPath, mtime: float) -> dict:
+    """Return the metadata of a document without a sidecar, derived from its path.
+
+    The directory holding the file stands in for the repository name;
+    files at the corpus root are named after the corpus itself.
+    """
+    parts = path.parent.parts
+    owner = parts[-2] if len(parts) >= 2 else "local"
+    name = parts[-1] if parts else "corpus"
+    return {
+        "full_name": f"{owner}/{name}",
+        "name": name,
+        "owner": owner,
+        "stars": 0,
+        "description": "",
+        "topics": [],
+        "language": None,
+        "organization": None,
+        "html_url": f"https://github.com/{owner}/{name}",
+        "updated_at": datetime.fromtimestamp(mtime, UTC).isoformat(),
+        "claude_file_path": path.name,
+    }
+
+
+def _candidate(path: PurePosixPath, mtime: float, sidecar: bytes | None) -> dict:
+    candidate = default_candidate(path, mtime)
+    if sidecar is not None:
+        try:
+            candidate.update(json.loads(sidecar))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable metadata for {path}: {e}")
+    return candidate
+
+
+def iter_directory(root: Path, pattern: str) -> Iterator[tuple[str, dict, str]]:
+    """Yield the path, metadata and content of every matching file in a tree."""
+    for path in sorted(root.rglob(pattern)):
+        if not path.is_file():
+            continue
+        sidecar = path.with_name(path.name + SIDECAR_SUFFIX)
+        relative = PurePosixPath(path.relative_to(root).as_posix())
+        candidate = _candidate(
+            relative,
+            path.stat().st_mtime,
+            sidecar.read_bytes() if sidecar.is_file() else None,
+        )
+        yield (
+            str(relative),
+            candidate,
+            path.read_text(encoding="utf-8", errors="replace"),
+        )
+
+
+def iter_tarball(path: Path, pattern: str) -> Iterator[tuple[str, dict, str]]:
+    """Yield the path, metadata and content of every matching tarball member."""
+    with tarfile.open(path) as archive:
+        members = {
+            member.name: member for member in archive.getmembers() if member.isfile()
+        }
+        for name in sorted(members):
+            member_path = PurePosixPath(name)
+            if not fnmatch.fnmatch(member_path.name, pattern):
+                continue
+            sidecar = members.get(name + SIDECAR_SUFFIX)
+            candidate = _candidate(
+                member_path,
+                members[name].mtime,
+                _read_member(archive, sidecar) if sidecar else None,
+            )
+            content = _read_member(archive, members[name]) or b""
+            yield name, candidate, content.decode("utf-8", errors="replace")
+
+
+def _read_member(archive: tarfile.TarFile, member: tarfile.TarInfo) -> bytes | None:
+    file = archive.extractfile(member)
+    return file.read() if file is not None else None
+
+
+def iter_corpus(corpus: str | Path, pattern: str) -> Iterator[tuple[str, dict, str]]:
+    """Yield the documents of a directory or tarball corpus in path order."""
+    corpus = Path(corpus)
+    if corpus.is_dir():
+        return iter_directory(corpus, pattern)
+    return iter_tarball(corpus, pattern)
+
+
+def evaluate_corpus(documents, processes: int = 0) -> Iterator[tuple[str, dict | None]]:
+    """Score (path, candidate, content) documents, yielding results in order.
+
+    Documents are read lazily as scoring proceeds; a document that fails
+    to score yields None.
+    """
+    documents = iter(documents)
+    paths: list[str] = []
+
+    def items():
+        for path, candidate, content in documents:
+            paths.append(path)
+            yield candidate, content
+
+    pool = EvaluationPool(workers=max(processes, 1) * 2, processes=processes)
+    results = pool.map(items(), evaluate_repository, prepare=lambda item: item)
+    for index, result in enumerate(results):
+        yield paths[index], result[0] if result else None
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+    if not os.path.isdir(args.corpus) and not (
+        os.path.isfile(args.corpus) and tarfile.is_tarfile(args.corpus)
+    ):
+        logger.error(f"Error: {args.corpus!r} is not a directory or tarball")
+        return 1
+
+    # One log line per scored document would drown the summary
+    logging.getLogger("scripts.discovery.evaluator").setLevel(logging.WARNING)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    started = time.perf_counter()
+    scored = 0
+    failed = 0
+    try:
+        for path, evaluation in evaluate_corpus(
+            iter_corpus(args.corpus, args.pattern), args.processes
+        ):
+            if evaluation is None:
+                failed += 1
+                continue
+            scored += 1
+            record = {
+                "path": path,
+                "full_name": evaluation["candidate"]["full_name"],
+                "score": evaluation["score"],
+                "suggested_category": evaluation["suggested_category"],
+                "claude_content_length": evaluation["claude_content_length"],
+                "reasons": evaluation["reasons"],
+            }
+            output.write(json.dumps(record) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    rate = scored / elapsed if elapsed > 0 else 0.0
+    logger.info(
+        f"Scored {scored} documents in {elapsed:.2f}s ({rate:.1f} docs/sec), "
+        f"{failed} failed"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,56 +1,55 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
 import json
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from scripts.markdown_document import MarkdownDocument, parse_document
+from scripts.profiling import Profiler, add_profile_arguments, profile_stage
+
+
+def section_bullets(document: MarkdownDocument, title_pattern: str) -> list[str]:
+    """Return the bullets listed right below the first heading matching a pattern."""
+    heading = document.find_heading(title_pattern)
+    if heading is None:
+        return []
+    return [bullet.text for bullet in document.bullets_after(heading)]
+
 
 def extract_takeaways(content: str) -> list[str]:
     """
-    Auto-extract takeaways using regex patterns.
+    Auto-extract takeaways from the document's sections.
 
     Priority:
     1. Look for "## Takeaways" or "## Key Takeaways" section
     2. Extract bullet points (- or *)
     3. Fallback: Extract first 3 bullets from "## Key Features" or "## Why"
     """
-    takeaways: list[str] = []
+    document = parse_document(content)
 
     # Pattern 1: Explicit takeaways section
     takeaway_patterns = [
-        r"##\s*(?:Key\s+)?Takeaways?\s*\n((?:[-*]\s+.+\n?)+)",
-        r"##\s*(?:Key\s+)?Insights?\s*\n((?:[-*]\s+.+\n?)+)",
-        r"##\s*What\s+(?:Makes|Sets).+\n((?:[-*]\s+.+\n?)+)",
+        r"(?:Key\s+)?Takeaways?",
+        r"(?:Key\s+)?Insights?",
+        r"What\s+(?:Makes|Sets).+",
     ]
 
     for pattern in takeaway_patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            bullets = re.findall(r"[-*]\s+(.+)", match.group(1))
-            takeaways.extend([b.strip() for b in bullets[:5]])
-            if takeaways:
-                return takeaways
-
-    # Pattern 2: Key Features section (fallback)
-    features_pattern = r"##\s*(?:Key\s+)?Features?\s*\n((?:[-*]\s+.+\n?)+)"
-    match = re.search(features_pattern, content, re.IGNORECASE)
-    if match:
-        bullets = re.findall(r"[-*]\s+(.+)", match.group(1))
-        takeaways.extend([b.strip() for b in bullets[:3]])
+        takeaways = section_bullets(document, pattern)[:5]
         if takeaways:
             return takeaways
 
-    # Pattern 3: Why section
-    why_pattern = r"##\s*Why.+\n((?:[-*]\s+.+\n?)+)"
-    match = re.search(why_pattern, content, re.IGNORECASE)
-    if match:
-        bullets = re.findall(r"[-*]\s+(.+)", match.group(1))
-        takeaways.extend([b.strip() for b in bullets[:3]])
+    # Pattern 2: Key Features section (fallback)
+    takeaways = section_bullets(document, r"(?:Key\s+)?Features?")[:3]
+    if takeaways:
+        return takeaways
 
-    return takeaways
+    # Pattern 3: Why section
+    return section_bullets(document, r"Why.+")[:3]
 
 
 def extract_languages(content: str) -> list[str]:
@@ -118,11 +117,9 @@ def extract_languages(content: str) -> list[str]:
                     languages.add(lang_map[word])
 
     # Method 2: Code block language hints
-    code_blocks = re.findall(r"```(\w+)", content)
-    for lang in code_blocks:
-        lang_lower = lang.lower()
-        if lang_lower in lang_map:
-            languages.add(lang_map[lang_lower])
+    for block in parse_document(content).code_blocks:
+        if block.language in lang_map:
+            languages.add(lang_map[block.language])
 
     # Method 3: File extension mentions
     extensions = re.findall(r"\.([a-z]{1,4})\b", content.lower())
@@ -147,24 +144,21 @@ def extract_languages(content: str) -> list[str]:
 
 def extract_key_features(content: str) -> list[str]:
     """Extract key features from the analysis."""
-    features: list[str] = []
+    document = parse_document(content)
 
     # Look for sections that indicate features
     section_patterns = [
-        r"##\s*(?:Key\s+)?Features?\s*\n((?:[-*]\s+.+\n?)+)",
-        r"##\s*Highlights?\s*\n((?:[-*]\s+.+\n?)+)",
-        r"##\s*What.+Covers?\s*\n((?:[-*]\s+.+\n?)+)",
+        r"(?:Key\s+)?Features?",
+        r"Highlights?",
+        r"What.+Covers?",
     ]
 
     for pattern in section_patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            bullets = re.findall(r"[-*]\s+(.+)", match.group(1))
-            features.extend([b.strip() for b in bullets[:5]])
-            if features:
-                return features
+        features = section_bullets(document, pattern)[:5]
+        if features:
+            return features
 
-    return features
+    return []
 
 
 def extract_source_url(content: str, owner: str, repo: str) -> str:
@@ -182,9 +176,8 @@ def extract_source_url(content: str, owner: str, repo: str) -> str:
 def extract_title(content: str, repo: str) -> str:
     """Extract title from content or use repo name."""
     # Try to find H1 heading
-    h1_match = re.search(r"^#\s+(.+)", content, re.MULTILINE)
-    if h1_match:
-        title = h1_match.group(1).strip()
+    title = parse_document(content).title
+    if title:
         # Clean up markdown links
         title = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", title)
         return title
@@ -239,8 +232,8 @@ def process_scenario(scenario_path: Path) -> dict[str, Any] | None:
     }
 
 
-def main() -> None:
-    """Main extraction function."""
+def extract() -> None:
+    """Extract every scenario into docs/public/scenarios.json."""
     # Find project root (where scenarios/ is located)
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
@@ -254,22 +247,23 @@ def main() -> None:
     categories: set[str] = set()
     all_languages: set[str] = set()
 
-    # Walk through all category directories
-    for category_dir in sorted(scenarios_dir.iterdir()):
-        if not category_dir.is_dir() or category_dir.name.startswith("."):
-            continue
+    with profile_stage("scan"):
+        # Walk through all category directories
+        for category_dir in sorted(scenarios_dir.iterdir()):
+            if not category_dir.is_dir() or category_dir.name.startswith("."):
+                continue
 
-        categories.add(category_dir.name)
+            categories.add(category_dir.name)
 
-        # Process each scenario in the category
-        for scenario_dir in sorted(category_dir.iterdir()):
-            if not scenario_dir.is_dir() or scenario_dir.name.startswith("."):
-                continue
+            # Process each scenario in the category
+            for scenario_dir in sorted(category_dir.iterdir()):
+                if not scenario_dir.is_dir() or scenario_dir.name.startswith("."):
+                    continue
 
-            scenario = process_scenario(scenario_dir)
-            if scenario:
-                scenarios.append(scenario)
-                all_languages.update(scenario.get("languages", []))
+                scenario = process_scenario(scenario_dir)
+                if scenario:
+                    scenarios.append(scenario)
+                    all_languages.update(scenario.get("languages", []))
 
     # Sort scenarios by category, then by title
     scenarios.sort(key=lambda s: (s["category"], s["title"].lower()))
@@ -287,7 +281,7 @@ def main() -> None:
     output_path = project_root / "docs" / "public" / "scenarios.json"
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
+    with profile_stage("write"), open(output_path, "w", encoding="utf-8") as f:
         json.dump(output, f, indent=2, ensure_ascii=False)
 
     print(f"Extracted {len(scenarios)} scenarios across {len(categories)} categories")
@@ -295,5 +289,21 @@ def main() -> None:
     print(f"Output written to: {output_path}")
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(
+        description="Extract scenario metadata for the documentation site."
+    )
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Main extraction function."""
+    args = parse_args(argv)
+    with Profiler("extract_scenarios", args.profile, args.profile_dir):
+        extract()
+
+
 if __name__ == "__main__":
     main()
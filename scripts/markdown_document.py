@@ -0,0 +1,209 @@
+"""Lightweight markdown document model shared by scoring and extraction."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+HEADING_PATTERN = re.compile(r"\s*(#{1,6})(?:\s+(.*?))?\s*$")
+FENCE_PATTERN = re.compile(r"\s*(`{3,}|~{3,})\s*([^\s`]*)")
+BULLET_PATTERN = re.compile(r"(\s*)([-*+])\s+(.+)")
+LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)\s]+)[^)]*\)")
+WORD_PATTERN = re.compile(r"\w+(?:['-]\w+)*")
+
+# Parsed documents kept per process, keyed by a hash of their content
+CACHE_SIZE = 256
+
+
+@dataclass
+class Heading:
+    """A heading and the headings nested under it."""
+
+    level: int
+    title: str
+    line: int
+    children: list[Heading] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class CodeBlock:
+    """A fenced code block; ``language`` is the info string's first word."""
+
+    language: str
+    text: str
+    line: int
+
+
+@dataclass(frozen=True)
+class Bullet:
+    """A bullet list item and the column its marker starts at."""
+
+    text: str
+    marker: str
+    indent: int
+    line: int
+
+
+@dataclass(frozen=True)
+class Link:
+    """An inline ``[text](url)`` link."""
+
+    text: str
+    url: str
+    line: int
+
+
+@dataclass
+class MarkdownDocument:
+    """Structure of a markdown document, found in a single pass over its lines.
+
+    Headings, bullets and links inside fenced code blocks are ignored, and
+    so are the code block's lines when counting words. Markup characters
+    such as ``#`` and list markers are not words.
+    """
+
+    headings: list[Heading] = field(default_factory=list)
+    outline: list[Heading] = field(default_factory=list)
+    code_blocks: list[CodeBlock] = field(default_factory=list)
+    bullets: list[Bullet] = field(default_factory=list)
+    links: list[Link] = field(default_factory=list)
+    word_count: int = 0
+
+    @property
+    def title(self) -> str | None:
+        """Return the first top-level heading, if there is one."""
+        return next((h.title for h in self.headings if h.level == 1), None)
+
+    def section_count(self, min_level: int = 2) -> int:
+        """Count headings at ``min_level`` or deeper."""
+        return sum(1 for heading in self.headings if heading.level >= min_level)
+
+    def has_heading(self, prefixes, min_level: int = 2) -> bool:
+        """Return True if a heading's title starts with any of the prefixes.
+
+        Titles are compared lowercased, so prefixes should be lowercase.
+        """
+        prefixes = tuple(prefixes)
+        return any(
+            heading.level >= min_level and heading.title.lower().startswith(prefixes)
+            for heading in self.headings
+        )
+
+    def find_heading(self, pattern: str, min_level: int = 2) -> Heading | None:
+        """Return the first heading whose whole title matches a regex."""
+        title_pattern = re.compile(pattern, re.IGNORECASE)
+        for heading in self.headings:
+            if heading.level >= min_level and title_pattern.fullmatch(heading.title):
+                return heading
+        return None
+
+    def bullets_after(self, heading: Heading) -> list[Bullet]:
+        """Return the unindented bullets on the lines right below a heading."""
+        by_line = {bullet.line: bullet for bullet in self.bullets}
+        found = []
+        line = heading.line + 1
+        while (bullet := by_line.get(line)) is not None and bullet.indent == 0:
+            found.append(bullet)
+            line += 1
+        return found
+
+
+def parse_markdown(content: str) -> MarkdownDocument:
+    """Tokenize markdown content into a document in one pass over its lines."""
+    document = MarkdownDocument()
+    # Open headings from the outermost to the most recent
+    open_headings: list[Heading] = []
+    fence = None
+    fence_language = ""
+    fence_start = 0
+    fence_lines: list[str] = []
+
+    for number, line in enumerate(content.splitlines()):
+        fence_match = FENCE_PATTERN.match(line)
+        if fence is not None:
+            if (
+                fence_match
+                and not fence_match.group(2)
+                and fence_match.group(1).startswith(fence)
+            ):
+                document.code_blocks.append(
+                    CodeBlock(fence_language, "\n".join(fence_lines), fence_start)
+                )
+                fence = None
+            else:
+                fence_lines.append(line)
+            continue
+        if fence_match:
+            fence = fence_match.group(1)
+            fence_language = fence_match.group(2).lower()
+            fence_start = number
+            fence_lines = []
+            continue
+
+        document.word_count += len(WORD_PATTERN.findall(line))
+        for link in LINK_PATTERN.finditer(line):
+            document.links.append(Link(link.group(1), link.group(2), number))
+
+        heading_match = HEADING_PATTERN.match(line)
+        if heading_match:
+            title = (heading_match.group(2) or "").rstrip("#").rstrip()
+            heading = Heading(len(heading_match.group(1)), title, number)
+            while open_headings and open_headings[-1].level >= heading.level:
+                open_headings.pop()
+            parent = open_headings[-1].children if open_headings else document.outline
+            parent.append(heading)
+            open_headings.append(heading)
+            document.headings.append(heading)
+            continue
+
+        bullet_match = BULLET_PATTERN.match(line)
+        if bullet_match:
+            document.bullets.append(
+                Bullet(
+                    bullet_match.group(3).strip(),
+                    bullet_match.group(2),
+                    len(bullet_match.group(1)),
+                    number,
+                )
+            )
+
+    if fence is not None:
+        # An unclosed fence runs to the end of the document
+        document.code_blocks.append(
+            CodeBlock(fence_language, "\n".join(fence_lines), fence_start)
+        )
+    return document
+
+
+_cache: OrderedDict[bytes, MarkdownDocument] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def parse_document(content: str) -> MarkdownDocument:
+    """Return the parsed document for some content, parsing it at most once.
+
+    Documents are memoized by a hash of their content rather than the
+    content itself, so the cache does not keep large texts alive. The
+    returned document is shared and must not be modified.
+    """
+    key = hashlib.blake2b(content.encode("utf-8", "surrogatepass")).digest()
+    with _cache_lock:
+        document = _cache.get(key)
+        if document is not None:
+            _cache.move_to_end(key)
+            return document
+    document = parse_markdown(content)
+    with _cache_lock:
+        _cache[key] = document
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return document
+
+
+def clear_document_cache() -> None:
+    """Forget every memoized document, so the next parse of any content is cold."""
+    with _cache_lock:
+        _cache.clear()
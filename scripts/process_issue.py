@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
-"""Parse discovery issue bodies and extract candidate data as JSON."""
+"""Parse discovery issue bodies and extract candidate data as JSON.
+
+Run from the repository root as ``python -m scripts.process_issue``.
+"""
 
 import argparse
 import html
@@ -10,6 +13,8 @@ import subprocess
 import sys
 from typing import Any
 
+from scripts.profiling import Profiler, add_profile_arguments, profile_stage
+
 logger = logging.getLogger(__name__)
 
 
@@ -171,7 +176,46 @@ def fetch_issue_body(issue_number: int) -> str:
     return result.stdout.strip()
 
 
-def main() -> int:
+def process(args: argparse.Namespace) -> int:
+    """Fetch or read an issue body and write its candidates as JSON."""
+    with profile_stage("fetch"):
+        if args.issue_number is not None:
+            logger.info("Fetching issue #%d from GitHub...", args.issue_number)
+            try:
+                issue_body = fetch_issue_body(args.issue_number)
+            except subprocess.CalledProcessError as exc:
+                logger.error("Failed to fetch issue: %s", exc)
+                return 1
+        else:
+            logger.info("Reading issue body from file: %s", args.body_file)
+            try:
+                with open(args.body_file, encoding="utf-8") as fh:
+                    issue_body = fh.read()
+            except OSError as exc:
+                logger.error("Failed to read body file: %s", exc)
+                return 1
+
+    with profile_stage("parse"):
+        candidates = parse_candidates(issue_body)
+    logger.info("Extracted %d candidate(s) above threshold", len(candidates))
+
+    output_json = json.dumps(candidates, indent=2, ensure_ascii=False)
+
+    if args.output:
+        try:
+            with open(args.output, "w", encoding="utf-8") as fh:
+                fh.write(output_json)
+            logger.info("Wrote candidates to %s", args.output)
+        except OSError as exc:
+            logger.error("Failed to write output file: %s", exc)
+            return 1
+    else:
+        print(output_json)
+
+    return 0
+
+
+def main(argv=None) -> int:
     """Entry point for the process-issue script."""
     setup_logging()
 
@@ -195,42 +239,12 @@ def main() -> int:
         default=None,
         help="Output file path (defaults to stdout)",
     )
+    add_profile_arguments(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    if args.issue_number is not None:
-        logger.info("Fetching issue #%d from GitHub...", args.issue_number)
-        try:
-            issue_body = fetch_issue_body(args.issue_number)
-        except subprocess.CalledProcessError as exc:
-            logger.error("Failed to fetch issue: %s", exc)
-            return 1
-    else:
-        logger.info("Reading issue body from file: %s", args.body_file)
-        try:
-            with open(args.body_file, encoding="utf-8") as fh:
-                issue_body = fh.read()
-        except OSError as exc:
-            logger.error("Failed to read body file: %s", exc)
-            return 1
-
-    candidates = parse_candidates(issue_body)
-    logger.info("Extracted %d candidate(s) above threshold", len(candidates))
-
-    output_json = json.dumps(candidates, indent=2, ensure_ascii=False)
-
-    if args.output:
-        try:
-            with open(args.output, "w", encoding="utf-8") as fh:
-                fh.write(output_json)
-            logger.info("Wrote candidates to %s", args.output)
-        except OSError as exc:
-            logger.error("Failed to write output file: %s", exc)
-            return 1
-    else:
-        print(output_json)
-
-    return 0
+    with Profiler("process_issue", args.profile, args.profile_dir):
+        return process(args)
 
 
 if __name__ == "__main__":
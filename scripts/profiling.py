@@ -0,0 +1,262 @@
+"""Opt-in profiling of the command line entry points.
+
+Every script accepts ``--profile MODES`` (or ``SCRIPT_PROFILE``) and
+``--profile-dir DIR`` (or ``SCRIPT_PROFILE_DIR``, default ``profiles``).
+MODES is a comma-separated list of:
+
+- ``cprofile``: deterministic profile of every thread, saved as a pstats
+  ``.prof`` file for ``python -m pstats`` or snakeviz.
+- ``sample``: wall-clock stack samples of every thread, saved as a
+  ``.collapsed`` file for flamegraph.pl or speedscope.
+- ``tracemalloc``: allocation snapshots taken at the end of each pipeline
+  stage and of the run, saved as ``.tracemalloc`` files with a text
+  summary of the largest allocation sites.
+
+Code marks pipeline stages with ``profile_stage``; samples taken in a stage
+are rooted at its name. Without an active profiler it does nothing.
+"""
+
+import argparse
+import contextlib
+import cProfile
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample", "tracemalloc")
+DEFAULT_PROFILE_DIR = "profiles"
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+# Allocation sites listed per snapshot in the tracemalloc summary
+TOP_ALLOCATIONS = 15
+
+_WORKER_SUFFIX = re.compile(r"[_-]\d+$")
+
+# Before Python 3.12 a cProfile.Profile only sees the thread that enabled it;
+# since then it is built on sys.monitoring, sees every thread, and only one
+# can be enabled at a time
+_PROFILE_PER_THREAD = sys.version_info < (3, 12)
+
+_active: "Profiler | None" = None
+
+
+def parse_modes(value: str) -> list[str]:
+    """Parse a comma-separated list of profile modes."""
+    modes = [mode.strip() for mode in value.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in PROFILE_MODES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown profile mode(s) {', '.join(unknown)}; "
+            f"choose from {', '.join(PROFILE_MODES)}"
+        )
+    return modes
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the --profile and --profile-dir options to a parser."""
+    parser.add_argument(
+        "--profile",
+        type=parse_modes,
+        default=os.environ.get("SCRIPT_PROFILE", ""),
+        metavar="MODES",
+        help=f"Profile the run: comma-separated {', '.join(PROFILE_MODES)} "
+        "(default: $SCRIPT_PROFILE)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=os.environ.get("SCRIPT_PROFILE_DIR") or DEFAULT_PROFILE_DIR,
+        help="Directory for profile output (default: $SCRIPT_PROFILE_DIR or profiles)",
+    )
+
+
+@contextlib.contextmanager
+def profile_stage(stage: str) -> Iterator[None]:
+    """Mark the block as a pipeline stage of the current thread."""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    thread = threading.get_ident()
+    previous = profiler.thread_stages.get(thread)
+    profiler.thread_stages[thread] = stage
+    try:
+        yield
+    finally:
+        if previous is None:
+            profiler.thread_stages.pop(thread, None)
+        else:
+            profiler.thread_stages[thread] = previous
+        profiler.stage_finished(stage)
+
+
+class Profiler:
+    """Profiles a block in the given modes and writes the results on exit.
+
+    Output files are named ``<name>_<timestamp>`` plus a mode-specific
+    suffix. With no modes the profiler does nothing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        modes: list[str],
+        output_dir: str | Path = DEFAULT_PROFILE_DIR,
+        interval: float = SAMPLE_INTERVAL,
+    ):
+        self.modes = list(modes)
+        self.output_dir = Path(output_dir)
+        self.prefix = f"{name}_{datetime.now():%Y%m%d_%H%M%S}"
+        self.interval = interval
+        self.thread_stages: dict[int, str] = {}
+        self.samples: Counter = Counter()
+        self.snapshots: list[tuple[str, tracemalloc.Snapshot]] = []
+        self.outputs: list[Path] = []
+        self._profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def __enter__(self) -> "Profiler":
+        global _active
+        if not self.modes:
+            return self
+        if _active is not None:
+            raise RuntimeError("A profiler is already active")
+        _active = self
+        if "tracemalloc" in self.modes:
+            tracemalloc.start()
+        if "sample" in self.modes:
+            self._sampler = threading.Thread(
+                target=self._sample, name="profile-sampler", daemon=True
+            )
+            self._sampler.start()
+        if "cprofile" in self.modes:
+            self._start_profile()
+            if _PROFILE_PER_THREAD:
+                # Threads started from now on profile themselves on their first call
+                threading.setprofile(self._profile_thread)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _active
+        if not self.modes:
+            return
+        if "cprofile" in self.modes:
+            if _PROFILE_PER_THREAD:
+                threading.setprofile(None)
+            # The calling thread's profile must be disabled first, since
+            # disabling any profile clears the calling thread's hook
+            self._profiles[0].disable()
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+        if "tracemalloc" in self.modes:
+            self.stage_finished("end")
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        _active = None
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if "cprofile" in self.modes:
+            self._write_cprofile()
+        if "sample" in self.modes:
+            self._write_samples()
+        if "tracemalloc" in self.modes:
+            self._write_snapshots(peak)
+        for path in self.outputs:
+            logger.info(f"Profile written to {path}")
+
+    def stage_finished(self, stage: str) -> None:
+        """Take an allocation snapshot at the end of a stage."""
+        if "tracemalloc" in self.modes and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            with self._lock:
+                self.snapshots.append((stage, snapshot))
+
+    def _start_profile(self) -> None:
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        profile.enable()
+
+    def _profile_thread(self, frame, event, arg) -> None:
+        sys.setprofile(None)
+        self._start_profile()
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread, frame in sys._current_frames().items():
+                if thread == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({Path(code.co_filename).name}:"
+                        f"{code.co_firstlineno})".replace(";", ",")
+                    )
+                    frame = frame.f_back
+                roots = [_WORKER_SUFFIX.sub("", names.get(thread, "thread"))]
+                stage = self.thread_stages.get(thread)
+                if stage is not None:
+                    roots.append(f"stage:{stage}")
+                self.samples[";".join(roots + stack[::-1])] += 1
+
+    def _write_cprofile(self) -> None:
+        path = self.output_dir / f"{self.prefix}.prof"
+        with self._lock:
+            profiles = list(self._profiles)
+        # Threads that never made a call leave empty profiles, which pstats rejects
+        recorded = []
+        for profile in profiles:
+            profile.create_stats()
+            if profile.stats:
+                recorded.append(profile)
+        if not recorded:
+            logger.warning("cProfile recorded no calls")
+            return
+        stats = pstats.Stats(recorded[0])
+        for profile in recorded[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+        self.outputs.append(path)
+
+    def _write_samples(self) -> None:
+        path = self.output_dir / f"{self.prefix}.collapsed"
+        path.write_text(
+            "".join(
+                f"{stack} {count}\n" for stack, count in sorted(self.samples.items())
+            )
+        )
+        self.outputs.append(path)
+
+    def _write_snapshots(self, peak: int) -> None:
+        summary = [f"Peak traced memory: {peak:,} bytes"]
+        stages = Counter()
+        for stage, snapshot in self.snapshots:
+            stages[stage] += 1
+            label = stage if stages[stage] == 1 else f"{stage}-{stages[stage]}"
+            path = self.output_dir / f"{self.prefix}.{label}.tracemalloc"
+            snapshot.dump(str(path))
+            self.outputs.append(path)
+            statistics = snapshot.statistics("lineno")
+            total = sum(stat.size for stat in statistics)
+            summary.append(f"\n[{label}] {total:,} bytes traced")
+            summary.extend(f"  {stat}" for stat in statistics[:TOP_ALLOCATIONS])
+        path = self.output_dir / f"{self.prefix}.tracemalloc.txt"
+        path.write_text("\n".join(summary) + "\n")
+        self.outputs.append(path)
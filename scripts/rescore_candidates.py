@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Re-score previously evaluated CLAUDE.md candidates offline.
+
+Every repository recorded in the discovery run state is scored again with
+the current weights and rules, using its cached content profile or, when
+the feature extractor changed, the CLAUDE.md blob kept in the blob store.
+No GitHub API calls are made, so the effect of a scoring change can be
+compared against the scores of the last runs.
+"""
+
+import argparse
+import json
+import os
+from collections.abc import Iterator
+
+from scripts.discovery.blob_store import DEFAULT_BLOB_STORE_PATH, BlobStore
+from scripts.discovery.evaluator import RepositoryEvaluator
+from scripts.discovery.feature_cache import DEFAULT_FEATURE_CACHE_PATH, FeatureCache
+from scripts.discovery.features import extract_content_profile
+from scripts.discovery.run_state import DEFAULT_STATE_PATH, RunStateStore
+from scripts.discovery.utils import setup_logging
+
+logger = setup_logging()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(
+        description="Re-score evaluated CLAUDE.md candidates without the GitHub API."
+    )
+    parser.add_argument(
+        "--output",
+        help="Write one JSON line per re-scored candidate to this file",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of largest score changes to log (default: 10)",
+    )
+    return parser.parse_args(argv)
+
+
+def rescore(
+    run_state: RunStateStore,
+    feature_cache: FeatureCache,
+    blob_store: BlobStore,
+    evaluator: RepositoryEvaluator | None = None,
+) -> Iterator[dict]:
+    """Yield the old and new score of every recorded candidate that can be scored.
+
+    Profiles missing from the feature cache are extracted from the blob
+    store and cached. Repositories recorded without metadata, or whose blob
+    is no longer stored, are skipped.
+    """
+    evaluator = evaluator or RepositoryEvaluator(None)
+    for full_name, entry in sorted(run_state.repositories.items()):
+        candidate = entry.get("candidate")
+        blob_sha = entry.get("blob_sha")
+        if candidate is None or not blob_sha:
+            logger.debug(f"Skipping {full_name}: no recorded metadata or blob SHA")
+            continue
+
+        profile = feature_cache.get(blob_sha)
+        if profile is None:
+            content = blob_store.get_text(blob_sha)
+            if content is None:
+                logger.warning(f"Skipping {full_name}: blob {blob_sha} is not stored")
+                continue
+            profile = extract_content_profile(content)
+            feature_cache.put(profile)
+
+        evaluation = evaluator.score_profile(candidate, profile)
+        yield {
+            "full_name": full_name,
+            "blob_sha": blob_sha,
+            "old_score": entry.get("score"),
+            "score": evaluation["score"],
+            "suggested_category": evaluation["suggested_category"],
+            "reasons": evaluation["reasons"],
+        }
+
+
+def main(argv=None):
+    """Main execution function."""
+    args = parse_args(argv)
+
+    state_path = os.environ.get("DISCOVERY_STATE", str(DEFAULT_STATE_PATH))
+    if not state_path or not os.path.exists(state_path):
+        logger.error(f"Error: no discovery run state found at {state_path!r}")
+        return 1
+    run_state = RunStateStore(state_path)
+
+    feature_cache = FeatureCache(
+        os.environ.get("DISCOVERY_FEATURE_CACHE") or DEFAULT_FEATURE_CACHE_PATH
+    )
+    blob_store = BlobStore(
+        os.environ.get("DISCOVERY_BLOB_STORE") or DEFAULT_BLOB_STORE_PATH
+    )
+
+    results = []
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    try:
+        for result in rescore(run_state, feature_cache, blob_store):
+            results.append(result)
+            if output is not None:
+                output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not None:
+            output.close()
+
+    changed = [r for r in results if r["score"] != r["old_score"]]
+    logger.info(
+        f"Re-scored {len(results)} of {len(run_state.repositories)} candidates: "
+        f"{len(changed)} changed score"
+    )
+    changed.sort(key=lambda r: abs(r["score"] - (r["old_score"] or 0)), reverse=True)
+    for result in changed[: args.top]:
+        logger.info(
+            f"  {result['full_name']}: {result['old_score']} -> {result['score']}"
+        )
+
+    stats = feature_cache.stats()
+    logger.info(
+        f"Feature cache: {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['writes']} profiles written"
+    )
+    feature_cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,13 +1,15 @@
 """Tool evaluator for scoring and assessing CLAUDE.md tool candidates."""
 
 import logging
-import re
 from datetime import datetime
 
 import requests.exceptions
 from github.GithubException import GithubException, UnknownObjectException
 
+from scripts.discovery.keyword_matcher import KeywordHits, KeywordMatcher
+from scripts.discovery.tracing import traced
 from scripts.discovery.utils import retry_with_backoff
+from scripts.markdown_document import parse_document
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +57,93 @@ RECOGNIZED_ORGS = {
     "shopify",
 }
 
+# CLI presence signals, matched case-sensitively against the raw README
+CLI_SIGNALS = [
+    "bin/",
+    '"bin"',
+    '"scripts"',
+    "[tool.",  # pyproject.toml [tool.scripts]
+    "console_scripts",
+    "entry_points",
+    "#!/usr/bin/env",
+    "#!/bin/sh",
+    "#!/bin/bash",
+]
+
+INSTALL_PATTERNS = [
+    "npm install",
+    "pip install",
+    "cargo install",
+    "brew install",
+    "go install",
+    "npx ",
+]
+
+CLAUDE_KEYWORDS = [
+    "generate",
+    "sync",
+    "lint",
+    "analyze",
+    "manage",
+    "claude.md",
+    "agents.md",
+    "claude code",
+]
+
+# Section titles, matched against heading prefixes
+INSTALL_SECTION_HEADINGS = [
+    "install",
+    "getting started",
+    "setup",
+    "usage",
+    "quick start",
+]
+
+FEATURE_SECTION_HEADINGS = [
+    "features",
+    "what it does",
+    "capabilities",
+    "overview",
+]
+
+LICENSE_README_KEYWORDS = ["license", "mit", "apache", "bsd", "unlicense"]
+
+RELEASE_KEYWORDS = ["release", "changelog", "version", "v0.", "v1.", "v2."]
+
+CONTRIBUTOR_KEYWORDS = [
+    "contributors",
+    "contributing",
+    "pull request",
+]
+
+TYPE_KEYWORDS: dict[str, list[str]] = {
+    "cli": ["command-line", "command line", "cli", "terminal"],
+    "plugin": ["plugin", "extension", "addon", "add-on"],
+    "library": ["library", "sdk", "package", "module", "import this"],
+    "service": ["api", "service", "saas", "platform", "deploy"],
+    "generator": [
+        "generat",
+        "creat",
+        "scaffold",
+        "bootstrap",
+        "init",
+    ],
+    "sync": ["sync", "synchron", "propagat"],
+    "linter": ["lint", "validate", "check", "enforce", "verify", "audit"],
+    "template": ["template", "boilerplate", "starter"],
+}
+
+# One matcher for every case-insensitive keyword above, built once at import
+KEYWORD_MATCHER = KeywordMatcher(
+    INSTALL_PATTERNS
+    + CLAUDE_KEYWORDS
+    + LICENSE_README_KEYWORDS
+    + RELEASE_KEYWORDS
+    + CONTRIBUTOR_KEYWORDS
+    + [keyword for keywords in TYPE_KEYWORDS.values() for keyword in keywords]
+)
+CLI_SIGNAL_MATCHER = KeywordMatcher(CLI_SIGNALS)
+
 
 class ToolEvaluator:
     """Handles evaluation and scoring of CLAUDE.md tool candidates."""
@@ -116,6 +205,7 @@ class ToolEvaluator:
             requests.exceptions.RequestException,
         ),
     )
+    @traced("evaluate")
     def evaluate_candidate(self, candidate: dict) -> dict | None:
         """Evaluate a tool candidate and return a scored assessment, or None if rejected."""
         if not self._validate_candidate(candidate):
@@ -123,23 +213,27 @@ class ToolEvaluator:
 
         try:
             readme_content = self._get_readme_content(candidate)
+            # Every keyword check below reads hits from one scan of the text
+            hits, readme_hits = self.scan_keywords(candidate, readme_content)
 
             # Calculate scoring components
             (
                 functionality_score,
                 functionality_reasons,
-            ) = self._calculate_tool_functionality_score(candidate, readme_content)
+            ) = self._calculate_tool_functionality_score(
+                candidate, readme_content, readme_hits
+            )
             documentation_score, documentation_reasons = self._score_readme_quality(
-                readme_content
+                readme_content, readme_hits
             )
             license_score, license_reasons = self._calculate_license_quality_score(
-                candidate, readme_content
+                candidate, readme_content, readme_hits
             )
             maturity_score, maturity_reasons = self._calculate_project_maturity_score(
-                candidate, readme_content
+                candidate, readme_content, readme_hits
             )
             community_score, community_reasons = self._calculate_community_score(
-                candidate
+                candidate, readme_hits
             )
 
             score = (
@@ -157,7 +251,7 @@ class ToolEvaluator:
                 + community_reasons
             )
 
-            tool_type = self._detect_tool_type(candidate, readme_content)
+            tool_type = self._detect_tool_type(candidate, readme_content, hits)
 
             evaluation = {
                 "candidate": candidate,
@@ -178,27 +272,41 @@ class ToolEvaluator:
             logger.error(f"Unexpected error evaluating {candidate['full_name']}: {e}")
             return None
 
-    def _calculate_tool_functionality_score(
+    def scan_keywords(
         self, candidate: dict, readme_content: str
+    ) -> tuple[KeywordHits, KeywordHits]:
+        """Find every keyword in the candidate's text in a single pass.
+
+        Description, README and topics are lowercased and scanned together
+        once. Returns the hits for the whole text, which drive tool type
+        detection, and a view of the hits inside the README alone, which
+        drive the README-based scores.
+        """
+        desc_lower = candidate.get("description", "").lower()
+        topics = [t.lower() for t in candidate.get("topics", [])]
+        readme_lower = readme_content.lower()
+        hits = KEYWORD_MATCHER.scan(f"{desc_lower} {readme_lower} {' '.join(topics)}")
+        readme_start = len(desc_lower) + 1
+        return hits, hits.within(readme_start, readme_start + len(readme_lower))
+
+    def _readme_hits(self, readme_content: str) -> KeywordHits:
+        """Scan a README on its own, for components called without hits."""
+        return KEYWORD_MATCHER.scan(readme_content.lower())
+
+    def _calculate_tool_functionality_score(
+        self,
+        candidate: dict,
+        readme_content: str,
+        readme_hits: KeywordHits | None = None,
     ) -> tuple[int, list[str]]:
         """Calculate score based on tool functionality evidence (0-30 points)."""
         score = 0
         reasons: list[str] = []
-        readme_lower = readme_content.lower()
+        if readme_hits is None:
+            readme_hits = self._readme_hits(readme_content)
 
         # CLI presence signals (0-12 points)
-        cli_signals = [
-            "bin/",
-            '"bin"',
-            '"scripts"',
-            "[tool.",  # pyproject.toml [tool.scripts]
-            "console_scripts",
-            "entry_points",
-            "#!/usr/bin/env",
-            "#!/bin/sh",
-            "#!/bin/bash",
-        ]
-        cli_count = sum(1 for sig in cli_signals if sig in readme_content)
+        cli_count = CLI_SIGNAL_MATCHER.scan(readme_content).count_present(CLI_SIGNALS)
         if cli_count >= 3:
             score += 12
             reasons.append("Strong CLI presence detected (multiple signals)")
@@ -207,15 +315,7 @@ class ToolEvaluator:
             reasons.append("CLI presence detected")
 
         # Installation instructions (0-8 points)
-        install_patterns = [
-            "npm install",
-            "pip install",
-            "cargo install",
-            "brew install",
-            "go install",
-            "npx ",
-        ]
-        install_count = sum(1 for p in install_patterns if p in readme_lower)
+        install_count = readme_hits.count_present(INSTALL_PATTERNS)
         if install_count >= 2:
             score += 8
             reasons.append("Clear installation instructions provided")
@@ -224,17 +324,7 @@ class ToolEvaluator:
             reasons.append("Installation instructions present")
 
         # CLAUDE.md-related keywords in README (0-10 points)
-        claude_keywords = [
-            "generate",
-            "sync",
-            "lint",
-            "analyze",
-            "manage",
-            "claude.md",
-            "agents.md",
-            "claude code",
-        ]
-        keyword_count = sum(1 for kw in claude_keywords if kw in readme_lower)
+        keyword_count = readme_hits.count_present(CLAUDE_KEYWORDS)
         if keyword_count >= 4:
             score += 10
             reasons.append("Strongly CLAUDE.md-focused (multiple keywords)")
@@ -247,14 +337,17 @@ class ToolEvaluator:
 
         return min(score, self.tool_functionality_weight), reasons
 
-    def _score_readme_quality(self, readme_content: str) -> tuple[int, list[str]]:
+    def _score_readme_quality(
+        self, readme_content: str, readme_hits: KeywordHits | None = None
+    ) -> tuple[int, list[str]]:
         """Calculate score based on README documentation quality (0-25 points)."""
         if not readme_content:
             return 0, []
 
         score = 0
         reasons: list[str] = []
-        readme_lower = readme_content.lower()
+        if readme_hits is None:
+            readme_hits = self._readme_hits(readme_content)
 
         # README length (0-7 points)
         content_length = len(readme_content)
@@ -269,46 +362,38 @@ class ToolEvaluator:
             reasons.append("Basic README documentation present")
 
         # Usage examples / code blocks (0-8 points)
-        code_block_count = readme_content.count("```")
-        if code_block_count >= 6:
+        document = parse_document(readme_content)
+        code_block_count = len(document.code_blocks)
+        if code_block_count >= 3:
             score += 8
             reasons.append("Rich usage examples with code blocks")
-        elif code_block_count >= 2:
+        elif code_block_count >= 1:
             score += 4
             reasons.append("Usage examples present")
 
         # Installation section (0-5 points)
-        install_section_keywords = [
-            "## install",
-            "## getting started",
-            "## setup",
-            "## usage",
-            "## quick start",
-        ]
-        if any(kw in readme_lower for kw in install_section_keywords):
+        if document.has_heading(INSTALL_SECTION_HEADINGS):
             score += 5
             reasons.append("Dedicated installation/setup section")
 
         # Feature list (0-5 points)
-        feature_section_keywords = [
-            "## features",
-            "## what it does",
-            "## capabilities",
-            "## overview",
-        ]
-        if any(kw in readme_lower for kw in feature_section_keywords):
+        if document.has_heading(FEATURE_SECTION_HEADINGS):
             score += 5
             reasons.append("Feature list documented")
 
         return min(score, self.documentation_quality_weight), reasons
 
     def _calculate_license_quality_score(
-        self, candidate: dict, readme_content: str
+        self,
+        candidate: dict,
+        readme_content: str,
+        readme_hits: KeywordHits | None = None,
     ) -> tuple[int, list[str]]:
         """Calculate score based on license quality (0-15 points)."""
         score = 0
         reasons: list[str] = []
-        readme_lower = readme_content.lower()
+        if readme_hits is None:
+            readme_hits = self._readme_hits(readme_content)
 
         license_name = self._get_license_name(candidate)
 
@@ -326,8 +411,7 @@ class ToolEvaluator:
             reasons.append(f"Non-permissive license ({license_name})")
 
         # License mentioned in README
-        license_readme_keywords = ["license", "mit", "apache", "bsd", "unlicense"]
-        if any(kw in readme_lower for kw in license_readme_keywords):
+        if readme_hits.any(LICENSE_README_KEYWORDS):
             score += 5
             reasons.append("License referenced in README")
 
@@ -349,12 +433,16 @@ class ToolEvaluator:
         return score, reasons
 
     def _calculate_project_maturity_score(
-        self, candidate: dict, readme_content: str
+        self,
+        candidate: dict,
+        readme_content: str,
+        readme_hits: KeywordHits | None = None,
     ) -> tuple[int, list[str]]:
         """Calculate score based on project maturity — excluding stars (0-20 points)."""
         score = 0
         reasons: list[str] = []
-        readme_lower = readme_content.lower()
+        if readme_hits is None:
+            readme_hits = self._readme_hits(readme_content)
 
         # Recent activity (0-8 points)
         days_since_update = self._calculate_days_since_update(candidate)
@@ -366,8 +454,7 @@ class ToolEvaluator:
             reasons.append("Updated in last 90 days")
 
         # Has releases (0-4 points) — look for release keywords in readme
-        release_keywords = ["release", "changelog", "version", "v0.", "v1.", "v2."]
-        if any(kw in readme_lower for kw in release_keywords):
+        if readme_hits.any(RELEASE_KEYWORDS):
             score += 4
             reasons.append("Has release history or versioning")
 
@@ -387,7 +474,9 @@ class ToolEvaluator:
 
         return min(score, self.project_maturity_weight), reasons
 
-    def _calculate_community_score(self, candidate: dict) -> tuple[int, list[str]]:
+    def _calculate_community_score(
+        self, candidate: dict, readme_hits: KeywordHits | None = None
+    ) -> tuple[int, list[str]]:
         """Calculate score based on community signals (0-10 points)."""
         score = 0
         reasons: list[str] = []
@@ -408,46 +497,27 @@ class ToolEvaluator:
             reasons.append(f"From recognized organization ({candidate['owner']})")
 
         # Contributors mentioned in README (0-2 points)
-        readme_lower = candidate.get("readme_content", "").lower()
-        contributor_keywords = [
-            "contributors",
-            "contributing",
-            "## contributing",
-            "pull request",
-        ]
-        if any(kw in readme_lower for kw in contributor_keywords):
+        if readme_hits is None:
+            readme_hits = self._readme_hits(candidate.get("readme_content", ""))
+        if readme_hits.any(CONTRIBUTOR_KEYWORDS):
             score += 2
             reasons.append("Community contribution guidelines present")
 
         return min(score, self.community_weight), reasons
 
-    def _detect_tool_type(self, candidate: dict, readme_content: str) -> str:
+    def _detect_tool_type(
+        self,
+        candidate: dict,
+        readme_content: str,
+        hits: KeywordHits | None = None,
+    ) -> str:
         """Detect the type of CLAUDE.md tool from candidate metadata and README content."""
-        readme_lower = readme_content.lower()
-        desc_lower = candidate.get("description", "").lower()
-        topics = [t.lower() for t in candidate.get("topics", [])]
-        combined = f"{desc_lower} {readme_lower} {' '.join(topics)}"
-
-        type_keywords: dict[str, list[str]] = {
-            "cli": ["command-line", "command line", "cli", "terminal"],
-            "plugin": ["plugin", "extension", "addon", "add-on"],
-            "library": ["library", "sdk", "package", "module", "import this"],
-            "service": ["api", "service", "saas", "platform", "deploy"],
-            "generator": [
-                "generat",
-                "creat",
-                "scaffold",
-                "bootstrap",
-                "init",
-            ],
-            "sync": ["sync", "synchron", "propagat"],
-            "linter": ["lint", "validate", "check", "enforce", "verify", "audit"],
-            "template": ["template", "boilerplate", "starter"],
-        }
+        if hits is None:
+            hits, _ = self.scan_keywords(candidate, readme_content)
 
         scores: dict[str, int] = {}
-        for tool_type, keywords in type_keywords.items():
-            count = sum(1 for kw in keywords if re.search(kw, combined))
+        for tool_type, keywords in TYPE_KEYWORDS.items():
+            count = hits.count_present(keywords)
             if count > 0:
                 scores[tool_type] = count
 
@@ -462,3 +532,8 @@ class ToolEvaluator:
             candidate["updated_at"].replace("Z", "+00:00")
         )
         return (datetime.now().replace(tzinfo=updated_date.tzinfo) - updated_date).days
+
+
+def evaluate_tool(candidate: dict) -> dict | None:
+    """Evaluate a tool candidate; a picklable entry point for worker processes."""
+    return ToolEvaluator().evaluate_candidate(candidate)
@@ -3,7 +3,15 @@
 import logging
 from typing import Any
 
-from .evaluator import ToolEvaluator
+from scripts.discovery.api_usage import ApiUsage
+from scripts.discovery.cassette import Cassette
+from scripts.discovery.evaluation_pool import EvaluationPool
+from scripts.discovery.http_cache import HTTPCache
+from scripts.discovery.orchestrator import build_transport
+from scripts.discovery.run_manifest import RunManifest
+from scripts.discovery.tracing import traced
+
+from .evaluator import ToolEvaluator, evaluate_tool
 from .loader import ToolLoader
 from .reporter import ToolIssueGenerator
 from .searcher import ToolSearcher
@@ -17,32 +25,66 @@ class ClaudeToolDiscovery:
     # Quality threshold for tool candidates (50-point scale)
     QUALITY_THRESHOLD = 50
 
-    def __init__(self, github_token: str):
+    def __init__(
+        self,
+        github_token: str | list[str],
+        http_cache: HTTPCache | None = None,
+        workers: int = 4,
+        processes: int = 0,
+        cassette: Cassette | None = None,
+        report_timestamp: str | None = None,
+    ):
         self.tool_loader = ToolLoader()
-        self.tool_searcher = ToolSearcher(github_token)
+        self.http_cache = http_cache
+        # Every GitHub request of the run, by pipeline stage and candidate
+        self.api_usage = ApiUsage()
+        # Stage timings and candidate counters for the run manifest
+        self.manifest = RunManifest("tools")
+        self.transport = build_transport(
+            github_token, http_cache, cassette, self.api_usage
+        )
+        self.tool_searcher = ToolSearcher(github_token, transport=self.transport)
         self.evaluator = ToolEvaluator(self.tool_searcher)
-        self.issue_generator = ToolIssueGenerator(self.tool_searcher)
+        self.evaluation_pool = EvaluationPool(workers, processes)
+        self.issue_generator = ToolIssueGenerator(
+            self.tool_searcher, timestamp=report_timestamp
+        )
+        # Candidates scored by the last run, whatever their score
+        self.evaluated = 0
 
         # Load existing tools to avoid duplicates
         self.existing_tools = self.tool_loader.load_existing_tools()
 
+    @traced("discovery")
     def discover_new_tools(self) -> list[dict[str, Any]]:
         """Main discovery workflow: search, evaluate, and report on new tools."""
         logger.info("Starting automated discovery of CLAUDE.md-related tools")
 
         # Search for candidate tool repositories
-        candidates = self.tool_searcher.search_github_repos(self.existing_tools)
+        with self.manifest.stage("search"):
+            candidates = self.tool_searcher.search_github_repos(self.existing_tools)
+        self.manifest.count("seen", len(candidates))
+        self.manifest.count("fetched", len(candidates))
 
         if not candidates:
             logger.info("No new tool candidates found")
             return []
 
-        # Evaluate each candidate
-        all_evaluations = []
-        for candidate in candidates:
-            evaluation = self.evaluator.evaluate_candidate(candidate)
-            if evaluation:
-                all_evaluations.append(evaluation)
+        # Evaluate candidates concurrently; READMEs were fetched during search,
+        # so worker processes can score them without API access
+        score = (
+            evaluate_tool
+            if self.evaluation_pool.processes
+            else self.evaluator.evaluate_candidate
+        )
+        with self.manifest.stage("evaluate"):
+            all_evaluations = [
+                evaluation
+                for evaluation in self.evaluation_pool.map(candidates, score)
+                if evaluation
+            ]
+        self.evaluated = len(all_evaluations)
+        self.manifest.count("scored", self.evaluated)
 
         # Filter for quality threshold (50+ points)
         quality_evaluations = [
@@ -56,6 +98,7 @@ class ClaudeToolDiscovery:
 
         # Create discovery issue/report
         if quality_evaluations:
-            self.issue_generator.create_discovery_issue(quality_evaluations)
+            with self.manifest.stage("report"):
+                self.issue_generator.create_discovery_issue(quality_evaluations)
 
         return quality_evaluations
@@ -4,6 +4,9 @@ import logging
 from datetime import datetime
 from typing import Any
 
+from scripts.discovery.api_usage import api_stage
+from scripts.discovery.tracing import span, traced
+
 from .reporters.issue_formatter import ToolIssueFormatter
 
 logger = logging.getLogger(__name__)
@@ -12,34 +15,39 @@ logger = logging.getLogger(__name__)
 class ToolIssueGenerator:
     """Handles GitHub issue creation and report generation for tool discovery."""
 
-    def __init__(self, github_searcher):
+    def __init__(self, github_searcher, timestamp: str | None = None):
         self.github_searcher = github_searcher
+        # Names the report file; the run's other output files share it
+        self.timestamp = timestamp
         self.issue_formatter = ToolIssueFormatter()
 
     def _get_issue_labels(self) -> list[str]:
         """Return labels to apply to the discovery issue."""
         return ["automation", "tool-discovery", "review-needed"]
 
+    @traced("report")
     def create_discovery_issue(self, evaluations: list[dict[str, Any]]) -> None:
         """Create a GitHub issue with the tool discovery results."""
         if not evaluations:
             logger.info("No tool evaluations to report")
             return
 
-        title = self.issue_formatter.create_issue_title(evaluations)
-        body = self.issue_formatter.create_issue_body(evaluations)
+        with span("report.format", evaluations=len(evaluations)):
+            title = self.issue_formatter.create_issue_title(evaluations)
+            body = self.issue_formatter.create_issue_body(evaluations)
 
         body = self._validate_and_truncate_body(body, evaluations)
 
         self._save_discovery_report(title, body)
 
         try:
-            repo = self.github_searcher.github.get_repo("josix/awesome-claude-md")
-            issue = repo.create_issue(
-                title=title,
-                body=body,
-                labels=self._get_issue_labels(),
-            )
+            with api_stage("report"), span("report.create_issue"):
+                repo = self.github_searcher.github.get_repo("josix/awesome-claude-md")
+                issue = repo.create_issue(
+                    title=title,
+                    body=body,
+                    labels=self._get_issue_labels(),
+                )
             logger.info(f"Created GitHub issue #{issue.number}: {title}")
             logger.info(f"Issue URL: {issue.html_url}")
         except Exception as e:
@@ -75,7 +83,7 @@ class ToolIssueGenerator:
 
     def _save_discovery_report(self, title: str, body: str) -> None:
         """Save tool discovery report to file for review."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self.timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"tool_discovery_report_{timestamp}.md"
 
         try:
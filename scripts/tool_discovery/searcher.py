@@ -1,34 +1,59 @@
 """GitHub repository searcher for finding CLAUDE.md-related tools."""
 
 import logging
-import time
 
 import requests
 import requests.exceptions
-from github import Github
 from github.GithubException import (
     GithubException,
     RateLimitExceededException,
     UnknownObjectException,
 )
 
+from scripts.discovery.api_usage import api_stage
+from scripts.discovery.dedupe import RepositoryDeduplicator
+from scripts.discovery.token_pool import (
+    TokenPool,
+    TokenPoolMiddleware,
+    normalize_tokens,
+)
+from scripts.discovery.tracing import span
+from scripts.discovery.transport import (
+    GitHubTransport,
+    create_github_client,
+    mount_transport,
+    raw_field,
+)
 from scripts.discovery.utils import retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+# Requests a repository costs before evaluation (README and topics)
+ENRICHMENT_CALLS_PER_REPO = 2
+
 
 class ToolSearcher:
     """Handles GitHub API interactions and tool repository searching."""
 
-    def __init__(self, github_token: str):
-        self.github = Github(github_token)
+    def __init__(
+        self,
+        github_token: str | list[str],
+        transport: GitHubTransport | None = None,
+    ):
+        # Requests are routed across the token pool and its rate limiters
+        self.tokens = normalize_tokens(github_token)
+        self.transport = transport or GitHubTransport(
+            [TokenPoolMiddleware(TokenPool(self.tokens))]
+        )
+        self.github = create_github_client(self.tokens[0], self.transport)
         self.session = requests.Session()
         self.session.headers.update(
             {
-                "Authorization": f"token {github_token}",
+                "Authorization": f"token {self.tokens[0]}",
                 "Accept": "application/vnd.github.v3+json",
             }
         )
+        mount_transport(self.session, self.transport)
 
     @retry_with_backoff(
         max_retries=3,
@@ -47,15 +72,16 @@ class ToolSearcher:
         ]
 
         all_candidates: list[dict] = []
-        seen_full_names: set[str] = set()
+        deduplicator = RepositoryDeduplicator(existing_tools)
 
         for query in search_queries:
             logger.info(f"Searching with query: {query}")
-            candidates = self._run_search_query(query, existing_tools, seen_full_names)
+            candidates = self._run_search_query(query, existing_tools, deduplicator)
             # Filter out any that are already in existing_tools
             filtered = [c for c in candidates if c["full_name"] not in existing_tools]
             all_candidates.extend(filtered)
 
+        deduplicator.log_summary(ENRICHMENT_CALLS_PER_REPO)
         logger.info(f"Found {len(all_candidates)} candidate tool repositories")
         return all_candidates
 
@@ -63,7 +89,7 @@ class ToolSearcher:
         self,
         query: str,
         existing_tools: set[str],
-        seen_full_names: set[str],
+        deduplicator: RepositoryDeduplicator,
     ) -> list[dict]:
         """Run a single GitHub search query and return tool candidates."""
         candidates = []
@@ -74,16 +100,19 @@ class ToolSearcher:
             )
 
             for page_num in range(1, 4):  # Limit to 3 pages to avoid timeout
-                page_results = search_results.get_page(page_num - 1)
+                with (
+                    api_stage("search"),
+                    span("search.page", query=query, page=page_num),
+                ):
+                    page_results = search_results.get_page(page_num - 1)
                 page_candidates = self._process_page_results(
-                    page_results, existing_tools, seen_full_names
+                    page_results, existing_tools, deduplicator
                 )
                 candidates.extend(page_candidates)
-                time.sleep(5)
 
         except RateLimitExceededException:
+            # The shared rate limiter already waited and retried this request
             logger.warning(f"Rate limit exceeded for query: {query}")
-            time.sleep(60)
         except Exception as e:
             logger.error(f"Error searching with query '{query}': {e}")
 
@@ -93,16 +122,20 @@ class ToolSearcher:
         self,
         page_results,
         existing_tools: set[str],
-        seen_full_names: set[str],
+        deduplicator: RepositoryDeduplicator,
     ) -> list[dict]:
         """Process a page of search results and return valid tool candidates."""
         candidates = []
 
-        for repo in page_results:
-            candidate = self._process_single_repo(repo, existing_tools)
-            if candidate and repo.full_name not in seen_full_names:
+        # Drop repositories seen on earlier pages or queries before fetching READMEs
+        for repo in deduplicator.filter(page_results):
+            with (
+                api_stage("repository", repo.full_name),
+                span("search.repository", repository=repo.full_name),
+            ):
+                candidate = self._process_single_repo(repo, existing_tools)
+            if candidate:
                 candidates.append(candidate)
-                seen_full_names.add(repo.full_name)
                 logger.info(
                     f"Found tool candidate: {repo.full_name} ({repo.stargazers_count} stars)"
                 )
@@ -124,9 +157,8 @@ class ToolSearcher:
 
     def _create_candidate_dict(self, repo, readme_content: str = "") -> dict:
         """Create a candidate dictionary from repository information."""
-        license_value = None
-        if repo.license:
-            license_value = repo.license.spdx_id if repo.license.spdx_id else None
+        license_info = raw_field(repo, "license") or {}
+        license_value = license_info.get("spdx_id") or None
 
         return {
             "full_name": repo.full_name,
@@ -136,7 +168,7 @@ class ToolSearcher:
             "stars": repo.stargazers_count,
             "forks": repo.forks_count,
             "language": repo.language,
-            "topics": repo.get_topics(),
+            "topics": self._fetch_topics(repo),
             "html_url": repo.html_url,
             "created_at": repo.created_at.isoformat(),
             "updated_at": repo.updated_at.isoformat(),
@@ -144,6 +176,11 @@ class ToolSearcher:
             "readme_content": readme_content,
         }
 
+    def _fetch_topics(self, repo) -> list[str]:
+        """Fetch the topics of a repository."""
+        with api_stage("topics"), span("search.topics"):
+            return repo.get_topics()
+
     @retry_with_backoff(
         max_retries=3,
         exceptions=(
@@ -158,7 +195,8 @@ class ToolSearcher:
 
         for path in possible_paths:
             try:
-                file_contents = repo.get_contents(path)
+                with api_stage("readme"), span("search.readme", path=path):
+                    file_contents = repo.get_contents(path)
                 return file_contents.decoded_content.decode("utf-8", errors="replace")
             except UnknownObjectException:
                 continue
@@ -6,12 +6,17 @@ Checks:
 2. GitHub repository links are valid
 3. CLAUDE.md file links are reachable
 4. Information consistency
+
+Run from the repository root as ``python -m scripts.verify_examples``.
 """
 
+import argparse
 import json
 import re
 from pathlib import Path
 
+from scripts.profiling import Profiler, add_profile_arguments, profile_stage
+
 
 def find_example_dirs() -> list[Path]:
     """Find all example directories in scenarios/"""
@@ -103,7 +108,7 @@ def verify_directory_name(
         return False, f"Expected: {expected_name}, Got: {actual_name}"
 
 
-def main():
+def verify():
     print("🔍 Verifying awesome-claude-md examples...\n")
 
     example_dirs = find_example_dirs()
@@ -184,6 +189,18 @@ def main():
     return results["failed"]
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Verify the example directories under scenarios/."
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with Profiler("verify_examples", args.profile, args.profile_dir):
+        with profile_stage("verify"):
+            return verify()
+
+
 if __name__ == "__main__":
     exit_code = main()
     exit(exit_code)
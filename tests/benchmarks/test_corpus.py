@@ -0,0 +1,68 @@
+"""Tests for the synthetic benchmark corpus."""
+
+import pytest
+
+from scripts.benchmarks.corpus import (
+    CorpusGenerator,
+    SeedMaterial,
+    format_size,
+    parse_size,
+)
+from scripts.markdown_document import parse_markdown
+
+SEED_DOCUMENT = """# Seed
+
+## Architecture
+
+A paragraph long enough to be harvested as prose for the corpus.
+
+- First bullet
+- Second bullet
+
+```python
+print("hello")
+```
+"""
+
+
+@pytest.fixture
+def generator():
+    material = SeedMaterial()
+    material.add_document(SEED_DOCUMENT)
+    return CorpusGenerator(material, seed=1)
+
+
+class TestCorpusGenerator:
+    """Test the CorpusGenerator class."""
+
+    def test_documents_are_reproducible_and_sized(self, generator):
+        """Test that documents reach their size and depend only on their key."""
+        document = generator.claude_md(4096, index=2)
+
+        assert len(document) >= 4096
+        assert document == generator.claude_md(4096, index=2)
+        assert document != generator.claude_md(4096, index=3)
+        parsed = parse_markdown(document)
+        assert parsed.section_count() > 1
+        assert parsed.code_blocks
+
+    def test_readme_has_install_and_usage_sections(self, generator):
+        """Test that generated READMEs look like tool READMEs."""
+        readme = generator.readme(2048)
+        candidate = generator.tool_candidate(readme, index=5)
+
+        assert "## Installation" in readme
+        assert "## Usage" in readme
+        assert candidate["readme_content"] == readme
+        assert candidate["full_name"] == "owner5/tool-5"
+
+
+def test_parse_and_format_size():
+    """Test size parsing and formatting round trips."""
+    assert parse_size("1KB") == 1024
+    assert parse_size("1.5mb") == 1536 * 1024
+    assert parse_size("300") == 300
+    assert format_size(5 * 1024 * 1024) == "5MB"
+    assert format_size(1000) == "1000B"
+    with pytest.raises(ValueError):
+        parse_size("big")
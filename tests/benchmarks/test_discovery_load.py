@@ -0,0 +1,45 @@
+"""Tests for the discovery load harness."""
+
+import os
+
+import pytest
+
+from scripts.benchmarks.corpus import CorpusGenerator, SeedMaterial
+from scripts.benchmarks.discovery_load import format_result, run_load
+from scripts.benchmarks.fake_github import populate
+from tests.benchmarks.test_fake_github import SEED_DOCUMENT
+
+
+@pytest.fixture
+def generator():
+    material = SeedMaterial()
+    material.add_document(SEED_DOCUMENT * 20)
+    return CorpusGenerator(material)
+
+
+class TestDiscoveryLoad:
+    """Test running the pipelines against the fake GitHub API."""
+
+    def test_file_discovery_runs_against_fake_server(self, generator):
+        """Test that sharded CLAUDE.md discovery finds and scores candidates."""
+        data = populate(60, documents=8, generator=generator)
+
+        result = run_load(data, "files", ["size", "pushed"], workers=2)
+
+        assert result["evaluated"] > 30
+        assert result["api_calls_per_candidate"] > 0
+        assert result["endpoint_calls_per_candidate"]["search_code"] > 0
+        assert result["endpoint_calls_per_candidate"]["create_issue"] > 0
+        assert result["errors"] == 0
+        assert "GITHUB_API_URL" not in os.environ
+        assert "calls/candidate" in format_result(result)
+
+    def test_tool_discovery_runs_against_fake_server(self, generator):
+        """Test that tool discovery fetches READMEs and topics per candidate."""
+        data = populate(0, tools=30, documents=8, generator=generator)
+
+        result = run_load(data, "tools", workers=2)
+
+        assert result["candidates"] > 0
+        assert result["endpoint_calls_per_candidate"]["contents"] >= 1
+        assert result["endpoint_calls_per_candidate"]["topics"] == 1
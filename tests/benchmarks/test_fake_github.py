@@ -0,0 +1,171 @@
+"""Tests for the fake GitHub API server."""
+
+import pytest
+import requests
+
+from scripts.benchmarks.corpus import CorpusGenerator, SeedMaterial
+from scripts.benchmarks.fake_github import (
+    FakeGitHubData,
+    FakeGitHubServer,
+    parse_query,
+    populate,
+)
+from scripts.discovery.enricher import RepositoryEnricher, claude_blob_text
+from scripts.discovery.transport import create_github_client
+
+SEED_DOCUMENT = """# Seed
+
+## Architecture
+
+A paragraph long enough to be harvested as prose for the corpus.
+
+- First bullet
+- Second bullet
+
+```python
+print("hello")
+```
+"""
+
+
+@pytest.fixture(scope="module")
+def data():
+    material = SeedMaterial()
+    material.add_document(SEED_DOCUMENT)
+    return populate(40, tools=10, documents=8, generator=CorpusGenerator(material))
+
+
+@pytest.fixture
+def server(data, monkeypatch):
+    with FakeGitHubServer(data) as server:
+        monkeypatch.setenv("GITHUB_API_URL", server.base_url)
+        yield server
+
+
+class TestFakeGitHubData:
+    """Test the data set and its search indexes."""
+
+    def test_parse_query(self):
+        """Test that OR joins terms into groups and qualifiers are split off."""
+        groups, qualifiers = parse_query(
+            '"CLAUDE.md" sync OR linter -language:Go size:>1000'
+        )
+
+        assert groups == [["claude.md"], ["sync", "linter"]]
+        assert qualifiers == [(True, "language", "Go"), (False, "size", ">1000")]
+
+    def test_search_code_applies_qualifiers(self, data):
+        """Test that code search filters by file name, size and stars."""
+        results = data.search_code("filename:CLAUDE.md size:2000..8000 stars:>=5")
+
+        assert results
+        for repo, file in results:
+            assert file.path.endswith("CLAUDE.md")
+            assert 2000 <= file.size <= 8000
+            assert repo.stars >= 5
+        assert len(data.search_code("filename:CLAUDE.md")) > len(results)
+
+    def test_files_have_their_own_blob_sha(self, data):
+        """Test that files sharing a pooled document still differ."""
+        shas = [file.sha for _, file in data.search_code("filename:CLAUDE.md")]
+
+        assert len(set(shas)) == len(shas)
+
+    def test_search_repositories_matches_terms_and_skips_forks(self, data):
+        """Test repository search over names and descriptions."""
+        results = data.search_repositories('"claude.md" generator OR linter')
+
+        assert results
+        for repo in results:
+            assert not repo.fork
+            assert "claude.md" in repo.description.lower()
+
+
+class TestFakeGitHubServer:
+    """Test the HTTP endpoints against the real clients."""
+
+    def test_code_search_through_pygithub(self, data, server):
+        """Test paginated code search and lazy repository completion."""
+        github = create_github_client("token", per_page=10)
+        results = github.search_code("filename:CLAUDE.md", sort="indexed")
+
+        page = results.get_page(1)
+        expected = data.search_code("filename:CLAUDE.md", "indexed")
+        assert results.totalCount == len(expected)
+        assert [hit.sha for hit in page] == [file.sha for _, file in expected[10:20]]
+
+        repo = page[0].repository
+        tree = repo.get_git_tree("HEAD", recursive=True)
+        contents = repo.get_contents(page[0].path)
+        assert repo.archived in (True, False)
+        assert page[0].path in [element.path for element in tree.tree]
+        assert contents.decoded_content.decode() == data.text(
+            repo_file(data, repo.full_name, page[0].path)
+        )
+
+    def test_search_cap(self, server):
+        """Test that pages beyond the first 1,000 results are refused."""
+        response = requests.get(
+            f"{server.base_url}/search/code",
+            params={"q": "filename:CLAUDE.md", "per_page": 100, "page": 11},
+        )
+
+        assert response.status_code == 422
+
+    def test_graphql_nodes_query(self, data, server):
+        """Test that the enricher's GraphQL query returns repository records."""
+        repo = next(iter(data.repositories.values()))
+        root = next(r for r in data.repositories.values() if "CLAUDE.md" in r.files)
+        enricher = RepositoryEnricher(requests.Session())
+
+        records = enricher.fetch_repositories([root.node_id, repo.node_id, "R_x"])
+
+        assert records[root.node_id]["nameWithOwner"] == root.full_name
+        assert claude_blob_text(records[root.node_id]) == data.text(
+            root.files["CLAUDE.md"]
+        )
+        assert "R_x" not in records
+
+    def test_issues_blobs_and_topics(self, data, server):
+        """Test issue creation, raw blobs and topics."""
+        github = create_github_client("token")
+        repo = next(r for r in data.repositories.values() if r.topics)
+        file = repo.files["README.md"]
+
+        issue = github.get_repo("josix/awesome-claude-md").create_issue(
+            title="Report", body="Body", labels=["discovery"]
+        )
+        blob = requests.get(
+            f"{server.base_url}/repos/{repo.full_name}/git/blobs/{file.sha}",
+            headers={"Accept": "application/vnd.github.raw"},
+        )
+
+        assert issue.number == 1
+        assert server.issues[0]["title"] == "Report"
+        assert blob.text == data.text(file)
+        assert github.get_repo(repo.full_name).get_topics() == repo.topics
+        assert server.stats()["endpoints"]["create_issue"] == 1
+
+    def test_rate_limits_and_errors(self):
+        """Test rate limit headers, exhausted quotas and injected errors."""
+        data = FakeGitHubData()
+        data.add_repository("owner", "repo")
+        limits = {"core": (2, 60), "search": (2, 60), "code_search": (2, 60)}
+        limits["graphql"] = (2, 60)
+
+        with FakeGitHubServer(data, rate_limits=limits) as server:
+            url = f"{server.base_url}/repos/owner/repo"
+            responses = [requests.get(url) for _ in range(3)]
+        with FakeGitHubServer(data, error_rate=1.0) as server:
+            failed = requests.get(f"{server.base_url}/repos/owner/repo")
+            stats = server.stats()
+
+        assert [r.status_code for r in responses] == [200, 200, 403]
+        assert responses[0].headers["X-RateLimit-Remaining"] == "1"
+        assert responses[2].headers["X-RateLimit-Remaining"] == "0"
+        assert failed.status_code == 502
+        assert stats["errors"] == 1
+
+
+def repo_file(data, full_name, path):
+    return data.repositories[full_name.lower()].files[path]
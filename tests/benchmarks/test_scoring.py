@@ -0,0 +1,52 @@
+"""Tests for the scoring benchmark."""
+
+from scripts.benchmarks.scoring import compare, main, run_benchmarks
+
+
+class TestScoringBenchmark:
+    """Test the scoring benchmark runner."""
+
+    def test_run_benchmarks_reports_every_tier(self):
+        """Test that both evaluators report throughput, memory and components."""
+        results = run_benchmarks([1024, 2048], docs=2, repeat=1)
+
+        repository = results["results"]["repository"]["1KB"]
+        assert repository["docs"] == 2
+        assert repository["docs_per_sec"] > 0
+        assert repository["peak_bytes"] > 0
+        assert set(repository["components_ms"]) >= {
+            "content_depth",
+            "suggest_category",
+        }
+        assert "readme_quality" in results["results"]["tool"]["2KB"]["components_ms"]
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        """Test that only slowdowns and memory growth past the tolerance count."""
+        baseline = {
+            "results": {
+                "tool": {"1KB": {"docs_per_sec": 100.0, "peak_bytes": 1000}},
+            }
+        }
+        within = {
+            "results": {
+                "tool": {"1KB": {"docs_per_sec": 80.0, "peak_bytes": 1200}},
+                "repository": {"1KB": {"docs_per_sec": 1.0, "peak_bytes": 1}},
+            }
+        }
+        beyond = {
+            "results": {
+                "tool": {"1KB": {"docs_per_sec": 70.0, "peak_bytes": 1300}},
+            }
+        }
+
+        assert compare(within, baseline, tolerance=0.25) == []
+        assert len(compare(beyond, baseline, tolerance=0.25)) == 2
+
+    def test_main_writes_baseline(self, tmp_path):
+        """Test writing a baseline and comparing a later run with it."""
+        baseline = tmp_path / "baseline.json"
+        args = ["--sizes", "1KB", "--docs", "1", "--repeat", "1"]
+
+        assert main([*args, "--baseline", str(baseline), "--write-baseline"]) == 0
+        assert baseline.exists()
+        assert main([*args, "--baseline", str(baseline), "--tolerance", "1"]) == 0
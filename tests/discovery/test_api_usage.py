@@ -0,0 +1,118 @@
+"""Tests for per-stage GitHub API usage accounting."""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from scripts.discovery.api_usage import (
+    UNATTRIBUTED,
+    ApiUsage,
+    ApiUsageMiddleware,
+    api_stage,
+    current_stage,
+    percentile,
+)
+from scripts.discovery.rate_limiter import RateLimiter, RateLimitMiddleware
+from scripts.discovery.transport import build_response
+
+
+def _request(url="https://api.github.com/repos/owner/repo"):
+    return requests.Request("GET", url).prepare()
+
+
+def _send(request, **kwargs):
+    return build_response(request, 200, {}, b"x" * 100)
+
+
+class TestApiStage:
+    """Test attributing requests to stages and candidates."""
+
+    def test_nested_stage_keeps_candidate(self):
+        """Test that an inner stage without a candidate keeps the outer one."""
+        with api_stage("repository", "owner/repo"):
+            with api_stage("topics"):
+                assert current_stage() == ("topics", "owner/repo")
+            assert current_stage() == ("repository", "owner/repo")
+        assert current_stage() == (UNATTRIBUTED, None)
+
+    def test_stage_is_per_thread(self):
+        """Test that a stage set in one thread does not leak into another."""
+        with api_stage("search"), ThreadPoolExecutor(1) as executor:
+            assert executor.submit(current_stage).result() == (UNATTRIBUTED, None)
+
+    def test_percentile(self):
+        values = [0.1 * i for i in range(1, 21)]
+
+        assert percentile([], 0.5) == 0.0
+        assert percentile(values, 0.5) == pytest.approx(1.0)
+        assert percentile(values, 0.95) == pytest.approx(1.9)
+
+
+class TestApiUsageMiddleware:
+    """Test recording requests through the transport middleware."""
+
+    def test_records_calls_per_stage_and_candidate(self):
+        """Test calls, bytes and candidates are charged to the current stage."""
+        usage = ApiUsage()
+        middleware = ApiUsageMiddleware(usage)
+
+        with api_stage("search"):
+            middleware.handle(_request(), send=_send)
+        for name in ("a/one", "a/one", "b/two"):
+            with api_stage("repository", name):
+                middleware.handle(_request(), send=_send)
+        summary = usage.summary()
+
+        assert summary["stages"]["search"]["calls"] == 1
+        assert summary["stages"]["search"]["calls_per_candidate"] is None
+        assert summary["stages"]["repository"]["bytes"] == 300
+        assert summary["stages"]["repository"]["calls_per_candidate"] == 1.5
+        assert summary["total"]["calls"] == 4
+        assert summary["costliest_candidates"][0] == {"candidate": "a/one", "calls": 2}
+
+    def test_failed_request_is_counted_as_error(self):
+        """Test that a request raising a network error is recorded and re-raised."""
+        usage = ApiUsage()
+        middleware = ApiUsageMiddleware(usage)
+
+        def send(request, **kwargs):
+            raise requests.exceptions.ConnectionError("reset")
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            middleware.handle(_request(), send=send)
+
+        assert usage.summary()["stages"][UNATTRIBUTED]["errors"] == 1
+
+    def test_reads_retries_and_waits_from_rate_limiter(self):
+        """Test that resends and limiter waits are reported apart from latency."""
+        usage = ApiUsage()
+        limiter = RateLimitMiddleware(RateLimiter())
+        middleware = ApiUsageMiddleware(usage)
+        responses = iter([429, 200])
+
+        def send(request, **kwargs):
+            return build_response(request, next(responses), {"Retry-After": "2"}, b"")
+
+        with patch("time.sleep"), api_stage("evaluate", "owner/repo"):
+            response = middleware.handle(
+                _request(),
+                send=lambda request, **kwargs: limiter.handle(request, send, **kwargs),
+            )
+        stage = usage.summary()["stages"]["evaluate"]
+
+        assert response.status_code == 200
+        assert stage["calls"] == 1
+        assert stage["retries"] == 1
+        assert stage["rate_limit_wait_seconds"] >= 1
+        assert stage["errors"] == 0
+
+    def test_save_writes_json(self, tmp_path):
+        usage = ApiUsage()
+        usage.record("readme", "owner/repo", 0.05, 10, 404)
+        path = tmp_path / "usage.json"
+
+        usage.save(path)
+
+        assert '"errors": 1' in path.read_text()
@@ -0,0 +1,73 @@
+"""Tests for vectorized batch scoring."""
+
+import pytest
+
+from scripts.discovery.evaluator import RepositoryEvaluator
+from scripts.discovery.features import FEATURE_NAMES, extract_features
+
+np = pytest.importorskip("numpy")
+
+from scripts.discovery.batch_scoring import BatchScorer, feature_matrix  # noqa: E402
+
+DOCUMENTS = [
+    "",
+    "Short note.",
+    "## Architecture\n## Setup\n## Testing\n## FAQ\nUse pytest instead of nose.\n"
+    "```python\nrun()\n```\nFor example, `src/app.py` calls main() and load().\n"
+    "You are a careful reviewer. Never skip tests. Always lint. Do not push.\n",
+    "# Guide\n" + "### Step\n" * 9 + "pip install x\nThe goal is a stable design "
+    "pattern and best practice methodology. We deliberately chose not to.\n"
+    + "x"
+    * 3200,
+]
+
+CANDIDATES = [
+    {
+        "owner": "google",
+        "organization": None,
+        "stars": 1500,
+        "updated_at": "2000-01-01T00:00:00Z",
+        "description": "Production automation platform",
+        "topics": ["ci/cd"],
+    },
+    {
+        "owner": "someone",
+        "organization": "stripe",
+        "stars": 600,
+        "updated_at": "2000-01-01T00:00:00Z",
+        "description": "",
+        "topics": [],
+    },
+]
+
+
+def _pairs():
+    for candidate in CANDIDATES:
+        for content in DOCUMENTS:
+            yield {**candidate, "full_name": "o/r"}, content
+
+
+def test_feature_matrix_columns_follow_feature_names():
+    """Test that each row lists features in FEATURE_NAMES order."""
+    rows = [dict.fromkeys(FEATURE_NAMES, 0) | {"stars": 7}]
+
+    matrix = feature_matrix(rows)
+
+    assert matrix.shape == (1, len(FEATURE_NAMES))
+    assert matrix[0, FEATURE_NAMES.index("stars")] == 7
+    assert feature_matrix([]).shape == (0, len(FEATURE_NAMES))
+
+
+@pytest.mark.parametrize("content_depth_weight", [30, 12])
+def test_batch_scores_match_evaluator(content_depth_weight):
+    """Test that vectorized scores equal per-candidate scores, weights included."""
+    evaluator = RepositoryEvaluator(None)
+    evaluator.content_depth_weight = content_depth_weight
+    pairs = list(_pairs())
+
+    expected = [evaluator.score_candidate(c, content)["score"] for c, content in pairs]
+    matrix = feature_matrix(extract_features(c, content) for c, content in pairs)
+    scorer = BatchScorer(evaluator)
+
+    assert scorer.score(matrix).tolist() == expected
+    assert scorer.score_candidates(pairs).tolist() == expected
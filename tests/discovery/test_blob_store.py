@@ -0,0 +1,88 @@
+"""Tests for the content-addressed blob store."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scripts.discovery.blob_store import BlobStore, git_blob_sha, resolve_compression
+
+
+class TestBlobStore:
+    """Test the BlobStore class."""
+
+    def test_git_blob_sha(self):
+        """Test that SHAs match git's blob hashing (git hash-object)."""
+        assert git_blob_sha(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+    @pytest.mark.parametrize("compression", ["gzip", "none"])
+    def test_round_trip_on_disk(self, tmp_path, compression):
+        """Test that blobs persist across store instances."""
+        store = BlobStore(tmp_path, compression=compression)
+        store.put_text("abcdef", "# CLAUDE.md\n")
+
+        reloaded = BlobStore(tmp_path, compression="none")
+
+        assert "abcdef" in reloaded
+        assert reloaded.get_text("abcdef") == "# CLAUDE.md\n"
+        assert (tmp_path / "ab").is_dir()
+
+    def test_memory_store(self):
+        """Test the in-process store used when no directory is configured."""
+        store = BlobStore()
+        store.put("sha1", b"data")
+
+        assert store.get("sha1") == b"data"
+        assert store.get("missing") is None
+        assert store.stats() == {"hits": 1, "misses": 1, "writes": 1, "evictions": 0}
+
+    def test_binary_blob_has_no_text(self, tmp_path):
+        """Test that non UTF-8 blobs are not returned as text."""
+        store = BlobStore(tmp_path)
+        store.put("bin", b"\xff\xfe\x00")
+
+        assert store.get_text("bin") is None
+
+    def test_corrupt_blob_is_discarded(self, tmp_path):
+        """Test that unreadable compressed files are treated as missing."""
+        store = BlobStore(tmp_path, compression="gzip")
+        path = tmp_path / "ab" / "cd.gz"
+        path.parent.mkdir()
+        path.write_bytes(b"not gzip")
+
+        assert store.get("abcd") is None
+        assert not path.exists()
+
+    def test_concurrent_puts_of_one_blob(self, tmp_path):
+        """Test that threads writing the same SHA leave one complete file."""
+        store = BlobStore(tmp_path, compression="none")
+        data = b"# CLAUDE.md\n" * 10_000
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda _: store.put("abcdef", data), range(32)))
+
+        assert store.get("abcdef") == data
+        assert [p.name for p in (tmp_path / "ab").iterdir()] == ["cdef"]
+
+    def test_prune_evicts_least_recently_read(self, tmp_path):
+        """Test that prune deletes the oldest blobs and stray temporary files."""
+        store = BlobStore(tmp_path, compression="none", max_bytes=250)
+        for index, sha in enumerate(["aa01", "aa02", "aa03"]):
+            store.put(sha, b"x" * 100)
+            os.utime(tmp_path / "aa" / sha[2:], (index, index))
+        (tmp_path / "aa" / "04.123.tmp").write_bytes(b"partial")
+        store.get("aa01")
+
+        assert store.prune() == 1
+        assert "aa02" not in store
+        assert "aa01" in store and "aa03" in store
+        assert not list(tmp_path.glob("*/*.tmp"))
+        assert store.stats()["evictions"] == 1
+
+    def test_resolve_compression(self):
+        """Test compression names are validated."""
+        assert resolve_compression("none") == "none"
+        assert resolve_compression(None) == "none"
+        assert resolve_compression("auto") in ("zstd", "gzip")
+        with pytest.raises(ValueError):
+            resolve_compression("lz4")
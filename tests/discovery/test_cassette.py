@@ -0,0 +1,117 @@
+"""Tests for GitHub API record/replay cassettes."""
+
+import json
+
+import pytest
+import requests
+
+from scripts.discovery.cassette import (
+    Cassette,
+    CassetteMiddleware,
+    CassetteMiss,
+    request_key,
+)
+from scripts.discovery.transport import (
+    GitHubTransport,
+    build_response,
+    create_github_client,
+)
+
+REPO_URL = "https://api.github.com/repos/owner/repo"
+
+
+class FakeServer:
+    """Callable standing in for the network; counts the requests it answers."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, request, **kwargs):
+        self.calls += 1
+        body = json.dumps(
+            {"full_name": "owner/repo", "name": "repo", "calls": self.calls}
+        )
+        return build_response(
+            request,
+            200,
+            {"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            body.encode(),
+        )
+
+
+def _request(method="GET", url=REPO_URL, **kwargs):
+    return requests.Request(method, url, **kwargs).prepare()
+
+
+class TestCassette:
+    """Test recording, replaying and request keys."""
+
+    def test_record_then_replay_in_order(self, tmp_path):
+        """Test that replays return recorded responses in order, then the last."""
+        path = tmp_path / "run.jsonl.gz"
+        server = FakeServer()
+        recorder = CassetteMiddleware(Cassette(path, mode="record"))
+        recorder.handle(_request(headers={"Authorization": "token secret"}), server)
+        recorder.handle(_request(), server)
+        recorder.cassette.close()
+
+        replayer = CassetteMiddleware(Cassette(path))
+        responses = [replayer.handle(_request(), send=None) for _ in range(3)]
+
+        assert [r.json()["calls"] for r in responses] == [1, 2, 2]
+        assert "content-encoding" not in responses[0].headers
+        assert replayer.cassette.stats() == {
+            "recorded": 0,
+            "replayed": 3,
+            "misses": 0,
+        }
+        assert b"secret" not in path.read_bytes()
+
+    def test_replay_miss_raises(self, tmp_path):
+        """Test that an unrecorded request fails like a network error."""
+        path = tmp_path / "empty.jsonl.gz"
+        Cassette(path, mode="record").close()
+
+        cassette = Cassette(path)
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            cassette.replay(request_key(_request()), _request())
+        with pytest.raises(CassetteMiss):
+            CassetteMiddleware(cassette).handle(_request(), send=None)
+        assert cassette.misses == 2
+
+    def test_request_key_ignores_query_order_and_hashes_body(self):
+        """Test that keys match reordered queries and tell bodies apart."""
+        first = _request(url=f"{REPO_URL}/contents?ref=main&path=CLAUDE.md")
+        second = _request(url=f"{REPO_URL}/contents?path=CLAUDE.md&ref=main")
+        query_a = _request("POST", "https://api.github.com/graphql", json={"q": "a"})
+        query_b = _request("POST", "https://api.github.com/graphql", json={"q": "b"})
+
+        assert request_key(first) == request_key(second)
+        assert request_key(query_a) != request_key(query_b)
+
+    def test_pygithub_replays_offline(self, tmp_path):
+        """Test that a PyGithub client is served entirely from the cassette."""
+        path = tmp_path / "run.jsonl.gz"
+        recorder = Cassette(path, mode="record")
+        CassetteMiddleware(recorder).handle(_request(), FakeServer())
+        recorder.close()
+
+        transport = GitHubTransport([CassetteMiddleware(Cassette(path))])
+        github = create_github_client("unused", transport)
+
+        assert github.get_repo("owner/repo").name == "repo"
+
+    def test_cassette_sits_in_front_of_the_cache(self, tmp_path):
+        """Test that replays bypass the HTTP cache and the token pool."""
+        from scripts.discovery.http_cache import HTTPCache
+        from scripts.discovery.orchestrator import build_transport
+
+        path = tmp_path / "run.jsonl.gz"
+        Cassette(path, mode="record").close()
+        transport = build_transport(
+            "token", HTTPCache(tmp_path / "cache.sqlite3"), Cassette(path)
+        )
+
+        assert isinstance(transport.middleware[0], CassetteMiddleware)
+        assert len(transport.middleware) == 4
@@ -0,0 +1,67 @@
+"""Tests for search hit deduplication."""
+
+from unittest.mock import Mock
+
+from scripts.discovery.dedupe import RepositoryDeduplicator
+
+
+def make_repo(full_name, **raw):
+    repo = Mock()
+    repo.full_name = full_name
+    repo._rawData = {"full_name": full_name, **raw}
+    return repo
+
+
+class TestRepositoryDeduplicator:
+    """Test the RepositoryDeduplicator class."""
+
+    def test_filter_collapses_duplicates_in_order(self):
+        """Test that each repository is admitted once, first occurrence first."""
+        deduplicator = RepositoryDeduplicator()
+        repos = [make_repo("a/one"), make_repo("b/two"), make_repo("A/One")]
+
+        assert [r.full_name for r in deduplicator.filter(repos)] == ["a/one", "b/two"]
+        assert deduplicator.counts["duplicate"] == 1
+        assert deduplicator.saved_calls(3) == 3
+
+    def test_drops_existing_forks_and_mirrors(self):
+        """Test that known, forked and mirrored repositories are dropped."""
+        deduplicator = RepositoryDeduplicator({"Owner/Existing"})
+        repos = [
+            make_repo("owner/existing"),
+            make_repo("someone/fork", fork=True),
+            make_repo("someone/mirror", mirror_url="https://git.example.com/x"),
+            make_repo("someone/original", fork=False, mirror_url=None),
+        ]
+
+        admitted = deduplicator.filter(repos)
+
+        assert [r.full_name for r in admitted] == ["someone/original"]
+        assert deduplicator.counts == {
+            "existing": 1,
+            "fork": 1,
+            "mirror": 1,
+            "admitted": 1,
+        }
+        assert deduplicator.saved_calls(2) == 0
+
+    def test_filter_with_accessor(self):
+        """Test deduplicating search hits through their repository."""
+        deduplicator = RepositoryDeduplicator()
+        hits = [Mock(repository=make_repo("a/b")), Mock(repository=make_repo("a/b"))]
+
+        assert len(deduplicator.filter(hits, lambda hit: hit.repository)) == 1
+
+    def test_excluded_duplicates_do_not_count_as_saved(self):
+        """Test that repeats of dropped repositories are not counted as duplicates."""
+        deduplicator = RepositoryDeduplicator({"owner/existing"})
+        repos = [
+            make_repo("owner/existing"),
+            make_repo("owner/existing"),
+            make_repo("someone/fork", fork=True),
+            make_repo("someone/fork", fork=True),
+        ]
+
+        assert deduplicator.filter(repos) == []
+        assert deduplicator.counts == {"existing": 2, "fork": 2}
+        assert deduplicator.saved_calls(3) == 0
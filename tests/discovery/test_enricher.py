@@ -0,0 +1,121 @@
+"""Tests for the batched GraphQL repository enricher."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from scripts.discovery.enricher import (
+    GraphQLError,
+    RepositoryEnricher,
+    candidate_from_record,
+    claude_blob_text,
+)
+
+
+def make_record(node_id="R_1", full_name="owner/repo", **overrides):
+    """Build a GraphQL repository record as returned by the nodes query."""
+    record = {
+        "id": node_id,
+        "nameWithOwner": full_name,
+        "name": full_name.split("/")[1],
+        "owner": {"__typename": "Organization", "login": full_name.split("/")[0]},
+        "description": "Test repository",
+        "stargazerCount": 120,
+        "forkCount": 7,
+        "primaryLanguage": {"name": "Python"},
+        "repositoryTopics": {"nodes": [{"topic": {"name": "ai"}}]},
+        "url": f"https://github.com/{full_name}",
+        "createdAt": "2023-01-01T00:00:00Z",
+        "updatedAt": "2023-12-01T00:00:00Z",
+        "isArchived": False,
+        "isFork": False,
+        "licenseInfo": {"spdxId": "MIT"},
+        "claudeFile": {
+            "oid": "abc123",
+            "byteSize": 2048,
+            "text": "# CLAUDE.md",
+            "isBinary": False,
+            "isTruncated": False,
+        },
+    }
+    record.update(overrides)
+    return record
+
+
+def graphql_response(nodes, errors=None):
+    response = Mock()
+    response.json.return_value = {"data": {"nodes": nodes}, "errors": errors}
+    return response
+
+
+class TestRepositoryEnricher:
+    """Test the RepositoryEnricher class."""
+
+    def test_fetch_repositories_batches_node_ids(self):
+        """Test that node IDs are deduplicated and sent in batches."""
+        session = Mock()
+        session.post.side_effect = [
+            graphql_response([make_record("R_1"), make_record("R_2")]),
+            graphql_response([make_record("R_3")]),
+        ]
+        enricher = RepositoryEnricher(session, batch_size=2)
+
+        records = enricher.fetch_repositories(["R_1", "R_2", "R_1", "R_3"])
+
+        assert set(records) == {"R_1", "R_2", "R_3"}
+        assert enricher.queries_sent == 2
+        first_ids = session.post.call_args_list[0].kwargs["json"]["variables"]["ids"]
+        assert first_ids == ["R_1", "R_2"]
+
+    def test_fetch_repositories_skips_null_nodes(self):
+        """Test that unresolvable nodes in a partial response are skipped."""
+        session = Mock()
+        session.post.return_value = graphql_response(
+            [make_record("R_1"), None], errors=[{"message": "Could not resolve"}]
+        )
+
+        records = RepositoryEnricher(session).fetch_repositories(["R_1", "R_2"])
+
+        assert list(records) == ["R_1"]
+
+    def test_fetch_repositories_raises_without_data(self):
+        """Test that a response without data raises GraphQLError."""
+        session = Mock()
+        session.post.return_value.json.return_value = {
+            "errors": [{"message": "Bad credentials"}]
+        }
+
+        with pytest.raises(GraphQLError):
+            RepositoryEnricher(session).fetch_repositories(["R_1"])
+
+    def test_candidate_from_record(self):
+        """Test converting a GraphQL record into a candidate dictionary."""
+        candidate = candidate_from_record(make_record(), "CLAUDE.md")
+
+        assert candidate["full_name"] == "owner/repo"
+        assert candidate["owner"] == "owner"
+        assert candidate["organization"] == "owner"
+        assert candidate["stars"] == 120
+        assert candidate["language"] == "Python"
+        assert candidate["topics"] == ["ai"]
+        assert candidate["claude_file_path"] == "CLAUDE.md"
+        assert candidate["claude_file_sha"] == "abc123"
+        assert claude_blob_text(make_record()) == "# CLAUDE.md"
+
+    def test_candidate_from_record_user_owner_and_truncated_blob(self):
+        """Test that user owners have no organization and truncated text is dropped."""
+        record = make_record(
+            owner={"__typename": "User", "login": "someone"},
+            claudeFile={
+                "oid": "abc",
+                "byteSize": 9000000,
+                "text": "partial",
+                "isBinary": False,
+                "isTruncated": True,
+            },
+        )
+
+        candidate = candidate_from_record(record, "CLAUDE.md")
+
+        assert candidate["organization"] is None
+        assert claude_blob_text(record) is None
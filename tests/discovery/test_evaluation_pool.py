@@ -0,0 +1,74 @@
+"""Tests for the concurrent evaluation pool."""
+
+import time
+
+from scripts.discovery.evaluation_pool import EvaluationPool
+from scripts.discovery.evaluator import RepositoryEvaluator, evaluate_repository
+
+
+class TestEvaluationPool:
+    """Test the EvaluationPool class."""
+
+    def test_results_keep_input_order(self):
+        """Test that slow early items do not reorder the output."""
+        pool = EvaluationPool(workers=4)
+
+        def score(item):
+            time.sleep(0.01 * (5 - item))
+            return item * 10
+
+        assert list(pool.map(range(6), score)) == [0, 10, 20, 30, 40, 50]
+
+    def test_failure_is_isolated(self):
+        """Test that one failing candidate does not affect the others."""
+        pool = EvaluationPool(workers=2)
+
+        def score(candidate):
+            if candidate["full_name"] == "bad/repo":
+                raise RuntimeError("boom")
+            return candidate["full_name"]
+
+        candidates = [{"full_name": n} for n in ("a/one", "bad/repo", "b/two")]
+
+        assert list(pool.map(candidates, score)) == ["a/one", None, "b/two"]
+        assert pool.failures == 1
+
+    def test_prepare_rejection(self):
+        """Test that a candidate rejected while preparing yields None."""
+        pool = EvaluationPool(workers=2)
+
+        results = pool.map(
+            [1, -1, 2],
+            score=lambda value: value * 2,
+            prepare=lambda value: (value,) if value > 0 else None,
+        )
+
+        assert list(results) == [2, None, 4]
+
+    def test_process_pool_scoring(self):
+        """Test scoring prepared candidates in worker processes."""
+        candidate = {
+            "full_name": "owner/repo",
+            "name": "repo",
+            "owner": "owner",
+            "stars": 150,
+            "html_url": "https://github.com/owner/repo",
+            "claude_file_path": "CLAUDE.md",
+            "description": "A web framework",
+            "updated_at": "2024-01-01T00:00:00Z",
+        }
+        content = "# CLAUDE.md\n\n## Architecture\n\nUses `pytest` for testing.\n"
+        pool = EvaluationPool(workers=2, processes=1)
+
+        [(evaluation, profile)] = list(
+            pool.map(
+                [candidate],
+                evaluate_repository,
+                prepare=lambda c: (c, content),
+            )
+        )
+
+        expected = RepositoryEvaluator(None).score_candidate(candidate, content)
+        assert evaluation["score"] == expected["score"]
+        assert evaluation["reasons"] == expected["reasons"]
+        assert profile.features["content_length"] == len(content)
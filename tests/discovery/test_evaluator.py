@@ -5,7 +5,13 @@ from unittest.mock import Mock
 
 import pytest
 
-from scripts.discovery.evaluator import RepositoryEvaluator
+from scripts.discovery.evaluator import RepositoryEvaluator, evaluate_repository
+from scripts.discovery.feature_cache import FeatureCache
+from scripts.discovery.features import (
+    ALL_CATEGORY_KEYWORDS,
+    extract_content_features,
+    extract_content_profile,
+)
 
 
 class TestRepositoryEvaluator:
@@ -100,7 +106,9 @@ class TestRepositoryEvaluator:
             + "x" * 3000
         )  # Make it substantial
 
-        score, reasons = evaluator._calculate_content_depth_score(comprehensive_content)
+        score, reasons = evaluator._calculate_content_depth_score(
+            extract_content_features(comprehensive_content)
+        )
         assert (
             score >= 20
         )  # Should get points for arch, dev, testing, troubleshooting, and length
@@ -110,7 +118,9 @@ class TestRepositoryEvaluator:
 
     def test_calculate_content_depth_score_empty(self, evaluator):
         """Test content depth score calculation with empty content."""
-        score, reasons = evaluator._calculate_content_depth_score("")
+        score, reasons = evaluator._calculate_content_depth_score(
+            extract_content_features("")
+        )
         assert score == 0
         assert len(reasons) == 0
 
@@ -147,7 +157,7 @@ class TestRepositoryEvaluator:
 
         candidate = {"description": "Educational example showing best practices"}
         score, reasons = evaluator._calculate_educational_value_score(
-            educational_content, candidate
+            extract_content_features(educational_content), candidate
         )
         assert score >= 15  # Should get points for patterns, examples, and guidance
         assert any(
@@ -250,7 +260,9 @@ class TestRepositoryEvaluator:
         npm test
         """
 
-        score, reasons = evaluator._calculate_ai_effectiveness_score(content)
+        score, reasons = evaluator._calculate_ai_effectiveness_score(
+            extract_content_features(content)
+        )
         # Should earn: sections (0), pkg manager (3), constraints (4)
         assert score >= 7
         assert any(
@@ -273,7 +285,9 @@ class TestRepositoryEvaluator:
         pip install -r requirements.txt
         """
 
-        score, reasons = evaluator._calculate_ai_effectiveness_score(content)
+        score, reasons = evaluator._calculate_ai_effectiveness_score(
+            extract_content_features(content)
+        )
         # Should earn: sections (3), pkg manager (3), context (2), role/methodology (2)
         assert score >= 10
         assert any("role" in r.lower() or "methodology" in r.lower() for r in reasons)
@@ -292,7 +306,9 @@ class TestRepositoryEvaluator:
         Run build() to compile.
         """
 
-        score, reasons = evaluator._calculate_content_depth_score(content)
+        score, reasons = evaluator._calculate_content_depth_score(
+            extract_content_features(content)
+        )
         # Should earn: architecture (8), file/function navigation (4)
         assert score >= 12
         assert any("navigation" in r.lower() or "file" in r.lower() for r in reasons)
@@ -312,7 +328,7 @@ class TestRepositoryEvaluator:
 
         candidate = {"description": "A deployment tool"}
         score, reasons = evaluator._calculate_educational_value_score(
-            content_code_only, candidate
+            extract_content_features(content_code_only), candidate
         )
         # Code snippets (5) + advanced keywords (5 for "pattern" and "best practice") = 10
         # No "example" keyword, so code_example_score = 5 not 8
@@ -336,7 +352,7 @@ class TestRepositoryEvaluator:
 
         candidate = {"description": "Database toolkit"}
         score, reasons = evaluator._calculate_educational_value_score(
-            content, candidate
+            extract_content_features(content), candidate
         )
         # Should earn: advanced (5 for "pattern"+"best practice"), code (5), rejection (3)
         assert score >= 13
@@ -362,3 +378,146 @@ class TestRepositoryEvaluator:
         assert score == 8
         assert not any("stars" in r.lower() for r in reasons)
         assert any("recently updated" in r.lower() for r in reasons)
+
+    def test_resolve_claude_content_prefers_blob_sha(self, evaluator):
+        """Test that a known blob SHA is read without fetching the repository."""
+        evaluator.github_searcher.read_blob.return_value = "# From the blob store"
+        candidate = {"full_name": "owner/repo", "claude_file_sha": "abc"}
+
+        content = evaluator._resolve_claude_content(candidate)
+
+        assert content == "# From the blob store"
+        evaluator.github_searcher.read_blob.assert_called_once_with("owner/repo", "abc")
+        evaluator.github_searcher.github.get_repo.assert_not_called()
+
+    def test_resolve_claude_content_without_sha_fetches_repo(self, evaluator):
+        """Test the REST fallback for candidates without a blob SHA."""
+        repo = evaluator.github_searcher.github.get_repo.return_value
+        repo.get_contents.return_value.decoded_content = b"# Fetched"
+        candidate = {"full_name": "owner/repo", "claude_file_path": "CLAUDE.md"}
+
+        assert evaluator._resolve_claude_content(candidate) == "# Fetched"
+        evaluator.github_searcher.read_blob.assert_not_called()
+
+    def test_weak_metadata_candidate_is_still_scored(self, evaluator):
+        """Test that stale, unstarred candidates are fetched and scored on content."""
+        candidate = {
+            "full_name": "owner/repo",
+            "name": "repo",
+            "owner": "owner",
+            "stars": 1,
+            "html_url": "https://github.com/owner/repo",
+            "claude_file_path": "CLAUDE.md",
+            "updated_at": "2020-01-01T00:00:00Z",
+        }
+        repo = evaluator.github_searcher.github.get_repo.return_value
+        repo.get_contents.return_value.decoded_content = b"## Architecture\n"
+
+        evaluation = evaluator.evaluate_candidate(candidate)
+
+        assert evaluation["score"] == 8 + 5
+        assert evaluator.fetched == 1
+
+    def test_scan_keywords_separates_content_from_metadata(self, evaluator):
+        """Test that one scan serves both category and content-only checks."""
+        candidate = {
+            "description": "Deliberately tiny tutorial",
+            "topics": ["Demo"],
+            "language": "Go",
+        }
+        content = "## Architecture\nA starter kit."
+
+        hits, content_hits = evaluator.scan_keywords(candidate, content)
+
+        assert "deliberately" in hits
+        assert "deliberately" not in content_hits
+        assert "architecture" in content_hits
+        assert content_hits.count_present(["tutorial", "demo", "starter"]) == 1
+        assert extract_content_features(
+            content, content_hits
+        ) == extract_content_features(content)
+        assert evaluator._suggest_category(candidate, content, hits) == (
+            "getting-started"
+        )
+
+    def test_calculate_ai_effectiveness_counts_real_headings(self, evaluator):
+        """Test that section counts use headings, not every '##' in the text."""
+        nested = "\n".join(f"### Section {i}" for i in range(4))
+        fenced = "```\n" + "\n".join(f"## Fake {i}" for i in range(8)) + "\n```"
+
+        nested_score, _ = evaluator._calculate_ai_effectiveness_score(
+            extract_content_features(nested)
+        )
+        fenced_score, fenced_reasons = evaluator._calculate_ai_effectiveness_score(
+            extract_content_features(fenced)
+        )
+
+        # Four ### headings are four sections, not enough for the top tier
+        assert nested_score == 3
+        assert not any("section" in reason.lower() for reason in fenced_reasons)
+        assert fenced_score == 0
+
+    def test_evaluate_candidate_uses_feature_cache(self, tmp_path):
+        """Test that a cached profile is scored without reading the blob."""
+        searcher = Mock()
+        searcher.read_blob.return_value = (
+            "# Service\n\n## Architecture\n\nA distributed api platform.\n"
+        )
+        evaluator = RepositoryEvaluator(
+            searcher, feature_cache=FeatureCache(tmp_path / "features.sqlite3")
+        )
+        candidate = {
+            "full_name": "owner/repo",
+            "name": "repo",
+            "owner": "owner",
+            "stars": 40,
+            "html_url": "https://github.com/owner/repo",
+            "claude_file_path": "CLAUDE.md",
+            "claude_file_sha": extract_content_profile(
+                searcher.read_blob.return_value
+            ).blob_sha,
+            "description": "A tutorial",
+            "topics": ["cli"],
+            "updated_at": "2024-01-01T00:00:00Z",
+        }
+
+        first = evaluator.evaluate_candidate(candidate)
+        second = evaluator.evaluate_candidate(candidate)
+
+        searcher.read_blob.assert_called_once()
+        assert evaluator.feature_cache.stats()["hits"] == 1
+        assert second == first
+        # Process mode hands the cached profile to the worker instead of content
+        assert evaluator.prepare_candidate(candidate) == (
+            candidate,
+            extract_content_profile(searcher.read_blob.return_value),
+        )
+
+    def test_score_profile_matches_score_candidate(self, evaluator):
+        """Test that scoring a profile equals scoring the content itself."""
+        candidate = {
+            "full_name": "owner/repo",
+            "owner": "owner",
+            "stars": 300,
+            "description": "Example sdk",
+            "topics": ["cli", "starter"],
+            "language": "Rust",
+            "updated_at": "2024-01-01T00:00:00Z",
+        }
+        content = (
+            "# SDK\n\n## Development\n\n```bash\nnpm test\n```\n"
+            "Prefer rust over go. A distributed platform with a build step.\n"
+        )
+
+        profile = extract_content_profile(content)
+        evaluation, extracted = evaluate_repository(candidate, content)
+
+        assert evaluator.score_profile(candidate, profile) == (
+            evaluator.score_candidate(candidate, content)
+        )
+        assert extracted == profile
+        assert evaluate_repository(candidate, profile) == (evaluation, None)
+
+    def test_category_keywords_cannot_span_metadata_and_content(self):
+        """Test the invariant that lets metadata and content be scanned apart."""
+        assert not any(" " in keyword for keyword in ALL_CATEGORY_KEYWORDS)
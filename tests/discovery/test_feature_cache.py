@@ -0,0 +1,58 @@
+"""Tests for the persistent feature cache."""
+
+from scripts.discovery.feature_cache import FeatureCache
+from scripts.discovery.features import (
+    content_extractor_version,
+    extract_content_profile,
+)
+
+CONTENT = "# Tool\n\n## Architecture\n\nA cli tool for the api.\n"
+
+
+class TestFeatureCache:
+    """Test the FeatureCache class."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored profile is read back unchanged by a new instance."""
+        path = tmp_path / "features.sqlite3"
+        profile = extract_content_profile(CONTENT)
+        cache = FeatureCache(path)
+        cache.put(profile)
+        cache.close()
+
+        reloaded = FeatureCache(path)
+
+        assert reloaded.version == content_extractor_version()
+        assert reloaded.get(profile.blob_sha) == profile
+        assert reloaded.get("missing") is None
+        assert reloaded.get(None) is None
+        assert reloaded.stats() == {
+            "hits": 1,
+            "misses": 2,
+            "writes": 0,
+            "invalidated": 0,
+            "entries": 1,
+        }
+
+    def test_version_change_invalidates_entries(self, tmp_path):
+        """Test that profiles from another extractor version are dropped."""
+        path = tmp_path / "features.sqlite3"
+        profile = extract_content_profile(CONTENT)
+        old = FeatureCache(path, version="old")
+        old.put(profile)
+        old.close()
+
+        cache = FeatureCache(path, version="new")
+
+        assert cache.get(profile.blob_sha) is None
+        assert cache.invalidated == 1
+        assert len(cache) == 0
+
+    def test_profile_is_keyed_by_content_blob_sha(self):
+        """Test that profiles carry the git blob SHA of their content."""
+        profile = extract_content_profile(CONTENT)
+
+        assert profile.blob_sha == extract_content_profile(CONTENT).blob_sha
+        assert profile.blob_sha != extract_content_profile(CONTENT + " ").blob_sha
+        assert profile.features["content_length"] == len(CONTENT)
+        assert profile.category_keywords == {"architecture", "cli", "tool", "api"}
@@ -0,0 +1,53 @@
+"""Tests for feature extraction and the scoring rules table."""
+
+from scripts.discovery.features import (
+    FEATURE_NAMES,
+    extract_content_features,
+    extract_features,
+    score_component,
+)
+
+
+def test_extract_features_covers_every_feature():
+    """Test that extraction yields exactly the named features."""
+    candidate = {
+        "owner": "someone",
+        "stars": 42,
+        "updated_at": "2020-01-01T00:00:00Z",
+        "description": "A stable tool",
+    }
+
+    features = extract_features(candidate, "## Setup\n```\nnpm test\n```\n")
+
+    assert tuple(features) == FEATURE_NAMES
+    assert features["development_section"] == 1
+    assert features["code_blocks"] == 1
+    assert features["package_manager_commands"] == 1
+    assert features["maintenance_signals"] == 1
+    assert features["stars"] == 42
+
+
+def test_empty_content_scores_nothing():
+    """Test that empty content yields no content points or reasons."""
+    features = extract_content_features("")
+
+    for component in ("content_depth", "educational_value", "ai_effectiveness"):
+        assert score_component(component, features, 100) == (0, [])
+
+
+def test_score_component_caps_groups_and_formats_reasons():
+    """Test that grouped points are capped and reasons use candidate fields."""
+    features = extract_content_features("```\ncode\n```\nFor example:")
+    # Code snippets (5) and examples (3) share an 8-point group cap
+    assert score_component("educational_value", features, 25) == (
+        8,
+        ["Includes concrete code snippets", "References examples or usage patterns"],
+    )
+    assert score_component("educational_value", features, 6)[0] == 6
+
+    candidate = {"stars": 1200, "owner": "someone"}
+    features = {"recognized_org": 0, "stars": 1200}
+    assert score_component("community_recognition", features, 10, candidate) == (
+        5,
+        ["High community validation (1200 stars)"],
+    )
@@ -0,0 +1,120 @@
+"""Tests for the persistent HTTP cache."""
+
+import requests
+
+from scripts.discovery.http_cache import CachedResponse, CachingMiddleware, HTTPCache
+from scripts.discovery.transport import build_response
+
+
+class FakeServer:
+    """Callable standing in for the network; honours If-None-Match."""
+
+    def __init__(self, body=b'{"ok": true}', etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def __call__(self, request, **kwargs):
+        self.requests.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == self.etag:
+            return build_response(request, 304, {"X-RateLimit-Remaining": "42"}, b"")
+        return build_response(
+            request,
+            200,
+            {"ETag": self.etag, "Content-Type": "application/json"},
+            self.body,
+        )
+
+
+def _get(url="https://api.github.com/repos/owner/repo", token="first"):
+    return requests.Request(
+        "GET",
+        url,
+        headers={"Accept": "application/json", "Authorization": f"token {token}"},
+    ).prepare()
+
+
+class TestHTTPCache:
+    """Test the HTTPCache store and CachingMiddleware."""
+
+    def test_revalidation_serves_cached_body(self, tmp_path):
+        """Test that a 304 is answered with the cached body and counted as a hit."""
+        cache = HTTPCache(tmp_path / "cache.sqlite3")
+        middleware = CachingMiddleware(cache)
+        server = FakeServer()
+
+        first = middleware.handle(_get(), send=server)
+        second = middleware.handle(_get(), send=server)
+
+        assert first.json() == {"ok": True}
+        assert second.status_code == 200
+        assert second.json() == {"ok": True}
+        assert second.headers["x-ratelimit-remaining"] == "42"
+        assert server.requests[1]["If-None-Match"] == '"v1"'
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["bytes_saved"] == len(b'{"ok": true}')
+
+    def test_changed_resource_replaces_entry(self, tmp_path):
+        """Test that a new ETag from the server replaces the cached response."""
+        cache = HTTPCache(tmp_path / "cache.sqlite3")
+        middleware = CachingMiddleware(cache)
+
+        middleware.handle(_get(), send=FakeServer(body=b"[1]", etag='"v1"'))
+        response = middleware.handle(_get(), send=FakeServer(body=b"[2]", etag='"v2"'))
+
+        assert response.json() == [2]
+        assert cache.stats()["misses"] == 2
+
+    def test_non_get_requests_bypass_cache(self, tmp_path):
+        """Test that only GET requests are cached."""
+        cache = HTTPCache(tmp_path / "cache.sqlite3")
+        middleware = CachingMiddleware(cache)
+        server = FakeServer()
+        request = requests.Request("POST", "https://api.github.com/graphql").prepare()
+
+        middleware.handle(request, send=server)
+
+        assert cache.stats()["misses"] == 0
+        assert cache.total_size() == 0
+
+    def test_entries_are_keyed_by_credential(self, tmp_path):
+        """Test that a response cached for one token is not revalidated by another."""
+        cache = HTTPCache(tmp_path / "cache.sqlite3")
+        middleware = CachingMiddleware(cache)
+        server = FakeServer()
+
+        middleware.handle(_get(token="first"), send=server)
+        middleware.handle(_get(token="second"), send=server)
+        middleware.handle(_get(token="first"), send=server)
+
+        assert "If-None-Match" not in server.requests[1]
+        assert server.requests[2]["If-None-Match"] == '"v1"'
+        assert cache.stats()["hits"] == 1
+        key = middleware._cache_key(_get(token="secret-token"))
+        assert "secret-token" not in key
+
+    def test_cache_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the cache file."""
+        path = tmp_path / "cache.sqlite3"
+        CachingMiddleware(HTTPCache(path)).handle(_get(), send=FakeServer())
+
+        cache = HTTPCache(path)
+        CachingMiddleware(cache).handle(_get(), send=FakeServer())
+
+        assert cache.stats()["hits"] == 1
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that least recently used entries are evicted over the size budget."""
+        cache = HTTPCache(tmp_path / "cache.sqlite3", max_bytes=10)
+        entry = CachedResponse(200, {}, b"12345", '"e"', None)
+
+        cache.put("a", entry)
+        cache.put("b", entry)
+        cache.touch("a")
+        cache.put("c", entry)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.stats()["evictions"] == 1
@@ -0,0 +1,70 @@
+"""Tests for the single-pass keyword matcher."""
+
+import random
+
+import pytest
+
+from scripts.discovery.keyword_matcher import KeywordMatcher
+
+
+def test_scan_finds_overlapping_and_prefix_keywords():
+    """Test that keywords sharing a start or overlapping are all reported."""
+    matcher = KeywordMatcher(["sync", "synchron", "chron", "## setup", "setup"])
+    hits = matcher.scan("resynchronise ## setup")
+
+    assert hits.positions("sync") == [2]
+    assert hits.positions("synchron") == [2]
+    assert hits.positions("chron") == [5]
+    assert hits.positions("## setup") == [14]
+    assert hits.positions("setup") == [17]
+
+
+def test_scan_escapes_regex_metacharacters():
+    """Test that keywords are matched literally."""
+    matcher = KeywordMatcher(["[tool.", "ci/cd", "v1."])
+    hits = matcher.scan("[tool.poetry] uses ci/cd from v1x")
+
+    assert "[tool." in hits
+    assert "ci/cd" in hits
+    assert "v1." not in hits
+
+
+def test_count_matches_str_count():
+    """Test that counts are non-overlapping, like str.count."""
+    matcher = KeywordMatcher(["##", "aa"])
+    text = "### title\n#### sub\naaaaa"
+    hits = matcher.scan(text)
+
+    assert hits.count("##") == text.count("##")
+    assert hits.count("aa") == text.count("aa")
+
+
+def test_within_excludes_hits_crossing_the_window():
+    """Test that a view only keeps keywords lying entirely inside it."""
+    matcher = KeywordMatcher(["api", "tool"])
+    text = "an api to" + "ol for tools"
+    hits = matcher.scan(text).within(9, len(text))
+
+    assert "api" not in hits
+    assert hits.positions("tool") == [16]
+    assert hits.count_present(["api", "tool"]) == 1
+
+
+def test_scan_agrees_with_substring_checks():
+    """Test that hits match ``keyword in text`` on random text."""
+    keywords = ["ab", "abc", "bca", "c", "cab", "aaa", "b b"]
+    matcher = KeywordMatcher(keywords)
+    rng = random.Random(0)
+    for _ in range(200):
+        text = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 30)))
+        start = rng.randint(0, len(text))
+        view = matcher.scan(text).within(start, len(text))
+        for keyword in keywords:
+            assert (keyword in view) == (keyword in text[start:])
+            assert view.count(keyword) == text[start:].count(keyword)
+
+
+def test_empty_keyword_rejected():
+    """Test that an empty keyword, which would match everywhere, is refused."""
+    with pytest.raises(ValueError):
+        KeywordMatcher(["ok", ""])
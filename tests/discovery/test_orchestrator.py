@@ -4,6 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
+from scripts.discovery.evaluator import RepositoryEvaluator
 from scripts.discovery.orchestrator import ClaudeFileDiscovery
 
 
@@ -25,7 +26,7 @@ class TestClaudeFileDiscovery:
     def test_discover_new_repositories_no_candidates(self, discovery):
         """Test discovery workflow with no candidates."""
         with patch.object(
-            discovery.github_searcher, "search_github_repos", return_value=[]
+            discovery.github_searcher, "iter_candidates", return_value=[]
         ):
             with patch.object(
                 discovery.evaluator, "evaluate_candidate", return_value=None
@@ -58,7 +59,7 @@ class TestClaudeFileDiscovery:
 
         with patch.object(
             discovery.github_searcher,
-            "search_github_repos",
+            "iter_candidates",
             return_value=[mock_candidate],
         ):
             with patch.object(
@@ -86,7 +87,7 @@ class TestClaudeFileDiscovery:
 
         with patch.object(
             discovery.github_searcher,
-            "search_github_repos",
+            "iter_candidates",
             return_value=[mock_candidate],
         ):
             with patch.object(
@@ -138,7 +139,7 @@ class TestClaudeFileDiscovery:
 
         with patch.object(
             discovery.github_searcher,
-            "search_github_repos",
+            "iter_candidates",
             return_value=mock_candidates,
         ):
             with patch.object(
@@ -154,3 +155,119 @@ class TestClaudeFileDiscovery:
                     assert result[0]["score"] == 5
                     assert result[1]["score"] == 7
                     mock_issue.assert_called_once_with(result)
+
+    def test_discover_new_repositories_records_run_state(self, tmp_path):
+        """Test that evaluated candidates are written to the run state ledger."""
+        from scripts.discovery.run_state import RunStateStore
+
+        run_state = RunStateStore(tmp_path / "state.json")
+        discovery = ClaudeFileDiscovery("dummy_token", run_state=run_state)
+        candidate = {
+            "full_name": "test/repo",
+            "claude_file_path": "CLAUDE.md",
+            "claude_file_sha": "abc",
+        }
+        evaluation = {"candidate": candidate, "score": 64}
+
+        with (
+            patch.object(
+                discovery.github_searcher,
+                "iter_candidates",
+                return_value=[candidate],
+            ),
+            patch.object(
+                discovery.evaluator, "evaluate_candidate", return_value=evaluation
+            ),
+            patch.object(discovery.issue_generator, "create_discovery_issue"),
+        ):
+            discovery.discover_new_repositories()
+
+        reloaded = RunStateStore(tmp_path / "state.json")
+        assert reloaded.is_unchanged("test/repo", "CLAUDE.md", "abc")
+        assert reloaded.repositories["test/repo"]["score"] == 64
+
+    def test_process_scoring_fills_feature_cache(self, tmp_path):
+        """Test that profiles extracted in worker processes are cached."""
+        from scripts.discovery.feature_cache import FeatureCache
+
+        feature_cache = FeatureCache(tmp_path / "features.sqlite3")
+        discovery = ClaudeFileDiscovery(
+            "dummy_token", processes=1, feature_cache=feature_cache
+        )
+        candidate = {
+            "full_name": "test/repo",
+            "name": "repo",
+            "owner": "test",
+            "stars": 10,
+            "html_url": "https://github.com/test/repo",
+            "claude_file_path": "CLAUDE.md",
+            "claude_content": "# Repo\n\n## Architecture\n",
+            "updated_at": "2024-01-01T00:00:00Z",
+        }
+
+        [evaluation] = discovery._evaluate_candidates([candidate])
+
+        assert evaluation["candidate"] is not candidate
+        assert evaluation["candidate"]["full_name"] == "test/repo"
+        assert feature_cache.stats()["writes"] == 1
+        assert len(feature_cache) == 1
+
+    def test_process_scoring_uses_evaluator_weights(self):
+        """Test that worker processes score with the discovery evaluator's weights."""
+        discovery = ClaudeFileDiscovery("dummy_token", processes=1)
+        discovery.evaluator.content_depth_weight = 4
+        candidate = {
+            "full_name": "test/repo",
+            "name": "repo",
+            "owner": "test",
+            "stars": 10,
+            "html_url": "https://github.com/test/repo",
+            "claude_file_path": "CLAUDE.md",
+            "claude_content": "# Repo\n\n## Architecture\n\n## Development\n",
+            "updated_at": "2024-01-01T00:00:00Z",
+        }
+        expected = discovery.evaluator.score_candidate(
+            candidate, candidate["claude_content"]
+        )
+
+        [evaluation] = discovery._evaluate_candidates([candidate])
+
+        assert evaluation["score"] == expected["score"]
+        default = RepositoryEvaluator(None).score_candidate(
+            candidate, candidate["claude_content"]
+        )
+        assert evaluation["score"] == default["score"] - 16 + 4
+
+    def test_discover_new_repositories_overlaps_search_and_evaluation(self, discovery):
+        """Test that evaluation starts before the search stage has finished."""
+        import threading
+
+        first_evaluated = threading.Event()
+        overlapped = []
+
+        def candidates(existing_repos):
+            yield {"full_name": "test/first"}
+            # The first candidate is evaluated while search is still running
+            overlapped.append(first_evaluated.wait(timeout=2))
+            yield {"full_name": "test/second"}
+
+        def evaluate(candidate):
+            first_evaluated.set()
+            return {"candidate": candidate, "score": 10}
+
+        with (
+            patch.object(
+                discovery.github_searcher, "iter_candidates", side_effect=candidates
+            ),
+            patch.object(
+                discovery.evaluator, "evaluate_candidate", side_effect=evaluate
+            ),
+            patch.object(discovery.issue_generator, "create_discovery_issue"),
+        ):
+            result = discovery.discover_new_repositories()
+
+        assert overlapped == [True]
+        assert [e["candidate"]["full_name"] for e in result] == [
+            "test/first",
+            "test/second",
+        ]
@@ -0,0 +1,62 @@
+"""Tests for the streaming pipeline stages."""
+
+import threading
+
+import pytest
+
+from scripts.discovery.pipeline import stream
+
+
+def test_stream_preserves_order():
+    """Test that items come out in the order the source produced them."""
+    assert list(stream(range(100), maxsize=4)) == list(range(100))
+
+
+def test_stream_applies_backpressure():
+    """Test that the producer never runs more than the queue size ahead."""
+    produced = []
+
+    def source():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    consumed = 0
+    for _ in stream(source(), maxsize=2):
+        consumed += 1
+        # Queue holds 2, plus one item blocked in put and the one just taken
+        assert len(produced) - consumed <= 3
+
+
+def test_stream_reraises_source_errors():
+    """Test that a failing stage surfaces its exception to the consumer."""
+
+    def source():
+        yield 1
+        raise RuntimeError("search failed")
+
+    results = []
+    with pytest.raises(RuntimeError, match="search failed"):
+        for item in stream(source()):
+            results.append(item)
+    assert results == [1]
+
+
+def test_stream_close_stops_producer():
+    """Test that abandoning a stream closes the source generator."""
+    closed = threading.Event()
+
+    def source():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    items = stream(source(), maxsize=1)
+    assert next(items) == 0
+    items.close()
+
+    assert closed.wait(timeout=2)
@@ -0,0 +1,116 @@
+"""Tests for the adaptive rate limiter."""
+
+import time
+from unittest.mock import patch
+
+import requests
+
+from scripts.discovery.rate_limiter import (
+    RateLimiter,
+    RateLimitMiddleware,
+    TokenBucket,
+    bucket_for_url,
+    is_rate_limited,
+)
+from scripts.discovery.transport import build_response
+
+
+def _request(url="https://api.github.com/repos/owner/repo"):
+    return requests.Request("GET", url).prepare()
+
+
+class TestBucketForUrl:
+    """Test request classification into rate limit buckets."""
+
+    def test_buckets(self):
+        assert bucket_for_url("https://api.github.com/repos/a/b") == "core"
+        assert bucket_for_url("https://api.github.com/search/code?q=x") == "code_search"
+        assert bucket_for_url("https://api.github.com/search/repositories") == "search"
+        assert bucket_for_url("https://api.github.com/graphql") == "graphql"
+
+
+class TestTokenBucket:
+    """Test the TokenBucket scheduling model."""
+
+    def test_burst_then_just_in_time(self):
+        """Test that requests within capacity go immediately and later ones are paced."""
+        bucket = TokenBucket(limit=2, window=60)
+        now = bucket.updated_at
+
+        assert bucket.reserve(now) == 0
+        assert bucket.reserve(now) == 0
+        assert bucket.reserve(now) == 30.0  # one token refills every 30 seconds
+        assert bucket.reserve(now) == 60.0
+
+    def test_observe_clamps_to_remaining(self):
+        """Test that the server's remaining count lowers the local estimate."""
+        bucket = TokenBucket(limit=30, window=60)
+        now = bucket.updated_at
+
+        bucket.observe(now, 30, 0, time.time() + 20)
+
+        assert bucket.reserve(now) >= 20
+
+    def test_retry_after_blocks_bucket(self):
+        """Test that Retry-After blocks the bucket for the given duration."""
+        bucket = TokenBucket(limit=5000, window=3600)
+        now = bucket.updated_at
+
+        bucket.observe(now, None, None, None, retry_after=15)
+
+        assert bucket.reserve(now) == 15
+
+
+class TestRateLimiter:
+    """Test the RateLimiter and its transport middleware."""
+
+    def test_observe_uses_resource_header(self):
+        """Test that X-RateLimit-Resource routes the observation to its bucket."""
+        limiter = RateLimiter()
+        limiter.observe(
+            "core",
+            {
+                "X-RateLimit-Resource": "search",
+                "X-RateLimit-Limit": "30",
+                "X-RateLimit-Remaining": "3",
+                "X-RateLimit-Reset": str(time.time() + 60),
+            },
+        )
+
+        assert limiter.buckets["search"].tokens <= 3
+        assert limiter.buckets["core"].tokens > 3
+
+    def test_acquire_caps_wait(self):
+        """Test that a single wait never exceeds max_wait."""
+        limiter = RateLimiter(max_wait=5)
+        limiter.observe("core", {"Retry-After": "600"}, 429)
+
+        with patch("time.sleep") as mock_sleep:
+            waited = limiter.acquire("core")
+
+        assert waited == 5
+        mock_sleep.assert_called_once_with(5)
+
+    def test_is_rate_limited(self):
+        request = _request()
+        assert is_rate_limited(build_response(request, 429, {}, b""))
+        assert is_rate_limited(
+            build_response(request, 403, {"X-RateLimit-Remaining": "0"}, b"")
+        )
+        assert not is_rate_limited(build_response(request, 403, {}, b""))
+        assert not is_rate_limited(build_response(request, 200, {}, b""))
+
+    def test_middleware_retries_rate_limited_response(self):
+        """Test that the middleware waits and resends a rate limited request."""
+        limiter = RateLimiter()
+        middleware = RateLimitMiddleware(limiter)
+        responses = iter([429, 200])
+
+        def send(request, **kwargs):
+            return build_response(request, next(responses), {"Retry-After": "1"}, b"")
+
+        with patch("time.sleep") as mock_sleep:
+            response = middleware.handle(_request(), send=send)
+
+        assert response.status_code == 200
+        assert mock_sleep.called
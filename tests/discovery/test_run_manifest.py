@@ -0,0 +1,106 @@
+"""Tests for run manifests and their comparison."""
+
+import json
+
+from scripts.discovery.api_usage import ApiUsage
+from scripts.discovery.run_manifest import RunManifest, compare_manifests, flatten
+
+
+def _manifest(**overrides):
+    manifest = {
+        "version": 1,
+        "pipeline": "files",
+        "wall_seconds": 100.0,
+        "stage_seconds": {"search": 60.0, "evaluate": 90.0},
+        "candidates": {"seen": 600, "fetched": 600, "scored": 600},
+        "caches": {"http_cache": {"hits": 800, "misses": 200, "hit_rate": 0.8}},
+        "api": {"calls": 500, "latency_p95_ms": 200.0},
+        "per_candidate": {"wall_ms": 100.0, "api_calls": 0.5},
+        "peak_rss_bytes": 100_000_000,
+    }
+    for path, value in overrides.items():
+        *parents, key = path.split("__")
+        target = manifest
+        for parent in parents:
+            target = target[parent]
+        target[key] = value
+    return manifest
+
+
+class TestRunManifest:
+    """Test collecting a run manifest."""
+
+    def test_stages_counters_and_caches(self, tmp_path):
+        """Test that timed stages count items and the manifest is saved as JSON."""
+        manifest = RunManifest("files")
+        usage = ApiUsage()
+        for _ in range(6):
+            usage.record("search", None, 0.01, 100, 200)
+
+        assert list(manifest.timed(range(3), "search", counter="seen")) == [0, 1, 2]
+        with manifest.stage("report"):
+            pass
+        manifest.count("fetched")
+        manifest.record_cache("blob_store", {"hits": 3, "misses": 1, "writes": 1})
+        manifest.save(tmp_path / "manifest.json", usage)
+        saved = json.loads((tmp_path / "manifest.json").read_text())
+
+        assert set(saved["stage_seconds"]) == {"search", "report"}
+        assert saved["candidates"] == {
+            "seen": 3,
+            "fetched": 1,
+            "scored": 0,
+        }
+        assert saved["caches"]["blob_store"]["hit_rate"] == 0.75
+        assert saved["api"]["calls"] == 6
+        assert saved["api"]["stages"] == {"search": 6}
+        assert saved["per_candidate"]["api_calls"] == 2.0
+        assert saved["peak_rss_bytes"] > 0
+
+    def test_flatten_skips_non_numeric_values(self):
+        metrics = flatten(_manifest())
+
+        assert metrics["caches.http_cache.hit_rate"] == 0.8
+        assert "pipeline" not in metrics
+
+
+class TestCompareManifests:
+    """Test flagging regressions between two manifests."""
+
+    def test_identical_runs_have_no_regressions(self):
+        changes = compare_manifests(_manifest(), _manifest())
+
+        assert not any(change.regression for change in changes)
+
+    def test_regressions_beyond_tolerance(self):
+        """Test that slower, costlier runs and falling hit rates are flagged."""
+        current = _manifest(
+            wall_seconds=130.0,
+            api__calls=520,
+            caches__http_cache__hit_rate=0.6,
+            candidates__seen=5000,
+        )
+
+        flagged = {
+            change.metric
+            for change in compare_manifests(_manifest(), current)
+            if change.regression
+        }
+
+        # api.calls rose 4%, within its 10% tolerance; counts are never flagged
+        assert flagged == {"wall_seconds", "caches.http_cache.hit_rate"}
+
+    def test_custom_tolerance_and_time_floor(self):
+        """Test that user tolerances win and tiny time changes are ignored."""
+        baseline = _manifest(stage_seconds__report=0.1)
+        current = _manifest(wall_seconds=130.0, stage_seconds__report=0.5)
+
+        changes = {
+            change.metric: change
+            for change in compare_manifests(baseline, current, {"wall_seconds": 0.5})
+        }
+
+        assert not changes["wall_seconds"].regression
+        assert changes["wall_seconds"].tolerance == 0.5
+        assert changes["wall_seconds"].change == 0.3
+        assert not changes["stage_seconds.report"].regression
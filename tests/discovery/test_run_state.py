@@ -0,0 +1,66 @@
+"""Tests for the incremental discovery run state."""
+
+import json
+
+from scripts.discovery.run_state import RunStateStore
+
+
+class TestRunStateStore:
+    """Test the RunStateStore class."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that cursors and evaluations persist across instances."""
+        path = tmp_path / "state" / "run_state.json"
+        store = RunStateStore(path)
+        store.set_query_cursor("q", ["a/b:CLAUDE.md:1", "c/d:CLAUDE.md:2"])
+        store.record_evaluation(
+            {
+                "full_name": "a/b",
+                "claude_file_path": "CLAUDE.md",
+                "claude_file_sha": "1",
+            },
+            72,
+        )
+        store.save()
+
+        reloaded = RunStateStore(path)
+
+        assert reloaded.query_cursor("q") == {"a/b:CLAUDE.md:1", "c/d:CLAUDE.md:2"}
+        assert reloaded.repositories["a/b"]["score"] == 72
+        assert reloaded.repositories["a/b"]["candidate"]["claude_file_sha"] == "1"
+        assert reloaded.is_unchanged("a/b", "CLAUDE.md", "1")
+
+    def test_is_unchanged(self, tmp_path):
+        """Test that a changed blob, path or missing SHA is not skipped."""
+        store = RunStateStore(tmp_path / "state.json")
+        store.record_evaluation(
+            {
+                "full_name": "a/b",
+                "claude_file_path": "CLAUDE.md",
+                "claude_file_sha": "1",
+            },
+            50,
+        )
+
+        assert not store.is_unchanged("a/b", "CLAUDE.md", "2")
+        assert not store.is_unchanged("a/b", "docs/CLAUDE.md", "1")
+        assert not store.is_unchanged("a/b", "CLAUDE.md", None)
+        assert not store.is_unchanged("x/y", "CLAUDE.md", "1")
+
+    def test_empty_cursor_not_recorded(self, tmp_path):
+        """Test that a failed search does not clear an existing cursor."""
+        store = RunStateStore(tmp_path / "state.json")
+        store.set_query_cursor("q", ["a"])
+        store.set_query_cursor("q", [])
+
+        assert store.query_cursor("q") == {"a"}
+
+    def test_corrupt_or_old_state_starts_fresh(self, tmp_path):
+        """Test that unreadable or outdated state files are ignored."""
+        corrupt = tmp_path / "corrupt.json"
+        corrupt.write_text("{not json")
+        assert RunStateStore(corrupt).repositories == {}
+
+        old = tmp_path / "old.json"
+        old.write_text(json.dumps({"version": 0, "repositories": {"a/b": {}}}))
+        assert RunStateStore(old).repositories == {}
@@ -1,11 +1,33 @@
 """Tests for the GitHubSearcher module."""
 
+import threading
 import time
 from unittest.mock import Mock, patch
 
 import pytest
 
 from scripts.discovery.searcher import GitHubSearcher
+from scripts.discovery.tree_probe import InstructionFile
+
+
+def make_hit(full_name, path="CLAUDE.md", sha="sha"):
+    """Build a mock code search hit."""
+    hit = Mock()
+    hit.repository.full_name = full_name
+    hit.path = path
+    hit.sha = sha
+    return hit
+
+
+def make_tree(*files):
+    """Build a mock recursive git tree from (path, size, sha) tuples."""
+    tree = Mock()
+    tree.raw_data = {"truncated": False}
+    tree.tree = []
+    for path, size, sha in files:
+        element = Mock(path=path, size=size, sha=sha, type="blob")
+        tree.tree.append(element)
+    return tree
 
 
 class TestGitHubSearcher:
@@ -15,30 +37,6 @@ class TestGitHubSearcher:
     def github_searcher(self):
         return GitHubSearcher("dummy_token")
 
-    def test_handle_rate_limiting_low_remaining(self, github_searcher):
-        """Test rate limiting handling when remaining is low."""
-        mock_response = Mock()
-        mock_response.headers = {
-            "X-RateLimit-Remaining": "5",
-            "X-RateLimit-Reset": str(int(time.time()) + 60),
-        }
-
-        with patch("time.sleep") as mock_sleep:
-            github_searcher._handle_rate_limiting(mock_response)
-            assert mock_sleep.called
-
-    def test_handle_rate_limiting_high_remaining(self, github_searcher):
-        """Test rate limiting handling when remaining is high."""
-        mock_response = Mock()
-        mock_response.headers = {
-            "X-RateLimit-Remaining": "50",
-            "X-RateLimit-Reset": str(int(time.time()) + 60),
-        }
-
-        with patch("time.sleep") as mock_sleep:
-            github_searcher._handle_rate_limiting(mock_response)
-            assert not mock_sleep.called
-
     def test_create_candidate_dict(self, github_searcher):
         """Test creating candidate dictionary."""
         mock_repo = Mock()
@@ -93,7 +91,9 @@ class TestGitHubSearcher:
         mock_repo.stargazers_count = 10  # Any star count is acceptable now
 
         # Mock the CLAUDE.md file finding
-        github_searcher._find_claude_file = Mock(return_value="CLAUDE.md")
+        github_searcher._find_claude_file = Mock(
+            return_value=InstructionFile("CLAUDE.md", 2000, "abc")
+        )
         github_searcher._create_candidate_dict = Mock(
             return_value={"full_name": "owner/repo"}
         )
@@ -101,38 +101,394 @@ class TestGitHubSearcher:
         existing_repos = set()
 
         result = github_searcher._process_single_repository(mock_repo, existing_repos)
-        assert result == {"full_name": "owner/repo"}
+        assert result == {"full_name": "owner/repo", "claude_file_sha": "abc"}
 
     def test_find_claude_file_found(self, github_searcher):
-        """Test finding CLAUDE.md file in repository."""
+        """Test finding CLAUDE.md anywhere in the repository tree."""
         mock_repo = Mock()
-        mock_file_contents = Mock()
-        mock_file_contents.size = 1000  # Above minimum
-
-        mock_repo.get_contents.return_value = mock_file_contents
+        mock_repo.get_git_tree.return_value = make_tree(
+            ("src/app.py", 5000, "s1"),
+            ("docs/CLAUDE.md", 1500, "s2"),
+            ("AGENTS.md", 4000, "s3"),
+        )
 
         result = github_searcher._find_claude_file(mock_repo)
-        assert result == "CLAUDE.md"
 
-    def test_find_claude_file_too_small(self, github_searcher):
-        """Test finding CLAUDE.md file that is too small."""
+        mock_repo.get_git_tree.assert_called_once_with("HEAD", recursive=True)
+        assert (result.path, result.size, result.sha) == ("docs/CLAUDE.md", 1500, "s2")
+
+    def test_find_claude_file_prefers_root(self, github_searcher):
+        """Test that root and .claude/ files win over nested ones."""
         mock_repo = Mock()
-        mock_file_contents = Mock()
-        mock_file_contents.size = 100  # Below minimum
+        mock_repo.get_git_tree.return_value = make_tree(
+            ("packages/a/CLAUDE.md", 2000, "s1"),
+            (".claude/CLAUDE.md", 2000, "s2"),
+        )
 
-        mock_repo.get_contents.return_value = mock_file_contents
+        assert github_searcher._find_claude_file(mock_repo).path == ".claude/CLAUDE.md"
 
-        result = github_searcher._find_claude_file(mock_repo)
-        assert result is None
+    def test_find_claude_file_too_small(self, github_searcher):
+        """Test that undersized files are skipped without further requests."""
+        mock_repo = Mock()
+        mock_repo.get_git_tree.return_value = make_tree(
+            ("CLAUDE.md", 100, "s1"), ("AGENTS.md", 1200, "s2")
+        )
+
+        assert github_searcher._find_claude_file(mock_repo).path == "AGENTS.md"
+        mock_repo.get_git_tree.return_value = make_tree(("CLAUDE.md", 100, "s1"))
+        assert github_searcher._find_claude_file(mock_repo) is None
+        mock_repo.get_contents.assert_not_called()
 
     def test_find_claude_file_not_found(self, github_searcher):
-        """Test when CLAUDE.md file is not found."""
+        """Test when the repository has no tree (e.g. it is empty)."""
         from github.GithubException import UnknownObjectException
 
         mock_repo = Mock()
-        mock_repo.get_contents.side_effect = UnknownObjectException(
+        mock_repo.get_git_tree.side_effect = UnknownObjectException(
             404, "Not Found", headers={}
         )
 
         result = github_searcher._find_claude_file(mock_repo)
         assert result is None
+
+    def test_process_graphql_record_probes_tree_without_root_file(
+        self, github_searcher
+    ):
+        """Test that records without a root CLAUDE.md fall back to the tree probe."""
+        from tests.discovery.test_enricher import make_record
+
+        mock_repo = Mock()
+        mock_repo.get_git_tree.return_value = make_tree(
+            ("services/api/CLAUDE.md", 3000, "nested")
+        )
+
+        candidate = github_searcher._process_graphql_record(
+            make_record(claudeFile=None), mock_repo
+        )
+
+        assert candidate["claude_file_path"] == "services/api/CLAUDE.md"
+        assert candidate["claude_file_sha"] == "nested"
+
+    def test_process_graphql_record_probes_tree_when_root_file_too_small(
+        self, github_searcher
+    ):
+        """Test that a too-small root CLAUDE.md falls back to a nested file."""
+        from tests.discovery.test_enricher import make_record
+
+        mock_repo = Mock()
+        mock_repo.get_git_tree.return_value = make_tree(
+            ("CLAUDE.md", 10, "small"), ("docs/CLAUDE.md", 3000, "nested")
+        )
+        small = make_record(
+            claudeFile={"oid": "small", "byteSize": 10, "text": "x", "isBinary": False}
+        )
+
+        candidate = github_searcher._process_graphql_record(small, mock_repo)
+
+        assert candidate["claude_file_path"] == "docs/CLAUDE.md"
+        assert candidate["claude_file_sha"] == "nested"
+
+    def test_probed_candidate_is_skipped_by_its_search_hit(
+        self, github_searcher, tmp_path
+    ):
+        """Test that a hit resolved to a nested file is skipped on the next run."""
+        from scripts.discovery.run_state import RunStateStore
+        from tests.discovery.test_enricher import make_record
+
+        hit = make_hit("owner/repo", path="CLAUDE.md", sha="root")
+        hit.repository.node_id = "R_1"
+        hit.repository.get_git_tree.return_value = make_tree(
+            ("services/api/CLAUDE.md", 3000, "nested")
+        )
+        github_searcher.enricher = Mock()
+        github_searcher.enricher.fetch_repositories.return_value = {
+            "R_1": make_record("R_1", claudeFile=None)
+        }
+        [candidate] = github_searcher._process_search_results([hit], set())
+
+        run_state = RunStateStore(tmp_path / "state.json")
+        run_state.record_evaluation(candidate, 70)
+        github_searcher.run_state = run_state
+
+        assert candidate["claude_file_path"] == "services/api/CLAUDE.md"
+        assert run_state.repositories["owner/repo"]["blob_sha"] == "nested"
+        assert github_searcher._select_new_hits("q", [[hit]]) == []
+
+    def test_search_github_repos_keeps_first_occurrence_in_page_order(
+        self, github_searcher
+    ):
+        """Test that pages reach dedupe in page order even when later ones finish first."""
+
+        def fake_page(query, page):
+            time.sleep(0.01 * (3 - page))  # Later pages finish first
+            return [make_hit(f"{query}/{page}"), make_hit("shared/repo", sha=page)]
+
+        def fake_process(hits, existing_repos):
+            return [
+                {"full_name": hit.repository.full_name, "search_sha": hit.sha}
+                for hit in hits
+            ]
+
+        with (
+            patch.object(github_searcher, "_fetch_page", side_effect=fake_page),
+            patch.object(
+                github_searcher, "_process_search_results", side_effect=fake_process
+            ),
+        ):
+            result = github_searcher.search_github_repos(set())
+
+        names = sorted(c["full_name"] for c in result)
+        assert names == [
+            "filename:CLAUDE.md size:>1000/0",
+            "filename:CLAUDE.md size:>1000/1",
+            "filename:CLAUDE.md size:>1000/2",
+            "filename:CLAUDE.md stars:>100/0",
+            "filename:CLAUDE.md stars:>100/1",
+            "filename:CLAUDE.md stars:>100/2",
+            "shared/repo",
+        ]
+        [shared] = [c for c in result if c["full_name"] == "shared/repo"]
+        assert shared["search_sha"] == 0
+
+    def test_iter_candidates_yields_before_search_completes(self, github_searcher):
+        """Test that candidates are yielded while later pages are still fetching."""
+        release = threading.Event()
+
+        def fake_page(query, page):
+            if page == 2:
+                assert release.wait(5)
+            return [make_hit(f"{query}/{page}")]
+
+        def fake_process(hits, existing_repos):
+            return [{"full_name": hit.repository.full_name} for hit in hits]
+
+        with (
+            patch.object(github_searcher, "_fetch_page", side_effect=fake_page),
+            patch.object(
+                github_searcher, "_process_search_results", side_effect=fake_process
+            ),
+        ):
+            candidates = github_searcher.iter_candidates(set())
+            first = next(candidates)
+            release.set()
+            rest = list(candidates)
+
+        assert not first["full_name"].endswith("/2")
+        assert len([first, *rest]) == 6
+
+    def test_fetch_page_rate_limited_returns_empty(self, github_searcher):
+        """Test that a page still rate limited after the limiter's retries is skipped."""
+        from github.GithubException import RateLimitExceededException
+
+        client = Mock()
+        client.search_code.return_value.get_page.side_effect = (
+            RateLimitExceededException(403, "rate limited", headers={})
+        )
+        github_searcher._thread_client = Mock(return_value=client)
+
+        assert github_searcher._fetch_page("q", 0) == []
+
+    def test_incremental_run_stops_at_known_results(self, github_searcher, tmp_path):
+        """Test that paging stops at the last run's cursor and unchanged blobs are skipped."""
+        from scripts.discovery.run_state import RunStateStore
+
+        run_state = RunStateStore(tmp_path / "state.json")
+        query = "filename:CLAUDE.md stars:>100"
+        run_state.set_query_cursor(query, ["old/repo:CLAUDE.md:sha-old"])
+        run_state.record_evaluation(
+            {
+                "full_name": "same/repo",
+                "claude_file_path": "CLAUDE.md",
+                "claude_file_sha": "sha-same",
+            },
+            42,
+        )
+        github_searcher.run_state = run_state
+        first_page = [
+            make_hit("new/repo", sha="sha-new"),
+            make_hit("same/repo", sha="sha-same"),
+            make_hit("old/repo", sha="sha-old"),
+            make_hit("older/repo", sha="sha-older"),
+        ]
+        fetched = []
+
+        def fake_page(q, page):
+            fetched.append((q, page))
+            return first_page if q == query else []
+
+        def fake_process(hits, existing_repos):
+            return [{"full_name": hit.repository.full_name} for hit in hits]
+
+        with (
+            patch.object(github_searcher, "_fetch_page", side_effect=fake_page),
+            patch.object(
+                github_searcher, "_process_search_results", side_effect=fake_process
+            ),
+        ):
+            result = github_searcher.search_github_repos(set())
+
+        assert [c["full_name"] for c in result] == ["new/repo"]
+        assert (query, 1) not in fetched
+        assert "new/repo:CLAUDE.md:sha-new" in run_state.query_cursor(query)
+
+    def test_sharded_search_fetches_every_shard_page(self):
+        """Test that sharded searches fetch all pages of every leaf shard."""
+        from scripts.discovery.sharding import Shard, ShardResult
+
+        searcher = GitHubSearcher("dummy_token", shard_dimensions=["size"])
+        assert searcher.github.per_page == 100
+        leaves = {
+            query: [
+                ShardResult(
+                    Shard(base=query, size=(0, 9)), 150, [make_hit(f"{query}/a")]
+                ),
+                ShardResult(
+                    Shard(base=query, size=(10, 20)), 20, [make_hit(f"{query}/b")]
+                ),
+            ]
+            for query in (
+                "filename:CLAUDE.md stars:>100",
+                "filename:CLAUDE.md size:>1000",
+            )
+        }
+
+        def fake_page(query, page):
+            return [make_hit(f"{query}#{page}")]
+
+        def fake_process(hits, existing_repos):
+            return [{"full_name": hit.repository.full_name} for hit in hits]
+
+        with (
+            patch.object(searcher.sharder, "expand", return_value=leaves),
+            patch.object(searcher, "_fetch_page", side_effect=fake_page) as fetch,
+            patch.object(searcher, "_process_search_results", side_effect=fake_process),
+        ):
+            result = searcher.search_github_repos(set())
+
+        assert fetch.call_count == 2
+        assert {
+            "filename:CLAUDE.md stars:>100/a",
+            "filename:CLAUDE.md stars:>100 size:0..9#1",
+            "filename:CLAUDE.md stars:>100/b",
+        } <= {c["full_name"] for c in result}
+
+    def test_searcher_uses_shared_rate_limiter(self, github_searcher):
+        """Test that the default transport draws from the token's shared limiter."""
+        from scripts.discovery.rate_limiter import get_rate_limiter
+        from scripts.discovery.token_pool import TokenPoolMiddleware, token_fingerprint
+
+        layers = github_searcher.transport.middleware
+        assert isinstance(layers[-1], TokenPoolMiddleware)
+        assert layers[-1].pool.limiter_for("dummy_token") is get_rate_limiter(
+            token_fingerprint("dummy_token")
+        )
+
+    def test_thread_client_is_per_thread(self, github_searcher):
+        """Test that each worker thread gets its own Github client."""
+        import threading
+
+        clients = []
+        thread = threading.Thread(
+            target=lambda: clients.append(github_searcher._thread_client())
+        )
+        thread.start()
+        thread.join()
+
+        assert github_searcher._thread_client() is github_searcher._thread_client()
+        assert clients[0] is not github_searcher._thread_client()
+
+    def test_process_search_results_uses_graphql_records(self, github_searcher):
+        """Test that enriched repositories become candidates without REST calls."""
+        from tests.discovery.test_enricher import make_record
+
+        code_result = Mock()
+        code_result.repository.full_name = "owner/repo"
+        code_result.repository.node_id = "R_1"
+        github_searcher.enricher = Mock()
+        github_searcher.enricher.fetch_repositories.return_value = {
+            "R_1": make_record("R_1")
+        }
+        github_searcher._process_single_repository = Mock()
+
+        result = github_searcher._process_search_results([code_result], set())
+
+        assert [c["full_name"] for c in result] == ["owner/repo"]
+        assert github_searcher.blob_store.get_text("abc123") == "# CLAUDE.md"
+        github_searcher._process_single_repository.assert_not_called()
+
+    def test_process_search_results_falls_back_to_rest(self, github_searcher):
+        """Test that a failed GraphQL query falls back to per-repository REST."""
+        from scripts.discovery.enricher import GraphQLError
+
+        code_result = make_hit("owner/repo", sha="sha-1")
+        github_searcher.enricher = Mock()
+        github_searcher.enricher.fetch_repositories.side_effect = GraphQLError("boom")
+        github_searcher._process_single_repository = Mock(
+            return_value={"full_name": "owner/repo", "stars": 3}
+        )
+
+        result = github_searcher._process_search_results([code_result], set())
+
+        assert result == [
+            {
+                "full_name": "owner/repo",
+                "stars": 3,
+                "search_path": "CLAUDE.md",
+                "search_sha": "sha-1",
+            }
+        ]
+
+    def test_process_graphql_record_filters(self, github_searcher):
+        """Test archived, forked, missing and small CLAUDE.md records are skipped."""
+        from tests.discovery.test_enricher import make_record
+
+        assert (
+            github_searcher._process_graphql_record(make_record(isArchived=True))
+            is None
+        )
+        assert github_searcher._process_graphql_record(make_record(isFork=True)) is None
+        assert (
+            github_searcher._process_graphql_record(make_record(claudeFile=None))
+            is None
+        )
+        small = make_record(
+            claudeFile={"oid": "a", "byteSize": 10, "text": "x", "isBinary": False}
+        )
+        assert github_searcher._process_graphql_record(small) is None
+        assert github_searcher._process_graphql_record(make_record()) is not None
+
+    def test_read_blob_uses_store_then_fetches_once(self, github_searcher):
+        """Test that blobs are served from the store and fetched at most once."""
+        response = Mock(content=b"# Fetched")
+        github_searcher.session = Mock()
+        github_searcher.session.get.return_value = response
+
+        assert github_searcher.read_blob("owner/repo", "sha1") == "# Fetched"
+        assert github_searcher.read_blob("owner/repo", "sha1") == "# Fetched"
+
+        github_searcher.session.get.assert_called_once()
+        url = github_searcher.session.get.call_args.args[0]
+        assert url.endswith("/repos/owner/repo/git/blobs/sha1")
+
+    def test_search_github_repos_enriches_each_repository_once(self, github_searcher):
+        """Test that a repository matching both queries is processed once."""
+
+        def fake_page(query, page):
+            return [make_hit("shared/repo"), make_hit(f"{query}/{page}")]
+
+        processed = []
+
+        def fake_process(hits, existing_repos):
+            processed.extend(hit.repository.full_name for hit in hits)
+            return [{"full_name": hit.repository.full_name} for hit in hits]
+
+        with (
+            patch.object(github_searcher, "_fetch_page", side_effect=fake_page),
+            patch.object(
+                github_searcher, "_process_search_results", side_effect=fake_process
+            ),
+        ):
+            github_searcher.search_github_repos(set())
+
+        assert processed.count("shared/repo") == 1
+        assert len(processed) == 7
@@ -0,0 +1,105 @@
+"""Tests for search query sharding."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from scripts.discovery.sharding import (
+    MAX_INDEXED_FILE_SIZE,
+    QuerySharder,
+    Shard,
+    ShardResult,
+)
+
+
+class TestQuerySharder:
+    """Test the QuerySharder class."""
+
+    def test_root_absorbs_size_qualifier(self):
+        """Test that an existing size qualifier becomes the initial range."""
+        sharder = QuerySharder(["size"])
+
+        shard = sharder.root("filename:CLAUDE.md size:>1000")
+
+        assert shard.base == "filename:CLAUDE.md"
+        assert shard.size == (1001, MAX_INDEXED_FILE_SIZE)
+        assert shard.query == f"filename:CLAUDE.md size:1001..{MAX_INDEXED_FILE_SIZE}"
+
+    def test_root_absorbs_pushed_qualifier(self):
+        """Test that pushed date ranges are parsed."""
+        sharder = QuerySharder(["pushed"])
+
+        shard = sharder.root("stars:>100 pushed:2024-01-01..2024-03-31")
+
+        assert shard.base == "stars:>100"
+        assert shard.pushed == (date(2024, 1, 1), date(2024, 3, 31))
+
+    def test_split_falls_through_dimensions(self):
+        """Test that exhausted dimensions hand over to the next one."""
+        sharder = QuerySharder(["size", "language"], languages=("Python", "Go"))
+        shard = Shard(base="q", size=(10, 10))
+
+        children = sharder.split(shard)
+
+        assert [child.query for child in children] == [
+            "q size:10..10 language:Python",
+            "q size:10..10 language:Go",
+            "q size:10..10 -language:Python -language:Go",
+        ]
+        assert sharder.split(children[0]) == []
+
+    def test_split_bisects_ranges(self):
+        """Test that size and date ranges are split into disjoint halves."""
+        sharder = QuerySharder(["size", "pushed"])
+
+        assert [c.size for c in sharder.split(Shard(base="q", size=(0, 9)))] == [
+            (0, 4),
+            (5, 9),
+        ]
+        halves = sharder.split(
+            Shard(base="q", size=(3, 3), pushed=(date(2024, 1, 1), date(2024, 1, 4)))
+        )
+        assert [c.pushed for c in halves] == [
+            (date(2024, 1, 1), date(2024, 1, 2)),
+            (date(2024, 1, 3), date(2024, 1, 4)),
+        ]
+
+    def test_unknown_dimension(self):
+        """Test that unsupported dimensions are rejected."""
+        with pytest.raises(ValueError):
+            QuerySharder(["stars"])
+
+    def test_expand_splits_until_under_cap(self):
+        """Test that oversized shards are subdivided and leaves keep their first page."""
+        sharder = QuerySharder(["size"], max_results=100)
+
+        def probe(query):
+            # 1 result per byte of the size range
+            low, high = map(int, query.rsplit("size:", 1)[1].split(".."))
+            total = high - low + 1
+            return total, [query]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leaves = sharder.expand(executor, probe, ["q size:0..399"])
+
+        results = leaves["q size:0..399"]
+        assert len(results) == 4
+        assert all(r.total_count <= 100 for r in results)
+        assert sum(r.total_count for r in results) == 400
+        assert results[0].first_page == ["q size:0..99"]
+        assert sharder.probes_sent == 7
+
+    def test_expand_keeps_unsplittable_shard(self):
+        """Test that a shard that cannot be split is kept and truncated."""
+        sharder = QuerySharder(["size"], max_results=100)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leaves = sharder.expand(executor, lambda q: (500, []), ["q size:5"])
+
+        assert [r.shard.size for r in leaves["q size:5"]] == [(5, 5)]
+
+    def test_page_count_respects_cap(self):
+        """Test that page counts never exceed what the API will return."""
+        assert ShardResult(Shard(base="q"), 250, []).page_count(100) == 3
+        assert ShardResult(Shard(base="q"), 5000, []).page_count(100) == 10
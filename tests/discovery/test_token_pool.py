@@ -0,0 +1,108 @@
+"""Tests for the GitHub token pool."""
+
+import time
+
+import pytest
+import requests
+
+from scripts.discovery.token_pool import (
+    TokenAssignmentMiddleware,
+    TokenPool,
+    TokenPoolMiddleware,
+    normalize_tokens,
+    tokens_from_env,
+)
+from scripts.discovery.transport import build_response
+
+
+class TestTokenPool:
+    """Test quota-aware routing across tokens."""
+
+    def test_normalize_tokens(self):
+        assert normalize_tokens("a") == ["a"]
+        assert normalize_tokens(["a", "", "b", "a"]) == ["a", "b"]
+
+    def test_tokens_from_env(self, monkeypatch):
+        monkeypatch.setenv("GITHUB_TOKEN", "primary")
+        monkeypatch.setenv("GITHUB_TOKENS", "extra1, extra2\nprimary")
+        assert tokens_from_env() == ["primary", "extra1", "extra2"]
+
+    def test_empty_pool_rejected(self):
+        with pytest.raises(ValueError):
+            TokenPool([])
+
+    def test_select_prefers_most_remaining_quota(self):
+        """Test that requests go to the token with the most remaining quota."""
+        pool = TokenPool(["pool-test-a1", "pool-test-b1"])
+        reset = str(time.time() + 600)
+        pool.limiter_for("pool-test-a1").observe(
+            "search", {"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": reset}
+        )
+        pool.limiter_for("pool-test-b1").observe(
+            "search", {"X-RateLimit-Remaining": "20", "X-RateLimit-Reset": reset}
+        )
+
+        assert pool.select("search") == "pool-test-b1"
+
+    def test_exhausted_token_is_parked_until_reset(self):
+        """Test that a token with no remaining quota is skipped until its reset."""
+        pool = TokenPool(["pool-test-a2", "pool-test-b2"])
+        pool.limiter_for("pool-test-a2").observe(
+            "core",
+            {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 600)},
+        )
+
+        selected = {pool.select("core") for _ in range(5)}
+
+        assert selected == {"pool-test-b2"}
+
+    def test_throughput_scales_with_tokens(self):
+        """Test that a pool of N tokens serves N buckets' worth of immediate requests."""
+        pool = TokenPool([f"pool-test-scale-{i}" for i in range(3)])
+        immediate = 0
+        for _ in range(3 * 10 + 5):
+            token = pool.select("code_search")
+            if pool.limiter_for(token).reserve("code_search") == 0:
+                immediate += 1
+
+        assert immediate == 30  # 10 code searches per token before waiting
+
+    def test_middleware_sets_authorization(self):
+        """Test that the middleware authenticates the request with the selected token."""
+        pool = TokenPool(["pool-test-auth"])
+        middleware = TokenPoolMiddleware(pool)
+        seen = []
+
+        def send(request, **kwargs):
+            seen.append(request.headers["Authorization"])
+            return build_response(request, 200, {}, b"")
+
+        request = requests.Request(
+            "GET",
+            "https://api.github.com/repos/a/b",
+            headers={"Authorization": "token other"},
+        ).prepare()
+        middleware.handle(request, send=send)
+
+        assert seen == ["token pool-test-auth"]
+        assert sum(pool.stats().values()) == 1
+
+    def test_assigned_token_is_kept_for_the_first_attempt(self):
+        """Test that the pool middleware sends with the token assigned upstream."""
+        pool = TokenPool(["pool-test-assign-a", "pool-test-assign-b"])
+        middleware = TokenPoolMiddleware(pool)
+        assigned, seen = [], []
+
+        def send(request, **kwargs):
+            seen.append(request.headers["Authorization"])
+            return build_response(request, 200, {}, b"")
+
+        def inner(request, **kwargs):
+            assigned.append(request.headers["Authorization"])
+            return middleware.handle(request, send=send)
+
+        request = requests.Request("GET", "https://api.github.com/repos/a/b").prepare()
+        TokenAssignmentMiddleware(pool).handle(request, send=inner)
+
+        assert seen == assigned
+        assert sum(pool.stats().values()) == 1
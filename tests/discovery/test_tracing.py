@@ -0,0 +1,180 @@
+"""Tests for tracing spans and their Chrome trace export."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from scripts.discovery.evaluator import RepositoryEvaluator
+from scripts.discovery.pipeline import stream
+from scripts.discovery.tracing import (
+    ContextThreadPoolExecutor,
+    Tracer,
+    current_span,
+    span,
+    traced,
+)
+
+CANDIDATE = {
+    "full_name": "owner/repo",
+    "name": "repo",
+    "owner": "owner",
+    "stars": 100,
+    "html_url": "https://github.com/owner/repo",
+    "claude_file_path": "CLAUDE.md",
+    "claude_file_sha": "abc",
+    "updated_at": "2024-01-01T00:00:00Z",
+}
+
+
+def _by_name(tracer):
+    return {finished.name: finished for finished in tracer.spans}
+
+
+class TestSpans:
+    """Test opening and nesting spans."""
+
+    def test_nested_spans_with_attributes(self):
+        """Test parent links, attributes and monotonic timestamps."""
+        with Tracer() as tracer:
+            with span("outer", query="q") as outer:
+                with span("inner") as inner:
+                    inner.set_attribute("hits", 3)
+                    assert current_span() is inner
+                assert current_span() is outer
+        spans = _by_name(tracer)
+
+        assert current_span() is None
+        assert spans["inner"].parent_id == spans["outer"].span_id
+        assert spans["outer"].parent_id is None
+        assert spans["outer"].attributes == {"query": "q"}
+        assert spans["inner"].attributes == {"hits": 3}
+        assert spans["outer"].start <= spans["inner"].start
+        assert spans["inner"].end <= spans["outer"].end
+
+    def test_spans_without_tracer_are_not_recorded(self):
+        with span("ignored") as ignored:
+            ignored.set_attribute("key", "value")
+
+        with Tracer() as tracer:
+            pass
+
+        assert tracer.spans == []
+
+    def test_failed_span_records_error(self):
+        with Tracer() as tracer, pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+
+        assert tracer.spans[0].attributes["error"] == "ValueError"
+
+    def test_traced_decorator(self):
+        @traced("work")
+        def work():
+            return current_span().name
+
+        with Tracer() as tracer:
+            assert work() == "work"
+
+        assert [finished.name for finished in tracer.spans] == ["work"]
+
+    def test_span_limit(self):
+        with Tracer(max_spans=2) as tracer:
+            for _ in range(5):
+                with span("many"):
+                    pass
+
+        assert len(tracer.spans) == 2
+        assert tracer.dropped == 3
+
+
+class TestContextPropagation:
+    """Test that spans carry over into worker threads."""
+
+    def test_thread_pool_tasks_are_children(self):
+        """Test that a context pool parents task spans, a plain pool does not."""
+
+        def task(name):
+            with span(name):
+                return threading.get_ident()
+
+        with Tracer() as tracer, span("submit"):
+            with ContextThreadPoolExecutor(max_workers=2) as executor:
+                workers = set(executor.map(task, ["a", "b", "c"]))
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                executor.submit(task, "plain").result()
+        spans = _by_name(tracer)
+
+        assert threading.get_ident() not in workers
+        for name in ("a", "b", "c"):
+            assert spans[name].parent_id == spans["submit"].span_id
+        assert spans["plain"].parent_id is None
+
+    def test_pipeline_stage_spans(self):
+        """Test that a streamed stage runs under a span parented by its caller."""
+
+        def produce():
+            with span("item"):
+                pass
+            yield 1
+
+        with Tracer() as tracer, span("run"):
+            assert list(stream(produce(), name="search")) == [1]
+        spans = _by_name(tracer)
+
+        assert spans["pipeline.search"].parent_id == spans["run"].span_id
+        assert spans["item"].parent_id == spans["pipeline.search"].span_id
+        assert spans["item"].thread_name == "discovery-search"
+
+
+class TestInstrumentation:
+    """Test the spans of the instrumented discovery classes."""
+
+    def test_evaluation_separates_fetching_and_scoring(self):
+        """Test that an evaluation has fetch, extract and score children."""
+        searcher = Mock()
+        searcher.read_blob.return_value = "# Project\n\n## Architecture\n\nText.\n"
+        evaluator = RepositoryEvaluator(searcher)
+
+        with Tracer() as tracer:
+            assert evaluator.evaluate_candidate(dict(CANDIDATE)) is not None
+        spans = _by_name(tracer)
+
+        assert spans["evaluate"].attributes == {
+            "repository": "owner/repo",
+            "cached": False,
+        }
+        for child in ("evaluate.fetch", "evaluate.extract", "evaluate.score"):
+            assert spans[child].parent_id == spans["evaluate"].span_id
+
+
+class TestChromeExport:
+    """Test the trace-event export."""
+
+    def test_save_writes_complete_events(self, tmp_path):
+        with Tracer() as tracer:
+            with span("search.page", page=1):
+                with span("search.enrich"):
+                    pass
+        path = tmp_path / "trace.json"
+
+        tracer.save(path)
+        trace = json.loads(path.read_text())
+
+        events = trace["traceEvents"]
+        [metadata] = [event for event in events if event["ph"] == "M"]
+        complete = [event for event in events if event["ph"] == "X"]
+        assert metadata["args"]["name"] == "MainThread"
+        assert [event["name"] for event in complete] == [
+            "search.page",
+            "search.enrich",
+        ]
+        assert complete[0]["cat"] == "search"
+        assert complete[0]["args"]["page"] == 1
+        assert complete[0]["ts"] <= complete[1]["ts"]
+        assert complete[1]["ts"] + complete[1]["dur"] <= (
+            complete[0]["ts"] + complete[0]["dur"]
+        )
+        assert complete[1]["args"]["parent_id"] == complete[0]["args"]["span_id"]
@@ -0,0 +1,87 @@
+"""Tests for the shared GitHub transport."""
+
+import json
+
+import requests
+
+from scripts.discovery.transport import (
+    GitHubTransport,
+    build_response,
+    create_github_client,
+    raw_field,
+)
+
+
+class RecordingMiddleware:
+    """Middleware that answers every request with a canned repository payload."""
+
+    def __init__(self):
+        self.urls = []
+
+    def handle(self, request, send, **kwargs):
+        self.urls.append(request.url)
+        body = json.dumps({"full_name": "owner/repo", "name": "repo"}).encode()
+        return build_response(request, 200, {"Content-Type": "application/json"}, body)
+
+
+class TestGitHubTransport:
+    """Test the GitHubTransport adapter and client wiring."""
+
+    def test_middleware_order(self):
+        """Test that middleware runs first-to-last around the request."""
+        calls = []
+
+        class Layer:
+            def __init__(self, name):
+                self.name = name
+
+            def handle(self, request, send, **kwargs):
+                calls.append(f"{self.name}:before")
+                response = send(request, **kwargs)
+                calls.append(f"{self.name}:after")
+                return response
+
+        transport = GitHubTransport(
+            [Layer("outer"), Layer("inner"), RecordingMiddleware()]
+        )
+        session = requests.Session()
+        session.mount("https://", transport)
+
+        response = session.get("https://api.github.com/repos/owner/repo")
+
+        assert response.json()["full_name"] == "owner/repo"
+        assert calls == ["outer:before", "inner:before", "inner:after", "outer:after"]
+
+    def test_create_github_client_routes_through_transport(self):
+        """Test that PyGithub requests are sent through the transport."""
+        recorder = RecordingMiddleware()
+        github = create_github_client("dummy_token", GitHubTransport([recorder]))
+
+        repo = github.get_repo("owner/repo")
+
+        assert repo.full_name == "owner/repo"
+        assert len(recorder.urls) == 1
+        assert recorder.urls[0].endswith("/repos/owner/repo")
+
+    def test_github_api_url_redirects_clients(self, monkeypatch):
+        """Test that GITHUB_API_URL points PyGithub at another server."""
+        monkeypatch.setenv("GITHUB_API_URL", "http://localhost:8000/")
+        recorder = RecordingMiddleware()
+        github = create_github_client("dummy_token", GitHubTransport([recorder]))
+
+        repo = github.get_repo("owner/repo")
+
+        assert recorder.urls == ["http://localhost:8000/repos/owner/repo"]
+        assert raw_field(repo, "name") == "repo"
+        assert raw_field(repo, "node_id") is None
+
+    def test_build_response(self):
+        """Test building a response without the network."""
+        request = requests.Request("GET", "https://api.github.com/x").prepare()
+        response = build_response(
+            request, 200, {"Content-Type": "application/json; charset=utf-8"}, b"{}"
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {}
+        assert response.headers["content-type"].startswith("application/json")
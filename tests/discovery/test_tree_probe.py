@@ -0,0 +1,47 @@
+"""Tests for locating instruction files in git trees."""
+
+from unittest.mock import Mock
+
+from scripts.discovery.tree_probe import find_instruction_files
+
+
+def element(path, size=2000, sha="sha", type="blob"):
+    return Mock(path=path, size=size, sha=sha, type=type)
+
+
+def test_find_instruction_files_orders_by_preference():
+    """Test that CLAUDE.md beats AGENTS.md and shallow paths beat nested ones."""
+    tree = [
+        element("a/b/CLAUDE.md"),
+        element("AGENTS.md"),
+        element("a/CLAUDE.md"),
+        element(".claude/CLAUDE.md"),
+        element("CLAUDE.md"),
+        element("README.md"),
+    ]
+
+    paths = [f.path for f in find_instruction_files(tree)]
+
+    assert paths == [
+        "CLAUDE.md",
+        ".claude/CLAUDE.md",
+        "a/CLAUDE.md",
+        "a/b/CLAUDE.md",
+        "AGENTS.md",
+    ]
+
+
+def test_find_instruction_files_matches_case_insensitively():
+    """Test that name variants are found and directories are ignored."""
+    tree = [
+        element("docs/claude.md", size=None),
+        element("CLAUDE.md", type="tree"),
+        element("Agents.md"),
+    ]
+
+    files = find_instruction_files(tree)
+
+    assert [(f.path, f.size) for f in files] == [
+        ("docs/claude.md", 0),
+        ("Agents.md", 2000),
+    ]
@@ -0,0 +1,45 @@
+"""Tests for the compare_runs module."""
+
+import json
+
+import pytest
+
+from scripts.compare_runs import main, parse_tolerance
+
+MANIFEST = {
+    "version": 1,
+    "pipeline": "tools",
+    "wall_seconds": 40.0,
+    "candidates": {"seen": 60, "fetched": 60, "scored": 60},
+    "api": {"calls": 300},
+}
+
+
+def _write(path, **values):
+    path.write_text(json.dumps({**MANIFEST, **values}))
+    return str(path)
+
+
+def test_main_passes_within_tolerance(tmp_path, capsys):
+    baseline = _write(tmp_path / "a.json")
+    current = _write(tmp_path / "b.json", wall_seconds=42.0)
+
+    assert main([baseline, current]) == 0
+    assert "No regressions" in capsys.readouterr().out
+
+
+def test_main_flags_regressions(tmp_path, capsys):
+    """Test that a regression is marked and sets the exit status."""
+    baseline = _write(tmp_path / "a.json")
+    current = _write(tmp_path / "b.json", api={"calls": 450})
+
+    assert main([baseline, current, "--tolerance", "api.*=0.2"]) == 1
+    output = capsys.readouterr().out
+    assert "! api.calls" in output
+    assert "+50.0%" in output
+
+
+def test_parse_tolerance():
+    assert parse_tolerance("stage_seconds.*=0.5") == ("stage_seconds.*", 0.5)
+    with pytest.raises(Exception, match="PATTERN=FRACTION"):
+        parse_tolerance("0.5")
@@ -0,0 +1,46 @@
+"""Tests for the discover_claude_tools entry point."""
+
+import json
+
+from scripts.benchmarks.discovery_load import LOAD_TOKEN, api_url
+from scripts.benchmarks.fake_github import FakeGitHubServer, populate
+from scripts.discover_claude_tools import main
+
+
+def test_api_usage_saved_without_a_report(tmp_path, monkeypatch):
+    """Test that a run with nothing to report still writes its API usage."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GITHUB_TOKEN", LOAD_TOKEN)
+    monkeypatch.setenv("GITHUB_HTTP_CACHE", "")
+    monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+    monkeypatch.delenv("GITHUB_CASSETTE", raising=False)
+
+    with (
+        FakeGitHubServer(populate(0, tools=0, documents=0)) as server,
+        api_url(server.base_url),
+    ):
+        main(["--api-usage", "usage.json", "--manifest", ""])
+
+    summary = json.loads((tmp_path / "usage.json").read_text())
+    assert summary["stages"]["search"]["calls"] > 0
+    assert not list(tmp_path.glob("*report*"))
+
+
+def test_default_output_files_share_the_report_timestamp(tmp_path, monkeypatch):
+    """Test that the report, manifest and API usage of a run can be matched."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GITHUB_TOKEN", LOAD_TOKEN)
+    monkeypatch.setenv("GITHUB_HTTP_CACHE", "")
+    monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+    monkeypatch.delenv("GITHUB_CASSETTE", raising=False)
+
+    with (
+        FakeGitHubServer(populate(0, tools=20)) as server,
+        api_url(server.base_url),
+    ):
+        main([])
+
+    (report,) = tmp_path.glob("tool_discovery_report_*.md")
+    timestamp = report.stem.removeprefix("tool_discovery_report_")
+    assert (tmp_path / f"tool_discovery_api_usage_{timestamp}.json").exists()
+    assert (tmp_path / f"tool_discovery_manifest_{timestamp}.json").exists()
@@ -0,0 +1,78 @@
+"""Tests for the evaluate_local module."""
+
+import json
+import tarfile
+
+from scripts.discovery.evaluator import RepositoryEvaluator
+from scripts.evaluate_local import evaluate_corpus, iter_corpus, main
+
+CONTENT = "# Service\n\n## Architecture\n\nA distributed platform.\n"
+METADATA = {
+    "full_name": "acme/service",
+    "owner": "acme",
+    "stars": 250,
+    "description": "Production sdk",
+    "topics": ["cli"],
+    "updated_at": "2024-01-01T00:00:00Z",
+}
+
+
+def _write_corpus(root):
+    (root / "acme" / "service").mkdir(parents=True)
+    (root / "acme" / "service" / "CLAUDE.md").write_text(CONTENT)
+    (root / "acme" / "service" / "CLAUDE.md.json").write_text(json.dumps(METADATA))
+    (root / "solo" / "tool").mkdir(parents=True)
+    (root / "solo" / "tool" / "CLAUDE.md").write_text("# Tool\n")
+    (root / "solo" / "tool" / "README.md").write_text("# Not scored\n")
+
+
+def test_directory_documents_use_sidecar_metadata(tmp_path):
+    """Test that sidecars override defaults derived from the path."""
+    _write_corpus(tmp_path)
+
+    documents = list(iter_corpus(tmp_path, "CLAUDE.md"))
+
+    assert [path for path, _, _ in documents] == [
+        "acme/service/CLAUDE.md",
+        "solo/tool/CLAUDE.md",
+    ]
+    _, candidate, content = documents[0]
+    assert content == CONTENT
+    assert candidate["stars"] == 250
+    assert candidate["claude_file_path"] == "CLAUDE.md"
+    _, default, _ = documents[1]
+    assert default["full_name"] == "solo/tool"
+    assert default["stars"] == 0
+
+
+def test_tarball_matches_directory(tmp_path):
+    """Test that a tarball of the corpus scores exactly like the directory."""
+    corpus = tmp_path / "corpus"
+    _write_corpus(corpus)
+    archive = tmp_path / "corpus.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        tar.add(corpus / "acme", arcname="acme")
+        tar.add(corpus / "solo", arcname="solo")
+
+    from_directory = list(evaluate_corpus(iter_corpus(corpus, "CLAUDE.md")))
+    from_tarball = list(evaluate_corpus(iter_corpus(archive, "CLAUDE.md")))
+
+    assert [(p, e["score"]) for p, e in from_directory] == [
+        (p, e["score"]) for p, e in from_tarball
+    ]
+    expected = RepositoryEvaluator(None).score_candidate(
+        from_directory[0][1]["candidate"], CONTENT
+    )
+    assert from_directory[0][1]["score"] == expected["score"]
+
+
+def test_main_streams_json_lines(tmp_path):
+    """Test the command line entry point with worker processes."""
+    _write_corpus(tmp_path / "corpus")
+    output = tmp_path / "scores.jsonl"
+
+    assert main([str(tmp_path / "corpus"), "--output", str(output)]) == 0
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+
+    assert [r["full_name"] for r in records] == ["acme/service", "solo/tool"]
+    assert main([str(output)]) == 1
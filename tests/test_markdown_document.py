@@ -0,0 +1,87 @@
+"""Tests for the markdown_document module."""
+
+from scripts.markdown_document import parse_document, parse_markdown
+
+SAMPLE_DOCUMENT = """# Project Title
+
+Intro with a [guide](https://example.com/guide "Guide") link.
+
+## Setup
+- Install dependencies
+- Run the server
+  - nested detail
+
+### Commands
+
+```Python
+# not a heading
+- not a bullet
+```
+
+## Architecture ##
+
+~~~
+unclosed fence
+"""
+
+
+class TestParseMarkdown:
+    """Test the single-pass markdown tokenizer."""
+
+    def test_heading_tree(self):
+        """Test that headings nest under the closest shallower heading."""
+        document = parse_markdown(SAMPLE_DOCUMENT)
+
+        assert document.title == "Project Title"
+        assert [h.title for h in document.headings] == [
+            "Project Title",
+            "Setup",
+            "Commands",
+            "Architecture",
+        ]
+        (root,) = document.outline
+        assert [h.title for h in root.children] == ["Setup", "Architecture"]
+        assert [h.title for h in root.children[0].children] == ["Commands"]
+        assert document.section_count() == 3
+
+    def test_code_blocks_hide_their_contents(self):
+        """Test that fenced lines are not read as headings, bullets or words."""
+        document = parse_markdown(SAMPLE_DOCUMENT)
+
+        assert [(b.language, b.text) for b in document.code_blocks] == [
+            ("python", "# not a heading\n- not a bullet"),
+            ("", "unclosed fence"),
+        ]
+        assert not document.has_heading(["not a heading"], min_level=1)
+        assert "not a bullet" not in [b.text for b in document.bullets]
+
+    def test_bullets_links_and_words(self):
+        """Test bullets, links and the prose word count."""
+        document = parse_markdown(SAMPLE_DOCUMENT)
+
+        setup = document.find_heading(r"setup")
+        assert [b.text for b in document.bullets_after(setup)] == [
+            "Install dependencies",
+            "Run the server",
+        ]
+        assert [(link.text, link.url) for link in document.links] == [
+            ("guide", "https://example.com/guide")
+        ]
+        assert document.word_count == 22
+
+    def test_deeper_headings_counted_once(self):
+        """Test that ### and #### headings each count as one section."""
+        document = parse_markdown("## A\n### B\n#### C\n####### not a heading\n")
+
+        assert document.section_count() == 3
+        assert document.has_heading(["b"], min_level=3)
+        assert not document.has_heading(["a"], min_level=3)
+
+
+def test_parse_document_is_memoized_by_content():
+    """Test that equal content returns the same parsed document."""
+    content = "## Cached\n"
+    first = parse_document(content)
+
+    assert parse_document("".join(["## Cached", "\n"])) is first
+    assert parse_document("## Other\n") is not first
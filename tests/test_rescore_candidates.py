@@ -0,0 +1,50 @@
+"""Tests for the rescore_candidates module."""
+
+from scripts.discovery.blob_store import BlobStore
+from scripts.discovery.evaluator import RepositoryEvaluator
+from scripts.discovery.feature_cache import FeatureCache
+from scripts.discovery.features import extract_content_profile
+from scripts.discovery.run_state import RunStateStore
+from scripts.rescore_candidates import rescore
+
+CONTENT = "# Service\n\n## Architecture\n\nA distributed platform.\n"
+
+
+def _candidate(name: str, sha: str) -> dict:
+    return {
+        "full_name": name,
+        "name": name.split("/")[1],
+        "owner": name.split("/")[0],
+        "stars": 20,
+        "html_url": f"https://github.com/{name}",
+        "claude_file_path": "CLAUDE.md",
+        "claude_file_sha": sha,
+        "description": "A service",
+        "topics": [],
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def test_rescore_reads_cache_then_blob_store(tmp_path):
+    """Test that profiles come from the cache, falling back to stored blobs."""
+    sha = extract_content_profile(CONTENT).blob_sha
+    run_state = RunStateStore(tmp_path / "state.json")
+    run_state.record_evaluation(_candidate("a/stored", sha), 10)
+    run_state.record_evaluation(_candidate("b/missing", "0" * 40), 10)
+    blob_store = BlobStore(tmp_path / "blobs", compression="gzip")
+    blob_store.put(sha, CONTENT.encode())
+    feature_cache = FeatureCache(tmp_path / "features.sqlite3")
+
+    [first] = rescore(run_state, feature_cache, blob_store)
+    [second] = rescore(run_state, feature_cache, blob_store)
+
+    expected = RepositoryEvaluator(None).score_candidate(
+        _candidate("a/stored", sha), CONTENT
+    )
+    assert first == second
+    assert first["full_name"] == "a/stored"
+    assert first["old_score"] == 10
+    assert first["score"] == expected["score"]
+    assert first["suggested_category"] == expected["suggested_category"]
+    assert blob_store.stats()["hits"] == 1
+    assert feature_cache.stats()["hits"] == 1
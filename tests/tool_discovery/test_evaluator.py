@@ -276,3 +276,12 @@ Here are some examples of usage.
         result = evaluator.evaluate_candidate(candidate)
         assert result is not None
         assert "tool_type" in result
+
+    def test_detect_tool_type_ignores_keywords_across_fields(self, evaluator):
+        """Test that a keyword split between description and README is not a hit."""
+        candidate = {"description": "Use the cl", "topics": []}
+
+        assert evaluator._detect_tool_type(candidate, "i to scaffold") == ("generator")
+        hits, readme_hits = evaluator.scan_keywords(candidate, "i to scaffold")
+        assert "cli" not in hits
+        assert "scaffold" in readme_hits
@@ -132,6 +132,17 @@ class TestToolIssueGenerator:
                     "tool_discovery_report_20231201_120000.md", "w", encoding="utf-8"
                 )
 
+    def test_save_discovery_report_uses_run_timestamp(self, issue_generator):
+        """Test that a timestamp given by the run names the report file."""
+        issue_generator.timestamp = "20231201_120000"
+
+        with patch("builtins.open", create=True) as mock_open:
+            issue_generator._save_discovery_report("Title", "Body")
+
+        mock_open.assert_called_with(
+            "tool_discovery_report_20231201_120000.md", "w", encoding="utf-8"
+        )
+
     def test_save_discovery_report_error(self, issue_generator):
         """Test saving discovery report when an error occurs."""
         title = "Monthly Tool Discovery"
@@ -133,3 +133,27 @@ class TestToolSearcher:
         assert result["full_name"] == "owner/tool"
         # License should be None or empty when not present
         assert result.get("license") is None or result.get("license") == ""
+
+    def test_process_page_results_dedupes_before_fetching(self, tool_searcher):
+        """Test that repositories seen earlier are dropped before the README fetch."""
+        from scripts.discovery.dedupe import RepositoryDeduplicator
+
+        repos = []
+        for name in ("owner/tool", "owner/other", "owner/tool"):
+            repo = Mock()
+            repo.full_name = name
+            repos.append(repo)
+        deduplicator = RepositoryDeduplicator()
+
+        with patch.object(
+            tool_searcher,
+            "_process_single_repo",
+            side_effect=lambda repo, existing: {"full_name": repo.full_name},
+        ) as process:
+            first = tool_searcher._process_page_results(repos, set(), deduplicator)
+            second = tool_searcher._process_page_results(repos[:1], set(), deduplicator)
+
+        assert [c["full_name"] for c in first] == ["owner/tool", "owner/other"]
+        assert second == []
+        assert process.call_count == 2
+        assert deduplicator.counts["duplicate"] == 2